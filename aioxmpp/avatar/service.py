@@ -435,6 +435,26 @@ class VCardAvatarDescriptor(AbstractAvatarDescriptor):
         return photo
 
 
+def _estimate_metadata_size(metadata):
+    """
+    Estimate the memory taken by the list of avatar descriptors `metadata`.
+
+    Only the strings and image data held by the descriptors are counted
+    exactly; the descriptor objects themselves are assumed to take a fixed
+    number of bytes.
+    """
+    size = 0
+    for descriptor in metadata:
+        size += 128
+        for value in (descriptor.id_, descriptor.mime_type, descriptor.url):
+            if value is not None:
+                size += len(value)
+        image_bytes = getattr(descriptor, "_image_bytes", None)
+        if image_bytes is not None:
+            size += len(image_bytes)
+    return size
+
+
 class AvatarService(service.Service):
     """
     Access and publish User Avatars (:xep:`84`). Fallback to vCard
@@ -491,6 +511,9 @@ class AvatarService(service.Service):
 
     .. autoattribute:: metadata_cache_size
        :annotation: = 200
+
+    .. autoattribute:: metadata_cache_max_bytes
+       :annotation: = None
     """
 
     ORDER_AFTER = [
@@ -551,6 +574,29 @@ class AvatarService(service.Service):
     def metadata_cache_size(self, value):
         self._metadata_cache.maxsize = value
 
+    @property
+    def metadata_cache_max_bytes(self):
+        """
+        Approximate maximum number of bytes taken by the entries in the avatar
+        metadata cache, or :data:`None` for no limit.
+
+        The estimate includes image data which was received together with the
+        metadata (as is the case for vCard based avatars). This restriction
+        applies in addition to :attr:`metadata_cache_size`.
+
+        .. versionadded:: 0.10
+        """
+        return self._metadata_cache.max_weight
+
+    @metadata_cache_max_bytes.setter
+    def metadata_cache_max_bytes(self, value):
+        if value is None:
+            self._metadata_cache.max_weight = None
+            self._metadata_cache.weight = None
+        else:
+            self._metadata_cache.weight = _estimate_metadata_size
+            self._metadata_cache.max_weight = value
+
     @property
     def synchronize_vcard(self):
         """
@@ -892,7 +938,10 @@ class AvatarService(service.Service):
         # condition because if our version is actually newer we will
         # soon get another notify for this version change!
         if jid not in self._metadata_cache:
+            # not looking the metadata up in the cache again: it may be too
+            # large for the cache and have been purged right away
             self._update_metadata(jid, metadata)
+            return metadata
         return self._metadata_cache[jid]
 
     @asyncio.coroutine
@@ -31,99 +31,154 @@
 
 """
 
+import collections
 import collections.abc
+import time
 
 
-class Node:
-    __slots__ = ("prev", "next_", "key", "value")
+class LRUDict(collections.abc.MutableMapping):
+    """
+    Size-restricted dictionary with Least Recently Used expiry policy.
 
+    .. versionadded:: 0.9
 
-def _init_linked_list():
-    root = Node()
-    root.prev = root
-    root.next_ = root
-    root.key = None
-    root.value = None
-    return root
+    The :class:`LRUDict` supports normal dictionary-style access and implements
+    :class:`collections.abc.MutableMapping`.
 
+    When the :attr:`maxsize` is exceeded, as many entries as needed to get
+    below the :attr:`maxsize` are removed from the dict. Least recently used
+    entries are purged first. Setting an entry does *not* count as use!
 
-def _remove_node(node):
-    node.next_.prev = node.prev
-    node.prev.next_ = node.next_
-    return node
+    .. autoattribute:: maxsize
 
+    .. versionchanged:: 0.10
 
-def _insert_node(before, new_node):
-    new_node.next_ = before.next_
-    new_node.next_.prev = new_node
-    new_node.prev = before
-    before.next_ = new_node
+       The dictionary is now implemented on top of
+       :class:`collections.OrderedDict`, which makes lookups considerably
+       cheaper. In addition, entries can expire after a time (see
+       :attr:`ttl`), the dictionary can be restricted by the total weight of
+       its values (see :attr:`weight` and :attr:`max_weight`) and statistics
+       are collected.
 
+    Expiry by time:
 
-def _length(node):
-    # this is used only for testing
-    cur = node.next_
-    i = 0
-    while cur is not node:
-        i += 1
-        cur = cur.next_
-    return i
+    .. autoattribute:: ttl
 
+    .. automethod:: expire
 
-def _has_consistent_links(node, node_dict=None):
-    # this is used only for testing
-    cur = node.next_
+    Restriction by weight:
 
-    if cur.prev is not node:
-        return False
+    .. autoattribute:: weight
 
-    while cur is not node:
-        if node_dict is not None and node_dict[cur.key] is not cur:
-            return False
-        if cur is not cur.next_.prev:
-            return False
-        cur = cur.next_
-    return True
+    .. autoattribute:: max_weight
 
+    .. autoattribute:: total_weight
 
-class LRUDict(collections.abc.MutableMapping):
-    """
-    Size-restricted dictionary with Least Recently Used expiry policy.
+    .. automethod:: reweigh
 
-    .. versionadded:: 0.9
+    Statistics:
 
-    The :class:`LRUDict` supports normal dictionary-style access and implements
-    :class:`collections.abc.MutableMapping`.
+    .. attribute:: hits
 
-    When the :attr:`maxsize` is exceeded, as many entries as needed to get
-    below the :attr:`maxsize` are removed from the dict. Least recently used
-    entries are purged first. Setting an entry does *not* count as use!
+       Number of successful lookups.
 
-    .. autoattribute:: maxsize
+    .. attribute:: misses
+
+       Number of lookups which raised :class:`KeyError`, including those for
+       entries which had expired.
+
+    .. attribute:: evictions
+
+       Number of entries which were removed to satisfy :attr:`maxsize` or
+       :attr:`max_weight`.
+
+    .. attribute:: expirations
+
+       Number of entries which were removed because their :attr:`ttl` had
+       passed.
+
+    .. automethod:: reset_counters
     """
 
+    __slots__ = (
+        "__data",
+        "__maxsize",
+        "__ttl",
+        "__deadlines",
+        "__weight",
+        "__max_weight",
+        "__weights",
+        "__total_weight",
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.__links = {}
-        self.__root = _init_linked_list()
-
+        self.__data = collections.OrderedDict()
         self.__maxsize = 1
 
+        self.__ttl = None
+        # maps the keys to the time.monotonic() timestamp at which they expire,
+        # in the order in which they were stored; None if ttl is None
+        self.__deadlines = None
+
+        self.__weight = None
+        self.__max_weight = None
+        # maps the keys to the weight of their values; None if weight is None
+        self.__weights = None
+        self.__total_weight = 0
+
+        self.reset_counters()
+
     def _test_consistency(self):
         """
         This method is only used for testing to assert that the operations
         leave the LRUDict in a valid state.
         """
-        return (_length(self.__root) == len(self.__links) and
-                _has_consistent_links(self.__root, self.__links))
+        if self.__deadlines is not None:
+            if set(self.__deadlines) != set(self.__data):
+                return False
+            deadlines = list(self.__deadlines.values())
+            if deadlines != sorted(deadlines):
+                return False
+
+        if self.__weights is not None:
+            if set(self.__weights) != set(self.__data):
+                return False
+            if sum(self.__weights.values()) != self.__total_weight:
+                return False
+
+        return True
+
+    def __forget(self, key):
+        if self.__deadlines is not None:
+            del self.__deadlines[key]
+        if self.__weights is not None:
+            self.__total_weight -= self.__weights.pop(key)
+
+    def __evict_oldest(self):
+        key, _ = self.__data.popitem(last=False)
+        self.__forget(key)
+        self.evictions += 1
+
+    def __compute_weight(self, value):
+        weight = self.__weight(value)
+        if weight < 0:
+            raise ValueError("weight must be non-negative")
+        return weight
 
     def _purge(self):
-        if self.__maxsize is None:
-            return
+        if self.__maxsize is not None:
+            while len(self.__data) > self.__maxsize:
+                self.__evict_oldest()
 
-        while len(self.__links) > self.__maxsize:
-            link = _remove_node(self.__root.prev)
-            del self.__links[link.key]
+        if self.__max_weight is not None:
+            while (self.__total_weight > self.__max_weight and
+                   self.__data):
+                self.__evict_oldest()
 
     @property
     def maxsize(self):
@@ -147,33 +202,246 @@ class LRUDict(collections.abc.MutableMapping):
         self.__maxsize = value
         self._purge()
 
+    @property
+    def ttl(self):
+        """
+        Time after which an entry expires, as :class:`datetime.timedelta`, or
+        :data:`None` (the default) if entries do not expire.
+
+        The time is counted from the moment the entry was last stored; using
+        an entry does not extend its lifetime. Expired entries behave as if
+        they had been deleted. They are removed when they are accessed, when
+        new entries are stored, when the dictionary is iterated over or its
+        length is taken, and by :meth:`expire`.
+
+        Setting this property restarts the lifetime of all entries.
+
+        .. versionadded:: 0.10
+        """
+        return self.__ttl
+
+    @ttl.setter
+    def ttl(self, value):
+        if value is None:
+            self.__ttl = None
+            self.__deadlines = None
+            return
+
+        if value.total_seconds() <= 0:
+            raise ValueError("ttl must be positive or None")
+
+        self.__ttl = value
+        deadline = time.monotonic() + value.total_seconds()
+        self.__deadlines = collections.OrderedDict(
+            (key, deadline)
+            for key in self.__data
+        )
+
+    def expire(self):
+        """
+        Remove all entries whose :attr:`ttl` has passed.
+
+        This is not needed for correctness, but can be used to free the memory
+        held by expired entries early.
+
+        .. versionadded:: 0.10
+        """
+        deadlines = self.__deadlines
+        if not deadlines:
+            return
+
+        now = time.monotonic()
+        while deadlines:
+            key, deadline = next(iter(deadlines.items()))
+            if deadline > now:
+                break
+            del self.__data[key]
+            self.__forget(key)
+            self.expirations += 1
+
+    @property
+    def weight(self):
+        """
+        Function which returns the weight of a value, or :data:`None` (the
+        default).
+
+        The function is called with the value as only argument and must return
+        a non-negative number; the unit (for example, bytes) is up to the
+        user. The weight of a value is determined when it is stored (and by
+        :meth:`reweigh`).
+
+        The weights are only used to restrict the dictionary if
+        :attr:`max_weight` is set. Setting this property re-weighs all
+        entries.
+
+        .. versionadded:: 0.10
+        """
+        return self.__weight
+
+    @weight.setter
+    def weight(self, value):
+        if value is None:
+            self.__weight = None
+            self.__weights = None
+            self.__total_weight = 0
+            return
+
+        weights = {
+            key: value(item)
+            for key, item in self.__data.items()
+        }
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("weight must be non-negative")
+
+        self.__weight = value
+        self.__weights = weights
+        self.__total_weight = sum(weights.values())
+        self._purge()
+
+    @property
+    def max_weight(self):
+        """
+        Maximum total :attr:`weight` of the values, or :data:`None` (the
+        default) for no limit.
+
+        When the limit is exceeded, least recently used entries are purged,
+        the same as with :attr:`maxsize`. Both limits apply at the same time.
+        An entry whose weight exceeds :attr:`max_weight` on its own is purged
+        right away.
+
+        Setting this property to a value other than :data:`None` requires that
+        :attr:`weight` is set. Changing this property purges overhanging
+        entries immediately.
+
+        .. versionadded:: 0.10
+        """
+        return self.__max_weight
+
+    @max_weight.setter
+    def max_weight(self, value):
+        if value is not None:
+            if value <= 0:
+                raise ValueError("max_weight must be positive or None")
+            if self.__weight is None:
+                raise ValueError("max_weight requires a weight function")
+        self.__max_weight = value
+        self._purge()
+
+    @property
+    def total_weight(self):
+        """
+        The sum of the weights of all entries (zero if :attr:`weight` is
+        :data:`None`).
+
+        .. versionadded:: 0.10
+        """
+        return self.__total_weight
+
+    def reweigh(self, key):
+        """
+        Determine the weight of the entry for `key` anew.
+
+        This is needed if the value has changed in a way which affects its
+        weight after it has been stored. If `key` is not in the dictionary or
+        :attr:`weight` is :data:`None`, nothing happens. This does not count
+        as use of the entry.
+
+        .. versionadded:: 0.10
+        """
+        if self.__weights is None:
+            return
+
+        try:
+            value = self.__data[key]
+        except KeyError:
+            return
+
+        weight = self.__compute_weight(value)
+        self.__total_weight += weight - self.__weights[key]
+        self.__weights[key] = weight
+        self._purge()
+
+    def reset_counters(self):
+        """
+        Reset all statistics counters to zero.
+
+        .. versionadded:: 0.10
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
     def __len__(self):
-        return len(self.__links)
+        self.expire()
+        return len(self.__data)
 
     def __iter__(self):
-        return iter(self.__links)
+        self.expire()
+        # iterate over a copy, so that the entries can be looked up (and thus
+        # reordered) during iteration
+        return iter(list(self.__data))
 
     def __setitem__(self, key, value):
-        try:
-            self.__links[key].value = value
-        except KeyError:
-            link = Node()
-            link.key = key
-            link.value = value
-            self.__links[key] = link
-            _insert_node(self.__root, link)
+        data = self.__data
+
+        if self.__weights is None and self.__deadlines is None:
+            # fast path for the plain LRU mode
+            if key in data:
+                data[key] = value
+                return
+            data[key] = value
+            if self.__maxsize is not None and len(data) > self.__maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+            return
+
+        is_new = key not in data
+
+        if self.__weights is not None:
+            weight = self.__compute_weight(value)
+            self.__total_weight += weight - self.__weights.get(key, 0)
+            self.__weights[key] = weight
+
+        if self.__deadlines is not None:
+            if is_new:
+                self.expire()
+            self.__deadlines[key] = time.monotonic() + \
+                self.__ttl.total_seconds()
+            self.__deadlines.move_to_end(key)
+
+        data[key] = value
+
+        if is_new or self.__max_weight is not None:
             self._purge()
 
     def __getitem__(self, key):
-        link = self.__links[key]
-        _remove_node(link)
-        _insert_node(self.__root, link)
-        return link.value
+        try:
+            value = self.__data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        if (self.__deadlines is not None and
+                self.__deadlines[key] <= time.monotonic()):
+            del self.__data[key]
+            self.__forget(key)
+            self.expirations += 1
+            self.misses += 1
+            raise KeyError(key)
+
+        self.__data.move_to_end(key)
+        self.hits += 1
+        return value
 
     def __delitem__(self, key):
-        link = self.__links.pop(key)
-        _remove_node(link)
+        del self.__data[key]
+        self.__forget(key)
 
     def clear(self):
-        self.__links.clear()
-        self.__root = _init_linked_list()
+        self.__data.clear()
+        if self.__deadlines is not None:
+            self.__deadlines.clear()
+        if self.__weights is not None:
+            self.__weights.clear()
+        self.__total_weight = 0
@@ -98,6 +98,7 @@ Filters
 
 import abc
 import asyncio
+import bisect
 import collections
 import contextlib
 import functools
@@ -259,22 +260,39 @@ class AbstractAdHocSignal:
     def __init__(self):
         super().__init__()
         self._connections = collections.OrderedDict()
+        self._snapshot = ()
         self.logger = logger
 
+    def _connections_snapshot(self):
+        # the snapshot is an immutable copy of the connections which is only
+        # rebuilt after the set of connections changed; this allows listeners
+        # to (dis-)connect while the signal is being fired without copying
+        # the connections on each emission
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = tuple(self._connections.items())
+            self._snapshot = snapshot
+        return snapshot
+
     def _connect(self, wrapper):
         token = object()
         self._connections[token] = wrapper
+        self._snapshot = None
         return token
 
+    def _remove(self, token):
+        try:
+            del self._connections[token]
+        except KeyError:
+            return
+        self._snapshot = None
+
     def disconnect(self, token):
         """
         Disconnect the connection identified by `token`. This never raises,
         even if an invalid `token` is passed.
         """
-        try:
-            del self._connections[token]
-        except KeyError:
-            pass
+        self._remove(token)
 
 
 class AdHocSignal(AbstractAdHocSignal):
@@ -531,14 +549,20 @@ class AdHocSignal(AbstractAdHocSignal):
         Instead of calling :meth:`fire` explicitly, the ad-hoc signal object
         itself can be called, too.
         """
-        for token, wrapper in list(self._connections.items()):
+        connections = self._snapshot
+        if connections is None:
+            connections = self._connections_snapshot()
+        if not connections:
+            return
+
+        for token, wrapper in connections:
             try:
                 keep = wrapper(args, kwargs)
             except Exception:
                 self.logger.exception("listener attached to signal raised")
                 keep = False
             if not keep:
-                del self._connections[token]
+                self._remove(token)
 
     def future(self):
         """
@@ -612,10 +636,10 @@ class SyncAdHocSignal(AbstractAdHocSignal):
         Instead of calling :meth:`fire` explicitly, the ad-hoc signal object
         itself can be called, too.
         """
-        for token, coro in list(self._connections.items()):
+        for token, coro in self._connections_snapshot():
             keep = yield from coro(*args, **kwargs)
             if not keep:
-                del self._connections[token]
+                self._remove(token)
 
     __call__ = fire
 
@@ -754,6 +778,10 @@ class Filter:
     def __init__(self):
         super().__init__()
         self._filter_order = []
+        self._filter_chain = ()
+
+    def _rebuild_chain(self):
+        self._filter_chain = tuple(func for _, _, func in self._filter_order)
 
     def register(self, func, order):
         """
@@ -783,8 +811,13 @@ class Filter:
         The returned token can be used to :meth:`unregister` a filter.
         """
         token = self.Token()
-        self._filter_order.append((order, token, func))
-        self._filter_order.sort(key=lambda x: x[0])
+        # insert after all entries with an equal order to keep the sort stable
+        index = bisect.bisect_right(
+            [entry_order for entry_order, _, _ in self._filter_order],
+            order,
+        )
+        self._filter_order.insert(index, (order, token, func))
+        self._rebuild_chain()
         return token
 
     def filter(self, obj, *args, **kwargs):
@@ -802,7 +835,7 @@ class Filter:
         Returns the object returned by the last function in the filter chain or
         :data:`None` if any function returned :data:`None`.
         """
-        for _, _, func in self._filter_order:
+        for func in self._filter_chain:
             obj = func(obj, *args, **kwargs)
             if obj is None:
                 return None
@@ -824,6 +857,7 @@ class Filter:
             raise ValueError("unregistered token: {!r}".format(
                 token_to_remove))
         del self._filter_order[i]
+        self._rebuild_chain()
 
     @contextlib.contextmanager
     def context_register(self, func, *args):
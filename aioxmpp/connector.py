@@ -206,70 +206,74 @@ class STARTTLSConnector(BaseConnector):
 
         stream.deadtime_hard_limit = timedelta(seconds=negotiation_timeout)
 
-        features = yield from features_future
-
         try:
-            features[nonza.StartTLSFeature]
-        except KeyError:
-            if not metadata.tls_required:
-                return transport, stream, (yield from features_future)
-            logger.debug(
-                "attempting STARTTLS despite not announced since it is"
-                " required")
-
-        try:
-            response = yield from protocol.send_and_wait_for(
-                stream,
-                [
-                    nonza.StartTLS(),
-                ],
-                [
-                    nonza.StartTLSFailure,
-                    nonza.StartTLSProceed,
-                ]
-            )
-        except errors.StreamError as exc:
-            raise errors.TLSUnavailable(
-                "STARTTLS not supported by server, but required by client"
-            )
-
-        if not isinstance(response, nonza.StartTLSProceed):
-            if metadata.tls_required:
-                message = (
-                    "server failed to STARTTLS"
-                )
-
-                protocol.send_stream_error_and_close(
+            features = yield from features_future
+
+            try:
+                features[nonza.StartTLSFeature]
+            except KeyError:
+                if not metadata.tls_required:
+                    return transport, stream, (yield from features_future)
+                logger.debug(
+                    "attempting STARTTLS despite not announced since it is"
+                    " required")
+
+            try:
+                response = yield from protocol.send_and_wait_for(
                     stream,
-                    condition=errors.StreamErrorCondition.POLICY_VIOLATION,
-                    text=message,
+                    [
+                        nonza.StartTLS(),
+                    ],
+                    [
+                        nonza.StartTLSFailure,
+                        nonza.StartTLSProceed,
+                    ]
+                )
+            except errors.StreamError as exc:
+                raise errors.TLSUnavailable(
+                    "STARTTLS not supported by server, but required by client"
                 )
 
-                raise errors.TLSUnavailable(message)
-            return transport, stream, (yield from features_future)
+            if not isinstance(response, nonza.StartTLSProceed):
+                if metadata.tls_required:
+                    message = (
+                        "server failed to STARTTLS"
+                    )
 
-        verifier = metadata.certificate_verifier_factory()
-        yield from verifier.pre_handshake(
-            domain,
-            host,
-            port,
-            metadata,
-        )
+                    protocol.send_stream_error_and_close(
+                        stream,
+                        condition=errors.StreamErrorCondition.POLICY_VIOLATION,
+                        text=message,
+                    )
 
-        ssl_context = metadata.ssl_context_factory()
-        verifier.setup_context(ssl_context, transport)
+                    raise errors.TLSUnavailable(message)
+                return transport, stream, (yield from features_future)
 
-        yield from stream.starttls(
-            ssl_context=ssl_context,
-            post_handshake_callback=verifier.post_handshake,
-        )
+            verifier = metadata.certificate_verifier_factory()
+            yield from verifier.pre_handshake(
+                domain,
+                host,
+                port,
+                metadata,
+            )
 
-        features_future = yield from protocol.reset_stream_and_get_features(
-            stream,
-            timeout=negotiation_timeout,
-        )
+            ssl_context = metadata.ssl_context_factory()
+            verifier.setup_context(ssl_context, transport)
 
-        return transport, stream, features_future
+            yield from stream.starttls(
+                ssl_context=ssl_context,
+                post_handshake_callback=verifier.post_handshake,
+            )
+
+            features = yield from protocol.reset_stream_and_get_features(
+                stream,
+                timeout=negotiation_timeout,
+            )
+
+            return transport, stream, features
+        except asyncio.CancelledError:
+            stream.abort()
+            raise
 
 
 class XMPPOverTLSConnector(BaseConnector):
@@ -379,4 +383,10 @@ class XMPPOverTLSConnector(BaseConnector):
 
         stream.deadtime_hard_limit = timedelta(seconds=negotiation_timeout)
 
-        return transport, stream, (yield from features_future)
+        try:
+            features = yield from features_future
+        except asyncio.CancelledError:
+            stream.abort()
+            raise
+
+        return transport, stream, features
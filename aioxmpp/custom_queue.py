@@ -24,12 +24,15 @@ import collections
 
 
 class AsyncDeque:
-    def __init__(self, *, loop=None):
+    def __init__(self, *, loop=None, notify=None):
         super().__init__()
         self._loop = loop
         self._data = collections.deque()
         self._non_empty = asyncio.Event(loop=self._loop)
         self._non_empty.clear()
+        # optional asyncio.Event which is set whenever an item is put into
+        # the deque; this allows to wait for multiple deques at once
+        self._notify = notify
 
     def __len__(self):
         return len(self._data)
@@ -43,10 +46,14 @@ class AsyncDeque:
     def put_nowait(self, obj):
         self._data.append(obj)
         self._non_empty.set()
+        if self._notify is not None:
+            self._notify.set()
 
     def putleft_nowait(self, obj):
         self._data.appendleft(obj)
         self._non_empty.set()
+        if self._notify is not None:
+            self._notify.set()
 
     def get_nowait(self):
         try:
@@ -75,3 +82,131 @@ class AsyncDeque:
     def clear(self):
         self._data.clear()
         self._non_empty.clear()
+
+
+class WeightedFairQueue:
+    """
+    Queue with multiple classes which are served in proportion to their
+    weights.
+
+    :param weights: Mapping of the class keys to their weights.
+    :type weights: :class:`dict` of hashable to positive :class:`int`
+    :param loop: Event loop to use.
+    :param notify: Optional :class:`asyncio.Event` which is set whenever an
+                   item is put into the queue.
+
+    Each class has its own FIFO. :meth:`get_nowait` picks the class using
+    smooth weighted round robin over the non-empty classes, so that a class
+    with weight 4 is served four times as often as a class with weight 1
+    while both have items queued, and the items of the classes are
+    interleaved instead of being served in bursts.
+
+    Items put with :meth:`putleft_nowait` bypass the classes: they are served
+    before any other item, most recently put first.
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, weights, *, loop=None, notify=None):
+        super().__init__()
+        self._loop = loop
+        self._head = collections.deque()
+        self._queues = collections.OrderedDict()
+        self._weights = {}
+        self._current = {}
+        for key, weight in weights.items():
+            self._queues[key] = collections.deque()
+            self._current[key] = 0
+            self.set_weight(key, weight)
+        self._size = 0
+        self._non_empty = asyncio.Event(loop=self._loop)
+        self._notify = notify
+
+    def get_weight(self, key):
+        return self._weights[key]
+
+    def set_weight(self, key, weight):
+        if key not in self._queues:
+            raise KeyError(key)
+        if weight < 1:
+            raise ValueError("weight must be positive")
+        self._weights[key] = weight
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, obj):
+        return (obj in self._head or
+                any(obj in queue for queue in self._queues.values()))
+
+    def qsize(self, key):
+        """
+        Return the number of items queued in the class `key`.
+        """
+        return len(self._queues[key])
+
+    def empty(self):
+        return not self._size
+
+    def _put(self):
+        self._size += 1
+        self._non_empty.set()
+        if self._notify is not None:
+            self._notify.set()
+
+    def put_nowait(self, obj, key):
+        self._queues[key].append(obj)
+        self._put()
+
+    def putleft_nowait(self, obj):
+        self._head.appendleft(obj)
+        self._put()
+
+    def _select(self):
+        # smooth weighted round robin (as used by nginx): every non-empty
+        # class earns its weight, the richest class is served and pays the
+        # total weight of all competing classes
+        best = None
+        best_current = None
+        total = 0
+        current = self._current
+        weights = self._weights
+        for key, queue in self._queues.items():
+            if not queue:
+                current[key] = 0
+                continue
+            weight = weights[key]
+            total += weight
+            value = current[key] + weight
+            current[key] = value
+            if best is None or value > best_current:
+                best = key
+                best_current = value
+        current[best] -= total
+        return self._queues[best]
+
+    def get_nowait(self):
+        if not self._size:
+            raise asyncio.QueueEmpty()
+        if self._head:
+            item = self._head.popleft()
+        else:
+            item = self._select().popleft()
+        self._size -= 1
+        if not self._size:
+            self._non_empty.clear()
+        return item
+
+    @asyncio.coroutine
+    def get(self):
+        while not self._size:
+            yield from self._non_empty.wait()
+        return self.get_nowait()
+
+    def clear(self):
+        self._head.clear()
+        for key, queue in self._queues.items():
+            queue.clear()
+            self._current[key] = 0
+        self._size = 0
+        self._non_empty.clear()
@@ -30,12 +30,25 @@ import aioxmpp.errors as errors
 import aioxmpp.service as service
 import aioxmpp.structs as structs
 import aioxmpp.stanza as stanza
+import aioxmpp.xml
 
 from aioxmpp.utils import namespaces
 
 from . import xso as disco_xso
 
 
+def _estimate_response_size(fut):
+    """
+    Estimate the memory taken by the result of `fut` by the length of its
+    serialised form.
+
+    Futures which are not done yet or have failed are counted as zero bytes.
+    """
+    if not fut.done() or fut.cancelled() or fut.exception() is not None:
+        return 0
+    return len(aioxmpp.xml.XSOBytesSerializer().serialize(fut.result()))
+
+
 class Node(object):
     """
     A :class:`Node` holds the information related to a specific node within the
@@ -537,8 +550,38 @@ class DiscoClient(service.Service):
     .. autoattribute:: items_cache_size
        :annotation: = 100
 
+    .. autoattribute:: info_cache_max_bytes
+       :annotation: = None
+
+    .. autoattribute:: items_cache_max_bytes
+       :annotation: = None
+
     .. automethod:: flush_cache
 
+    To share the information about servers with other clients in the same
+    process:
+
+    .. attribute:: server_info_cache
+       :annotation: = None
+
+       A mutable mapping (such as a :class:`aioxmpp.cache.LRUDict`) which is
+       shared by several :class:`DiscoClient` instances, or :data:`None`.
+
+       If set, the results of :meth:`query_info` for domain JIDs (see
+       :attr:`aioxmpp.JID.is_domain`) are stored in the mapping and
+       :meth:`query_info` returns results from the mapping (unless
+       `require_fresh` is true) before sending a query. This assumes that
+       servers return the same information to all clients. The mapping is
+       not affected by :meth:`flush_cache` or by the destruction of the
+       stream; use a mapping whose entries expire (such as a
+       :class:`~aioxmpp.cache.LRUDict` with a
+       :attr:`~aioxmpp.cache.LRUDict.ttl`) to pick up changes of the servers.
+
+       :class:`aioxmpp.host.ClientHost` sets this attribute for the clients
+       it manages.
+
+       .. versionadded:: 0.10
+
     Usage example, assuming that you have a :class:`.node.Client` `client`::
 
       import aioxmpp.disco as disco
@@ -566,6 +609,7 @@ class DiscoClient(service.Service):
         self._info_pending.maxsize = 10000
         self._items_pending = aioxmpp.cache.LRUDict()
         self._items_pending.maxsize = 100
+        self.server_info_cache = None
 
         self.client.on_stream_destroyed.connect(
             self._clear_cache
@@ -600,6 +644,58 @@ class DiscoClient(service.Service):
     def items_cache_size(self, value):
         self._items_pending.maxsize = value
 
+    @staticmethod
+    def _store_request(cache, key, fut):
+        cache[key] = fut
+        if not fut.done():
+            # the size of the response is only known once it has arrived
+            fut.add_done_callback(
+                lambda fut: cache.reweigh(key)
+            )
+
+    @staticmethod
+    def _set_max_bytes(cache, value):
+        if value is None:
+            cache.max_weight = None
+            cache.weight = None
+        else:
+            cache.weight = _estimate_response_size
+            cache.max_weight = value
+
+    @property
+    def info_cache_max_bytes(self):
+        """
+        Approximate maximum number of bytes taken by the results in the cache
+        for :meth:`query_info`, or :data:`None` for no limit.
+
+        The size of a result is estimated by the length of its serialised
+        form. Queries which are still in progress count as zero bytes. This
+        restriction applies in addition to :attr:`info_cache_size`.
+
+        .. versionadded:: 0.10
+        """
+        return self._info_pending.max_weight
+
+    @info_cache_max_bytes.setter
+    def info_cache_max_bytes(self, value):
+        self._set_max_bytes(self._info_pending, value)
+
+    @property
+    def items_cache_max_bytes(self):
+        """
+        Approximate maximum number of bytes taken by the results in the cache
+        for :meth:`query_items`, or :data:`None` for no limit.
+
+        See :attr:`info_cache_max_bytes` for details.
+
+        .. versionadded:: 0.10
+        """
+        return self._items_pending.max_weight
+
+    @items_cache_max_bytes.setter
+    def items_cache_max_bytes(self, value):
+        self._set_max_bytes(self._items_pending, value)
+
     def _clear_cache(self):
         for fut in self._info_pending.values():
             if not fut.done():
@@ -695,9 +791,18 @@ class DiscoClient(service.Service):
         .. versionchanged:: 0.9
 
             The `no_cache` argument was added.
+
+        .. versionchanged:: 0.10
+
+            Results for domain JIDs are shared through the
+            :attr:`server_info_cache`, if it is set.
         """
         key = jid, node
 
+        shared_cache = self.server_info_cache
+        if shared_cache is not None and not jid.is_domain:
+            shared_cache = None
+
         if not require_fresh:
             try:
                 request = self._info_pending[key]
@@ -705,9 +810,17 @@ class DiscoClient(service.Service):
                 pass
             else:
                 try:
-                    return (yield from request)
+                    result = yield from request
                 except asyncio.CancelledError:
                     pass
+                else:
+                    return result
+
+            if shared_cache is not None:
+                try:
+                    return shared_cache[key]
+                except KeyError:
+                    pass
 
         request = asyncio.ensure_future(
             self.send_and_decode_info_query(jid, node)
@@ -721,7 +834,7 @@ class DiscoClient(service.Service):
         )
 
         if not no_cache:
-            self._info_pending[key] = request
+            self._store_request(self._info_pending, key, request)
         try:
             if timeout is not None:
                 try:
@@ -743,6 +856,9 @@ class DiscoClient(service.Service):
                         del self._info_pending[key]
             raise
 
+        if not no_cache and shared_cache is not None:
+            shared_cache[key] = result
+
         return result
 
     @asyncio.coroutine
@@ -774,9 +890,11 @@ class DiscoClient(service.Service):
                 pass
             else:
                 try:
-                    return (yield from request)
+                    result = yield from request
                 except asyncio.CancelledError:
                     pass
+                else:
+                    return result
 
         request_iq = stanza.IQ(to=jid, type_=structs.IQType.GET)
         request_iq.payload = disco_xso.ItemsQuery(node=node)
@@ -785,7 +903,7 @@ class DiscoClient(service.Service):
             self.client.send(request_iq)
         )
 
-        self._items_pending[key] = request
+        self._store_request(self._items_pending, key, request)
         try:
             if timeout is not None:
                 try:
@@ -847,7 +965,7 @@ class DiscoClient(service.Service):
 
         .. versionadded:: 0.5
         """
-        self._info_pending[jid, node] = fut
+        self._store_request(self._info_pending, (jid, node), fut)
 
 
 class mount_as_node(service.Descriptor):
@@ -62,6 +62,23 @@ import aioxmpp.service
 import aioxmpp.stream
 
 
+class _IndexSlot:
+    """
+    Callbacks registered for one bare JID and one stanza type.
+    """
+    __slots__ = ("resources", "wildcard")
+
+    def __init__(self):
+        # callbacks registered without wildcard, by resource (None for the
+        # bare JID itself)
+        self.resources = {}
+        # callback registered for the bare JID with wildcard_resource
+        self.wildcard = None
+
+    def __bool__(self):
+        return bool(self.resources) or self.wildcard is not None
+
+
 class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
     """
     Dispatch stanzas based on their sender and type.
@@ -77,6 +94,14 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
 
     .. automethod:: handler_context
 
+    Statistics:
+
+    .. autoattribute:: dispatched
+
+    .. autoattribute:: unmatched
+
+    .. automethod:: reset_counters
+
     For deriving classes, the following methods are relevant:
 
     .. automethod:: _feed
@@ -85,11 +110,48 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
 
     .. autoattribute:: local_jid
 
+    .. versionchanged:: 0.10
+
+       Lookups use an index by stanza type, domain and localpart, so that
+       :meth:`_feed` neither allocates keys nor constructs bare JIDs.
     """
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._map = {}
+        # type_ -> domain -> localpart -> _IndexSlot
+        self._index = {}
+        # type_ -> callback registered with from_ = None
+        self._type_wildcards = {}
+        self._dispatched = 0
+        self._unmatched = 0
+
+    @property
+    def dispatched(self):
+        """
+        Number of stanzas which have been passed to a callback.
+
+        .. versionadded:: 0.10
+        """
+        return self._dispatched
+
+    @property
+    def unmatched(self):
+        """
+        Number of stanzas for which no callback was found.
+
+        .. versionadded:: 0.10
+        """
+        return self._unmatched
+
+    def reset_counters(self):
+        """
+        Reset :attr:`dispatched` and :attr:`unmatched` to zero.
+
+        .. versionadded:: 0.10
+        """
+        self._dispatched = 0
+        self._unmatched = 0
 
     @abc.abstractproperty
     def local_jid(self):
@@ -116,25 +178,85 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
         from_ = stanza.from_
         if from_ is None:
             from_ = self.local_jid
+        type_ = stanza.type_
+
+        cb = None
+        index = self._index
+        if index:
+            by_domain = index.get(type_)
+            if by_domain is not None:
+                cb = self._lookup(by_domain, from_)
+            if cb is None:
+                by_domain = index.get(None)
+                if by_domain is not None:
+                    cb = self._lookup(by_domain, from_)
+
+        if cb is None:
+            type_wildcards = self._type_wildcards
+            cb = type_wildcards.get(type_)
+            if cb is None:
+                cb = type_wildcards.get(None)
+                if cb is None:
+                    self._unmatched += 1
+                    return False
+
+        self._dispatched += 1
+        cb(stanza)
+        return True
+
+    @staticmethod
+    def _lookup(by_domain, from_):
+        by_localpart = by_domain.get(from_.domain)
+        if by_localpart is None:
+            return None
+        slot = by_localpart.get(from_.localpart)
+        if slot is None:
+            return None
+        cb = slot.resources.get(from_.resource)
+        if cb is None:
+            cb = slot.wildcard
+        return cb
+
+    def _index_add(self, type_, from_, wildcard_resource, cb):
+        if from_ is None:
+            self._type_wildcards[type_] = cb
+            return
+
+        by_localpart = self._index.setdefault(type_, {}).setdefault(
+            from_.domain, {}
+        )
+        try:
+            slot = by_localpart[from_.localpart]
+        except KeyError:
+            slot = _IndexSlot()
+            by_localpart[from_.localpart] = slot
+
+        if wildcard_resource:
+            slot.wildcard = cb
+        else:
+            slot.resources[from_.resource] = cb
 
-        keys = [
-            (stanza.type_, from_, False),
-            (stanza.type_, from_.bare(), True),
-            (None, from_, False),
-            (None, from_.bare(), True),
-            (stanza.type_, None, False),
-            (None, from_, False),
-            (None, None, False),
-        ]
-
-        for key in keys:
-            try:
-                cb = self._map[key]
-            except KeyError:
-                continue
-            cb(stanza)
+    def _index_remove(self, type_, from_, wildcard_resource):
+        if from_ is None:
+            del self._type_wildcards[type_]
             return
 
+        by_domain = self._index[type_]
+        by_localpart = by_domain[from_.domain]
+        slot = by_localpart[from_.localpart]
+        if wildcard_resource:
+            slot.wildcard = None
+        else:
+            del slot.resources[from_.resource]
+
+        # prune empty levels so that lookups stay cheap
+        if not slot:
+            del by_localpart[from_.localpart]
+            if not by_localpart:
+                del by_domain[from_.domain]
+                if not by_domain:
+                    del self._index[type_]
+
     def register_callback(self, type_, from_, cb, *,
                           wildcard_resource=True):
         """
@@ -209,6 +331,7 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
             )
 
         self._map[type_, from_, wildcard_resource] = cb
+        self._index_add(type_, from_, wildcard_resource, cb)
 
     def unregister_callback(self, type_, from_, *,
                             wildcard_resource=True):
@@ -231,6 +354,7 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
             wildcard_resource = False
 
         self._map.pop((type_, from_, wildcard_resource))
+        self._index_remove(type_, from_, wildcard_resource)
 
     @contextlib.contextmanager
     def handler_context(self, type_, from_, cb, *, wildcard_resource=True):
@@ -53,11 +53,13 @@ Service
 
 .. autoclass:: Cache
 
+.. autoclass:: SQLiteCapsDatabase
+
 .. currentmodule:: aioxmpp.entitycaps.xso
 
 
 """
 
-from .service import EntityCapsService, Cache  # NOQA
+from .service import EntityCapsService, Cache, SQLiteCapsDatabase  # NOQA
 from . import xso  # NOQA
 Service = EntityCapsService
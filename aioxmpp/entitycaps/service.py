@@ -23,10 +23,14 @@ import asyncio
 import collections
 import copy
 import functools
+import io
 import logging
 import os
+import sqlite3
 import tempfile
+import urllib.request
 
+import aioxmpp.cache
 import aioxmpp.callbacks
 import aioxmpp.disco as disco
 import aioxmpp.service
@@ -57,12 +61,28 @@ class Cache:
     In addition to serving the databases, it provides deduplication for queries
     by holding a cache of futures looking up the same hash.
 
+    The databases can either be directories with one file per hash, or
+    single-file :class:`SQLiteCapsDatabase` instances. Entries read from the
+    databases are kept in memory (up to :attr:`parsed_cache_size` of them), so
+    that they do not have to be parsed again.
+
+    .. versionchanged:: 0.10
+
+       Support for :class:`SQLiteCapsDatabase` and the in-memory cache of
+       parsed entries were added.
+
     Database management (user API):
 
     .. automethod:: set_system_db_path
 
     .. automethod:: set_user_db_path
 
+    .. automethod:: set_system_db
+
+    .. automethod:: set_user_db
+
+    .. autoattribute:: parsed_cache_size
+
     Queries (API intended for :class:`Service`):
 
     .. automethod:: create_query_future
@@ -77,6 +97,10 @@ class Cache:
         self._memory_overlay = {}
         self._system_db_path = None
         self._user_db_path = None
+        self._system_db = None
+        self._user_db = None
+        self._parsed_cache = aioxmpp.cache.LRUDict()
+        self._parsed_cache.maxsize = 1024
 
     def _erase_future(self, key, fut):
         try:
@@ -88,10 +112,62 @@ class Cache:
                 del self._lookup_cache[key]
 
     def set_system_db_path(self, path):
+        """
+        Use the directory `path` as trusted database.
+
+        This replaces a database set with :meth:`set_system_db`.
+        """
         self._system_db_path = path
+        self._system_db = None
+        self._parsed_cache.clear()
 
     def set_user_db_path(self, path):
+        """
+        Use the directory `path` as user-level database.
+
+        This replaces a database set with :meth:`set_user_db`.
+        """
         self._user_db_path = path
+        self._user_db = None
+        self._parsed_cache.clear()
+
+    def set_system_db(self, db):
+        """
+        Use the :class:`SQLiteCapsDatabase` `db` as trusted database.
+
+        This replaces a directory set with :meth:`set_system_db_path`.
+
+        .. versionadded:: 0.10
+        """
+        self._system_db = db
+        self._system_db_path = None
+        self._parsed_cache.clear()
+
+    def set_user_db(self, db):
+        """
+        Use the :class:`SQLiteCapsDatabase` `db` as user-level database.
+
+        This replaces a directory set with :meth:`set_user_db_path`.
+
+        .. versionadded:: 0.10
+        """
+        self._user_db = db
+        self._user_db_path = None
+        self._parsed_cache.clear()
+
+    @property
+    def parsed_cache_size(self):
+        """
+        Maximum number of entries read from the databases which are kept in
+        memory, so that they do not need to be read and parsed again.
+
+        .. versionadded:: 0.10
+        """
+        return self._parsed_cache.maxsize
+
+    @parsed_cache_size.setter
+    def parsed_cache_size(self, value):
+        self._parsed_cache.maxsize = value
 
     def lookup_in_database(self, key):
         try:
@@ -102,6 +178,37 @@ class Cache:
             logger.debug("memory cache hit: %s", key)
             return result
 
+        try:
+            result = self._parsed_cache[key]
+        except KeyError:
+            pass
+        else:
+            logger.debug("parsed cache hit: %s", key)
+            return result
+
+        result = self._read_from_database(key)
+        self._parsed_cache[key] = result
+        return result
+
+    def _read_from_database(self, key):
+        if self._system_db is not None:
+            try:
+                result = self._system_db.lookup(key)
+            except KeyError:
+                pass
+            else:
+                logger.debug("system db hit: %s", key)
+                return result
+
+        if self._user_db is not None:
+            try:
+                result = self._user_db.lookup(key)
+            except KeyError:
+                pass
+            else:
+                logger.debug("user db hit: %s", key)
+                return result
+
         key_path = key.path
 
         if self._system_db_path is not None:
@@ -186,7 +293,13 @@ class Cache:
         """
         copied_entry = copy.copy(entry)
         self._memory_overlay[key] = copied_entry
-        if self._user_db_path is not None:
+        if self._user_db is not None:
+            asyncio.ensure_future(asyncio.get_event_loop().run_in_executor(
+                None,
+                self._user_db.store,
+                key,
+                entry.captured_events))
+        elif self._user_db_path is not None:
             asyncio.ensure_future(asyncio.get_event_loop().run_in_executor(
                 None,
                 writeback,
@@ -194,6 +307,159 @@ class Cache:
                 entry.captured_events))
 
 
+class SQLiteCapsDatabase:
+    """
+    Entity capabilities database stored in a single SQLite file.
+
+    :param path: Path to the database file.
+    :type path: :class:`pathlib.Path`
+
+    .. versionadded:: 0.10
+
+    This is an alternative to the directory-based databases of :class:`Cache`
+    which avoids creating one file per hash. Entries are stored in a table
+    indexed by the same relative path which would be used in the directory
+    layout, so existing directories can be imported with
+    :meth:`import_directory`.
+
+    The file is opened read-only for lookups, so that a
+    :class:`SQLiteCapsDatabase` can also be used for a trusted, read-only
+    database. It is created when the first entry is stored.
+
+    Use :meth:`Cache.set_system_db` and :meth:`Cache.set_user_db` to make the
+    :class:`Cache` use a :class:`SQLiteCapsDatabase`.
+
+    .. automethod:: lookup
+
+    .. automethod:: store
+
+    .. automethod:: import_directory
+
+    .. automethod:: close
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._path = path
+        self._reader = None
+
+    def _connect_writer(self):
+        conn = sqlite3.connect(str(self._path))
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entitycaps ("
+                "key TEXT PRIMARY KEY, "
+                "info BLOB NOT NULL"
+                ")"
+            )
+        except:  # NOQA
+            conn.close()
+            raise
+        return conn
+
+    def _get_reader(self):
+        if self._reader is None:
+            uri = "file:{}?mode=ro".format(
+                urllib.request.pathname2url(os.path.abspath(str(self._path)))
+            )
+            self._reader = sqlite3.connect(uri, uri=True)
+        return self._reader
+
+    def lookup(self, key):
+        """
+        Return the :class:`~.disco.xso.InfoQuery` stored for `key`.
+
+        :raises KeyError: if there is no entry for `key`
+
+        A database which cannot be opened (for example because it does not
+        exist yet) is treated as empty.
+        """
+        try:
+            row = self._get_reader().execute(
+                "SELECT info FROM entitycaps WHERE key = ?",
+                (key.path.as_posix(),)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.debug("failed to read from caps database %s: %s",
+                         self._path, exc)
+            self.close()
+            raise KeyError(key) from None
+
+        if row is None:
+            raise KeyError(key)
+
+        return aioxmpp.xml.read_single_xso(
+            io.BytesIO(row[0]),
+            disco.xso.InfoQuery,
+        )
+
+    def store(self, key, captured_events):
+        """
+        Store the entry for `key` given by the XSO events `captured_events`.
+
+        This method blocks; :class:`Cache` calls it in an executor.
+        """
+        buf = io.BytesIO()
+        generator = aioxmpp.xml.XMPPXMLGenerator(
+            buf,
+            short_empty_elements=True)
+        generator.startDocument()
+        aioxmpp.xso.events_to_sax(captured_events, generator)
+        generator.endDocument()
+
+        conn = self._connect_writer()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entitycaps (key, info) "
+                    "VALUES (?, ?)",
+                    (key.path.as_posix(), buf.getvalue())
+                )
+        finally:
+            conn.close()
+
+    def import_directory(self, path):
+        """
+        Import the entries from a directory-based database at `path`.
+
+        :param path: The directory to import.
+        :type path: :class:`pathlib.Path`
+        :return: The number of entries imported.
+        :rtype: :class:`int`
+
+        Entries which are already in the database are kept. This method
+        blocks.
+        """
+        count = 0
+        conn = self._connect_writer()
+        try:
+            with conn:
+                for file_path in path.glob("**/*.xml"):
+                    if not file_path.is_file():
+                        continue
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO entitycaps (key, info) "
+                        "VALUES (?, ?)",
+                        (file_path.relative_to(path).as_posix(),
+                         file_path.read_bytes())
+                    )
+                    count += cursor.rowcount
+        finally:
+            conn.close()
+        return count
+
+    def close(self):
+        """
+        Close the connection used for lookups.
+
+        It is reopened automatically by the next lookup.
+        """
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
 class EntityCapsService(aioxmpp.service.Service):
     """
     Make use and provide service discovery information in presence broadcasts.
@@ -0,0 +1,565 @@
+########################################################################
+# File name: host.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+"""
+:mod:`~aioxmpp.host` --- Run many clients in one process
+########################################################
+
+Applications which run a large number of :class:`aioxmpp.Client` instances in
+one process (for example, gateways or bots serving many accounts) can use a
+:class:`ClientHost` to let the clients share read-mostly state and to limit
+the load they put on the network.
+
+.. versionadded:: 0.10
+
+.. autoclass:: ClientHost
+
+.. autoclass:: ConnectionLimiter
+
+.. autoclass:: ClientMetrics
+"""
+import asyncio
+import contextlib
+import logging
+
+from datetime import timedelta
+
+from . import (
+    cache,
+    disco,
+    entitycaps,
+    network,
+    stream,
+    tasks,
+)
+
+
+class ConnectionLimiter:
+    """
+    Limit the rate and the concurrency of connection attempts.
+
+    :param rate: Sustained number of connection attempts per second, or
+        :data:`None` for no rate limit.
+    :type rate: positive :class:`float` or :data:`None`
+    :param burst: Number of connection attempts which may be made in a burst,
+        defaults to `rate` (but at least one).
+    :type burst: positive :class:`int` or :data:`None`
+    :param max_concurrent: Maximum number of connection attempts in progress
+        at the same time, or :data:`None` for no limit.
+    :type max_concurrent: positive :class:`int` or :data:`None`
+
+    The rate is enforced with a :class:`aioxmpp.stream.TokenBucket`. A
+    connection attempt lasts from :meth:`acquire` to :meth:`release`; for
+    :class:`aioxmpp.Client`, this includes the stream negotiation and the
+    authentication.
+
+    An instance can be assigned to :attr:`aioxmpp.Client.connection_limiter`
+    of one or more clients directly, or passed to :class:`ClientHost`.
+
+    .. automethod:: acquire
+
+    .. automethod:: release
+
+    .. attribute:: attempts
+
+       Total number of connection attempts started.
+
+    .. autoattribute:: in_progress
+    """
+
+    def __init__(self, *, rate=None, burst=None, max_concurrent=None):
+        super().__init__()
+        if rate is not None:
+            if burst is None:
+                burst = max(1, rate)
+            self._bucket = stream.TokenBucket(rate, burst)
+        else:
+            self._bucket = None
+
+        if max_concurrent is not None:
+            if max_concurrent <= 0:
+                raise ValueError("max_concurrent must be positive")
+            self._semaphore = asyncio.Semaphore(max_concurrent)
+        else:
+            self._semaphore = None
+
+        self.attempts = 0
+        self._in_progress = 0
+
+    @property
+    def in_progress(self):
+        """
+        Number of connection attempts which are currently in progress.
+        """
+        return self._in_progress
+
+    @asyncio.coroutine
+    def acquire(self):
+        """
+        Wait until a connection attempt may be started.
+
+        Each successful call must be paired with a call to :meth:`release`.
+        """
+        if self._semaphore is not None:
+            yield from self._semaphore.acquire()
+
+        try:
+            if self._bucket is not None:
+                delay = self._bucket.delay(1)
+                while delay:
+                    yield from asyncio.sleep(delay)
+                    delay = self._bucket.delay(1)
+                self._bucket.consume(1)
+        except:  # NOQA
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+
+        self.attempts += 1
+        self._in_progress += 1
+
+    def release(self):
+        """
+        Mark a connection attempt as finished.
+        """
+        self._in_progress -= 1
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+
+class ClientMetrics:
+    """
+    Counters describing the connection history of one or more clients.
+
+    Instances are returned by :meth:`ClientHost.get_metrics` and
+    :meth:`ClientHost.get_aggregate_metrics`.
+
+    .. attribute:: connection_attempts
+
+       Number of connection attempts.
+
+    .. attribute:: connection_wait_time
+
+       Total time in seconds the connection attempts were delayed by the
+       :class:`ConnectionLimiter`.
+
+    .. attribute:: streams_established
+
+       Number of times a stream was established.
+
+    .. attribute:: streams_suspended
+
+       Number of times a stream was suspended.
+
+    .. attribute:: streams_destroyed
+
+       Number of times a stream was destroyed.
+
+    .. attribute:: failures
+
+       Number of times the client failed and stopped.
+
+    .. attribute:: established
+
+       Number of clients with an established stream.
+
+    .. attribute:: tasks
+
+       Number of tasks running in the :attr:`ClientHost.task_pool` for the
+       clients.
+    """
+
+    __slots__ = (
+        "connection_attempts",
+        "connection_wait_time",
+        "streams_established",
+        "streams_suspended",
+        "streams_destroyed",
+        "failures",
+        "established",
+        "tasks",
+    )
+
+    def __init__(self):
+        super().__init__()
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def _add(self, other):
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def __repr__(self):
+        return "<{}.{} {}>".format(
+            type(self).__module__,
+            type(self).__qualname__,
+            " ".join(
+                "{}={!r}".format(name, getattr(self, name))
+                for name in self.__slots__
+            )
+        )
+
+
+class _HostedClient:
+    """
+    Per-client state of a :class:`ClientHost`.
+
+    This is also assigned as :attr:`aioxmpp.Client.connection_limiter` to
+    count the connection attempts of the client.
+    """
+
+    def __init__(self, host, client):
+        super().__init__()
+        self.host = host
+        self.client = client
+        self.metrics = ClientMetrics()
+        self.stack = contextlib.ExitStack()
+
+    @asyncio.coroutine
+    def acquire(self):
+        limiter = self.host.connection_limiter
+        self.metrics.connection_attempts += 1
+        if limiter is None:
+            return
+
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        yield from limiter.acquire()
+        self.metrics.connection_wait_time += loop.time() - started
+
+    def release(self):
+        limiter = self.host.connection_limiter
+        if limiter is not None:
+            limiter.release()
+
+    def stream_established(self):
+        self.metrics.streams_established += 1
+
+    def stream_suspended(self, reason):
+        self.metrics.streams_suspended += 1
+
+    def stream_destroyed(self, reason=None):
+        self.metrics.streams_destroyed += 1
+
+    def failure(self, err):
+        self.metrics.failures += 1
+
+
+class ClientHost:
+    """
+    Shared context for many :class:`aioxmpp.Client` instances.
+
+    :param max_tasks: Limit for the total number of tasks in the
+        :attr:`task_pool`.
+    :type max_tasks: :class:`int` or :data:`None`
+    :param max_tasks_per_client: Limit for the number of tasks per client in
+        the :attr:`task_pool`.
+    :type max_tasks_per_client: :class:`int` or :data:`None`
+    :param connection_limiter: Limiter for the connection attempts of all
+        clients.
+    :type connection_limiter: :class:`ConnectionLimiter` or :data:`None`
+    :param dns_cache: DNS cache to use; see :attr:`dns_cache`.
+    :type dns_cache: :class:`aioxmpp.network.DNSCache` or :data:`None`
+    :param server_info_cache_size: Maximum number of entries in the
+        :attr:`server_info_cache`.
+    :type server_info_cache_size: :class:`int`
+    :param server_info_ttl: Time after which entries of the
+        :attr:`server_info_cache` expire, or :data:`None` to keep them until
+        they are purged by size.
+    :type server_info_ttl: :class:`datetime.timedelta` or :data:`None`
+
+    Clients are added to the host with :meth:`attach`. While a client is
+    attached, the host:
+
+    * assigns the shared :attr:`entitycaps_cache` to the
+      :class:`aioxmpp.EntityCapsService` of the client,
+    * assigns the shared :attr:`server_info_cache` to the
+      :class:`aioxmpp.DiscoClient` of the client (see
+      :attr:`aioxmpp.DiscoClient.server_info_cache`),
+    * routes the connection attempts of the client through the
+      :attr:`connection_limiter` and
+    * collects the :class:`ClientMetrics` of the client.
+
+    Services which are summoned after the client has been attached are
+    configured as well.
+
+    The :attr:`dns_cache` is only used once it has been installed
+    process-wide with :meth:`install_dns_cache` (see
+    :func:`aioxmpp.network.set_dns_cache`); it is then used by all clients,
+    including those which are not attached. :meth:`close` restores the cache
+    which was installed before.
+
+    Caches which contain information specific to an account (such as the
+    roster or the avatar metadata, which depend on the subscriptions of the
+    account) are not shared.
+
+    .. automethod:: attach
+
+    .. automethod:: detach
+
+    .. autoattribute:: clients
+
+    .. automethod:: install_dns_cache
+
+    .. automethod:: close
+
+    .. automethod:: spawn(client, coro_fun, *args, **kwargs)
+
+    .. automethod:: get_metrics
+
+    .. automethod:: get_aggregate_metrics
+
+    .. attribute:: entitycaps_cache
+
+       The :class:`aioxmpp.entitycaps.Cache` shared by the clients.
+
+    .. attribute:: server_info_cache
+
+       The :class:`aioxmpp.cache.LRUDict` holding the service discovery
+       information of servers shared by the clients. Its
+       :attr:`~aioxmpp.cache.LRUDict.ttl` is set to `server_info_ttl`, so
+       that changes of the server configuration are picked up eventually.
+
+    .. attribute:: dns_cache
+
+       The :class:`aioxmpp.network.DNSCache`. If no cache is passed to the
+       constructor, the cache which is currently installed is used; if there
+       is none, a new one is created. See :meth:`install_dns_cache`.
+
+    .. attribute:: task_pool
+
+       The :class:`aioxmpp.tasks.TaskPool` which runs the tasks started with
+       :meth:`spawn`. The tasks of each client are in a group whose key is the
+       client.
+
+    .. attribute:: connection_limiter
+
+       The :class:`ConnectionLimiter` passed to the constructor or
+       :data:`None`. Changes take effect with the next connection attempt.
+    """
+
+    def __init__(self, *,
+                 max_tasks=None,
+                 max_tasks_per_client=None,
+                 connection_limiter=None,
+                 dns_cache=None,
+                 server_info_cache_size=1024,
+                 server_info_ttl=timedelta(hours=1),
+                 logger=None):
+        super().__init__()
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.entitycaps_cache = entitycaps.Cache()
+        self.server_info_cache = cache.LRUDict()
+        self.server_info_cache.maxsize = server_info_cache_size
+        self.server_info_cache.ttl = server_info_ttl
+
+        if dns_cache is None:
+            dns_cache = network.get_dns_cache()
+        if dns_cache is None:
+            dns_cache = network.DNSCache()
+        self.dns_cache = dns_cache
+        self._installed = False
+        self._previous_dns_cache = None
+
+        self.task_pool = tasks.TaskPool(
+            max_tasks=max_tasks,
+            default_limit=max_tasks_per_client,
+            logger=self.logger.getChild("task_pool"),
+        )
+        self.connection_limiter = connection_limiter
+
+        self._clients = {}
+
+    @property
+    def clients(self):
+        """
+        A snapshot of the attached clients, in the order they were attached.
+        """
+        return list(self._clients)
+
+    def install_dns_cache(self):
+        """
+        Install the :attr:`dns_cache` process-wide.
+
+        The previously installed cache is remembered and restored by
+        :meth:`close`. Calling this method again has no effect.
+        """
+        if self._installed:
+            return
+        self._previous_dns_cache = network.get_dns_cache()
+        network.set_dns_cache(self.dns_cache)
+        self._installed = True
+
+    def close(self):
+        """
+        Undo :meth:`install_dns_cache`.
+
+        The cache which was installed before is restored, unless another cache
+        has been installed in the meantime. Attached clients are not detached.
+        """
+        if not self._installed:
+            return
+        if network.get_dns_cache() is self.dns_cache:
+            network.set_dns_cache(self._previous_dns_cache)
+        self._previous_dns_cache = None
+        self._installed = False
+
+    def _share_with(self, service):
+        if isinstance(service, entitycaps.EntityCapsService):
+            service.cache = self.entitycaps_cache
+        elif isinstance(service, disco.DiscoClient):
+            service.server_info_cache = self.server_info_cache
+
+    def _unshare_with(self, service):
+        if isinstance(service, entitycaps.EntityCapsService):
+            if service.cache is self.entitycaps_cache:
+                del service.cache
+        elif isinstance(service, disco.DiscoClient):
+            if service.server_info_cache is self.server_info_cache:
+                service.server_info_cache = None
+
+    def attach(self, client):
+        """
+        Let `client` use the shared state of the host.
+
+        :param client: The client to attach.
+        :type client: :class:`aioxmpp.Client`
+        :raises ValueError: if `client` is already attached.
+
+        The :attr:`aioxmpp.Client.connection_limiter` of the `client` is
+        replaced.
+        """
+        if client in self._clients:
+            raise ValueError("client is already attached")
+
+        hosted = _HostedClient(self, client)
+        stack = hosted.stack
+        stack.enter_context(
+            client.on_service_summoned.context_connect(self._share_with)
+        )
+        stack.enter_context(
+            client.on_stream_established.context_connect(
+                hosted.stream_established
+            )
+        )
+        stack.enter_context(
+            client.on_stream_suspended.context_connect(
+                hosted.stream_suspended
+            )
+        )
+        stack.enter_context(
+            client.on_stream_destroyed.context_connect(
+                hosted.stream_destroyed
+            )
+        )
+        stack.enter_context(
+            client.on_failure.context_connect(hosted.failure)
+        )
+
+        for service in client._services.values():
+            self._share_with(service)
+
+        client.connection_limiter = hosted
+        self._clients[client] = hosted
+
+    def detach(self, client):
+        """
+        Stop sharing the state of the host with `client`.
+
+        :param client: The client to detach.
+        :type client: :class:`aioxmpp.Client`
+        :raises KeyError: if `client` is not attached.
+
+        The services of the `client` get private caches again, its
+        :attr:`~aioxmpp.Client.connection_limiter` is reset to :data:`None`
+        and the tasks spawned for it with :meth:`spawn` are cancelled.
+        """
+        hosted = self._clients.pop(client)
+        hosted.stack.close()
+
+        for service in client._services.values():
+            self._unshare_with(service)
+
+        if client.connection_limiter is hosted:
+            client.connection_limiter = None
+
+        for task in self.task_pool.iter_tasks(client):
+            task.cancel()
+
+    def spawn(self, __client, __coro_fun, *args, **kwargs):
+        """
+        Start a coroutine on behalf of a client in the :attr:`task_pool`.
+
+        :param client: The client on whose behalf the coroutine runs.
+        :type client: :class:`aioxmpp.Client`
+        :param coro_fun: Coroutine function to run
+        :raises KeyError: if `client` is not attached.
+        :raises RuntimeError: if a limit of the :attr:`task_pool` is
+            exhausted.
+        :rtype: :class:`asyncio.Task`
+        :return: The task in which the coroutine runs.
+
+        The task is cancelled when the client is detached.
+        """
+        if __client not in self._clients:
+            raise KeyError(__client)
+        return self.task_pool.spawn(
+            {__client},
+            __coro_fun,
+            *args,
+            **kwargs
+        )
+
+    def _finalise_metrics(self, client, metrics):
+        metrics.established = int(client.established)
+        metrics.tasks = self.task_pool.get_task_count(client)
+        return metrics
+
+    def get_metrics(self, client):
+        """
+        Return the metrics of an attached client.
+
+        :param client: The client to return the metrics for.
+        :type client: :class:`aioxmpp.Client`
+        :raises KeyError: if `client` is not attached.
+        :rtype: :class:`ClientMetrics`
+
+        The returned object is a snapshot.
+        """
+        hosted = self._clients[client]
+        metrics = ClientMetrics()
+        metrics._add(hosted.metrics)
+        return self._finalise_metrics(client, metrics)
+
+    def get_aggregate_metrics(self):
+        """
+        Return the sum of the metrics of all attached clients.
+
+        :rtype: :class:`ClientMetrics`
+
+        Statistics about the shared caches are available from the caches
+        themselves (for example :attr:`aioxmpp.network.DNSCache.hit_rate`).
+        """
+        total = ClientMetrics()
+        for client in self._clients:
+            total._add(self.get_metrics(client))
+        return total
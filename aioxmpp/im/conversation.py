@@ -231,6 +231,8 @@ class AbstractConversationMember(metaclass=abc.ABCMeta):
     .. autoattribute:: uid
     """
 
+    __slots__ = ("_conversation_jid", "_is_self", "__weakref__")
+
     def __init__(self,
                  conversation_jid,
                  is_self):
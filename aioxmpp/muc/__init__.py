@@ -61,6 +61,8 @@ The service returns :class:`Room` objects which are used to track joined MUCs:
 
 .. autoclass:: LeaveMode
 
+.. autoclass:: RoomMembers
+
 Inside rooms, there are occupants:
 
 .. autoclass:: Occupant
@@ -161,6 +163,7 @@ from .service import (  # NOQA
     MUCClient,
     Occupant,
     Room,
+    RoomMembers,
     LeaveMode,
     RoomState,
     ServiceMember,
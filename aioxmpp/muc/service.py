@@ -20,6 +20,7 @@
 #
 ########################################################################
 import asyncio
+import collections.abc
 import functools
 import uuid
 
@@ -159,6 +160,9 @@ class Occupant(aioxmpp.im.conversation.AbstractConversationMember):
 
     """
 
+    __slots__ = ("presence_state", "presence_status", "affiliation", "role",
+                 "_direct_jid", "_uid")
+
     def __init__(self,
                  occupantjid,
                  is_self,
@@ -173,9 +177,11 @@ class Occupant(aioxmpp.im.conversation.AbstractConversationMember):
         self.affiliation = affiliation
         self.role = role
         self._direct_jid = jid
-        if jid is None:
-            self._uid = b"urn:uuid:" + uuid.uuid4().bytes
-        else:
+        # the random uid of occupants with unknown direct JID is only
+        # generated when needed; most Occupant instances are only used to
+        # carry the information of a presence stanza
+        self._uid = None
+        if jid is not None:
             self._set_uid_from_direct_jid(self._direct_jid)
 
             if not self._direct_jid.is_bare:
@@ -216,6 +222,8 @@ class Occupant(aioxmpp.im.conversation.AbstractConversationMember):
                 Documentation of the attribute on the base class, with
                 additional information on semantics.
         """
+        if self._uid is None:
+            self._uid = b"urn:uuid:" + uuid.uuid4().bytes
         return self._uid
 
     @classmethod
@@ -238,7 +246,7 @@ class Occupant(aioxmpp.im.conversation.AbstractConversationMember):
             occupantjid=presence.from_,
             is_self=is_self,
             presence_state=aioxmpp.structs.PresenceState.from_stanza(presence),
-            presence_status=aioxmpp.structs.LanguageMap(presence.status),
+            presence_status=presence.status,
             affiliation=affiliation,
             role=role,
             jid=jid,
@@ -261,11 +269,207 @@ class Occupant(aioxmpp.im.conversation.AbstractConversationMember):
             type(self).__module__,
             type(self).__qualname__,
             self._conversation_jid,
-            self._uid,
+            self.uid,
             self._direct_jid,
         )
 
 
+class _OccupantTable:
+    """
+    The occupants of a :class:`Room`, indexed by occupant JID (and thus
+    nickname), direct JID, role and affiliation.
+
+    The indices use dicts as ordered sets, so that all operations on a single
+    occupant are O(1).
+    """
+
+    __slots__ = ("me", "_by_occupant_jid", "_by_direct_jid", "_by_role",
+                 "_by_affiliation", "_members")
+
+    def __init__(self):
+        super().__init__()
+        self.me = None
+        self._by_occupant_jid = {}
+        self._by_direct_jid = {}
+        self._by_role = {}
+        self._by_affiliation = {}
+        self._members = ()
+
+    def __len__(self):
+        return len(self._by_occupant_jid)
+
+    def clear(self):
+        self.me = None
+        self._by_occupant_jid.clear()
+        self._by_direct_jid.clear()
+        self._by_role.clear()
+        self._by_affiliation.clear()
+        self._members = ()
+
+    def __contains__(self, occupant):
+        try:
+            jid = occupant.conversation_jid
+        except AttributeError:
+            return False
+        return self._by_occupant_jid.get(jid) is occupant
+
+    def _index_add(self, occupant):
+        self._by_occupant_jid[occupant.conversation_jid] = occupant
+        if occupant.direct_jid is not None:
+            self._by_direct_jid.setdefault(
+                occupant.direct_jid, {}
+            )[occupant] = None
+        self._by_role.setdefault(occupant.role, {})[occupant] = None
+        self._by_affiliation.setdefault(
+            occupant.affiliation, {}
+        )[occupant] = None
+
+    @staticmethod
+    def _discard(index, key, occupant):
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(occupant, None)
+        if not bucket:
+            del index[key]
+
+    def _index_remove(self, occupant):
+        del self._by_occupant_jid[occupant.conversation_jid]
+        if occupant.direct_jid is not None:
+            self._discard(self._by_direct_jid, occupant.direct_jid, occupant)
+        self._discard(self._by_role, occupant.role, occupant)
+        self._discard(self._by_affiliation, occupant.affiliation, occupant)
+
+    def set_me(self, occupant):
+        if self.me is not None:
+            self._index_remove(self.me)
+        self.me = occupant
+        self._index_add(occupant)
+        self._members = None
+
+    def add(self, occupant):
+        self._index_add(occupant)
+        self._members = None
+
+    def remove(self, occupant):
+        self._index_remove(occupant)
+        self._members = None
+
+    def get(self, occupant_jid):
+        return self._by_occupant_jid.get(occupant_jid)
+
+    def update(self, occupant, info):
+        """
+        Apply the information from `info` to `occupant` with
+        :meth:`Occupant.update` and update the indices accordingly.
+        """
+        old_direct_jid = occupant.direct_jid
+        old_role = occupant.role
+        old_affiliation = occupant.affiliation
+
+        occupant.update(info)
+
+        if occupant not in self:
+            return
+
+        if occupant.direct_jid != old_direct_jid:
+            if old_direct_jid is not None:
+                self._discard(self._by_direct_jid, old_direct_jid, occupant)
+            if occupant.direct_jid is not None:
+                self._by_direct_jid.setdefault(
+                    occupant.direct_jid, {}
+                )[occupant] = None
+
+        if occupant.role != old_role:
+            self._discard(self._by_role, old_role, occupant)
+            self._by_role.setdefault(occupant.role, {})[occupant] = None
+
+        if occupant.affiliation != old_affiliation:
+            self._discard(self._by_affiliation, old_affiliation, occupant)
+            self._by_affiliation.setdefault(
+                occupant.affiliation, {}
+            )[occupant] = None
+
+    def rename(self, occupant, new_nick):
+        """
+        Change the nickname of `occupant` to `new_nick`.
+        """
+        indexed = occupant in self
+        if indexed:
+            del self._by_occupant_jid[occupant.conversation_jid]
+        occupant._conversation_jid = occupant.conversation_jid.replace(
+            resource=new_nick
+        )
+        if indexed:
+            self._by_occupant_jid[occupant.conversation_jid] = occupant
+
+    def by_direct_jid(self, jid):
+        return list(self._by_direct_jid.get(jid, ()))
+
+    def by_role(self, role):
+        return list(self._by_role.get(role, ()))
+
+    def by_affiliation(self, affiliation):
+        return list(self._by_affiliation.get(affiliation, ()))
+
+    def members(self):
+        """
+        Return a tuple of all occupants, the local occupant first.
+
+        The tuple is cached until the set of occupants changes.
+        """
+        members = self._members
+        if members is None:
+            members = tuple(
+                occupant
+                for occupant in self._by_occupant_jid.values()
+                if occupant is not self.me
+            )
+            if self.me is not None:
+                members = (self.me,) + members
+            self._members = members
+        return members
+
+
+class RoomMembers(collections.abc.Sequence):
+    """
+    Read-only view on the occupants of a :class:`Room`, as returned by
+    :attr:`Room.members`.
+
+    The view reflects the current state of the room. The number of occupants
+    and membership tests are computed in constant time; iteration and
+    indexing operate on a snapshot of the occupants, which is only re-created
+    after the set of occupants changed.
+
+    .. versionadded:: 0.10
+    """
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table):
+        super().__init__()
+        self._table = table
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, occupant):
+        return occupant in self._table
+
+    def __iter__(self):
+        return iter(self._table.members())
+
+    def __getitem__(self, index):
+        return self._table.members()[index]
+
+    def __repr__(self):
+        return "<{}.{} {!r}>".format(
+            type(self).__module__,
+            type(self).__qualname__,
+            list(self),
+        )
+
+
 class RoomState(Enum):
     """
     Enumeration which describes the state a :class:`~.muc.Room` is in.
@@ -399,6 +603,17 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
 
     .. autoattribute:: muc_subject_setter
 
+    The occupants are indexed, so that they can be looked up without
+    iterating over :attr:`members`:
+
+    .. automethod:: muc_get_occupant
+
+    .. automethod:: muc_get_occupants_by_jid
+
+    .. automethod:: muc_get_occupants_by_role
+
+    .. automethod:: muc_get_occupants_by_affiliation
+
     .. attribute:: muc_autorejoin
 
        A boolean flag indicating whether this MUC is supposed to be
@@ -776,12 +991,12 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
     def __init__(self, service, mucjid):
         super().__init__(service)
         self._mucjid = mucjid
-        self._occupant_info = {}
+        self._occupants = _OccupantTable()
+        self._members = RoomMembers(self._occupants)
         self._subject = aioxmpp.structs.LanguageMap()
         self._subject_setter = None
         self._joined = False
         self._active = False
-        self._this_occupant = None
         self._tracking_by_id = {}
         self._tracking_metadata = {}
         self._tracking_by_body = {}
@@ -854,7 +1069,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
         :data:`None` again, but the identity of the object changes on each
         :meth:`on_enter`.
         """
-        return self._this_occupant
+        return self._occupants.me
 
     @property
     def jid(self):
@@ -867,16 +1082,69 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
     @property
     def members(self):
         """
-        A copy of the list of occupants. The local user is always the first
-        item in the list, unless the :meth:`on_enter` has not fired yet.
+        A :class:`RoomMembers` view on the occupants. The local user is always
+        the first item, unless the :meth:`on_enter` has not fired yet.
+
+        .. versionchanged:: 0.10
+
+           This used to be a copy of the list of occupants. It is now a
+           read-only view, which reflects changes to the occupants. Use
+           ``list(room.members)`` to obtain a copy.
         """
+        return self._members
 
-        if self._this_occupant is not None:
-            items = [self._this_occupant]
-        else:
-            items = []
-        items += list(self._occupant_info.values())
-        return items
+    def muc_get_occupant(self, nick):
+        """
+        Return the occupant with the given nickname.
+
+        :param nick: The nickname of the occupant.
+        :type nick: :class:`str`
+        :rtype: :class:`Occupant` or :data:`None`
+        :return: The occupant (which may be :attr:`me`) or :data:`None` if
+            there is no occupant with that nickname.
+
+        .. versionadded:: 0.10
+        """
+        return self._occupants.get(self._mucjid.replace(resource=nick))
+
+    def muc_get_occupants_by_jid(self, jid):
+        """
+        Return the occupants with the given direct JID.
+
+        :param jid: The bare direct JID of the occupants.
+        :type jid: :class:`aioxmpp.JID`
+        :rtype: :class:`list` of :class:`Occupant`
+
+        Only occupants whose :attr:`~Occupant.direct_jid` is known are found.
+        A user may be in the room with more than one occupant.
+
+        .. versionadded:: 0.10
+        """
+        return self._occupants.by_direct_jid(jid)
+
+    def muc_get_occupants_by_role(self, role):
+        """
+        Return the occupants with the given role.
+
+        :param role: The role, e.g. ``"moderator"``.
+        :type role: :class:`str`
+        :rtype: :class:`list` of :class:`Occupant`
+
+        .. versionadded:: 0.10
+        """
+        return self._occupants.by_role(role)
+
+    def muc_get_occupants_by_affiliation(self, affiliation):
+        """
+        Return the occupants with the given affiliation.
+
+        :param affiliation: The affiliation, e.g. ``"owner"``.
+        :type affiliation: :class:`str`
+        :rtype: :class:`list` of :class:`Occupant`
+
+        .. versionadded:: 0.10
+        """
+        return self._occupants.by_affiliation(affiliation)
 
     @property
     def service_member(self):
@@ -937,8 +1205,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
         self._history_replay_occupants.clear()
 
     def _resume(self):
-        self._this_occupant = None
-        self._occupant_info = {}
+        self._occupants.clear()
         self._active = False
         self._state = RoomState.JOIN_PRESENCE
         self.on_muc_resume()
@@ -947,8 +1214,8 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
         try:
             tracker = self._tracking_by_id[message.id_]
         except KeyError:
-            if (self._this_occupant is not None and
-                    message.from_ == self._this_occupant.conversation_jid):
+            if (self._occupants.me is not None and
+                    message.from_ == self._occupants.me.conversation_jid):
                 key = _extract_one_pair(message.body)
                 self._service.logger.debug("trying to match by body: %r",
                                            key)
@@ -1017,14 +1284,14 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
             if self._match_tracker(message):
                 return
 
-        if (self._this_occupant and
-                self._this_occupant._conversation_jid == message.from_):
-            occupant = self._this_occupant
+        if (self._occupants.me and
+                self._occupants.me._conversation_jid == message.from_):
+            occupant = self._occupants.me
         else:
             if message.from_.resource is None:
                 occupant = self._service_member
             else:
-                occupant = self._occupant_info.get(message.from_, None)
+                occupant = self._occupants.get(message.from_)
 
             if (self._state == RoomState.HISTORY and
                     not sent and
@@ -1069,7 +1336,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
             self._enter_active_state()
 
         elif message.body:
-            if occupant is not None and occupant == self._this_occupant:
+            if occupant is not None and occupant == self._occupants.me:
                 tracker = aioxmpp.tracking.MessageTracker()
                 tracker._set_state(
                     aioxmpp.tracking.MessageState.DELIVERED_TO_RECIPIENT
@@ -1166,7 +1433,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
             ))
 
         if to_emit:
-            existing.update(info)
+            self._occupants.update(existing, info)
             for signal, args, kwargs in to_emit:
                 signal(*args, **kwargs)
 
@@ -1186,7 +1453,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
 
             self._service.logger.debug("%s: not active, configuring",
                                        self._mucjid)
-            self._this_occupant = info
+            self._occupants.set_me(info)
             self._joined = True
             self._active = True
             self._state = RoomState.HISTORY
@@ -1199,7 +1466,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
             self.on_enter()
             return
 
-        existing = self._this_occupant
+        existing = self._occupants.me
         mode, data = self._diff_presence(stanza, info, existing)
         if mode == _OccupantDiffClass.NICK_CHANGED:
             new_nick, = data
@@ -1208,16 +1475,14 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
                                        self._mucjid,
                                        old_nick,
                                        new_nick)
-            existing._conversation_jid = existing.conversation_jid.replace(
-                resource=new_nick
-            )
+            self._occupants.rename(existing, new_nick)
             self.on_nick_changed(existing, old_nick, new_nick)
         elif mode == _OccupantDiffClass.LEFT:
             mode, actor, reason = data
             self._service.logger.debug("%s: we left the MUC. reason=%r",
                                        self._mucjid,
                                        reason)
-            existing.update(info)
+            self._occupants.update(existing, info)
             self.on_exit(muc_leave_mode=mode,
                          muc_actor=actor,
                          muc_reason=reason,
@@ -1247,17 +1512,16 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
             self._enter_active_state()
 
         if (muc_xso.StatusCode.SELF in stanza.xep0045_muc_user.status_codes or
-                (self._this_occupant is not None and
-                 self._this_occupant.conversation_jid == stanza.from_)):
+                (self._occupants.me is not None and
+                 self._occupants.me.conversation_jid == stanza.from_)):
             self._service.logger.debug("%s: is self-presence",
                                        self._mucjid)
             self._handle_self_presence(stanza)
             return
 
         info = Occupant.from_presence(stanza, False)
-        try:
-            existing = self._occupant_info[info.conversation_jid]
-        except KeyError:
+        existing = self._occupants.get(info.conversation_jid)
+        if existing is None:
             if stanza.type_ == aioxmpp.structs.PresenceType.UNAVAILABLE:
                 self._service.logger.debug(
                     "received unavailable presence from unknown occupant %r."
@@ -1265,7 +1529,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
                     stanza.from_,
                 )
                 return
-            self._occupant_info[info.conversation_jid] = info
+            self._occupants.add(info)
             self.on_join(info)
             return
 
@@ -1273,21 +1537,17 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
         if mode == _OccupantDiffClass.NICK_CHANGED:
             new_nick, = data
             old_nick = existing.nick
-            del self._occupant_info[existing.conversation_jid]
-            existing._conversation_jid = existing.conversation_jid.replace(
-                resource=new_nick
-            )
-            self._occupant_info[existing.conversation_jid] = existing
+            self._occupants.rename(existing, new_nick)
             self.on_nick_changed(existing, old_nick, new_nick)
         elif mode == _OccupantDiffClass.LEFT:
             mode, actor, reason = data
-            existing.update(info)
+            self._occupants.update(existing, info)
             self.on_leave(existing,
                           muc_leave_mode=mode,
                           muc_actor=actor,
                           muc_reason=reason,
                           muc_status_codes=stanza.xep0045_muc_user.status_codes)
-            del self._occupant_info[existing.conversation_jid]
+            self._occupants.remove(existing)
 
     def _handle_role_request(self, form):
         def submit(fut):
@@ -1439,7 +1699,7 @@ class Room(aioxmpp.im.conversation.AbstractConversation):
         token = tracking_svc.send_tracked(msg, tracker)
         self.on_message(
             msg,
-            self._this_occupant,
+            self._occupants.me,
             aioxmpp.im.dispatcher.MessageSource.STREAM,
             tracker=tracker,
         )
@@ -69,6 +69,25 @@ been set) if a timeout occurs and switch to TCP if problems persist.
 
 .. autofunction:: repeated_query
 
+Caching query results
+=====================
+
+.. versionadded:: 0.10
+
+By default, each call to :func:`repeated_query` (and thus to
+:func:`lookup_srv` and :func:`lookup_tlsa`) sends a query to the resolver.
+Applications which run many clients against the same domains can install a
+process-wide :class:`DNSCache` using :func:`set_dns_cache`. The cache honours
+the TTL of the records, caches negative results, merges concurrent identical
+queries into one and keeps serving expired results for a short while during
+their refresh.
+
+.. autoclass:: DNSCache
+
+.. autofunction:: get_dns_cache
+
+.. autofunction:: set_dns_cache
+
 SRV records
 ===========
 
@@ -82,20 +101,28 @@ SRV records
 """
 
 import asyncio
+import collections
 import functools
 import itertools
 import logging
 import random
 import threading
+import time
+
+from datetime import timedelta
 
 import dns
 import dns.flags
 import dns.resolver
 
+from .cache import LRUDict
+
 logger = logging.getLogger(__name__)
 
 _state = threading.local()
 
+_dns_cache = None
+
 
 class ValidationError(Exception):
     pass
@@ -142,6 +169,247 @@ def set_resolver(resolver):
     _state.overridden_resolver = True
 
 
+_DNSCacheEntry = collections.namedtuple(
+    "_DNSCacheEntry",
+    ["value", "expires", "stale_until"]
+)
+
+
+class DNSCache:
+    """
+    Cache for the results of :func:`repeated_query`.
+
+    :param maxsize: Maximum number of cached results.
+    :type maxsize: :class:`int`
+    :param negative_ttl: Lifetime of negative results.
+    :type negative_ttl: :class:`datetime.timedelta`
+    :param max_ttl: Upper bound for the lifetime of positive results.
+    :type max_ttl: :class:`datetime.timedelta`
+    :param stale_ttl: Time for which expired results are still served while
+        they are refreshed.
+    :type stale_ttl: :class:`datetime.timedelta`
+
+    Positive results are kept for the TTL of the returned record set (but at
+    most for `max_ttl`); records with a TTL of zero are not cached. Negative
+    results (that is, the :data:`None` returned by :func:`repeated_query` for
+    NXDOMAIN and empty answers) are kept for `negative_ttl`. Errors are never
+    cached.
+
+    When a result has expired, but not for longer than `stale_ttl`, it is
+    returned nevertheless and a new query is started in the background to
+    refresh it. If the refresh fails, the stale result is served until the
+    `stale_ttl` has passed, after which the next lookup waits for a new query.
+
+    If a query is already in progress for a result which is not cached, the
+    lookup waits for that query instead of sending another one.
+
+    The cache uses futures bound to the event loop of the queries; it must
+    therefore only be used with a single event loop.
+
+    .. versionadded:: 0.10
+
+    .. autoattribute:: maxsize
+
+    .. attribute:: negative_ttl
+
+       The `negative_ttl` passed to the constructor.
+
+    .. attribute:: max_ttl
+
+       The `max_ttl` passed to the constructor.
+
+    .. attribute:: stale_ttl
+
+       The `stale_ttl` passed to the constructor.
+
+    .. automethod:: clear
+
+    Statistics:
+
+    .. attribute:: hits
+
+       Number of lookups answered with a fresh cached result.
+
+    .. attribute:: stale_hits
+
+       Number of lookups answered with an expired result while it was being
+       refreshed.
+
+    .. attribute:: misses
+
+       Number of lookups which had to wait for a query.
+
+    .. attribute:: coalesced
+
+       Number of :attr:`misses` which waited for a query started by an
+       earlier lookup instead of starting their own.
+
+    .. autoattribute:: hit_rate
+
+    .. automethod:: reset_counters
+    """
+
+    def __init__(self, *,
+                 maxsize=1024,
+                 negative_ttl=timedelta(seconds=60),
+                 max_ttl=timedelta(days=1),
+                 stale_ttl=timedelta(seconds=60)):
+        super().__init__()
+        self._entries = LRUDict()
+        self._entries.maxsize = maxsize
+        self._inflight = {}
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.stale_ttl = stale_ttl
+        self.reset_counters()
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of cached results. Changing this property purges the
+        least recently used results immediately.
+        """
+        return self._entries.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._entries.maxsize = value
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of the lookups which were answered from the cache (including
+        :attr:`stale_hits`), or :data:`None` if no lookups were made since the
+        counters were reset.
+        """
+        nlookups = self.hits + self.stale_hits + self.misses
+        if not nlookups:
+            return None
+        return (self.hits + self.stale_hits) / nlookups
+
+    def reset_counters(self):
+        """
+        Reset all statistics counters to zero.
+        """
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def clear(self):
+        """
+        Remove all cached results.
+
+        Queries which are in progress are not affected.
+        """
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_ttl(self, value):
+        if value is None:
+            return self.negative_ttl.total_seconds()
+        return min(value.rrset.ttl, self.max_ttl.total_seconds())
+
+    def _store(self, key, value):
+        ttl = self._get_ttl(value)
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+
+        expires = time.monotonic() + ttl
+        self._entries[key] = _DNSCacheEntry(
+            value,
+            expires,
+            expires + self.stale_ttl.total_seconds(),
+        )
+
+    def _query_done(self, key, loop, fut):
+        if self._inflight.get((key, loop)) is fut:
+            del self._inflight[key, loop]
+
+        if fut.cancelled():
+            return
+
+        exc = fut.exception()
+        if exc is not None:
+            logger.debug("DNS query for %r failed: %s", key, exc)
+            return
+
+        self._store(key, fut.result())
+
+    def _start_query(self, key, query, loop):
+        fut = asyncio.ensure_future(query(), loop=loop)
+        # futures cannot be awaited from another loop, so queries are only
+        # shared between lookups on the same loop
+        self._inflight[key, loop] = fut
+        fut.add_done_callback(functools.partial(self._query_done, key, loop))
+        return fut
+
+    @asyncio.coroutine
+    def _lookup(self, key, query, loop):
+        """
+        Return the cached result for `key` or the result of the coroutine
+        function `query`.
+        """
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            now = time.monotonic()
+            if now < entry.expires:
+                self.hits += 1
+                return entry.value
+
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                if (key, loop) not in self._inflight:
+                    logger.debug("refreshing stale DNS result for %r", key)
+                    self._start_query(key, query, loop)
+                return entry.value
+
+            del self._entries[key]
+
+        self.misses += 1
+        fut = self._inflight.get((key, loop))
+        if fut is None:
+            fut = self._start_query(key, query, loop)
+        else:
+            self.coalesced += 1
+
+        # shield the query, it is shared with other lookups
+        return (yield from asyncio.shield(fut, loop=loop))
+
+
+def get_dns_cache():
+    """
+    Return the :class:`DNSCache` used by :func:`repeated_query`, or
+    :data:`None` (the default) if results are not cached.
+
+    .. versionadded:: 0.10
+    """
+    return _dns_cache
+
+
+def set_dns_cache(cache):
+    """
+    Use the :class:`DNSCache` `cache` for all :func:`repeated_query` calls
+    which use the default resolver (that is, which do not pass a `resolver`).
+
+    Pass :data:`None` to disable caching again.
+
+    Unlike the resolver (see :func:`set_resolver`), the cache is not
+    thread-local: it is meant to be shared by all clients using the same event
+    loop.
+
+    .. versionadded:: 0.10
+    """
+    global _dns_cache
+    _dns_cache = cache
+
+
 @asyncio.coroutine
 def repeated_query(qname, rdtype,
                    nattempts=None,
@@ -207,6 +475,49 @@ def repeated_query(qname, rdtype,
     :class:`~dns.resolver.NoNameservers` exception is treated as normal
     timeout. If the exception re-occurs in the second query, it is re-raised,
     as it indicates a serious configuration problem.
+
+    If a :class:`DNSCache` has been installed with :func:`set_dns_cache`,
+    `resolver` is :data:`None` and the thread-local resolver has not been
+    overridden with :func:`set_resolver`, the result is taken from the cache
+    if possible, and stored in the cache otherwise.
+
+    .. versionchanged:: 0.10
+
+       Support for caching results with :class:`DNSCache` was added.
+    """
+    if nattempts is not None and nattempts <= 0:
+        raise ValueError("query cannot succeed with non-positive amount "
+                         "of attempts")
+
+    query = functools.partial(
+        _repeated_query,
+        qname, rdtype,
+        nattempts=nattempts,
+        resolver=resolver,
+        require_ad=require_ad,
+        executor=executor,
+    )
+
+    cache = _dns_cache
+    if (cache is None or resolver is not None or
+            getattr(_state, "overridden_resolver", False)):
+        return (yield from query())
+
+    return (yield from cache._lookup(
+        (qname, rdtype, require_ad),
+        query,
+        asyncio.get_event_loop(),
+    ))
+
+
+@asyncio.coroutine
+def _repeated_query(qname, rdtype,
+                    nattempts,
+                    resolver,
+                    require_ad,
+                    executor):
+    """
+    Implementation of :func:`repeated_query` without caching.
     """
     global _state
 
@@ -224,10 +535,6 @@ def repeated_query(qname, rdtype,
         else:
             nattempts = 2
 
-    if nattempts <= 0:
-        raise ValueError("query cannot succeed with non-positive amount "
-                         "of attempts")
-
     qname = qname.decode("ascii")
 
     def handle_timeout():
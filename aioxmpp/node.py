@@ -60,6 +60,7 @@ Utilities
 
 """
 import asyncio
+import collections
 import contextlib
 import logging
 import warnings
@@ -233,10 +234,14 @@ def discover_connectors(
 
 
 @asyncio.coroutine
-def _try_options(options, exceptions,
-                 jid, metadata, negotiation_timeout, loop, logger):
+def _connect_sequentially(options, exceptions,
+                          jid, metadata, negotiation_timeout, loop, logger):
     """
-    Helper function for :func:`connect_xmlstream`.
+    Helper function for :func:`_try_options`.
+
+    Try the connection options from the iterator `options` one after another
+    and return the result of the first successful one, or :data:`None` if the
+    iterator is exhausted.
     """
     for host, port, conn in options:
         logger.debug(
@@ -244,7 +249,7 @@ def _try_options(options, exceptions,
             jid.domain, host, port, conn
         )
         try:
-            transport, xmlstream, features = yield from conn.connect(
+            result = yield from conn.connect(
                 loop,
                 metadata,
                 jid.domain,
@@ -265,6 +270,137 @@ def _try_options(options, exceptions,
             jid.domain,
             conn,
         )
+        return result
+
+    return None
+
+
+@asyncio.coroutine
+def _connect_racing(options, exceptions,
+                    jid, metadata, negotiation_timeout, loop, logger,
+                    attempt_delay):
+    """
+    Helper function for :func:`_try_options`.
+
+    Start connection attempts for the options from the iterator `options`,
+    staggered by `attempt_delay` seconds, and return the result of the first
+    attempt to reach the stream features. The next attempt is started early if
+    an attempt fails. All other attempts are cancelled and their streams are
+    closed.
+
+    Return :data:`None` if the iterator is exhausted and all attempts failed.
+    """
+    pending = collections.OrderedDict()
+    exhausted = False
+
+    try:
+        while True:
+            if not exhausted:
+                try:
+                    host, port, conn = next(options)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    logger.debug(
+                        "domain %s: trying to connect to %r:%s using %r",
+                        jid.domain, host, port, conn
+                    )
+                    task = asyncio.ensure_future(
+                        conn.connect(
+                            loop,
+                            metadata,
+                            jid.domain,
+                            host,
+                            port,
+                            negotiation_timeout,
+                            base_logger=logger,
+                        ),
+                        loop=loop,
+                    )
+                    pending[task] = conn
+
+            if not pending:
+                return None
+
+            done, _ = yield from asyncio.wait(
+                list(pending),
+                timeout=None if exhausted else attempt_delay,
+                return_when=asyncio.FIRST_COMPLETED,
+                loop=loop,
+            )
+
+            result = None
+            for task in [task for task in pending if task in done]:
+                conn = pending.pop(task)
+                try:
+                    task_result = task.result()
+                except OSError as exc:
+                    logger.warning(
+                        "connection failed: %s", exc
+                    )
+                    exceptions.append(exc)
+                    continue
+                except:  # NOQA
+                    if result is not None:
+                        # do not leak the stream of the attempt which has
+                        # already succeeded in this iteration
+                        result[1].abort()
+                    raise
+
+                if result is not None:
+                    # another attempt finished in the same iteration
+                    task_result[1].abort()
+                    continue
+
+                logger.debug(
+                    "domain %s: connection succeeded using %r",
+                    jid.domain,
+                    conn,
+                )
+                result = task_result
+
+            if result is not None:
+                return result
+    finally:
+        if pending:
+            for task in pending:
+                task.cancel()
+            yield from asyncio.wait(list(pending), loop=loop)
+            for task in pending:
+                if (not task.cancelled() and
+                        task.exception() is None):
+                    # finished before the cancellation took effect
+                    task.result()[1].abort()
+
+
+@asyncio.coroutine
+def _try_options(options, exceptions,
+                 jid, metadata, negotiation_timeout, loop, logger,
+                 attempt_delay=None):
+    """
+    Helper function for :func:`connect_xmlstream`.
+    """
+    options = iter(options)
+
+    while True:
+        if attempt_delay is None:
+            result = yield from _connect_sequentially(
+                options,
+                exceptions,
+                jid, metadata, negotiation_timeout, loop, logger,
+            )
+        else:
+            result = yield from _connect_racing(
+                options,
+                exceptions,
+                jid, metadata, negotiation_timeout, loop, logger,
+                attempt_delay,
+            )
+
+        if result is None:
+            return None
+
+        transport, xmlstream, features = result
 
         if not metadata.sasl_providers:
             return transport, xmlstream, features
@@ -296,8 +432,6 @@ def _try_options(options, exceptions,
 
         return transport, xmlstream, features
 
-    return None
-
 
 @asyncio.coroutine
 def connect_xmlstream(
@@ -306,7 +440,8 @@ def connect_xmlstream(
         negotiation_timeout=60.,
         override_peer=[],
         loop=None,
-        logger=logger):
+        logger=logger,
+        attempt_delay=None):
     """
     Prepare and connect a :class:`aioxmpp.protocol.XMLStream` to a server
     responsible for the given `jid` and authenticate against that server using
@@ -326,6 +461,10 @@ def connect_xmlstream(
     :type loop: :class:`asyncio.BaseEventLoop`
     :param logger: Logger to use (defaults to module-wide logger)
     :type logger: :class:`logging.Logger`
+    :param attempt_delay: Delay after which the next connection option is
+                          tried in parallel, or :data:`None` to try the
+                          options one after another.
+    :type attempt_delay: :class:`float` in seconds or :data:`None`
     :raises ValueError: if the domain from the `jid` announces that XMPP is not
                         supported at all.
     :raises aioxmpp.errors.TLSFailure: if all connection attempts fail and one
@@ -360,6 +499,16 @@ def connect_xmlstream(
     fail and the set of encountered errors includes a TLS error, the TLS error
     is re-raised instead of raising a :class:`aioxmpp.errors.MultiOSError`.
 
+    If `attempt_delay` is not :data:`None`, the connection options are raced
+    against each other (similar to the "Happy Eyeballs" algorithm of
+    :rfc:`8305`): the next option is tried if the previous attempt has not
+    reached the stream features within `attempt_delay` seconds, or as soon as
+    it fails, while the previous attempts keep running. The first attempt to
+    reach the stream features is used and all other attempts are cancelled.
+    The options from `override_peer` are still raced separately and before the
+    discovered options. Errors of cancelled attempts are not included in the
+    :class:`aioxmpp.errors.MultiOSError`.
+
     Return a triple ``(transport, xmlstream, features)``. `transport`
     the underlying :class:`asyncio.Transport` which is used for the `xmlstream`
     :class:`~.protocol.XMLStream` instance. `features` is the
@@ -373,6 +522,10 @@ def connect_xmlstream(
        The explicit raising of TLS errors has been introduced. Before, TLS
        errors were treated like any other connection error, possibly masking
        configuration problems.
+
+    .. versionchanged:: 0.10
+
+       The `attempt_delay` argument was added.
     """
     loop = asyncio.get_event_loop() if loop is None else loop
 
@@ -384,6 +537,7 @@ def connect_xmlstream(
         options,
         exceptions,
         jid, metadata, negotiation_timeout, loop, logger,
+        attempt_delay=attempt_delay,
     )
     if result is not None:
         return result
@@ -398,6 +552,7 @@ def connect_xmlstream(
         options,
         exceptions,
         jid, metadata, negotiation_timeout, loop, logger,
+        attempt_delay=attempt_delay,
     )
     if result is not None:
         return result
@@ -437,6 +592,12 @@ class Client:
     :type loop: :class:`asyncio.BaseEventLoop` or :data:`None`
     :param logger: Logger to use instead of the default logger
     :type logger: :class:`logging.Logger` or :data:`None`
+    :param write_policy: Write coalescing policy for the XML streams
+    :type write_policy: :class:`~aioxmpp.protocol.WriteCoalescingPolicy` or
+        :data:`None`
+    :param attempt_delay: Delay after which the next connection option is
+        tried in parallel, or :data:`None` to try them one after another
+    :type attempt_delay: :class:`datetime.timedelta` or :data:`None`
 
     These classes deal with managing the :class:`~aioxmpp.stream.StanzaStream`
     and the underlying :class:`~aioxmpp.protocol.XMLStream` instances. The
@@ -549,6 +710,42 @@ class Client:
     .. autoattribute:: resumption_timeout
         :annotation: = None
 
+    .. attribute:: write_policy
+        :annotation: = None
+
+       The :class:`~aioxmpp.protocol.WriteCoalescingPolicy` which is applied
+       to the :class:`~aioxmpp.protocol.XMLStream` once it is connected (see
+       :attr:`aioxmpp.protocol.XMLStream.write_policy`). If :data:`None`,
+       writes are not coalesced.
+
+       Changes take effect when the next stream is connected.
+
+       .. versionadded:: 0.10
+
+    .. attribute:: connection_limiter
+        :annotation: = None
+
+       If not :data:`None`, an object which limits the connection attempts,
+       such as :class:`aioxmpp.host.ConnectionLimiter`. The coroutine method
+       :meth:`acquire` of the object is awaited before each connection
+       attempt and its method :meth:`release` is called when the attempt has
+       finished (successfully or not).
+
+       .. versionadded:: 0.10
+
+    .. attribute:: attempt_delay
+        :annotation: = None
+
+       If not :data:`None`, a :class:`datetime.timedelta` after which the next
+       connection option is tried in parallel to the pending attempts when
+       connecting; the first attempt to reach the stream features wins. See
+       the `attempt_delay` argument to :func:`connect_xmlstream`. If
+       :data:`None`, the connection options are tried one after another.
+
+       Changes take effect with the next connection attempt.
+
+       .. versionadded:: 0.10
+
     Connection information:
 
     .. autoattribute:: established
@@ -679,6 +876,17 @@ class Client:
 
           The `reason` argument was added.
 
+    .. signal:: on_service_summoned(service)
+
+       Fires when a :class:`~aioxmpp.service.Service` has been instantiated
+       by :meth:`summon`, including services which are summoned as
+       dependencies of other services.
+
+       :param service: The new service instance.
+       :type service: :class:`~aioxmpp.service.Service`
+
+       .. versionadded:: 0.10
+
     Services:
 
     .. automethod:: summon
@@ -702,6 +910,7 @@ class Client:
     on_stream_destroyed = callbacks.Signal()
     on_stream_suspended = callbacks.Signal()
     on_stream_established = callbacks.Signal()
+    on_service_summoned = callbacks.Signal()
 
     before_stream_established = callbacks.SyncSignal()
 
@@ -713,7 +922,9 @@ class Client:
                  max_initial_attempts=4,
                  override_peer=[],
                  loop=None,
-                 logger=None):
+                 logger=None,
+                 write_policy=None,
+                 attempt_delay=None):
         super().__init__()
         self._local_jid = local_jid
         self._loop = loop or asyncio.get_event_loop()
@@ -748,6 +959,9 @@ class Client:
         self.established_event = asyncio.Event()
         self._max_initial_attempts = max_initial_attempts
         self._resumption_timeout = None
+        self.write_policy = write_policy
+        self.attempt_delay = attempt_delay
+        self.connection_limiter = None
 
         self.on_stopped.logger = self.logger.getChild("on_stopped")
         self.on_failure.logger = self.logger.getChild("on_failure")
@@ -941,17 +1155,34 @@ class Client:
                 ))
         override_peer += self.override_peer
 
-        tls_transport, xmlstream, features = \
-            yield from connect_xmlstream(
-                self._local_jid,
-                self._security_layer,
-                negotiation_timeout=self.negotiation_timeout.total_seconds(),
-                override_peer=override_peer,
-                loop=self._loop,
-                logger=self.logger)
+        limiter = self.connection_limiter
+        if limiter is not None:
+            yield from limiter.acquire()
+
+        try:
+            tls_transport, xmlstream, features = \
+                yield from connect_xmlstream(
+                    self._local_jid,
+                    self._security_layer,
+                    negotiation_timeout=(
+                        self.negotiation_timeout.total_seconds()
+                    ),
+                    override_peer=override_peer,
+                    loop=self._loop,
+                    logger=self.logger,
+                    attempt_delay=(
+                        self.attempt_delay.total_seconds()
+                        if self.attempt_delay is not None
+                        else None
+                    ))
+        finally:
+            if limiter is not None:
+                limiter.release()
 
         self._had_connection = True
 
+        xmlstream.write_policy = self.write_policy
+
         try:
             features, sm_resumed = yield from self._negotiate_stream(
                 xmlstream,
@@ -1068,6 +1299,7 @@ class Client:
                 }
             )
             self._services[class_] = instance
+            self.on_service_summoned(instance)
             return instance
 
     def summon(self, class_):
@@ -1182,6 +1414,8 @@ class Client:
 
         :param stanza: Stanza to send
         :type stanza: :class:`IQ`, :class:`Message` or :class:`Presence`
+        :param priority: Priority class of the stanza
+        :type priority: :class:`~.stream.StanzaPriority` or :data:`None`
         :param kwargs: see :class:`StanzaToken`
         :raises ConnectionError: if the stream is not :attr:`established`
             yet.
@@ -1190,7 +1424,12 @@ class Client:
 
         The `stanza` is enqueued in the active queue for transmission and will
         be sent on the next opportunity. The relative ordering of stanzas
-        enqueued is always preserved.
+        enqueued with the same `priority` is always preserved.
+
+        If `priority` is :data:`None`, the stanza is sent with
+        :attr:`~.StanzaPriority.INTERACTIVE` priority, so that stanzas enqueued
+        without a priority keep their order. See
+        :class:`~.stream.StanzaPriority` for details.
 
         Return a fresh :class:`StanzaToken` instance which traks the progress
         of the transmission of the `stanza`. The `kwargs` are forwarded to the
@@ -1208,6 +1447,8 @@ class Client:
 
             This method has been moved from
             :meth:`aioxmpp.stream.StanzaStream.enqueue`.
+
+            The `priority` argument was added.
         """
         if not self.established_event.is_set():
             raise ConnectionError("stream is not ready")
@@ -1215,7 +1456,7 @@ class Client:
         return self.stream._enqueue(stanza, **kwargs)
 
     @asyncio.coroutine
-    def send(self, stanza, *, timeout=None, cb=None):
+    def send(self, stanza, *, timeout=None, cb=None, priority=None):
         """
         Send a stanza.
 
@@ -1226,6 +1467,8 @@ class Client:
         :type timeout: :class:`~numbers.Real` or :data:`None`
         :param cb: Optional callback which is called synchronously when the
             reply is received (IQ requests only!)
+        :param priority: Priority class of the stanza, see :meth:`enqueue`.
+        :type priority: :class:`~.stream.StanzaPriority` or :data:`None`
         :raise OSError: if the underlying XML stream fails and stream
             management is not disabled.
         :raise aioxmpp.stream.DestructionRequested:
@@ -1291,6 +1534,7 @@ class Client:
               payloads.
             * This method was moved from
               :meth:`aioxmpp.stream.StanzaStream.send`.
+            * The `priority` argument was added.
 
         .. versionchanged:: 0.9
 
@@ -1332,7 +1576,8 @@ class Client:
 
         return (yield from self.stream._send_immediately(stanza,
                                                          timeout=timeout,
-                                                         cb=cb))
+                                                         cb=cb,
+                                                         priority=priority))
 
 
 class PresenceManagedClient(Client):
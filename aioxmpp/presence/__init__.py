@@ -36,6 +36,8 @@ of peers, no matter whether they are in the roster or not.
 
 .. currentmodule:: aioxmpp.presence
 
+.. autoclass:: ResourcePresence
+
 .. class:: Service
 
    Alias of :class:`.PresenceClient`.
@@ -46,5 +48,9 @@ of peers, no matter whether they are in the roster or not.
 
 """
 
-from .service import PresenceClient, PresenceServer  # NOQA
+from .service import (  # NOQA
+    PresenceClient,
+    PresenceServer,
+    ResourcePresence,
+)
 Service = PresenceClient  # NOQA
@@ -28,6 +28,132 @@ import aioxmpp.structs
 import aioxmpp.xso.model
 
 
+class ResourcePresence:
+    """
+    Compact record of the presence of a single available resource, as kept
+    by :class:`PresenceClient`.
+
+    .. attribute:: state
+
+       The :class:`~aioxmpp.PresenceState` of the resource.
+
+    .. attribute:: priority
+
+       The priority of the resource, as :class:`int`.
+
+    .. autoattribute:: status
+
+    .. attribute:: stanza
+
+       The presence stanza from which the record was created or :data:`None`
+       if :attr:`~aioxmpp.PresenceClient.keep_stanzas` was false when the
+       stanza was received.
+
+    The records must be treated as read-only.
+
+    .. versionadded:: 0.10
+    """
+
+    __slots__ = ("state", "priority", "stanza", "_status", "_key")
+
+    def __init__(self, state, priority, status=None, stanza=None):
+        super().__init__()
+        self.state = state
+        self.priority = priority
+        self.stanza = stanza
+        self._status = status
+        self._key = None
+
+    @property
+    def status(self):
+        """
+        The :class:`~aioxmpp.structs.LanguageMap` mapping languages to status
+        texts.
+        """
+        if self._status is None:
+            if self.stanza is not None:
+                return self.stanza.status
+            return _NO_STATUS
+        return self._status
+
+    def __repr__(self):
+        return "<{}.{} state={!r} priority={!r}>".format(
+            type(self).__module__,
+            type(self).__qualname__,
+            self.state,
+            self.priority,
+        )
+
+
+# PresenceState objects are immutable; share them between all records, as
+# well as the (read-only) empty status map
+#
+# along with the state, its rank in the ordering of the states is stored; the
+# rank is used in place of the state in the sort key of a resource, as
+# comparing integers is much cheaper
+_AVAILABLE_STATES = {
+    state.show: (state, rank)
+    for rank, state in enumerate(sorted(
+        aioxmpp.structs.PresenceState(True, show)
+        for show in aioxmpp.structs.PresenceShow
+    ))
+}
+
+# the sort key of a resource is the rank of its state in the upper bits and
+# the sequence number of the resource in the lower bits
+_SEQ_BITS = 48
+
+_NO_STATUS = aioxmpp.structs.LanguageMap()
+
+
+class _PeerPresence:
+    __slots__ = ("resources", "error", "best", "_next_seq")
+
+    def __init__(self):
+        super().__init__()
+        self.resources = {}
+        self.error = None
+        self.best = None
+        self._next_seq = 0
+
+    def update(self, resource, info, rank):
+        # resources with equal states are ordered by the time they became
+        # available, the latest one being the most available
+        old = self.resources.get(resource)
+        if old is None:
+            seq = self._next_seq
+            self._next_seq += 1
+        else:
+            seq = old._key & ((1 << _SEQ_BITS) - 1)
+        info._key = (rank << _SEQ_BITS) | seq
+        self.resources[resource] = info
+
+        best = self.best
+        if best is None:
+            self.best = resource
+        elif best == resource:
+            if info._key < old._key:
+                self._recalculate_best()
+        elif self.resources[best]._key < info._key:
+            self.best = resource
+
+        return old is None
+
+    def remove(self, resource):
+        del self.resources[resource]
+        if self.best == resource:
+            self._recalculate_best()
+
+    def _recalculate_best(self):
+        best = None
+        best_key = None
+        for resource, info in self.resources.items():
+            if best_key is None or best_key < info._key:
+                best = resource
+                best_key = info._key
+        self.best = best
+
+
 class PresenceClient(aioxmpp.service.Service):
     """
     The presence service tracks all incoming presence information (this does
@@ -51,10 +177,21 @@ class PresenceClient(aioxmpp.service.Service):
 
     .. automethod:: get_most_available_stanza
 
+    .. automethod:: get_most_available_resource
+
     .. automethod:: get_peer_resources
 
+    .. automethod:: get_resource_presence
+
     .. automethod:: get_stanza
 
+    The presence of each available resource is stored as a compact
+    :class:`ResourcePresence` record. The most available resource of each
+    peer is kept up-to-date on each presence, so that querying it does not
+    require to sort the resources.
+
+    .. autoattribute:: keep_stanzas
+
     On presence changes of peers, signals are emitted:
 
     .. signal:: on_bare_available(stanza)
@@ -102,6 +239,13 @@ class PresenceClient(aioxmpp.service.Service):
        This class was formerly known as :class:`aioxmpp.presence.Service`. It
        is still available under that name, but the alias will be removed in
        1.0.
+
+    .. versionchanged:: 0.10
+
+       Presence is stored in compact :class:`ResourcePresence` records and
+       the most available resource is indexed. :meth:`on_bare_unavailable`
+       only fires on an error presence if the peer had an available
+       resource.
     """
 
     ORDER_AFTER = [
@@ -119,6 +263,47 @@ class PresenceClient(aioxmpp.service.Service):
         super().__init__(client, **kwargs)
 
         self._presences = {}
+        self._keep_stanzas = True
+
+    @property
+    def keep_stanzas(self):
+        """
+        Whether the full presence stanzas are kept in addition to the compact
+        :class:`ResourcePresence` records.
+
+        This defaults to true. If it is set to false, already stored stanzas
+        are discarded and the methods returning stanzas return stanzas which
+        are re-created from the records. Those carry the type, show, priority
+        and status of the original stanza, but no extension payloads. Error
+        stanzas are always kept.
+
+        .. versionadded:: 0.10
+        """
+        return self._keep_stanzas
+
+    @keep_stanzas.setter
+    def keep_stanzas(self, value):
+        value = bool(value)
+        self._keep_stanzas = value
+        if value:
+            return
+        for peer in self._presences.values():
+            for info in peer.resources.values():
+                if info.stanza is not None:
+                    info._status = info.stanza.status or None
+                    info.stanza = None
+
+    def _make_stanza(self, peer_jid, resource, info):
+        if info.stanza is not None:
+            return info.stanza
+        st = aioxmpp.stanza.Presence(
+            type_=aioxmpp.structs.PresenceType.AVAILABLE,
+            show=info.state.show,
+            from_=peer_jid.replace(resource=resource),
+        )
+        st.priority = info.priority
+        st.status.update(info.status)
+        return st
 
     def get_most_available_stanza(self, peer_jid):
         """
@@ -132,18 +317,35 @@ class PresenceClient(aioxmpp.service.Service):
                  :data:`None` if there is no available resource.
 
         The "most available" resource is the one whose presence state orderest
-        highest according to :class:`~aioxmpp.PresenceState`.
+        highest according to :class:`~aioxmpp.PresenceState`. If multiple
+        resources have the same presence state, the one which became available
+        last is returned.
 
         If there is no available resource for a given `peer_jid`, :data:`None`
         is returned.
         """
-        presences = sorted(
-            self.get_peer_resources(peer_jid).items(),
-            key=lambda item: aioxmpp.structs.PresenceState.from_stanza(item[1])
-        )
-        if not presences:
+        peer = self._presences.get(peer_jid)
+        if peer is None or peer.best is None:
+            return None
+        return self._make_stanza(peer_jid, peer.best,
+                                 peer.resources[peer.best])
+
+    def get_most_available_resource(self, peer_jid):
+        """
+        Return the resource of the most available resource of the contact.
+
+        :param peer_jid: Bare JID of the contact.
+        :type peer_jid: :class:`aioxmpp.JID`
+        :rtype: :class:`str` or :data:`None`
+        :return: The resource whose stanza :meth:`get_most_available_stanza`
+            would return or :data:`None` if there is no available resource.
+
+        .. versionadded:: 0.10
+        """
+        peer = self._presences.get(peer_jid)
+        if peer is None:
             return None
-        return presences[-1][1]
+        return peer.best
 
     def get_peer_resources(self, peer_jid):
         """
@@ -155,11 +357,32 @@ class PresenceClient(aioxmpp.service.Service):
         returned mapping is empty.
         """
         try:
-            d = dict(self._presences[peer_jid])
-            d.pop(None, None)
-            return d
+            peer = self._presences[peer_jid]
         except KeyError:
             return {}
+        return {
+            resource: self._make_stanza(peer_jid, resource, info)
+            for resource, info in peer.resources.items()
+        }
+
+    def get_resource_presence(self, peer_jid):
+        """
+        Return the compact presence record of a resource.
+
+        :param peer_jid: Full JID of the resource.
+        :type peer_jid: :class:`aioxmpp.JID`
+        :rtype: :class:`ResourcePresence` or :data:`None`
+        :return: The presence record of the resource or :data:`None` if the
+            resource is not available.
+
+        .. versionadded:: 0.10
+        """
+        try:
+            return self._presences[peer_jid.bare()].resources[
+                peer_jid.resource
+            ]
+        except KeyError:
+            return None
 
     def get_stanza(self, peer_jid):
         """
@@ -170,14 +393,18 @@ class PresenceClient(aioxmpp.service.Service):
         If no presence was ever received for the given bare JID, :data:`None`
         is returned.
         """
+        bare = peer_jid.bare()
         try:
-            return self._presences[peer_jid.bare()][peer_jid.resource]
+            peer = self._presences[bare]
         except KeyError:
-            pass
+            return None
+        if peer.error is not None:
+            return peer.error
         try:
-            return self._presences[peer_jid.bare()][None]
+            info = peer.resources[peer_jid.resource]
         except KeyError:
-            pass
+            return None
+        return self._make_stanza(bare, peer_jid.resource, info)
 
     @aioxmpp.dispatcher.presence_handler(
         aioxmpp.structs.PresenceType.AVAILABLE,
@@ -191,35 +418,48 @@ class PresenceClient(aioxmpp.service.Service):
     def handle_presence(self, st):
         bare = st.from_.bare()
         resource = st.from_.resource
+        # the type is always a member of the enumeration, thus identity
+        # comparison is sufficient (and much cheaper than equality)
+        type_ = st.type_
 
-        if st.type_ == aioxmpp.structs.PresenceType.UNAVAILABLE:
+        if type_ is aioxmpp.structs.PresenceType.UNAVAILABLE:
             try:
-                dest_dict = self._presences[bare]
+                peer = self._presences[bare]
             except KeyError:
                 return
-            dest_dict.pop(None, None)
-            if resource in dest_dict:
+            peer.error = None
+            if resource in peer.resources:
                 self.on_unavailable(st.from_, st)
-                if len(dest_dict) == 1:
+                if len(peer.resources) == 1:
                     self.on_bare_unavailable(st)
-                del dest_dict[resource]
-        elif st.type_ == aioxmpp.structs.PresenceType.ERROR:
-            try:
-                dest_dict = self._presences[bare]
-            except KeyError:
-                pass
-            else:
-                for resource in dest_dict.keys():
+                peer.remove(resource)
+            if not peer.resources:
+                del self._presences[bare]
+        elif type_ is aioxmpp.structs.PresenceType.ERROR:
+            peer = self._presences.get(bare)
+            if peer is not None and peer.resources:
+                for resource in peer.resources.keys():
                     self.on_unavailable(st.from_.replace(resource=resource),
                                         st)
                 self.on_bare_unavailable(st)
-            self._presences[bare] = {None: st}
+            peer = _PeerPresence()
+            peer.error = st
+            self._presences[bare] = peer
         else:
-            dest_dict = self._presences.setdefault(bare, {})
-            dest_dict.pop(None, None)
-            bare_became_available = not dest_dict
-            resource_became_available = resource not in dest_dict
-            dest_dict[resource] = st
+            peer = self._presences.get(bare)
+            if peer is None:
+                peer = _PeerPresence()
+                self._presences[bare] = peer
+            peer.error = None
+            bare_became_available = not peer.resources
+            state, rank = _AVAILABLE_STATES[st.show]
+            if self._keep_stanzas:
+                # the status is taken from the stanza when it is needed
+                info = ResourcePresence(state, st.priority, stanza=st)
+            else:
+                info = ResourcePresence(state, st.priority,
+                                        st.status or None)
+            resource_became_available = peer.update(resource, info, rank)
 
             if bare_became_available:
                 self.on_bare_available(st)
@@ -35,6 +35,8 @@ class. Separating them helps with testing.
 
 .. autoclass:: XMLStream
 
+.. autoclass:: WriteCoalescingPolicy
+
 Utilities for XML streams
 =========================
 
@@ -187,6 +189,125 @@ class DebugWrapper:
             self._muted = False
 
 
+class WriteCoalescingPolicy:
+    """
+    Configure the coalescing of writes of an :class:`XMLStream`.
+
+    :param max_delay: Maximum time data is held back before it is written.
+    :type max_delay: :class:`datetime.timedelta` or :data:`None`
+    :param max_size: Amount of buffered bytes at which the buffer is written
+        immediately.
+    :type max_size: :class:`int`
+
+    When write coalescing is enabled, the serialised XSOs are collected in a
+    buffer instead of being written to the transport one by one. The buffer
+    is written to the transport with a single call (using
+    :meth:`asyncio.WriteTransport.writelines` if more than one piece is
+    buffered) when one of the following happens:
+
+    * If `max_delay` is :data:`None`, in the next iteration of the event
+      loop. Otherwise, `max_delay` after the first piece of data has been put
+      into the empty buffer.
+    * The amount of buffered data reaches `max_size` bytes.
+    * The stream needs the data to be on the wire, for example before
+      starting TLS, writing the EOF or closing the transport.
+
+    This reduces the number of system calls and allows for better packing of
+    TLS records when many stanzas are sent in a burst, at the cost of a
+    slightly higher latency for the individual stanza.
+
+    .. versionadded:: 0.10
+
+    .. attribute:: max_delay
+
+    .. attribute:: max_size
+    """
+
+    __slots__ = ("max_delay", "max_size")
+
+    def __init__(self, *, max_delay=None, max_size=16384):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_delay = max_delay
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "<{}.{} max_delay={!r} max_size={}>".format(
+            type(self).__module__,
+            type(self).__qualname__,
+            self.max_delay,
+            self.max_size,
+        )
+
+
+class _CoalescingWriter:
+    """
+    File-like object wrapping a transport which coalesces writes according to
+    a :class:`WriteCoalescingPolicy`.
+
+    If :attr:`policy` is :data:`None`, all writes are passed through to the
+    transport immediately.
+    """
+
+    def __init__(self, transport, loop):
+        self._transport = transport
+        self._loop = loop
+        self._pieces = []
+        self._size = 0
+        self._handle = None
+        self.policy = None
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        policy = self.policy
+        if policy is None:
+            self._transport.write(data)
+            return
+
+        self._pieces.append(data)
+        self._size += len(data)
+        if self._size >= policy.max_size:
+            self.flush()
+        elif self._handle is None:
+            if policy.max_delay is None:
+                self._handle = self._loop.call_soon(self.flush)
+            else:
+                self._handle = self._loop.call_later(
+                    policy.max_delay.total_seconds(),
+                    self.flush,
+                )
+
+    def flush(self):
+        """
+        Write all buffered data to the transport.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        pieces = self._pieces
+        if not pieces:
+            return
+        self._pieces = []
+        self._size = 0
+
+        if len(pieces) == 1:
+            self._transport.write(pieces[0])
+        else:
+            self._transport.writelines(pieces)
+
+    def discard(self):
+        """
+        Drop all buffered data without writing it.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pieces = []
+        self._size = 0
+
+
 class AlivenessMonitor:
     """
     Monitors aliveness of a data stream.
@@ -350,6 +471,27 @@ class XMLStream(asyncio.Protocol):
     child for logging purposes. This eases debugging and allows for
     connection-specific loggers.
 
+    `write_policy` may be a :class:`WriteCoalescingPolicy` to enable
+    coalescing of writes to the transport. It can also be changed later
+    using :attr:`write_policy`. By default, each XSO is written to the
+    transport as soon as it is sent.
+
+    `parser_factory` must be a callable which returns a new incremental XML
+    parser (see :func:`aioxmpp.xml.make_parser`) each time the stream is
+    (re-)started. It defaults to :class:`aioxmpp.xml.ExpatParser`, which
+    drives :mod:`pyexpat` directly and avoids most of the overhead of
+    :mod:`xml.sax`. Passing :func:`aioxmpp.xml.make_parser` restores the
+    :mod:`xml.sax` based parser.
+
+    .. versionchanged:: 0.10
+
+       The `parser_factory` argument was added and the default parser was
+       changed to :class:`aioxmpp.xml.ExpatParser`.
+
+    .. versionchanged:: 0.10
+
+       The `write_policy` argument was added.
+
     Receiving XSOs:
 
     .. attribute:: stanza_parser
@@ -378,6 +520,12 @@ class XMLStream(asyncio.Protocol):
 
     .. automethod:: send_xso
 
+    .. autoattribute:: write_policy
+
+    .. automethod:: flush
+
+    .. autoattribute:: bytes_sent
+
     Manipulating stream state:
 
     .. automethod:: starttls
@@ -447,9 +595,15 @@ class XMLStream(asyncio.Protocol):
                  features_future,
                  sorted_attributes=False,
                  base_logger=logging.getLogger("aioxmpp"),
-                 loop=None):
+                 loop=None,
+                 parser_factory=xml.ExpatParser,
+                 write_policy=None):
         self._to = to
+        self._write_policy = write_policy
+        self._coalescing_writer = None
+        self._bytes_sent = 0
         self._sorted_attributes = sorted_attributes
+        self._parser_factory = parser_factory
         self._logger = base_logger.getChild("XMLStream")
         self._transport = None
         self._features_future = features_future
@@ -501,6 +655,7 @@ class XMLStream(asyncio.Protocol):
         if self._transport_closing:
             return
         self._transport_closing = True
+        self.flush()
         self._transport.close()
 
     def _stream_starts_closing(self, task):
@@ -615,6 +770,8 @@ class XMLStream(asyncio.Protocol):
         if self._smachine.state != State.CLOSED:
             self._smachine.state = State.CLOSING_STREAM_FOOTER_RECEIVED
         self._transport_closing = True
+        if self._coalescing_writer is not None:
+            self._coalescing_writer.discard()
         if self._transport is not None:
             self._transport.abort()
         self._exception = self._exception or ConnectionError(
@@ -627,6 +784,9 @@ class XMLStream(asyncio.Protocol):
 
         assert self._transport is None
         self._transport = transport
+        self._bytes_sent = 0
+        self._coalescing_writer = _CoalescingWriter(transport, self._loop)
+        self._coalescing_writer.policy = self._write_policy
         self._writer = None
         self._exception = None
         # we need to set the state before we call reset()
@@ -640,6 +800,10 @@ class XMLStream(asyncio.Protocol):
             return
         self._smachine.state = State.CLOSED
         self._exception = self._exception or exc
+        if self._coalescing_writer is not None:
+            self._coalescing_writer.discard()
+            self._bytes_sent = self._coalescing_writer.bytes_written
+            self._coalescing_writer = None
         self._kill_state()
         self._writer = None
         self._transport = None
@@ -699,6 +863,7 @@ class XMLStream(asyncio.Protocol):
             return
         self._writer.close()
         if self._transport.can_write_eof():
+            self.flush()
             self._transport.write_eof()
         if self._smachine.state == State.STREAM_HEADER_SENT:
             # at this point, we cannot wait for the peer to send
@@ -737,15 +902,15 @@ class XMLStream(asyncio.Protocol):
         self._processor.on_stream_header = self._rx_stream_header
         self._processor.on_stream_footer = self._rx_stream_footer
         self._processor.on_exception = self._rx_exception
-        self._parser = xml.make_parser()
+        self._parser = self._parser_factory()
         self._parser.setContentHandler(self._processor)
         self._debug_wrapper = None
 
         if self._logger.getEffectiveLevel() <= logging.DEBUG:
-            dest = DebugWrapper(self._transport, self._logger)
+            dest = DebugWrapper(self._coalescing_writer, self._logger)
             self._debug_wrapper = dest
         else:
-            dest = self._transport
+            dest = self._coalescing_writer
         self._writer = xml.XMLStreamWriter(
             dest,
             self._to,
@@ -795,6 +960,7 @@ class XMLStream(asyncio.Protocol):
             return
         if (self._smachine.state != State.CLOSING and
                 self._transport.can_write_eof()):
+            self.flush()
             self._transport.write_eof()
         self._close_transport()
 
@@ -828,6 +994,53 @@ class XMLStream(asyncio.Protocol):
         self._require_connection()
         self._writer.send(obj)
 
+    def flush(self):
+        """
+        Write any data held back by write coalescing to the transport.
+
+        If write coalescing is disabled or the stream is not connected, this
+        does nothing.
+
+        .. versionadded:: 0.10
+        """
+        if self._coalescing_writer is not None:
+            self._coalescing_writer.flush()
+
+    @property
+    def bytes_sent(self):
+        """
+        The number of bytes sent over the stream since the connection was
+        made.
+
+        This includes stream headers, nonzas and data which is still held back
+        by write coalescing (see :attr:`write_policy`).
+
+        .. versionadded:: 0.10
+        """
+        if self._coalescing_writer is not None:
+            return self._coalescing_writer.bytes_written
+        return self._bytes_sent
+
+    @property
+    def write_policy(self):
+        """
+        The :class:`WriteCoalescingPolicy` in effect or :data:`None` if
+        writes are not coalesced.
+
+        When the policy is changed, any held back data is written to the
+        transport first.
+
+        .. versionadded:: 0.10
+        """
+        return self._write_policy
+
+    @write_policy.setter
+    def write_policy(self, value):
+        self.flush()
+        self._write_policy = value
+        if self._coalescing_writer is not None:
+            self._coalescing_writer.policy = value
+
     def can_starttls(self):
         """
         Return true if the transport supports STARTTLS and false otherwise.
@@ -859,6 +1072,7 @@ class XMLStream(asyncio.Protocol):
         if not self.can_starttls():
             raise RuntimeError("starttls not available on transport")
 
+        self.flush()
         yield from self._transport.starttls(ssl_context,
                                             post_handshake_callback)
         self._reset_state()
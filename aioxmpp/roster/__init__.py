@@ -42,6 +42,8 @@ This subpackage provides :class:`.RosterClient`, a service to interact with
 
 .. autoclass:: Item
 
+.. autoclass:: RosterStore
+
 .. module:: aioxmpp.roster.xso
 
 .. currentmodule:: aioxmpp.roster.xso
@@ -65,4 +67,5 @@ versioning:
 """
 
 from .service import RosterClient, Item  # NOQA
+from .store import RosterStore  # NOQA
 Service = RosterClient  # NOQA
@@ -311,6 +311,20 @@ class RosterClient(aioxmpp.service.Service):
 
         .. versionadded:: 0.9
 
+    .. signal:: on_update_applied(version)
+
+        Fires after a roster push or the initial roster has been applied
+        completely.
+
+        :param version: The roster version after the update.
+        :type version: :class:`str` or :data:`None`
+
+        The events for the individual entries have fired before this event.
+        This is used by :class:`~aioxmpp.roster.RosterStore` to persist the
+        changes of an update as a whole.
+
+        .. versionadded:: 0.10
+
     Modifying roster contents:
 
     .. automethod:: set_entry
@@ -374,6 +388,17 @@ class RosterClient(aioxmpp.service.Service):
     services won’t delete roster contents between two connections on the same
     :class:`.Client` instance.
 
+    For large rosters, the items can be exported and imported one by one
+    instead of as a single dictionary:
+
+    .. automethod:: export_items_as_json
+
+    .. automethod:: import_items_from_json
+
+    :class:`~aioxmpp.roster.RosterStore` builds on these methods and on
+    :meth:`on_update_applied` to keep the roster on disk, writing only the
+    changes of each update.
+
     .. versionchanged:: 0.8
 
        This class was formerly known as :class:`aioxmpp.roster.Service`. It
@@ -396,6 +421,8 @@ class RosterClient(aioxmpp.service.Service):
     on_group_added = callbacks.Signal()
     on_group_removed = callbacks.Signal()
 
+    on_update_applied = callbacks.Signal()
+
     on_subscribed = callbacks.Signal()
     on_subscribe = callbacks.Signal()
     on_unsubscribed = callbacks.Signal()
@@ -493,6 +520,7 @@ class RosterClient(aioxmpp.service.Service):
                     self._update_entry(item)
 
             self.version = request.ver
+            self.on_update_applied(self.version)
 
     @aioxmpp.dispatcher.presence_handler(
         aioxmpp.structs.PresenceType.SUBSCRIBE,
@@ -570,6 +598,7 @@ class RosterClient(aioxmpp.service.Service):
             for item in response.items:
                 self._update_entry(item)
 
+            self.on_update_applied(self.version)
             self.on_initial_roster_received()
             return True
 
@@ -579,13 +608,26 @@ class RosterClient(aioxmpp.service.Service):
         JSON-compatible dictionary and return that dictionary.
         """
         return {
-            "items": {
-                str(jid): item.export_as_json()
-                for jid, item in self.items.items()
-            },
+            "items": dict(self.export_items_as_json()),
             "ver": self.version
         }
 
+    def export_items_as_json(self):
+        """
+        Export the roster items one by one.
+
+        :return: Iterator over pairs of the stringified JID and the
+            JSON-compatible dictionary of each item (see
+            :meth:`Item.export_as_json`).
+
+        The iterator must be consumed before the roster changes; the roster
+        version can be obtained from :attr:`version`.
+
+        .. versionadded:: 0.10
+        """
+        for jid, item in self.items.items():
+            yield str(jid), item.export_as_json()
+
     def import_from_json(self, data):
         """
         Replace the current roster with the :meth:`export_as_json`-compatible
@@ -598,11 +640,32 @@ class RosterClient(aioxmpp.service.Service):
         be used for roster versioning. See below (in the docs of
         :class:`Service`).
         """
-        self.version = data.get("ver", None)
+        self.import_items_from_json(
+            data.get("items", {}).items(),
+            data.get("ver", None),
+        )
+
+    def import_items_from_json(self, items, version):
+        """
+        Replace the current roster with the given items.
+
+        :param items: The items to import.
+        :type items: iterable of pairs as returned by
+            :meth:`export_items_as_json`
+        :param version: The roster version.
+        :type version: :class:`str` or :data:`None`
+
+        This works like :meth:`import_from_json`, but `items` is consumed
+        lazily, so that it can be read from a file without holding the
+        whole exported roster in memory.
+
+        .. versionadded:: 0.10
+        """
+        self.version = version
 
         self.items.clear()
         self.groups.clear()
-        for jid, data in data.get("items", {}).items():
+        for jid, data in items:
             jid = structs.JID.fromstr(jid)
             item = Item(jid)
             item.update_from_json(data)
@@ -0,0 +1,296 @@
+########################################################################
+# File name: store.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import json
+import logging
+import os
+import tempfile
+
+import aioxmpp.utils
+
+
+logger = logging.getLogger(__name__)
+
+
+class RosterStore:
+    """
+    Append-only on-disk storage for the contents of a
+    :class:`~aioxmpp.RosterClient`.
+
+    :param path: Path to the file holding the roster.
+    :type path: :class:`pathlib.Path`
+
+    .. versionadded:: 0.10
+
+    The file contains one JSON object per line. After the roster has been
+    loaded with :meth:`load`, :meth:`attach` connects the store to the
+    roster, and each roster update (a roster push or the initial roster
+    received on connect) is appended to the file. Only the entries changed by
+    the update are written, together with the new roster version. This way,
+    roster versioning only needs to transfer the difference on reconnect and
+    the file is never rewritten as a whole during normal operation.
+
+    The changes of an update only take effect when the whole update has been
+    written, so an interrupted write leaves the file in the state before the
+    update. If writing an update fails, the error is logged and the changed
+    entries are written again with the next update.
+
+    As the file grows with each update, it should be compacted from time to
+    time with :meth:`compact`, for example when the client is shut down.
+
+    .. automethod:: load
+
+    .. automethod:: attach
+
+    .. automethod:: detach
+
+    .. automethod:: compact
+
+    .. automethod:: close
+
+    .. note::
+
+       All methods block while accessing the file. The amount of data written
+       per update is proportional to the size of the update only.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._path = path
+        self._writer = None
+        self._roster = None
+        self._tokens = []
+        self._dirty = set()
+
+    @property
+    def path(self):
+        """
+        The path of the file holding the roster.
+        """
+        return self._path
+
+    def _read(self):
+        items = {}
+        version = None
+        pending = []
+
+        try:
+            f = self._path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return None, items
+
+        with f:
+            for lineno, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # an interrupted write; the update it belongs to has not
+                    # been committed and must be discarded
+                    logger.warning(
+                        "discarding incomplete update in %s (line %d)",
+                        self._path, lineno,
+                    )
+                    pending.clear()
+                    continue
+
+                if "jid" in record:
+                    pending.append(record)
+                    continue
+
+                for change in pending:
+                    try:
+                        items[change["jid"]] = change["item"]
+                    except KeyError:
+                        items.pop(change["jid"], None)
+                pending.clear()
+                version = record.get("ver")
+
+        if pending:
+            logger.warning("discarding uncommitted update in %s", self._path)
+
+        return version, items
+
+    def load(self, roster):
+        """
+        Replace the contents of `roster` with the roster stored in the file.
+
+        :param roster: The roster to load the data into.
+        :type roster: :class:`~aioxmpp.RosterClient`
+
+        If the file does not exist, the roster is emptied. Like
+        :meth:`~aioxmpp.RosterClient.import_from_json`, this does not emit
+        any events on the roster and must be called before the client
+        connects.
+        """
+        version, items = self._read()
+        roster.import_items_from_json(items.items(), version)
+
+    def attach(self, roster):
+        """
+        Write the updates of `roster` to the file from now on.
+
+        :param roster: The roster to track.
+        :type roster: :class:`~aioxmpp.RosterClient`
+        :raises RuntimeError: if the store is already attached to a roster
+
+        The file must contain the current contents of `roster`, which is the
+        case after :meth:`load` or :meth:`compact`.
+        """
+        if self._roster is not None:
+            raise RuntimeError("store is already attached to a roster")
+
+        self._roster = roster
+        self._tokens = [
+            (signal, signal.connect(self._entry_changed))
+            for signal in [
+                roster.on_entry_added,
+                roster.on_entry_name_changed,
+                roster.on_entry_subscription_state_changed,
+                roster.on_entry_added_to_group,
+                roster.on_entry_removed_from_group,
+                roster.on_entry_removed,
+            ]
+        ]
+        self._tokens.append((
+            roster.on_update_applied,
+            roster.on_update_applied.connect(self._update_applied),
+        ))
+
+    def detach(self):
+        """
+        Stop writing the updates of the roster to the file.
+
+        Changes of an update which has not been applied completely are
+        discarded. Detaching a store which is not attached has no effect.
+        """
+        for signal, token in self._tokens:
+            signal.disconnect(token)
+        self._tokens.clear()
+        self._dirty.clear()
+        self._roster = None
+
+    def _entry_changed(self, item, *args):
+        self._dirty.add(item.jid)
+
+    def _ends_with_newline(self):
+        try:
+            with self._path.open("rb") as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    def _get_writer(self):
+        if self._writer is None:
+            aioxmpp.utils.mkdir_exist_ok(self._path.parent)
+            # terminate a line left over by an interrupted write, so that it
+            # does not swallow the next record
+            needs_newline = not self._ends_with_newline()
+            self._writer = self._path.open("a", encoding="utf-8")
+            if needs_newline:
+                self._writer.write("\n")
+        return self._writer
+
+    def _update_applied(self, version):
+        items = self._roster.items
+        lines = []
+        for jid in self._dirty:
+            record = {"jid": str(jid)}
+            try:
+                item = items[jid]
+            except KeyError:
+                pass
+            else:
+                record["item"] = item.export_as_json()
+            lines.append(json.dumps(record))
+        lines.append(json.dumps({"ver": version}))
+
+        try:
+            writer = self._get_writer()
+            writer.write("\n".join(lines))
+            writer.write("\n")
+            writer.flush()
+        except OSError:
+            # keep the changed entries, so that the next update writes them
+            # again; raising would disconnect the store from the roster
+            logger.exception(
+                "failed to write roster update to %s",
+                self._path,
+            )
+            self._discard_writer()
+            return
+
+        self._dirty.clear()
+
+    def _discard_writer(self):
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+        except OSError:
+            pass
+        self._writer = None
+
+    def compact(self, roster=None):
+        """
+        Rewrite the file so that it only contains the current contents of the
+        roster.
+
+        :param roster: The roster to write; defaults to the attached roster.
+        :type roster: :class:`~aioxmpp.RosterClient`
+        :raises RuntimeError: if no `roster` is given and the store is not
+            attached
+
+        The file is replaced atomically.
+        """
+        if roster is None:
+            roster = self._roster
+            if roster is None:
+                raise RuntimeError("store is not attached to a roster")
+
+        self.close()
+        aioxmpp.utils.mkdir_exist_ok(self._path.parent)
+        with tempfile.NamedTemporaryFile(mode="w",
+                                         encoding="utf-8",
+                                         dir=str(self._path.parent),
+                                         delete=False) as tmpf:
+            try:
+                for jid, data in roster.export_items_as_json():
+                    tmpf.write(json.dumps({"jid": jid, "item": data}))
+                    tmpf.write("\n")
+                tmpf.write(json.dumps({"ver": roster.version}))
+                tmpf.write("\n")
+            except:  # NOQA
+                os.unlink(tmpf.name)
+                raise
+        os.replace(tmpf.name, str(self._path))
+
+    def close(self):
+        """
+        Close the file.
+
+        It is reopened automatically when the next update is written.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
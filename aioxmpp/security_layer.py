@@ -40,6 +40,8 @@ for example using :class:`aioxmpp.Client`.
 
 .. autoclass:: SecurityLayer(ssl_context_factory, certificate_verifier_factory, tls_required, sasl_providers)
 
+.. autoclass:: TLSSessionCache
+
 .. autofunction:: negotiate_sasl
 
 Certificate verifiers
@@ -89,6 +91,8 @@ instances of the following classes can be used:
 
 .. autoclass:: PasswordSASLProvider
 
+.. autoclass:: SCRAMKeyCache
+
 .. autoclass:: AnonymousSASLProvider
 
 .. note::
@@ -119,8 +123,16 @@ import base64
 import collections
 import enum
 import functools
+import hashlib
+import hmac
 import logging
+import os
 import ssl
+import sys
+import time
+import weakref
+
+from datetime import timedelta
 
 import pyasn1
 import pyasn1.codec.der.decoder
@@ -132,6 +144,7 @@ import OpenSSL.SSL
 import aiosasl
 
 from . import errors, sasl, nonza, xso, protocol
+from .cache import LRUDict
 from .utils import namespaces
 
 
@@ -719,6 +732,315 @@ class ErrorRecordingVerifier(CertificateVerifier):
                     ", ".join(map(str, self._errors))))
 
 
+class TLSSessionCache:
+    """
+    Cache for TLS sessions, to resume them on later connections.
+
+    :param maxsize: Maximum number of cached sessions.
+    :type maxsize: :class:`int`
+    :param max_age: Time after which a cached session is not offered anymore.
+    :type max_age: :class:`datetime.timedelta`
+
+    Sessions are keyed by the domain and the host of the connection and by the
+    verification policy of the certificate verifier (its class and, for the
+    verifiers with hooks, the hooks or the pin store). A session is thus only
+    resumed by a connection which would have accepted the certificate of the
+    server, too. Sessions of connections without certificate verification (see
+    the `no_verify` argument of :func:`make`) are never stored.
+
+    When a TLS handshake starts, the cached session for the key (if any) is
+    offered to the server. If the server accepts it, the handshake is
+    abbreviated: the key exchange and the transmission and verification of the
+    certificate chain are skipped. If it does not, a full handshake takes
+    place.
+
+    A session is only stored after the certificate verifier accepted the
+    connection (see :meth:`CertificateVerifier.post_handshake`). With TLS 1.3,
+    the session tickets sent by the server after the handshake are stored as
+    they arrive.
+
+    To use the cache, pass it as `tls_session_cache` to :func:`make` or wrap
+    the `certificate_verifier_factory` of a :class:`SecurityLayer` using
+    :meth:`wrap_verifier_factory`.
+
+    .. note::
+
+       The verifiers created by the cache install their own info callback on
+       the :class:`OpenSSL.SSL.Context` (see
+       :meth:`OpenSSL.SSL.Context.set_info_callback`), replacing any info
+       callback set by the `ssl_context_factory`. pyOpenSSL offers no way to
+       retrieve the previous callback to chain to it.
+
+    .. versionadded:: 0.10
+
+    .. autoattribute:: maxsize
+
+    .. attribute:: max_age
+
+       The `max_age` passed to the constructor.
+
+    .. automethod:: wrap_verifier_factory
+
+    .. automethod:: wrap_verifier
+
+    .. automethod:: clear
+
+    Statistics:
+
+    .. attribute:: hits
+
+       Number of handshakes in which a cached session was offered. The server
+       may still decline to resume the session.
+
+    .. attribute:: misses
+
+       Number of handshakes for which no session was cached.
+
+    .. attribute:: stores
+
+       Number of sessions stored in the cache.
+
+    .. autoattribute:: hit_rate
+
+    .. automethod:: reset_counters
+    """
+
+    def __init__(self, *,
+                 maxsize=1024,
+                 max_age=timedelta(hours=2)):
+        super().__init__()
+        self._entries = LRUDict()
+        self._entries.maxsize = maxsize
+        self.max_age = max_age
+        self.reset_counters()
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of cached sessions. Changing this property purges the
+        least recently used sessions immediately.
+        """
+        return self._entries.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._entries.maxsize = value
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of the handshakes in which a cached session was offered, or
+        :data:`None` if no handshakes were made since the counters were reset.
+        """
+        nlookups = self.hits + self.misses
+        if not nlookups:
+            return None
+        return self.hits / nlookups
+
+    def reset_counters(self):
+        """
+        Reset all statistics counters to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def clear(self):
+        """
+        Remove all cached sessions.
+        """
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        try:
+            session, stored = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if time.monotonic() - stored > self.max_age.total_seconds():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return session
+
+    def _store(self, key, session):
+        self._entries[key] = session, time.monotonic()
+        self.stores += 1
+
+    def wrap_verifier(self, verifier, domain, host):
+        """
+        Return a :class:`CertificateVerifier` which resumes sessions from this
+        cache.
+
+        :param verifier: The verifier to wrap.
+        :type verifier: :class:`CertificateVerifier`
+        :param domain: The domain of the connection.
+        :type domain: :class:`str`
+        :param host: The host name of the connection.
+        :type host: :class:`str`
+
+        The returned verifier delegates to `verifier` and additionally offers
+        the cached session for `domain`, `host` and the verification policy of
+        `verifier` in the handshake. The session of the connection is stored
+        once `verifier` accepted the connection.
+
+        A verifier which does not verify the certificate at all is returned
+        unchanged.
+
+        .. seealso::
+
+           :meth:`wrap_verifier_factory`
+              takes the domain and host from the connection instead.
+        """
+        if isinstance(verifier, _NullVerifier):
+            return verifier
+        return _SessionResumingVerifier(
+            self,
+            verifier,
+            (domain, host, _verification_policy(verifier)),
+        )
+
+    def wrap_verifier_factory(self, certificate_verifier_factory):
+        """
+        Return a certificate verifier factory whose verifiers resume sessions
+        from this cache.
+
+        :param certificate_verifier_factory: The factory to wrap.
+        :return: A callable which returns a fresh :class:`CertificateVerifier`
+            on each call.
+
+        The verifiers returned by the new factory delegate to a verifier
+        created by `certificate_verifier_factory`, as
+        :meth:`wrap_verifier` does. The domain and host of the connection are
+        taken from the arguments of
+        :meth:`CertificateVerifier.pre_handshake`.
+
+        The result is suitable as
+        :attr:`SecurityLayer.certificate_verifier_factory`; :func:`make` uses
+        this method to apply its `tls_session_cache` argument.
+        """
+        def factory():
+            verifier = certificate_verifier_factory()
+            if isinstance(verifier, _NullVerifier):
+                return verifier
+            return _SessionResumingVerifier(self, verifier)
+
+        return factory
+
+
+def _hook_identity(hook):
+    # bound methods are created anew on each attribute access
+    try:
+        return hook.__self__, hook.__func__
+    except AttributeError:
+        return hook
+
+
+def _verification_policy(verifier):
+    """
+    Return a hashable value which is equal for verifiers which accept the same
+    certificates.
+    """
+    if isinstance(verifier, PinningPKIXCertificateVerifier):
+        return (
+            type(verifier),
+            _hook_identity(verifier._query_pin),
+            _hook_identity(verifier._post_handshake_deferred_failure),
+        )
+    if isinstance(verifier, HookablePKIXCertificateVerifier):
+        return (
+            type(verifier),
+            _hook_identity(verifier._quick_check),
+            _hook_identity(verifier._post_handshake_deferred_failure),
+        )
+    return type(verifier)
+
+
+class _SessionResumingVerifier(CertificateVerifier):
+    def __init__(self, cache, verifier, key=None):
+        super().__init__()
+        self._cache = cache
+        self._verifier = verifier
+        self._key = key
+        self._handshake_done = False
+        self._in_post_handshake_message = False
+        self._session = None
+        self._verified = False
+
+    @asyncio.coroutine
+    def pre_handshake(self, domain, host, port, metadata):
+        if self._key is None:
+            self._key = domain, host, _verification_policy(self._verifier)
+        yield from self._verifier.pre_handshake(domain, host, port, metadata)
+
+    def setup_context(self, ctx, transport):
+        self._verifier.setup_context(ctx, transport)
+        ctx.set_info_callback(self._info_callback)
+
+    def verify_callback(self, *args):
+        return self._verifier.verify_callback(*args)
+
+    def _store_session(self):
+        # without a key (pre_handshake was not called), the session could be
+        # offered to any other host
+        if self._key is not None:
+            self._cache._store(self._key, self._session)
+
+    def _capture_session(self, conn):
+        self._session = conn.get_session()
+        if self._verified:
+            self._store_session()
+
+    def _info_callback(self, conn, where, ret):
+        if where & OpenSSL.SSL.SSL_CB_HANDSHAKE_START:
+            if not self._handshake_done and self._key is not None:
+                session = self._cache._get(self._key)
+                if session is not None:
+                    conn.set_session(session)
+        elif where & OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE:
+            self._handshake_done = True
+            # the session established by a TLS 1.3 handshake cannot be
+            # resumed; the server sends session tickets after the handshake
+            if conn.get_protocol_version_name() != "TLSv1.3":
+                self._capture_session(conn)
+        elif self._handshake_done:
+            if where & OpenSSL.SSL.SSL_CB_CONNECT_LOOP == \
+                    OpenSSL.SSL.SSL_CB_CONNECT_LOOP:
+                self._in_post_handshake_message = True
+            elif (self._in_post_handshake_message and
+                    where & OpenSSL.SSL.SSL_CB_CONNECT_EXIT ==
+                    OpenSSL.SSL.SSL_CB_CONNECT_EXIT):
+                self._in_post_handshake_message = False
+                self._capture_session(conn)
+
+    @asyncio.coroutine
+    def post_handshake(self, transport):
+        yield from self._verifier.post_handshake(transport)
+        self._verified = True
+        if self._session is not None:
+            self._store_session()
+
+        # OpenSSL marks the session of a connection which is freed without a
+        # TLS shutdown as not resumable. This happens whenever a connection
+        # breaks, which is when resumption is most useful; TLS 1.1 and later
+        # do not require to discard the session in that case.
+        weakref.finalize(
+            transport,
+            _keep_session_resumable,
+            transport.get_extra_info("ssl_object"),
+        )
+
+
+def _keep_session_resumable(conn):
+    conn.set_shutdown(conn.get_shutdown() | OpenSSL.SSL.SENT_SHUTDOWN)
+
+
 class SASLMechanism(xso.XSO):
     TAG = (namespaces.sasl, "mechanism")
 
@@ -897,6 +1219,340 @@ class SASLProvider:
         """
 
 
+_SCRAMKeys = collections.namedtuple(
+    "_SCRAMKeys",
+    [
+        "salted_password",
+        "client_key",
+        "server_key",
+    ]
+)
+
+
+def _derive_scram_keys(hashfun_name, password, salt, iteration_count):
+    salted_password = hashlib.pbkdf2_hmac(
+        hashfun_name,
+        password,
+        salt,
+        iteration_count,
+    )
+    return _SCRAMKeys(
+        salted_password,
+        hmac.new(salted_password, b"Client Key", hashfun_name).digest(),
+        hmac.new(salted_password, b"Server Key", hashfun_name).digest(),
+    )
+
+
+class SCRAMKeyCache:
+    """
+    Cache for the keys derived from passwords during SCRAM authentication.
+
+    :param maxsize: Maximum number of cached keys.
+    :type maxsize: :class:`int`
+    :param executor: Executor to derive the keys in, or :data:`None` to
+        derive them in the event loop thread.
+    :type executor: :class:`concurrent.futures.Executor`
+
+    SCRAM (:rfc:`5802`) derives the ``SaltedPassword`` from the password
+    with PBKDF2, using the salt and iteration count sent by the server. The
+    iteration count is chosen to make this expensive. As long as the server
+    does not change the salt, the result does not change, so reconnects can
+    reuse it.
+
+    The derived keys are cached by JID, salt, iteration count and hash
+    function. In addition, they are only used if the password has not
+    changed. Keys are only stored after the server has proven that it knows
+    them, too (by sending a valid server signature), and they are removed
+    again if an authentication which uses them fails.
+
+    The derivation may be run in an `executor`. With a
+    :class:`concurrent.futures.ProcessPoolExecutor`, many accounts
+    authenticating at the same time (for example after a network outage) do
+    not block the event loop and can use multiple CPUs.
+
+    To use the cache, pass it as `scram_key_cache` to
+    :class:`PasswordSASLProvider` or :func:`make`.
+
+    .. note::
+
+       The cached keys allow to authenticate as the user, just like the
+       password itself.
+
+    .. versionadded:: 0.10
+
+    .. autoattribute:: maxsize
+
+    .. attribute:: executor
+
+       The `executor` passed to the constructor.
+
+    .. automethod:: clear
+
+    Statistics:
+
+    .. attribute:: hits
+
+       Number of authentications which used cached keys.
+
+    .. attribute:: misses
+
+       Number of authentications which had to derive the keys.
+
+    .. autoattribute:: hit_rate
+
+    .. automethod:: reset_counters
+    """
+
+    def __init__(self, *, maxsize=1024, executor=None):
+        super().__init__()
+        self._entries = LRUDict()
+        self._entries.maxsize = maxsize
+        self._secret = os.urandom(32)
+        self.executor = executor
+        self.reset_counters()
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of cached keys. Changing this property purges the
+        least recently used keys immediately.
+        """
+        return self._entries.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._entries.maxsize = value
+
+    @property
+    def hit_rate(self):
+        """
+        Fraction of the authentications which used cached keys, or
+        :data:`None` if no authentications were made since the counters were
+        reset.
+        """
+        nlookups = self.hits + self.misses
+        if not nlookups:
+            return None
+        return self.hits / nlookups
+
+    def reset_counters(self):
+        """
+        Reset all statistics counters to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Remove all cached keys.
+        """
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _password_digest(self, password):
+        return hmac.new(self._secret, password, "sha256").digest()
+
+    @asyncio.coroutine
+    def _get_keys(self, jid, hashfun_name, password, salt, iteration_count):
+        """
+        Return the cached keys or derive them.
+
+        Derived keys are not stored; use :meth:`_store_keys` once the
+        authentication has succeeded.
+        """
+        key = jid, salt, iteration_count, hashfun_name
+        try:
+            cached_digest, keys = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            if hmac.compare_digest(cached_digest,
+                                   self._password_digest(password)):
+                self.hits += 1
+                return keys
+
+        self.misses += 1
+        if self.executor is None:
+            keys = _derive_scram_keys(
+                hashfun_name,
+                password,
+                salt,
+                iteration_count,
+            )
+        else:
+            keys = yield from asyncio.get_event_loop().run_in_executor(
+                self.executor,
+                _derive_scram_keys,
+                hashfun_name,
+                password,
+                salt,
+                iteration_count,
+            )
+
+        return keys
+
+    def _store_keys(self, jid, hashfun_name, password, salt, iteration_count,
+                    keys):
+        key = jid, salt, iteration_count, hashfun_name
+        self._entries[key] = self._password_digest(password), keys
+
+    def _evict_keys(self, jid, hashfun_name, salt, iteration_count):
+        key = jid, salt, iteration_count, hashfun_name
+        self._entries.pop(key, None)
+
+
+# salted passwords prepared by _CachingSCRAM for the PBKDF2 call of aiosasl,
+# keyed by the arguments of that call; the values are pairs of the salted
+# password and the number of authentications waiting for it
+_prepared_salted_passwords = {}
+
+
+def _pbkdf2(hash_name, password, salt, iterations):
+    try:
+        salted_password, _ = _prepared_salted_passwords[
+            hash_name, password, salt, iterations
+        ]
+    except KeyError:
+        return hashlib.pbkdf2_hmac(hash_name, password, salt, iterations)
+    return salted_password
+
+
+def _install_pbkdf2_hook():
+    # aiosasl looks the function up in its module namespace on each call
+    scram_module = sys.modules[aiosasl.SCRAM.__module__]
+    if scram_module.pbkdf2 is not _pbkdf2:
+        scram_module.pbkdf2 = _pbkdf2
+
+
+class _KeyPreparingStateMachine:
+    """
+    Wrapper around a SASL state machine which calls the coroutine function
+    `prepare` with the first challenge of the server before passing it on.
+    """
+
+    def __init__(self, sm, prepare):
+        super().__init__()
+        self._sm = sm
+        self._prepare = prepare
+
+    @asyncio.coroutine
+    def initiate(self, mechanism, payload=None):
+        state, payload = yield from self._sm.initiate(mechanism, payload)
+        if state == aiosasl.SASLState.CHALLENGE and payload is not None:
+            yield from self._prepare(payload)
+        return state, payload
+
+    def __getattr__(self, name):
+        return getattr(self._sm, name)
+
+
+class _CachingSCRAM(aiosasl.SCRAM):
+    """
+    :class:`aiosasl.SCRAM` with the key derivation going through a
+    :class:`SCRAMKeyCache`.
+
+    The exchange itself is done by :class:`aiosasl.SCRAM`. When the server
+    has sent the salt and the iteration count, the keys are obtained from the
+    cache (or derived, possibly in the executor of the cache) and handed to
+    the PBKDF2 call of :mod:`aiosasl` (see :func:`_install_pbkdf2_hook`).
+    """
+
+    def __init__(self, credential_provider, key_cache, jid, **kwargs):
+        super().__init__(self._provide_credentials, **kwargs)
+        self._inner_credential_provider = credential_provider
+        self._key_cache = key_cache
+        self._jid = jid
+        self._encoded_password = None
+        self._prepared = None
+        _install_pbkdf2_hook()
+
+    @asyncio.coroutine
+    def _provide_credentials(self):
+        username, password = yield from self._inner_credential_provider()
+        self._encoded_password = aiosasl.stringprep.saslprep(
+            password
+        ).encode("utf-8")
+        return username, password
+
+    @asyncio.coroutine
+    def _prepare_keys(self, info, payload):
+        try:
+            parsed_payload = dict(self.parse_message(payload))
+            iteration_count = int(parsed_payload[b"i"])
+            salt = base64.b64decode(parsed_payload[b"s"])
+        except Exception:  # NOQA
+            # aiosasl rejects the message
+            return
+
+        if (self.enforce_minimum_iteration_count and
+                iteration_count < info.minimum_iteration_count):
+            return
+
+        keys = yield from self._key_cache._get_keys(
+            self._jid,
+            info.hashfun_name,
+            self._encoded_password,
+            salt,
+            iteration_count,
+        )
+
+        key = (info.hashfun_name, self._encoded_password, salt,
+               iteration_count)
+        _, nwaiting = _prepared_salted_passwords.get(key, (None, 0))
+        _prepared_salted_passwords[key] = keys.salted_password, nwaiting + 1
+        self._prepared = key, keys
+
+    def _release_keys(self):
+        key, _ = self._prepared
+        salted_password, nwaiting = _prepared_salted_passwords[key]
+        if nwaiting > 1:
+            _prepared_salted_passwords[key] = salted_password, nwaiting - 1
+        else:
+            del _prepared_salted_passwords[key]
+
+    @asyncio.coroutine
+    def authenticate(self, sm, token):
+        _, info = token
+        self._prepared = None
+        try:
+            yield from super().authenticate(
+                _KeyPreparingStateMachine(
+                    sm,
+                    functools.partial(self._prepare_keys, info),
+                ),
+                token,
+            )
+        except aiosasl.SASLError:
+            if self._prepared is not None:
+                # the server may have changed the credentials without
+                # changing the salt
+                (_, _, salt, iteration_count), _ = self._prepared
+                self._key_cache._evict_keys(
+                    self._jid,
+                    info.hashfun_name,
+                    salt,
+                    iteration_count,
+                )
+            raise
+        finally:
+            if self._prepared is not None:
+                self._release_keys()
+
+        if self._prepared is not None:
+            (hashfun_name, password, salt, iteration_count), keys = \
+                self._prepared
+            self._key_cache._store_keys(
+                self._jid,
+                hashfun_name,
+                password,
+                salt,
+                iteration_count,
+                keys,
+            )
+
+
 class PasswordSASLProvider(SASLProvider):
     """
     Perform password-based SASL authentication.
@@ -907,6 +1563,9 @@ class PasswordSASLProvider(SASLProvider):
     :param max_auth_attempts: Maximum number of authentication attempts with a
                               single mechansim.
     :type max_auth_attempts: positive :class:`int`
+    :param scram_key_cache: Cache for the keys derived from the password by
+                            SCRAM.
+    :type scram_key_cache: :class:`SCRAMKeyCache` or :data:`None`
 
     `password_provider` must be a coroutine taking two arguments, a JID and an
     integer number. The first argument is the JID which is trying to
@@ -921,17 +1580,29 @@ class PasswordSASLProvider(SASLProvider):
     successfully before. In any case, :class:`aiosasl.SCRAM` is used. If TLS has
     been negotiated, :class:`aiosasl.PLAIN` is also supported.
 
+    If `scram_key_cache` is not :data:`None`, SCRAM takes the keys derived
+    from the password from the cache, so that reconnects do not have to
+    repeat the expensive key derivation. See :class:`SCRAMKeyCache` for
+    details.
+
     .. seealso::
 
        :class:`SASLProvider`
           for the public interface of this class.
+
+    .. versionchanged:: 0.10
+
+       The `scram_key_cache` argument was added.
     """
 
     def __init__(self, password_provider, *,
-                 max_auth_attempts=3, **kwargs):
+                 max_auth_attempts=3,
+                 scram_key_cache=None,
+                 **kwargs):
         super().__init__(**kwargs)
         self._password_provider = password_provider
         self._max_auth_attempts = max_auth_attempts
+        self._scram_key_cache = scram_key_cache
 
     @asyncio.coroutine
     def execute(self,
@@ -975,7 +1646,15 @@ class PasswordSASLProvider(SASLProvider):
             if mechanism_class is None:
                 return False
 
-            mechanism = mechanism_class(credential_provider)
+            if (mechanism_class is aiosasl.SCRAM and
+                    self._scram_key_cache is not None):
+                mechanism = _CachingSCRAM(
+                    credential_provider,
+                    self._scram_key_cache,
+                    client_jid,
+                )
+            else:
+                mechanism = mechanism_class(credential_provider)
             last_auth_error = None
             for nattempt in range(self._max_auth_attempts):
                 try:
@@ -1318,7 +1997,9 @@ def make(
         pin_type=PinType.PUBLIC_KEY,
         post_handshake_deferred_failure=None,
         anonymous=False,
-        no_verify=False):
+        no_verify=False,
+        tls_session_cache=None,
+        scram_key_cache=None):
     """
     Construct a :class:`SecurityLayer`. Depending on the arguments passed,
     different features are enabled or disabled.
@@ -1346,6 +2027,11 @@ def make(
         **strongly discouraged** outside controlled test environments. See
         below for alternatives.
     :type no_verify: :class:`bool`
+    :param tls_session_cache: Cache to resume TLS sessions from.
+    :type tls_session_cache: :class:`TLSSessionCache` or :data:`None`
+    :param scram_key_cache: Cache for the keys derived from the password by
+        SCRAM.
+    :type scram_key_cache: :class:`SCRAMKeyCache` or :data:`None`
     :raise RuntimeError: if `anonymous` is a :class:`str` and the version of
         :mod:`aiosasl` in use does not provide :class:`aiosasl.ANONYMOUS`
     :return: A new :class:`SecurityLayer` instance configured as per the
@@ -1412,9 +2098,20 @@ def make(
     The versaility and simplicity of use of this function make (pun intended)
     it the preferred way to construct :class:`SecurityLayer` instances.
 
+    If `tls_session_cache` is given, the certificate verifier factory is
+    wrapped using :meth:`TLSSessionCache.wrap_verifier_factory`, so that the
+    connections of the security layer resume TLS sessions from the cache.
+
+    `scram_key_cache` is passed to the :class:`PasswordSASLProvider`; see
+    :class:`SCRAMKeyCache` for details.
+
     .. versionadded:: 0.8
 
        Support for SASL ANONYMOUS was added.
+
+    .. versionadded:: 0.10
+
+       The `tls_session_cache` and `scram_key_cache` arguments.
     """
 
     if isinstance(password_provider, str):
@@ -1466,9 +2163,16 @@ def make(
         sasl_providers.append(
             PasswordSASLProvider(
                 password_provider,
+                scram_key_cache=scram_key_cache,
             ),
         )
 
+    if tls_session_cache is not None:
+        certificate_verifier_factory = \
+            tls_session_cache.wrap_verifier_factory(
+                certificate_verifier_factory
+            )
+
     return SecurityLayer(
         default_ssl_context,
         certificate_verifier_factory,
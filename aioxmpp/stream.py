@@ -158,6 +158,20 @@ instances and the filters available on them.
 
 .. autofunction:: stanza_filter
 
+Outbound rate shaping
+=====================
+
+Many servers throttle the data they accept from a client (for example with
+the *shapers* of Prosody and ejabberd). A client which exceeds these limits
+will find its data piling up in the TCP buffers, up to the point where the
+dead time limits of the stream (see above) trip. To stay below the limits of
+the server, a :class:`RateShapingPolicy` can be configured on the
+:class:`StanzaStream` with :attr:`~.StanzaStream.shaping_policy`.
+
+.. autoclass:: RateShapingPolicy
+
+.. autoclass:: TokenBucket
+
 Low-level stanza tracking
 =========================
 
@@ -172,6 +186,8 @@ internal queues.
 
 .. autoclass:: StanzaState
 
+.. autoclass:: StanzaPriority
+
 Filters
 =======
 
@@ -189,6 +205,7 @@ Exceptions
 """
 
 import asyncio
+import collections
 import contextlib
 import functools
 import logging
@@ -208,6 +225,7 @@ from . import (
     protocol,
     structs,
     ping,
+    tasks,
 )
 
 from .utils import namespaces
@@ -235,6 +253,152 @@ class PingEventType(Enum):
     TIMEOUT = 2
 
 
+class TokenBucket:
+    """
+    Token bucket to limit the rate of an activity.
+
+    :param rate: Number of tokens added to the bucket per second.
+    :type rate: positive :class:`float`
+    :param burst: Capacity of the bucket.
+    :type burst: positive :class:`float`
+    :param clock: Function returning the current time in seconds; defaults
+        to :func:`time.monotonic`.
+
+    The bucket starts full. The tokens are consumed *after* the activity took
+    place, because the exact cost of an activity (such as the number of bytes
+    written) is often only known afterwards. Thus, the bucket can go into
+    debt, which is paid back before :meth:`delay` allows further activity.
+
+    .. autoattribute:: level
+
+    .. automethod:: consume
+
+    .. automethod:: delay
+
+    .. versionadded:: 0.10
+    """
+
+    __slots__ = ("rate", "burst", "_clock", "_level", "_timestamp")
+
+    def __init__(self, rate, burst, *, clock=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst <= 0:
+            raise ValueError("burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock or time.monotonic
+        self._level = burst
+        self._timestamp = self._clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._level = min(
+            self.burst,
+            self._level + (now - self._timestamp) * self.rate
+        )
+        self._timestamp = now
+
+    @property
+    def level(self):
+        """
+        The current number of tokens in the bucket. Negative if the bucket
+        is in debt.
+        """
+        self._refill()
+        return self._level
+
+    def consume(self, amount):
+        """
+        Take `amount` tokens from the bucket.
+        """
+        self._refill()
+        self._level -= amount
+
+    def delay(self, amount=0):
+        """
+        Return the time in seconds until the bucket holds at least `amount`
+        tokens (zero if it does already).
+        """
+        self._refill()
+        if self._level >= amount:
+            return 0
+        return (amount - self._level) / self.rate
+
+
+class RateShapingPolicy:
+    """
+    Limits for the rate of outgoing data of a :class:`StanzaStream`.
+
+    :param bytes_per_second: Sustained number of bytes per second to send.
+    :type bytes_per_second: positive :class:`int` or :data:`None`
+    :param byte_burst: Number of bytes which may be sent in a burst, defaults
+        to `bytes_per_second`.
+    :type byte_burst: positive :class:`int` or :data:`None`
+    :param stanzas_per_second: Sustained number of stanzas per second to send.
+    :type stanzas_per_second: positive :class:`float` or :data:`None`
+    :param stanza_burst: Number of stanzas which may be sent in a burst,
+        defaults to `stanzas_per_second` (but at least one).
+    :type stanza_burst: positive :class:`int` or :data:`None`
+
+    Each limit which is not :data:`None` is enforced with a
+    :class:`TokenBucket`. The byte limit accounts for all data sent over the
+    :class:`~.protocol.XMLStream` (see :attr:`.XMLStream.bytes_sent`),
+    including nonzas and IQ responses; the stanza limit only for stanzas taken
+    from the active queue.
+
+    While a limit is exhausted, stanzas stay in the active queue (where they
+    can still be aborted). Incoming stanzas are processed as usual.
+
+    .. versionadded:: 0.10
+
+    .. attribute:: bytes_per_second
+
+    .. attribute:: byte_burst
+
+    .. attribute:: stanzas_per_second
+
+    .. attribute:: stanza_burst
+    """
+
+    __slots__ = ("bytes_per_second", "byte_burst",
+                 "stanzas_per_second", "stanza_burst")
+
+    def __init__(self, *,
+                 bytes_per_second=None,
+                 byte_burst=None,
+                 stanzas_per_second=None,
+                 stanza_burst=None):
+        if bytes_per_second is not None and bytes_per_second <= 0:
+            raise ValueError("bytes_per_second must be positive")
+        if stanzas_per_second is not None and stanzas_per_second <= 0:
+            raise ValueError("stanzas_per_second must be positive")
+        if byte_burst is None:
+            byte_burst = bytes_per_second
+        elif byte_burst <= 0:
+            raise ValueError("byte_burst must be positive")
+        if stanza_burst is None:
+            if stanzas_per_second is not None:
+                stanza_burst = max(1, stanzas_per_second)
+        elif stanza_burst < 1:
+            raise ValueError("stanza_burst must be at least one")
+        self.bytes_per_second = bytes_per_second
+        self.byte_burst = byte_burst
+        self.stanzas_per_second = stanzas_per_second
+        self.stanza_burst = stanza_burst
+
+    def __repr__(self):
+        return ("<{}.{} bytes_per_second={!r} byte_burst={!r} "
+                "stanzas_per_second={!r} stanza_burst={!r}>").format(
+            type(self).__module__,
+            type(self).__qualname__,
+            self.bytes_per_second,
+            self.byte_burst,
+            self.stanzas_per_second,
+            self.stanza_burst,
+        )
+
+
 class DestructionRequested(ConnectionError):
     """
     Subclass of :class:`ConnectionError` indicating that the destruction of the
@@ -311,6 +475,50 @@ class StanzaState(Enum):
     FAILED = 7
 
 
+class StanzaPriority(Enum):
+    """
+    Priority classes for outgoing stanzas.
+
+    The :class:`StanzaStream` keeps a queue per class and serves the classes
+    in proportion to their weights (see
+    :meth:`StanzaStream.set_priority_weight`) while more than one class has
+    stanzas waiting. Thus, a large amount of :attr:`BULK` stanzas does not
+    delay the other classes arbitrarily, while the :attr:`BULK` class still
+    makes progress when the other classes are busy.
+
+    The order of stanzas is only preserved within a class. Stanzas which are
+    enqueued without an explicit priority all go to :attr:`INTERACTIVE`, so
+    they are sent in the order they were enqueued.
+
+    .. attribute:: CONTROL
+
+       Stanzas which keep the stream and the protocol going, such as pings.
+       The pings sent by the stream to detect dead connections use this
+       class.
+
+       Default weight: 16
+
+    .. attribute:: INTERACTIVE
+
+       Stanzas which a user is waiting for. This is the default for all
+       stanzas.
+
+       Default weight: 4
+
+    .. attribute:: BULK
+
+       Stanzas which are sent in large amounts and are not latency-critical,
+       for example when importing a roster or publishing many items.
+
+       Default weight: 1
+
+    .. versionadded:: 0.10
+    """
+    CONTROL = 0
+    INTERACTIVE = 1
+    BULK = 2
+
+
 class StanzaErrorAwareListener:
     def __init__(self, forward_to):
         self._forward_to = forward_to
@@ -510,6 +718,41 @@ class StanzaStream:
 
     .. automethod:: flush_incoming
 
+    Broker configuration:
+
+    .. autoattribute:: incoming_batch_size
+
+    .. autoattribute:: outgoing_batch_size
+
+    Limiting IQ request handlers:
+
+    .. autoattribute:: max_iq_request_tasks
+
+    .. autoattribute:: iq_request_queue_limit
+
+    .. automethod:: set_iq_request_limit
+
+    .. automethod:: get_iq_request_limit
+
+    Outbound rate shaping (see
+    :ref:`aioxmpp.stream.Outbound rate shaping`):
+
+    .. autoattribute:: shaping_policy
+
+    Priorities of outgoing stanzas (see :class:`StanzaPriority`):
+
+    .. automethod:: get_priority_weight
+
+    .. automethod:: set_priority_weight
+
+    Stream Management acknowledgement requests:
+
+    .. autoattribute:: sm_ack_request_count
+
+    .. autoattribute:: sm_ack_request_interval
+
+    .. autoattribute:: sm_ack_max_unacked
+
     Timeout configuration (see
     :ref:`aioxmpp.stream.General Information.Timeouts`):
 
@@ -781,15 +1024,49 @@ class StanzaStream:
 
         self._local_jid = local_jid
 
-        self._active_queue = custom_queue.AsyncDeque(loop=self._loop)
-        self._incoming_queue = custom_queue.AsyncDeque(loop=self._loop)
+        # set whenever a stanza is put into one of the queues, to wake up the
+        # broker task
+        self._broker_wakeup = asyncio.Event(loop=self._loop)
+        self._active_queue = custom_queue.WeightedFairQueue(
+            {
+                StanzaPriority.CONTROL: 16,
+                StanzaPriority.INTERACTIVE: 4,
+                StanzaPriority.BULK: 1,
+            },
+            loop=self._loop,
+            notify=self._broker_wakeup,
+        )
+        self._incoming_queue = custom_queue.AsyncDeque(
+            loop=self._loop,
+            notify=self._broker_wakeup,
+        )
+        self._incoming_batch_size = 64
+        self._outgoing_batch_size = 64
+
+        self._shaping_policy = None
+        self._byte_bucket = None
+        self._stanza_bucket = None
+        # value of XMLStream.bytes_sent at the last accounting
+        self._bytes_accounted = 0
+
+        self._sm_ack_request_count = 1
+        self._sm_ack_request_interval = None
+        self._sm_ack_max_unacked = None
+        self._sm_ack_timer = None
 
         self._iq_response_map = callbacks.TagDispatcher()
         self._iq_request_map = {}
 
-        # list of running IQ request coroutines: used to cancel them when the
+        # set of running IQ request coroutines: used to cancel them when the
         # stream is destroyed
-        self._iq_request_tasks = []
+        self._iq_request_tasks = set()
+        # enforces the limits on concurrently running IQ request coroutines;
+        # the group key is the payload class
+        self._iq_request_pool = tasks.TaskPool(logger=self._logger)
+        # requests which could not be started due to the limits, per payload
+        # class
+        self._iq_request_backlog = collections.OrderedDict()
+        self._iq_request_queue_limit = 128
 
         self._xmlstream_exception = None
 
@@ -868,6 +1145,282 @@ class StanzaStream:
         self._soft_timeout = value
         self._update_xmlstream_limits()
 
+    @property
+    def incoming_batch_size(self):
+        """
+        Maximum number of received stanzas which are processed in one turn of
+        the broker task.
+
+        The broker task processes up to :attr:`outgoing_batch_size` outgoing
+        and up to :attr:`incoming_batch_size` incoming stanzas before it
+        yields to the event loop. The ratio of the two sizes controls how the
+        broker divides its time between the two directions when both queues
+        are busy (for example when the stream is flooded with stanzas).
+
+        Must be a positive integer; defaults to 64.
+
+        .. versionadded:: 0.10
+        """
+        return self._incoming_batch_size
+
+    @incoming_batch_size.setter
+    def incoming_batch_size(self, value):
+        if value < 1:
+            raise ValueError("batch size must be positive")
+        self._incoming_batch_size = value
+
+    @property
+    def outgoing_batch_size(self):
+        """
+        Maximum number of enqueued stanzas which are sent in one turn of the
+        broker task.
+
+        If stream management is enabled, an acknowledgement is requested after
+        each batch. See :attr:`incoming_batch_size` for details.
+
+        Must be a positive integer; defaults to 64.
+
+        .. versionadded:: 0.10
+        """
+        return self._outgoing_batch_size
+
+    @outgoing_batch_size.setter
+    def outgoing_batch_size(self, value):
+        if value < 1:
+            raise ValueError("batch size must be positive")
+        self._outgoing_batch_size = value
+
+    @property
+    def shaping_policy(self):
+        """
+        The :class:`RateShapingPolicy` which limits the rate of outgoing data,
+        or :data:`None` (the default) to send as fast as possible.
+
+        Setting the policy resets the token buckets to their burst size.
+
+        .. versionadded:: 0.10
+        """
+        return self._shaping_policy
+
+    @shaping_policy.setter
+    def shaping_policy(self, value):
+        self._shaping_policy = value
+        self._byte_bucket = None
+        self._stanza_bucket = None
+        if value is not None:
+            if value.bytes_per_second is not None:
+                self._byte_bucket = TokenBucket(
+                    value.bytes_per_second,
+                    value.byte_burst,
+                )
+            if value.stanzas_per_second is not None:
+                self._stanza_bucket = TokenBucket(
+                    value.stanzas_per_second,
+                    value.stanza_burst,
+                )
+        if self._byte_bucket is not None and self._xmlstream is not None:
+            self._bytes_accounted = self._xmlstream.bytes_sent
+        # the broker may be waiting for the old buckets to refill
+        self._broker_wakeup.set()
+
+    def _shaping_delay(self):
+        """
+        Return the time in seconds until the next stanza may be sent according
+        to the :attr:`shaping_policy`.
+        """
+        delay = 0
+        if self._byte_bucket is not None:
+            delay = self._byte_bucket.delay()
+        if self._stanza_bucket is not None:
+            delay = max(delay, self._stanza_bucket.delay(1))
+        return delay
+
+    def _shaping_account(self, xmlstream, nstanzas):
+        """
+        Charge the bytes written to `xmlstream` since the last call and
+        `nstanzas` stanzas to the token buckets.
+        """
+        if self._byte_bucket is not None:
+            bytes_sent = xmlstream.bytes_sent
+            self._byte_bucket.consume(bytes_sent - self._bytes_accounted)
+            self._bytes_accounted = bytes_sent
+        if self._stanza_bucket is not None and nstanzas:
+            self._stanza_bucket.consume(nstanzas)
+
+    def get_priority_weight(self, priority):
+        """
+        Return the weight of the :class:`StanzaPriority` `priority`.
+
+        .. versionadded:: 0.10
+        """
+        return self._active_queue.get_weight(priority)
+
+    def set_priority_weight(self, priority, weight):
+        """
+        Set the weight of the :class:`StanzaPriority` `priority`.
+
+        :param priority: The priority class to modify.
+        :type priority: :class:`StanzaPriority`
+        :param weight: The new weight.
+        :type weight: positive :class:`int`
+        :raises ValueError: if `weight` is not positive
+
+        While stanzas of multiple priority classes are waiting to be sent,
+        each class gets a share of the sent stanzas proportional to its
+        weight.
+
+        .. versionadded:: 0.10
+        """
+        self._active_queue.set_weight(priority, weight)
+
+    @property
+    def sm_ack_request_count(self):
+        """
+        Number of stanzas to send before an acknowledgement is requested.
+
+        With stream management enabled, the stream requests an acknowledgement
+        (``<r/>``) from the peer once this many stanzas have been sent since
+        the last request. Outstanding requests are also sent:
+
+        * when the number of unacknowledged stanzas reaches
+          :attr:`sm_ack_max_unacked`,
+        * after :attr:`sm_ack_request_interval` has passed since the first
+          stanza was sent without a request or, if no interval is set, as soon
+          as no more stanzas are waiting to be sent, and
+        * together with our own acknowledgements, when the peer requests one.
+
+        The default of 1 requests an acknowledgement after each batch of sent
+        stanzas (see :attr:`outgoing_batch_size`). Higher values, together
+        with an :attr:`sm_ack_request_interval`, reduce the overhead on the
+        wire for clients which send many stanzas in short succession.
+
+        Must be a positive integer.
+
+        .. versionadded:: 0.10
+        """
+        return self._sm_ack_request_count
+
+    @sm_ack_request_count.setter
+    def sm_ack_request_count(self, value):
+        if value < 1:
+            raise ValueError("ack request count must be positive")
+        self._sm_ack_request_count = value
+
+    @property
+    def sm_ack_request_interval(self):
+        """
+        Maximum delay between sending a stanza and requesting an
+        acknowledgement for it, as :class:`datetime.timedelta`, or
+        :data:`None`.
+
+        See :attr:`sm_ack_request_count` for details. Defaults to
+        :data:`None`.
+
+        .. versionadded:: 0.10
+        """
+        return self._sm_ack_request_interval
+
+    @sm_ack_request_interval.setter
+    def sm_ack_request_interval(self, value):
+        if value is not None and value <= timedelta(0):
+            raise ValueError("ack request interval must be positive")
+        self._sm_ack_request_interval = value
+
+    @property
+    def sm_ack_max_unacked(self):
+        """
+        Number of unacknowledged stanzas at which an acknowledgement is
+        requested immediately, or :data:`None`.
+
+        This bounds the amount of stanzas which need to be retransmitted when
+        the stream is resumed. See :attr:`sm_ack_request_count` for details.
+        Defaults to :data:`None`.
+
+        .. versionadded:: 0.10
+        """
+        return self._sm_ack_max_unacked
+
+    @sm_ack_max_unacked.setter
+    def sm_ack_max_unacked(self, value):
+        if value is not None and value < 1:
+            raise ValueError("unacked stanza limit must be positive")
+        self._sm_ack_max_unacked = value
+
+    @property
+    def max_iq_request_tasks(self):
+        """
+        Maximum number of IQ request handlers which may run concurrently, or
+        :data:`None` for no limit.
+
+        Requests which arrive while the limit (or the limit of their payload
+        class, see :meth:`set_iq_request_limit`) is exhausted are queued. See
+        :attr:`iq_request_queue_limit` for what happens when the queue is
+        full.
+
+        Defaults to :data:`None`.
+
+        .. versionadded:: 0.10
+        """
+        return self._iq_request_pool.get_limit(())
+
+    @max_iq_request_tasks.setter
+    def max_iq_request_tasks(self, value):
+        self._iq_request_pool.set_limit((), value)
+        self._start_queued_iq_requests()
+
+    @property
+    def iq_request_queue_limit(self):
+        """
+        Maximum number of IQ requests per payload class which are queued while
+        the handler limits are exhausted.
+
+        If a request arrives while the queue for its payload class is full, it
+        is replied to with a ``resource-constraint`` error of type
+        :attr:`~.ErrorType.WAIT`, telling the peer to retry later. With a value
+        of zero, no requests are queued at all.
+
+        Must be a non-negative integer; defaults to 128.
+
+        .. versionadded:: 0.10
+        """
+        return self._iq_request_queue_limit
+
+    @iq_request_queue_limit.setter
+    def iq_request_queue_limit(self, value):
+        if value < 0:
+            raise ValueError("queue limit must be non-negative")
+        self._iq_request_queue_limit = value
+
+    def set_iq_request_limit(self, payload_cls, limit):
+        """
+        Limit the number of concurrently running IQ request handlers for a
+        payload class.
+
+        :param payload_cls: Payload class to limit
+        :type payload_cls: :class:`~.XMLStreamClass`
+        :param limit: Maximum number of concurrent handlers or :data:`None`
+                      to remove the limit.
+        :type limit: non-negative :class:`int` or :data:`None`
+        :raises ValueError: if `limit` is negative
+
+        The limit applies to all request handlers for `payload_cls`,
+        independent of the IQ type. Requests exceeding the limit are queued,
+        see :attr:`iq_request_queue_limit`.
+
+        .. versionadded:: 0.10
+        """
+        self._iq_request_pool.set_limit(payload_cls, limit)
+        self._start_queued_iq_requests()
+
+    def get_iq_request_limit(self, payload_cls):
+        """
+        Return the limit set with :meth:`set_iq_request_limit` for
+        `payload_cls`, or :data:`None` if no limit is set.
+
+        .. versionadded:: 0.10
+        """
+        return self._iq_request_pool.get_limit(payload_cls)
+
     def _coerce_enum(self, value, enum_class):
         if not isinstance(value, enum_class):
             if self._ALLOW_ENUM_COERCION:
@@ -915,6 +1468,8 @@ class StanzaStream:
         """
         self._logger.debug("destroying stream state (exc=%r)", exc)
         self._iq_response_map.close_all(exc)
+        # requests which have not been started yet are dropped
+        self._iq_request_backlog.clear()
         for task in self._iq_request_tasks:
             # we don’t need to remove, that’s handled by their
             # add_done_callback
@@ -935,7 +1490,8 @@ class StanzaStream:
 
         Compose a response and send that response.
         """
-        self._iq_request_tasks.remove(task)
+        self._iq_request_tasks.discard(task)
+        self._start_queued_iq_requests()
         try:
             payload = task.result()
         except errors.XMPPError as err:
@@ -1001,19 +1557,70 @@ class StanzaStream:
                 self._enqueue(response)
                 return
 
-            try:
-                awaitable = coro(stanza_obj)
-            except Exception as exc:
-                awaitable = asyncio.Future()
-                awaitable.set_exception(exc)
-
-            task = asyncio.ensure_future(awaitable)
-            task.add_done_callback(
-                functools.partial(
-                    self._iq_request_coro_done,
-                    stanza_obj))
-            self._iq_request_tasks.append(task)
-            self._logger.debug("started task to handle request: %r", task)
+            payload_cls = type(stanza_obj.payload)
+            backlog = self._iq_request_backlog.get(payload_cls)
+            if (backlog is None and
+                    self._iq_request_pool.has_capacity({payload_cls})):
+                self._start_iq_request(stanza_obj, coro)
+                return
+
+            if backlog is None:
+                backlog = collections.deque()
+                self._iq_request_backlog[payload_cls] = backlog
+
+            if len(backlog) >= self._iq_request_queue_limit:
+                self._logger.warning(
+                    "too many pending IQ requests, rejecting: from=%r, "
+                    "type_=%r, payload=%r",
+                    stanza_obj.from_,
+                    stanza_obj.type_,
+                    stanza_obj.payload
+                )
+                if not backlog:
+                    del self._iq_request_backlog[payload_cls]
+                response = stanza_obj.make_reply(type_=structs.IQType.ERROR)
+                response.error = stanza.Error(
+                    condition=errors.ErrorCondition.RESOURCE_CONSTRAINT,
+                    type_=structs.ErrorType.WAIT,
+                )
+                self._enqueue(response)
+                return
+
+            self._logger.debug("queued IQ request: %r", stanza_obj)
+            backlog.append((stanza_obj, coro))
+
+    def _start_iq_request(self, stanza_obj, coro):
+        """
+        Start the IQ request handler `coro` for the request `stanza_obj` in the
+        task pool.
+        """
+        try:
+            awaitable = coro(stanza_obj)
+        except Exception as exc:
+            awaitable = asyncio.Future()
+            awaitable.set_exception(exc)
+
+        task = self._iq_request_pool.add(
+            {type(stanza_obj.payload)},
+            awaitable,
+        )
+        task.add_done_callback(
+            functools.partial(
+                self._iq_request_coro_done,
+                stanza_obj))
+        self._iq_request_tasks.add(task)
+        self._logger.debug("started task to handle request: %r", task)
+
+    def _start_queued_iq_requests(self):
+        """
+        Start queued IQ requests for as long as the limits allow.
+        """
+        for payload_cls, backlog in list(self._iq_request_backlog.items()):
+            while backlog and self._iq_request_pool.has_capacity(
+                    {payload_cls}):
+                self._start_iq_request(*backlog.popleft())
+            if not backlog:
+                del self._iq_request_backlog[payload_cls]
 
     def _process_incoming_message(self, stanza_obj):
         """
@@ -1129,6 +1736,9 @@ class StanzaStream:
             response.counter = self._sm_inbound_ctr
             self._logger.debug("sending SM ack: %r", response)
             xmlstream.send_xso(response)
+            if self._sm_unrequested:
+                # piggyback our own request on the response
+                self._sm_request_ack(xmlstream)
             return
 
         # raise if it is not a stanza
@@ -1220,20 +1830,25 @@ class StanzaStream:
         if self._sm_enabled:
             token._set_state(StanzaState.SENT)
             self._sm_unacked_list.append(token)
+            self._sm_unrequested += 1
         else:
             token._set_state(StanzaState.SENT_WITHOUT_SM)
 
     def _process_outgoing(self, xmlstream, token):
         """
-        Process the current outgoing stanza `token` and also any other outgoing
-        stanza which is currently in the active queue. After all stanzas have
-        been processed, use :meth:`_send_ping` to allow an opportunistic ping
-        to be sent.
+        Process the current outgoing stanza `token` and also other outgoing
+        stanzas which are currently in the active queue, up to a total of
+        :attr:`outgoing_batch_size`. If stream management is enabled, request
+        an acknowledgement afterwards if the ack request policy says so.
         """
 
+        if self._shaping_policy is not None:
+            self._process_outgoing_shaped(xmlstream, token)
+            return
+
         self._send_stanza(xmlstream, token)
         # try to send a bulk
-        while True:
+        for _ in range(self._outgoing_batch_size - 1):
             try:
                 token = self._active_queue.get_nowait()
             except asyncio.QueueEmpty:
@@ -1241,8 +1856,81 @@ class StanzaStream:
             self._send_stanza(xmlstream, token)
 
         if self._sm_enabled:
-            self._logger.debug("sending SM req")
-            xmlstream.send_xso(nonza.SMRequest())
+            self._sm_schedule_ack_request(xmlstream)
+
+    def _process_outgoing_shaped(self, xmlstream, token):
+        """
+        Version of :meth:`_process_outgoing` which honours the
+        :attr:`shaping_policy`. The caller has to ensure that the first
+        stanza may be sent.
+        """
+        for i in range(self._outgoing_batch_size):
+            if i > 0:
+                if self._shaping_delay() > 0:
+                    break
+                try:
+                    token = self._active_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            sent = token.state == StanzaState.ACTIVE
+            self._send_stanza(xmlstream, token)
+            self._shaping_account(xmlstream, int(sent))
+
+        if self._sm_enabled:
+            self._sm_schedule_ack_request(xmlstream)
+            self._shaping_account(xmlstream, 0)
+
+    def _sm_request_ack(self, xmlstream):
+        """
+        Send an SM ack request and reset the ack request policy state.
+        """
+        self._sm_cancel_ack_timer()
+        self._sm_unrequested = 0
+        self._logger.debug("sending SM req")
+        xmlstream.send_xso(nonza.SMRequest())
+
+    def _sm_schedule_ack_request(self, xmlstream):
+        """
+        Apply the ack request policy after stanzas have been sent: either send
+        an SM ack request right away or make sure that one is sent later.
+        """
+        if not self._sm_unrequested:
+            return
+
+        if (self._sm_unrequested >= self._sm_ack_request_count or
+                (self._sm_ack_max_unacked is not None and
+                 len(self._sm_unacked_list) >= self._sm_ack_max_unacked)):
+            self._sm_request_ack(xmlstream)
+            return
+
+        if (self._sm_ack_request_interval is not None and
+                self._sm_ack_timer is None):
+            self._sm_ack_timer = self._loop.call_later(
+                self._sm_ack_request_interval.total_seconds(),
+                self._sm_ack_timer_fired,
+            )
+
+    def _sm_flush_on_idle(self, xmlstream):
+        """
+        Called by the broker when the active queue has run empty. Without an
+        :attr:`sm_ack_request_interval`, outstanding ack requests are sent now.
+        """
+        if (self._sm_unrequested and
+                self._sm_ack_request_interval is None):
+            self._sm_request_ack(xmlstream)
+
+    def _sm_ack_timer_fired(self):
+        self._sm_ack_timer = None
+        if (not self._sm_enabled or
+                self._xmlstream is None or
+                not self._sm_unrequested):
+            return
+        self._sm_request_ack(self._xmlstream)
+
+    def _sm_cancel_ack_timer(self):
+        if self._sm_ack_timer is not None:
+            self._sm_ack_timer.cancel()
+            self._sm_ack_timer = None
 
     def register_iq_response_callback(self, from_, id_, cb):
         """
@@ -1737,8 +2425,7 @@ class StanzaStream:
         )
 
         if self._sm_enabled:
-            req = nonza.SMRequest()
-            xmlstream.send_xso(req)
+            self._sm_request_ack(xmlstream)
         else:
             iq = stanza.IQ(
                 type_=structs.IQType.GET,
@@ -1751,7 +2438,7 @@ class StanzaStream:
                 # we don’t care, just wanna make sure that this doesn’t fail
                 lambda stanza: None,
             )
-            self._enqueue(iq)
+            self._enqueue(iq, priority=StanzaPriority.CONTROL)
 
     def _start_prepare(self, xmlstream, receiver):
         self._xmlstream_failure_token = xmlstream.on_closing.connect(
@@ -1922,50 +2609,60 @@ class StanzaStream:
     def _run(self, xmlstream):
         self._xmlstream = xmlstream
         self._update_xmlstream_limits()
-        active_fut = asyncio.ensure_future(self._active_queue.get(),
-                                           loop=self._loop)
-        incoming_fut = asyncio.ensure_future(self._incoming_queue.get(),
-                                             loop=self._loop)
+        if self._byte_bucket is not None:
+            self._bytes_accounted = xmlstream.bytes_sent
+        active_queue = self._active_queue
+        incoming_queue = self._incoming_queue
+        wakeup = self._broker_wakeup
 
         try:
             while True:
-                timeout = None
-                done, pending = yield from asyncio.wait(
-                    [
-                        active_fut,
-                        incoming_fut,
-                    ],
-                    return_when=asyncio.FIRST_COMPLETED,
-                    timeout=timeout)
+                shaping_delay = 0
+                if (self._shaping_policy is not None and
+                        not active_queue.empty()):
+                    # nonzas and IQ responses sent in the meantime count, too
+                    self._shaping_account(xmlstream, 0)
+                    shaping_delay = self._shaping_delay()
+
+                if (active_queue.empty() or shaping_delay > 0) and \
+                        incoming_queue.empty():
+                    wakeup.clear()
+                    if shaping_delay > 0:
+                        try:
+                            yield from asyncio.wait_for(
+                                wakeup.wait(),
+                                shaping_delay,
+                                loop=self._loop,
+                            )
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        yield from wakeup.wait()
+                    continue
 
                 with (yield from self._broker_lock):
-                    if active_fut in done:
-                        self._process_outgoing(xmlstream, active_fut.result())
-                        active_fut = asyncio.ensure_future(
-                            self._active_queue.get(),
-                            loop=self._loop)
-
-                    if incoming_fut in done:
-                        self._process_incoming(xmlstream,
-                                               incoming_fut.result())
-                        incoming_fut = asyncio.ensure_future(
-                            self._incoming_queue.get(),
-                            loop=self._loop)
+                    if not active_queue.empty() and shaping_delay <= 0:
+                        self._process_outgoing(xmlstream,
+                                               active_queue.get_nowait())
 
-        finally:
-            # make sure we rescue any stanzas which possibly have already been
-            # caught by the calls to get()
-            self._logger.debug("task terminating, rescuing stanzas and "
-                               "clearing handlers")
-            if incoming_fut.done() and not incoming_fut.exception():
-                self._incoming_queue.putleft_nowait(incoming_fut.result())
-            else:
-                incoming_fut.cancel()
+                    for _ in range(self._incoming_batch_size):
+                        try:
+                            stanza_obj = incoming_queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                        self._process_incoming(xmlstream, stanza_obj)
 
-            if active_fut.done() and not active_fut.exception():
-                self._active_queue.putleft_nowait(active_fut.result())
-            else:
-                active_fut.cancel()
+                    if self._sm_enabled and active_queue.empty():
+                        self._sm_flush_on_idle(xmlstream)
+
+                if ((not active_queue.empty() and shaping_delay <= 0) or
+                        not incoming_queue.empty()):
+                    # there is more work, but let others run first
+                    yield from asyncio.sleep(0, loop=self._loop)
+
+        finally:
+            self._logger.debug("task terminating, clearing handlers")
+            self._sm_cancel_ack_timer()
 
             # we also lock shutdown, because the main race is among the SM
             # variables
@@ -1995,13 +2692,15 @@ class StanzaStream:
     def recv_erroneous_stanza(self, partial_obj, exc):
         self._incoming_queue.put_nowait((partial_obj, exc))
 
-    def _enqueue(self, stanza, **kwargs):
+    def _enqueue(self, stanza, *, priority=None, **kwargs):
         if self._closed:
             raise self._xmlstream_exception
 
         stanza.validate()
+        if priority is None:
+            priority = StanzaPriority.INTERACTIVE
         token = StanzaToken(stanza, **kwargs)
-        self._active_queue.put_nowait(token)
+        self._active_queue.put_nowait(token, priority)
         stanza.autoset_id()
         self._logger.debug("enqueued stanza %r with token %r",
                            stanza, token)
@@ -2111,7 +2810,8 @@ class StanzaStream:
 
             self._sm_outbound_base = 0
             self._sm_inbound_ctr = 0
-            self._sm_unacked_list = []
+            self._sm_unacked_list = collections.deque()
+            self._sm_unrequested = 0
             self._sm_enabled = True
             self._sm_id = response.id_
             self._sm_resumable = response.resume
@@ -2211,7 +2911,7 @@ class StanzaStream:
 
         if not self.sm_enabled:
             raise RuntimeError("Stream Management not enabled")
-        return self._sm_unacked_list[:]
+        return list(self._sm_unacked_list)
 
     @property
     def sm_max(self):
@@ -2289,9 +2989,10 @@ class StanzaStream:
         # remove any acked stanzas
         self.sm_ack(remote_ctr)
         # reinsert the remaining stanzas
-        for token in self._sm_unacked_list:
+        for token in reversed(self._sm_unacked_list):
             self._active_queue.putleft_nowait(token)
         self._sm_unacked_list.clear()
+        self._sm_unrequested = 0
 
     @asyncio.coroutine
     def resume_sm(self, xmlstream):
@@ -2367,6 +3068,8 @@ class StanzaStream:
         for token in self._sm_unacked_list:
             token._set_state(StanzaState.SENT_WITHOUT_SM)
         del self._sm_unacked_list
+        del self._sm_unrequested
+        self._sm_cancel_ack_timer()
 
         self._destroy_stream_state(ConnectionError(
             "stream management disabled"
@@ -2417,14 +3120,13 @@ class StanzaStream:
                 )
             )
 
-        acked = self._sm_unacked_list[:to_drop]
-        del self._sm_unacked_list[:to_drop]
         self._sm_outbound_base = remote_ctr
 
-        if acked:
-            self._logger.debug("%d stanzas acked by remote", len(acked))
-        for token in acked:
-            token._set_state(StanzaState.ACKED)
+        if to_drop:
+            self._logger.debug("%d stanzas acked by remote", to_drop)
+        popleft = self._sm_unacked_list.popleft
+        for _ in range(to_drop):
+            popleft()._set_state(StanzaState.ACKED)
 
     @asyncio.coroutine
     def send_iq_and_wait_for_reply(self, iq, *,
@@ -2479,7 +3181,8 @@ class StanzaStream:
         yield from self._enqueue(stanza)
 
     @asyncio.coroutine
-    def _send_immediately(self, stanza, *, timeout=None, cb=None):
+    def _send_immediately(self, stanza, *, timeout=None, cb=None,
+                          priority=None):
         """
         Send a stanza without waiting for the stream to be ready to send
         stanzas.
@@ -2496,7 +3199,7 @@ class StanzaStream:
                 raise ValueError(
                     "cb not supported with non-IQ non-request stanzas"
                 )
-            yield from self._enqueue(stanza)
+            yield from self._enqueue(stanza, priority=priority)
             return
 
         # we use the long way with a custom listener instead of a future here
@@ -2568,7 +3271,7 @@ class StanzaStream:
         )
 
         try:
-            yield from self._enqueue(stanza)
+            yield from self._enqueue(stanza, priority=priority)
         except Exception:
             listener.cancel()
             raise
@@ -25,6 +25,12 @@ Stringprep support
 
 This module implements the Nodeprep (`RFC 6122`_) and Resourceprep (`RFC 6122`_) stringprep profiles.
 
+.. versionchanged:: 0.10
+
+   Strings which consist only of ASCII characters are checked against tables
+   precomputed at import time, skipping normalisation and the bidi checks.
+   The results are identical to those of the full algorithm.
+
 .. autofunction:: nodeprep
 
 .. autofunction:: resourceprep
@@ -36,6 +42,7 @@ This module implements the Nodeprep (`RFC 6122`_) and Resourceprep (`RFC 6122`_)
 
 """
 
+import re
 import stringprep
 import unicodedata
 
@@ -144,32 +151,111 @@ def _nodeprep_do_mapping(chars):
             i += len(replacement)
 
 
-def nodeprep(string, allow_unassigned=False):
+_nodeprep_prohibited_tables = (
+    stringprep.in_table_c11,
+    stringprep.in_table_c12,
+    stringprep.in_table_c21,
+    stringprep.in_table_c22,
+    stringprep.in_table_c3,
+    stringprep.in_table_c4,
+    stringprep.in_table_c5,
+    stringprep.in_table_c6,
+    stringprep.in_table_c7,
+    stringprep.in_table_c8,
+    stringprep.in_table_c9,
+    lambda x: x in _nodeprep_prohibited
+)
+
+_resourceprep_prohibited_tables = (
+    stringprep.in_table_c12,
+    stringprep.in_table_c21,
+    stringprep.in_table_c22,
+    stringprep.in_table_c3,
+    stringprep.in_table_c4,
+    stringprep.in_table_c5,
+    stringprep.in_table_c6,
+    stringprep.in_table_c7,
+    stringprep.in_table_c8,
+    stringprep.in_table_c9,
+)
+
+_nameprep_prohibited_tables = (
+    stringprep.in_table_c12,
+    stringprep.in_table_c22,
+    stringprep.in_table_c3,
+    stringprep.in_table_c4,
+    stringprep.in_table_c5,
+    stringprep.in_table_c6,
+    stringprep.in_table_c7,
+    stringprep.in_table_c8,
+    stringprep.in_table_c9,
+)
+
+
+def _build_ascii_tables(map_table, prohibited_tables):
     """
-    Process the given `string` using the Nodeprep (`RFC 6122`_) profile. In the
-    error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
-    raised.
+    Evaluate the steps of a stringprep profile on each ASCII character.
+
+    `map_table` is the mapping function applied in addition to table B.1 (or
+    :data:`None`) and `prohibited_tables` are the tables of prohibited output.
+
+    Return a tuple ``(pattern, translation)``. `pattern` is a compiled regular
+    expression which fully matches the strings which are made only of ASCII
+    characters which pass all steps of the profile and are mapped to a single
+    ASCII character. For those strings, applying `translation` with
+    :meth:`str.translate` gives the same result as the full profile: NFKC
+    does not change ASCII strings, no ASCII character is in R/AL and all of
+    them are assigned, but that is checked here anyway.
     """
 
+    allowed = []
+    translation = {}
+    for cp in range(0x80):
+        c = chr(cp)
+        if stringprep.in_table_b1(c):
+            continue
+
+        mapped = map_table(c) if map_table is not None else c
+        if len(mapped) != 1 or ord(mapped) >= 0x80:
+            continue
+
+        if (unicodedata.normalize("NFKC", mapped) != mapped or
+                check_against_tables(mapped, prohibited_tables) is not None or
+                is_RandALCat(mapped) or
+                stringprep.in_table_a1(mapped)):
+            continue
+
+        allowed.append(c)
+        if mapped != c:
+            translation[cp] = mapped
+
+    pattern = re.compile(
+        "[{}]*".format("".join(map(re.escape, allowed)))
+    )
+    return pattern, translation
+
+
+_nodeprep_ascii, _nodeprep_ascii_translation = _build_ascii_tables(
+    stringprep.map_table_b2,
+    _nodeprep_prohibited_tables,
+)
+
+_resourceprep_ascii, _resourceprep_ascii_translation = _build_ascii_tables(
+    None,
+    _resourceprep_prohibited_tables,
+)
+
+_nameprep_ascii, _nameprep_ascii_translation = _build_ascii_tables(
+    stringprep.map_table_b2,
+    _nameprep_prohibited_tables,
+)
+
+
+def _nodeprep_full(string, allow_unassigned):
     chars = list(string)
     _nodeprep_do_mapping(chars)
     do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c11,
-            stringprep.in_table_c12,
-            stringprep.in_table_c21,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-            lambda x: x in _nodeprep_prohibited
-        ))
+    check_prohibited_output(chars, _nodeprep_prohibited_tables)
     check_bidi(chars)
 
     if not allow_unassigned:
@@ -183,6 +269,18 @@ def nodeprep(string, allow_unassigned=False):
     return "".join(chars)
 
 
+def nodeprep(string, allow_unassigned=False):
+    """
+    Process the given `string` using the Nodeprep (`RFC 6122`_) profile. In the
+    error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
+    raised.
+    """
+
+    if _nodeprep_ascii.fullmatch(string):
+        return string.translate(_nodeprep_ascii_translation)
+    return _nodeprep_full(string, allow_unassigned)
+
+
 def _resourceprep_do_mapping(chars):
     i = 0
     while i < len(chars):
@@ -193,30 +291,11 @@ def _resourceprep_do_mapping(chars):
         i += 1
 
 
-def resourceprep(string, allow_unassigned=False):
-    """
-    Process the given `string` using the Resourceprep (`RFC 6122`_) profile. In
-    the error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError`
-    is raised.
-    """
-
+def _resourceprep_full(string, allow_unassigned):
     chars = list(string)
     _resourceprep_do_mapping(chars)
     do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c12,
-            stringprep.in_table_c21,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-        ))
+    check_prohibited_output(chars, _resourceprep_prohibited_tables)
     check_bidi(chars)
 
     if not allow_unassigned:
@@ -230,29 +309,23 @@ def resourceprep(string, allow_unassigned=False):
     return "".join(chars)
 
 
-def nameprep(string, allow_unassigned=False):
+def resourceprep(string, allow_unassigned=False):
     """
-    Process the given `string` using the Nameprep (`RFC 3491`_) profile. In the
-    error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
-    raised.
+    Process the given `string` using the Resourceprep (`RFC 6122`_) profile. In
+    the error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError`
+    is raised.
     """
 
+    if _resourceprep_ascii.fullmatch(string):
+        return string.translate(_resourceprep_ascii_translation)
+    return _resourceprep_full(string, allow_unassigned)
+
+
+def _nameprep_full(string, allow_unassigned):
     chars = list(string)
     _nodeprep_do_mapping(chars)
     do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c12,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-        ))
+    check_prohibited_output(chars, _nameprep_prohibited_tables)
     check_bidi(chars)
 
     if not allow_unassigned:
@@ -264,3 +337,15 @@ def nameprep(string, allow_unassigned=False):
         )
 
     return "".join(chars)
+
+
+def nameprep(string, allow_unassigned=False):
+    """
+    Process the given `string` using the Nameprep (`RFC 3491`_) profile. In the
+    error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
+    raised.
+    """
+
+    if _nameprep_ascii.fullmatch(string):
+        return string.translate(_nameprep_ascii_translation)
+    return _nameprep_full(string, allow_unassigned)
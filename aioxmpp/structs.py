@@ -44,6 +44,18 @@ Jabber IDs
 
 .. autoclass:: JID(localpart, domain, resource)
 
+.. currentmodule:: aioxmpp.structs
+
+.. autoclass:: JIDCache
+
+.. data:: jid_cache
+
+   The :class:`JIDCache` instance used by :meth:`aioxmpp.JID.fromstr`.
+
+   .. versionadded:: 0.10
+
+.. currentmodule:: aioxmpp
+
 Presence
 ========
 
@@ -76,6 +88,7 @@ import enum
 import functools
 import warnings
 
+from .cache import LRUDict
 from .stringprep import nodeprep, resourceprep, nameprep
 
 
@@ -756,7 +769,18 @@ class JID(collections.namedtuple("JID", ["localpart", "domain", "resource"])):
         """
         Obtain a :class:`JID` object by parsing a JID from the given string
         `s`.
+
+        .. versionchanged:: 0.10
+
+           Results are memoised in :data:`aioxmpp.structs.jid_cache`. Parsing
+           the same string twice may thus return the identical object.
         """
+        if cls is JID:
+            return jid_cache.lookup(s, strict)
+        return cls._fromstr_uncached(s, strict)
+
+    @classmethod
+    def _fromstr_uncached(cls, s, strict):
         nodedomain, sep, resource = s.partition("/")
         if not sep:
             resource = None
@@ -768,6 +792,119 @@ class JID(collections.namedtuple("JID", ["localpart", "domain", "resource"])):
         return cls(localpart, domain, resource, strict=strict)
 
 
+class JIDCache:
+    """
+    Bounded memo which maps strings to parsed :class:`~aioxmpp.JID` objects.
+
+    :param maxsize: Maximum number of JIDs to keep.
+    :type maxsize: :class:`int`
+
+    .. versionadded:: 0.10
+
+    Parsing a JID involves applying three stringprep profiles, which is
+    comparatively expensive. As the same JIDs tend to show up over and over
+    again in a stream, :meth:`aioxmpp.JID.fromstr` keeps the results in an
+    instance of this class (see :data:`jid_cache`). Since :class:`JID` objects
+    are immutable, the cached objects are handed out as they are.
+
+    Strings which fail to parse are not cached; the exception is raised anew
+    on each lookup.
+
+    .. autoattribute:: maxsize
+
+    .. attribute:: hits
+
+       Number of lookups which were answered from the cache.
+
+    .. attribute:: misses
+
+       Number of lookups which required the string to be parsed.
+
+    .. automethod:: lookup
+
+    .. automethod:: clear
+
+    .. automethod:: reset_counters
+    """
+
+    def __init__(self, maxsize=8192):
+        super().__init__()
+        self._entries = LRUDict()
+        self._maxsize = None
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of entries in the cache. Reducing the size purges
+        overhanging entries immediately.
+
+        A size of zero disables the cache: all cached entries are dropped and
+        lookups always parse the string (they still count as misses).
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        if value < 0:
+            raise ValueError("maxsize must be non-negative")
+        if value == 0:
+            self._entries.clear()
+        else:
+            self._entries.maxsize = value
+        self._maxsize = value
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, s, strict=True):
+        """
+        Return the :class:`~aioxmpp.JID` for the string `s`.
+
+        :param s: The string to parse.
+        :type s: :class:`str`
+        :param strict: Whether to parse strictly; see :class:`~aioxmpp.JID`.
+        :type strict: :class:`bool`
+        :raises ValueError: if `s` is not a valid JID
+        :return: The parsed JID.
+        :rtype: :class:`~aioxmpp.JID`
+
+        Results for strict and non-strict parsing are cached separately.
+        """
+        key = s, strict
+        try:
+            result = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = JID._fromstr_uncached(s, strict)
+        if self._maxsize:
+            self._entries[key] = result
+        return result
+
+    def clear(self):
+        """
+        Drop all cached entries. The counters are not touched.
+        """
+        self._entries.clear()
+
+    def reset_counters(self):
+        """
+        Reset :attr:`hits` and :attr:`misses` to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+
+
+jid_cache = JIDCache()
+
+
 @functools.total_ordering
 class PresenceShow(CompatibilityMixin, enum.Enum):
     """
@@ -26,6 +26,7 @@
 .. autoclass:: TaskPool
 """
 import asyncio
+import functools
 import logging
 
 
@@ -47,10 +48,19 @@ class TaskPool:
     coroutine is running in that group, it is the limit on the total number of
     coroutines running in the pool.
 
+    `default_limit` is the limit applied to all groups except ``()`` for which
+    no explicit limit has been set with :meth:`set_limit`.
+
     When a coroutine exits (either normally or by an exception or
     cancellation), it is removed from the pool and the counters for running
     coroutines are adapted accordingly.
 
+    .. versionchanged:: 0.10
+
+       The limits are now enforced and the tasks are accounted for in their
+       groups. Previously, :meth:`spawn` started the coroutine
+       unconditionally.
+
     Controlling limits on groups:
 
     .. automethod:: set_limit
@@ -61,17 +71,22 @@ class TaskPool:
 
     .. automethod:: clear_limit
 
+    .. automethod:: has_capacity
+
     Starting and adding coroutines:
 
     .. automethod:: spawn(group, coro_fun, *args, **kwargs)
 
     .. automethod:: add
+
+    .. automethod:: iter_tasks
     """
 
     def __init__(self, *, max_tasks=None, default_limit=None, logger=None):
         super().__init__()
         if logger is None:
             logger = logging.getLogger(__name__)
+        self._logger = logger
         self._group_limits = {}
         self._group_tasks = {}
         self.default_limit = default_limit
@@ -104,6 +119,9 @@ class TaskPool:
             self._group_limits.pop(group, None)
             return
 
+        if new_limit < 0:
+            raise ValueError("limit must be non-negative")
+
         self._group_limits[group] = new_limit
 
     def clear_limit(self, group):
@@ -142,7 +160,73 @@ class TaskPool:
         :return: Number of currently running tasks
         :rtype: :class:`int`
         """
-        return 0
+        return len(self._group_tasks.get(group, ()))
+
+    def _effective_limit(self, group):
+        try:
+            return self._group_limits[group]
+        except KeyError:
+            if group == ():
+                return None
+            return self.default_limit
+
+    def has_capacity(self, groups):
+        """
+        Check whether a coroutine could be added to the given pool groups.
+
+        :param groups: The groups the coroutine would belong to.
+        :type groups: :class:`set` of group keys
+        :rtype: :class:`bool`
+        :return: :data:`True` if none of the limits of the `groups` (or the
+                 total limit) is exhausted.
+
+        .. versionadded:: 0.10
+        """
+        for group in set(groups) | {()}:
+            limit = self._effective_limit(group)
+            if limit is not None and self.get_task_count(group) >= limit:
+                return False
+        return True
+
+    def _check_limits(self, groups):
+        for group in groups:
+            limit = self._effective_limit(group)
+            if limit is not None and self.get_task_count(group) >= limit:
+                raise RuntimeError(
+                    "maximum number of tasks in group {!r} exhausted".format(
+                        group
+                    )
+                )
+
+    def _task_done(self, groups, task):
+        for group in groups:
+            tasks = self._group_tasks[group]
+            tasks.discard(task)
+            if not tasks:
+                del self._group_tasks[group]
+
+    def _account(self, groups, task):
+        for group in groups:
+            self._group_tasks.setdefault(group, set()).add(task)
+        task.add_done_callback(
+            functools.partial(self._task_done, groups)
+        )
+        return task
+
+    def iter_tasks(self, group=()):
+        """
+        Iterate over the tasks currently running in `group`.
+
+        :param group: Group key of the group to query.
+        :type group: hashable
+        :return: Snapshot of the tasks in `group`.
+        :rtype: iterable of :class:`asyncio.Task`
+
+        With the default `group`, all tasks of the pool are returned.
+
+        .. versionadded:: 0.10
+        """
+        return list(self._group_tasks.get(group, ()))
 
     def add(self, groups, coro):
         """
@@ -161,6 +245,9 @@ class TaskPool:
         coroutine is not accepted into the pool and :class:`RuntimeError` is
         raised.
         """
+        groups = frozenset(groups) | {()}
+        self._check_limits(groups)
+        return self._account(groups, asyncio.ensure_future(coro))
 
     def spawn(self, __groups, __coro_fun, *args, **kwargs):
         """
@@ -195,6 +282,10 @@ class TaskPool:
 
         """
         # ensure the implicit group is included
-        __groups = set(__groups) | {()}
+        __groups = frozenset(__groups) | {()}
+        self._check_limits(__groups)
 
-        return asyncio.ensure_future(__coro_fun(*args, **kwargs))
+        return self._account(
+            __groups,
+            asyncio.ensure_future(__coro_fun(*args, **kwargs)),
+        )
@@ -642,6 +642,7 @@ class XMLStreamMock(InteractivityMock):
         self.stanza_parser = xso.XSOParser()
         self.can_starttls_value = False
         self._error_futures = []
+        self.bytes_sent = 0
 
     def _execute_single(self, do):
         do(self)
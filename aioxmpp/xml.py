@@ -33,6 +33,8 @@ The most useful class here is the :class:`XMPPXMLGenerator`:
 
 .. autoclass:: XMPPXMLGenerator
 
+.. autoclass:: XSOBytesSerializer
+
 .. autoclass:: XMLStreamWriter
 
 Processing XML streams
@@ -47,6 +49,8 @@ instances, the following classes and functions can be used:
 
 .. autofunction:: make_parser
 
+.. autoclass:: ExpatParser
+
 Utility functions
 =================
 
@@ -64,8 +68,10 @@ import copy
 import ctypes
 import ctypes.util
 import contextlib
+import functools
 import io
 
+import xml.parsers.expat as pyexpat
 import xml.sax
 import xml.sax.saxutils
 
@@ -114,6 +120,26 @@ def xmlValidateNameValue_str(s):
     )
 
 
+@functools.lru_cache(maxsize=4096)
+def _is_valid_local_name(name):
+    # element and attribute names of XSO classes form a small, fixed set;
+    # validating them once per process instead of once per element is a major
+    # win when serialising
+    return ":" not in name and xmlValidateNameValue_str(name)
+
+
+@functools.lru_cache(maxsize=256)
+def _ns_decl_bytes(prefix, uri):
+    if prefix:
+        name = "xmlns:" + prefix
+    else:
+        name = "xmlns"
+    return " {}={}".format(
+        name,
+        xml.sax.saxutils.quoteattr(uri)
+    ).encode("utf-8")
+
+
 def is_valid_cdata_str(s):
     for c in s:
         o = ord(c)
@@ -237,7 +263,7 @@ class XMPPXMLGenerator:
 
         # NOTE: when adding state, make sure to handle it in buffer() and to
         # add tests that buffer() handles it correctly
-        self._ns_map_stack = [({}, set(), 0)]
+        self._ns_map_stack = [({}, set(), 0, None)]
         self._curr_ns_map = {}
         self._pending_start_element = False
         self._ns_prefixes_floating_in = {}
@@ -267,7 +293,7 @@ class XMPPXMLGenerator:
         if not isinstance(name, tuple):
             raise ValueError("names must be tuples")
 
-        if ":" in name[1] or not xmlValidateNameValue_str(name[1]):
+        if not _is_valid_local_name(name[1]):
             raise ValueError("invalid name: {!r}".format(name[1]))
 
         if name[0]:
@@ -306,7 +332,7 @@ class XMPPXMLGenerator:
         self._pending_start_element = False
         self._write(b">")
 
-    def _pin_floating_ns_decls(self, old_counter):
+    def _pin_floating_ns_decls(self, old_counter, qname):
         if self._ns_prefixes_floating_out:
             raise RuntimeError("namespace prefix has not been closed")
 
@@ -316,7 +342,8 @@ class XMPPXMLGenerator:
             (
                 self._curr_ns_map.copy(),
                 set(new_prefixes) - self._ns_auto_prefixes_floating_in,
-                old_counter
+                old_counter,
+                qname,
             )
         )
 
@@ -419,25 +446,18 @@ class XMPPXMLGenerator:
         else:
             attrib = []
 
-        pending_prefixes = self._pin_floating_ns_decls(old_counter)
+        qname = qname.encode("utf-8")
+        pending_prefixes = self._pin_floating_ns_decls(old_counter, qname)
 
         self._write(b"<")
-        self._write(qname.encode("utf-8"))
+        self._write(qname)
 
         if None in pending_prefixes:
             uri = pending_prefixes.pop(None)
-            self._write(b" xmlns=")
-            self._write(xml.sax.saxutils.quoteattr(uri).encode("utf-8"))
+            self._write(_ns_decl_bytes(None, uri))
 
         for prefix, uri in sorted(pending_prefixes.items()):
-            self._write(b" xmlns")
-            if prefix:
-                self._write(b":")
-                self._write(prefix.encode("utf-8"))
-            self._write(b"=")
-            self._write(
-                xml.sax.saxutils.quoteattr(uri).encode("utf-8")
-            )
+            self._write(_ns_decl_bytes(prefix, uri))
 
         if self._sorted_attributes:
             attrib.sort()
@@ -466,17 +486,19 @@ class XMPPXMLGenerator:
         if self._ns_prefixes_floating_out:
             raise RuntimeError("namespace prefix has not been closed")
 
+        (self._curr_ns_map, self._ns_prefixes_floating_out,
+         self._ns_counter, qname) = self._ns_map_stack.pop()
+
         if self._pending_start_element == name:
             self._pending_start_element = False
             self._write(b"/>")
         else:
             self._write(b"</")
-            self._write(self._qname(name).encode("utf-8"))
+            # re-use the name generated by startElementNS; the prefix of the
+            # element cannot have changed in the meantime
+            self._write(qname)
             self._write(b">")
 
-        self._curr_ns_map, self._ns_prefixes_floating_out, self._ns_counter = \
-            self._ns_map_stack.pop()
-
     def endPrefixMapping(self, prefix):
         """
         End a prefix mapping declared with :meth:`startPrefixMapping`. See
@@ -646,6 +668,343 @@ class XMPPXMLGenerator:
             self._flush = old_flush
 
 
+class XSOBytesSerializer:
+    """
+    Serialise XSOs directly to UTF-8 encoded bytes.
+
+    :param nsmap: Namespace prefixes which are declared in the context in
+        which the serialised XSOs are going to be placed.
+    :type nsmap: :class:`~collections.abc.Mapping` mapping prefixes to
+        namespace URIs
+    :param sorted_attributes: Sort the attributes in the output.
+    :type sorted_attributes: :class:`bool`
+    :param additional_escapes: Sequence of characters to escape in CDATA.
+    :type additional_escapes: :class:`~collections.abc.Iterable` of
+        1-codepoint :class:`str` objects.
+
+    This is an alternative to :class:`XMPPXMLGenerator` for serialising
+    complete XSO trees, such as stanzas inside a stream. Instead of writing
+    each piece of output to a file-like object, all output is appended to a
+    single :class:`bytearray`, which is returned by :meth:`serialize`.
+    Since the serialiser starts from a fixed namespace context (`nsmap`) for
+    each XSO, no state needs to be saved and restored to provide exception
+    safety: if serialisation fails, the partial output is simply dropped.
+
+    The generated XML follows the same rules as the output of
+    :class:`XMPPXMLGenerator` with `short_empty_elements` enabled: names are
+    validated, character data and attribute values are escaped (including
+    `additional_escapes`), control characters in character data are rejected
+    and namespace prefixes are chosen automatically in the same way. In
+    addition, a prefix which is re-bound to a different namespace in a nested
+    element is not used anymore for the namespace it was bound to previously.
+
+    `nsmap` must correspond to the prefixes in effect at the point where the
+    output is inserted. Declarations from `nsmap` are not emitted.
+
+    .. automethod:: serialize
+
+    The serialiser implements the subset of the SAX content handler interface
+    which is used by :meth:`.xso.XSO.unparse_to_sax`:
+
+    .. automethod:: startPrefixMapping(prefix, uri)
+
+    .. automethod:: startElementNS
+
+    .. automethod:: characters
+
+    .. automethod:: endElementNS
+
+    .. automethod:: endPrefixMapping
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, nsmap={}, *,
+                 sorted_attributes=False,
+                 additional_escapes=[]):
+        self._root_prefix_map = dict(nsmap)
+        self._root_uri_map = {
+            uri: prefix
+            for prefix, uri in nsmap.items()
+        }
+        self._sorted_attributes = sorted_attributes
+        self._additional_escapes = {
+            char: "&#{};".format(ord(char))
+            for char in additional_escapes
+        }
+        self._buf = None
+
+    def _reset(self):
+        self._buf = bytearray()
+        self._stack = []
+        self._prefix_map = self._root_prefix_map
+        self._uri_map = self._root_uri_map
+        self._counter = -1
+        self._pending_start_element = None
+        self._floating_prefixes = {}
+        self._floating_uris = {}
+        self._floating_explicit = set()
+        self._floating_out = frozenset()
+
+    def serialize(self, xso):
+        """
+        Serialise an XSO.
+
+        :param xso: The object to serialise.
+        :type xso: :class:`~.xso.XSO`
+        :raises Exception: from any serialisation errors, usually
+                           :class:`ValueError`.
+        :return: The serialised XSO.
+        :rtype: :class:`bytearray`
+
+        A new :class:`bytearray` is returned on each call, so it is safe to
+        hand it to a transport which keeps a reference to the data.
+        """
+        self._reset()
+        try:
+            xso.unparse_to_sax(self)
+            return self._buf
+        finally:
+            self._buf = None
+            self._stack = None
+
+    def _roll_prefix(self, attr):
+        if not attr and None not in self._floating_prefixes:
+            return None
+
+        prefix_number = self._counter + 1
+        while True:
+            prefix = "ns{}".format(prefix_number)
+            if prefix not in self._floating_prefixes:
+                break
+            prefix_number += 1
+        self._counter = prefix_number
+        return prefix
+
+    def _qname(self, name, attr):
+        if not isinstance(name, tuple):
+            raise ValueError("names must be tuples")
+
+        uri, localname = name
+        if not _is_valid_local_name(localname):
+            raise ValueError("invalid name: {!r}".format(localname))
+
+        if uri:
+            if uri == namespaces.xml:
+                return "xml:" + localname
+            try:
+                prefix = self._floating_uris[uri]
+                if attr and prefix is None:
+                    raise KeyError()
+            except KeyError:
+                try:
+                    prefix = self._uri_map[uri]
+                    if     (prefix in self._floating_prefixes or
+                            (attr and prefix is None) or
+                            self._prefix_map.get(prefix) != uri):
+                        raise KeyError()
+                except KeyError:
+                    # namespace is undeclared, we have to declare it..
+                    prefix = self._roll_prefix(attr)
+                    self._floating_prefixes[prefix] = uri
+                    self._floating_uris[uri] = prefix
+
+            if prefix:
+                return prefix + ":" + localname
+
+        elif   (not attr and
+                (self._prefix_map.get(None) or
+                 self._floating_prefixes.get(None))):
+            raise ValueError("cannot create unnamespaced element when "
+                             "prefixless namespace is bound")
+
+        return localname
+
+    def startPrefixMapping(self, prefix, uri):
+        """
+        Declare a namespace prefix for the next element.
+
+        This works like :meth:`XMPPXMLGenerator.startPrefixMapping`.
+        """
+        if     (prefix is not None and
+                (prefix == "xml" or
+                 prefix == "xmlns" or
+                 not _is_valid_local_name(prefix))):
+            raise ValueError("not a valid prefix: {!r}".format(prefix))
+
+        if prefix in self._floating_prefixes:
+            raise ValueError("prefix already declared for next element")
+        self._floating_explicit.add(prefix)
+        self._floating_prefixes[prefix] = uri
+        self._floating_uris[uri] = prefix
+
+    def startElementNS(self, name, qname, attributes=None):
+        """
+        Start an element. The arguments are the same as for
+        :meth:`XMPPXMLGenerator.startElementNS`.
+        """
+        buf = self._buf
+        if self._pending_start_element is not None:
+            self._pending_start_element = None
+            buf += b">"
+
+        old_counter = self._counter
+
+        qname = self._qname(name, False)
+        if attributes:
+            attrib = []
+            for attrname, value in attributes.items():
+                attrqname = self._qname(attrname, True)
+                if attrqname == "xmlns":
+                    raise ValueError("xmlns not allowed as attribute name")
+                attrib.append((attrqname, value))
+            if self._sorted_attributes:
+                attrib.sort()
+        else:
+            attrib = ()
+
+        if self._floating_out:
+            raise RuntimeError("namespace prefix has not been closed")
+
+        qname = qname.encode("utf-8")
+        buf += b"<"
+        buf += qname
+
+        floating_prefixes = self._floating_prefixes
+        if floating_prefixes:
+            prefix_map = self._prefix_map
+            self._stack.append((
+                prefix_map,
+                self._uri_map,
+                frozenset(self._floating_explicit),
+                old_counter,
+                qname,
+            ))
+
+            new_decls = [
+                (prefix, uri)
+                for prefix, uri in floating_prefixes.items()
+                if prefix_map.get(prefix) != uri
+            ]
+
+            self._prefix_map = dict(prefix_map)
+            self._prefix_map.update(floating_prefixes)
+            self._uri_map = dict(self._uri_map)
+            self._uri_map.update(self._floating_uris)
+            self._floating_prefixes = {}
+            self._floating_uris = {}
+            self._floating_explicit.clear()
+
+            # default namespace first, like XMPPXMLGenerator
+            new_decls.sort(key=lambda x: (x[0] is not None, x[0] or ""))
+            for prefix, uri in new_decls:
+                buf += _ns_decl_bytes(prefix, uri)
+        else:
+            self._stack.append((
+                self._prefix_map,
+                self._uri_map,
+                frozenset(),
+                old_counter,
+                qname,
+            ))
+
+        for attrname, value in attrib:
+            buf += b" "
+            buf += attrname.encode("utf-8")
+            buf += b"="
+            buf += xml.sax.saxutils.quoteattr(
+                value,
+                self._additional_escapes,
+            ).encode("utf-8")
+
+        self._pending_start_element = name
+
+    def endElementNS(self, name, qname):
+        """
+        End a previously started element.
+        """
+        if self._floating_out:
+            raise RuntimeError("namespace prefix has not been closed")
+
+        (self._prefix_map, self._uri_map, self._floating_out,
+         self._counter, qname) = self._stack.pop()
+
+        buf = self._buf
+        if self._pending_start_element == name:
+            self._pending_start_element = None
+            buf += b"/>"
+        else:
+            buf += b"</"
+            buf += qname
+            buf += b">"
+
+    def endPrefixMapping(self, prefix):
+        """
+        End a prefix mapping declared with :meth:`startPrefixMapping`.
+        """
+        if prefix not in self._floating_out:
+            raise KeyError(prefix)
+        self._floating_out = self._floating_out - {prefix}
+
+    def characters(self, chars):
+        """
+        Add character data to the current element. Special characters are
+        escaped and control characters are rejected with
+        :class:`ValueError`.
+        """
+        buf = self._buf
+        if self._pending_start_element is not None:
+            self._pending_start_element = None
+            buf += b">"
+        if not is_valid_cdata_str(chars):
+            raise ValueError("control characters are not allowed in "
+                             "well-formed XML")
+        buf += xml.sax.saxutils.escape(
+            chars,
+            self._additional_escapes,
+        ).encode("utf-8")
+
+    def startElement(self, name, attributes=None):
+        """
+        Not supported; only elements with proper namespacing are supported by
+        this serialiser.
+        """
+        raise NotImplementedError("namespace-incorrect documents are "
+                                  "not supported")
+
+    def endElement(self, name):
+        """
+        Not supported; only elements with proper namespacing are supported by
+        this serialiser.
+        """
+        self.startElement(name)
+
+    def processingInstruction(self, target, data):
+        """
+        Not supported; explicitly forbidden in XMPP. Raises
+        :class:`ValueError`.
+        """
+        raise ValueError("restricted xml: processing instruction forbidden")
+
+    def ignorableWhitespace(self, whitespace):
+        """
+        Not supported.
+        """
+        raise NotImplementedError("ignorableWhitespace")
+
+    def skippedEntity(self, name):
+        """
+        Not supported.
+        """
+        raise NotImplementedError("skippedEntity")
+
+    def setDocumentLocator(self, locator):
+        """
+        Not supported.
+        """
+        raise NotImplementedError("setDocumentLocator")
+
+
 class XMLStreamWriter:
     """
     A convenient class to write a standard conforming XML stream.
@@ -707,6 +1066,10 @@ class XMLStreamWriter:
             "stream": namespaces.xmlstream
         }
         self._nsmap_to_use.update(nsmap)
+        self._serializer = XSOBytesSerializer(
+            self._nsmap_to_use,
+            sorted_attributes=sorted_attributes)
+        self._write = f.write
         self._closed = False
 
     @property
@@ -751,14 +1114,24 @@ class XMLStreamWriter:
         re-raised; the :meth:`send` method thus provides strong exception
         safety.
 
+        The `xso` is serialised using a :class:`XSOBytesSerializer` and the
+        result is passed to the file-like object with a single call to its
+        :meth:`write` method.
+
         .. warning::
 
            The behaviour of :meth:`send` after :meth:`abort` or :meth:`close`
            and before :meth:`start` is undefined.
 
+        .. versionchanged:: 0.10
+
+           The object is serialised using :class:`XSOBytesSerializer` instead
+           of going through :class:`XMPPXMLGenerator`.
+
         """
-        with self._writer.buffer():
-            xso.unparse_to_sax(self._writer)
+        data = self._serializer.serialize(xso)
+        self._writer._finish_pending_start_element()
+        self._write(data)
 
     def abort(self):
         """
@@ -871,7 +1244,10 @@ class XMPPXMLProcessor:
         """
         A :class:`~.xso.XSOParser` object (or compatible) which will
         receive the sax-ish events used in :mod:`~aioxmpp.xso`. It
-        is driven using an instance of :class:`~.xso.SAXDriver`.
+        is driven using an instance of :class:`~.xso.SAXDriver` in batched
+        mode, that is, the events of each stanza are passed to
+        :meth:`~.xso.XSOParser.parse_event_list` at once if the object
+        supports it.
 
         This object can only be set before :meth:`startDocument` has been
         called (or after :meth:`endDocument` has been called).
@@ -904,7 +1280,7 @@ class XMPPXMLProcessor:
             raise RuntimeError("invalid state: {}".format(self._state))
         self._state = ProcessorState.STARTED
         self._depth = 0
-        self._driver = xso.SAXDriver(self._stanza_parser)
+        self._driver = xso.SAXDriver(self._stanza_parser, batched=True)
 
     def startElement(self, name, attributes):
         raise RuntimeError("incorrectly configured parser: "
@@ -1097,6 +1473,155 @@ def make_parser():
     return p
 
 
+@functools.lru_cache(maxsize=1024)
+def _split_expat_name(name):
+    uri, sep, localname = name.partition(" ")
+    if not sep:
+        return None, name
+    return uri, localname
+
+
+class ExpatParser:
+    """
+    Incremental parser for XMPP XML streams which drives :mod:`pyexpat`
+    directly instead of going through :mod:`xml.sax`.
+
+    It implements the subset of :class:`xml.sax.xmlreader.IncrementalParser`
+    which is needed to parse XML streams (:meth:`setContentHandler`,
+    :meth:`feed` and :meth:`close`) and can thus be used in place of the
+    parser returned by :func:`make_parser`. Compared to the SAX parser, the
+    per-event translation layer is much thinner:
+
+    * Element and attribute names are split into ``(namespace, localname)``
+      pairs using a bounded cache, as the same few names occur over and over
+      again in an XML stream.
+    * Attributes are passed to the content handler as plain :class:`dict`.
+    * Adjacent character data is coalesced into a single
+      :meth:`~xml.sax.handler.ContentHandler.characters` call.
+    * Namespace prefix mapping events are not reported.
+
+    The restrictions imposed by :class:`XMPPLexicalHandler` (no comments, no
+    DTDs and no non-predefined entities) are enforced as with
+    :func:`make_parser`. Parse errors are reported as
+    :class:`xml.sax.SAXParseException`, like the SAX parser does.
+
+    .. automethod:: setContentHandler
+
+    .. automethod:: feed
+
+    .. automethod:: close
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cont_handler = None
+        self._parser = None
+        self._parsing = False
+
+    def getContentHandler(self):
+        return self._cont_handler
+
+    def setContentHandler(self, handler):
+        """
+        Set the content handler to which the events are forwarded.
+
+        :param handler: The content handler, usually a
+            :class:`XMPPXMLProcessor`.
+
+        The content handler must be set before the first call to :meth:`feed`.
+        """
+        self._cont_handler = handler
+
+    def _start_element(self, name, attrs):
+        self._cont_handler.startElementNS(
+            _split_expat_name(name),
+            None,
+            {
+                _split_expat_name(attrname): value
+                for attrname, value in attrs.items()
+            }
+        )
+
+    def _end_element(self, name):
+        self._cont_handler.endElementNS(_split_expat_name(name), None)
+
+    def _start_doctype_decl(self, name, sysid, pubid, has_internal_subset):
+        XMPPLexicalHandler.startDTD(name, pubid, sysid)
+
+    def _reset(self):
+        parser = pyexpat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._cont_handler.characters
+        parser.ProcessingInstructionHandler = \
+            self._cont_handler.processingInstruction
+        parser.CommentHandler = XMPPLexicalHandler.comment
+        parser.StartDoctypeDeclHandler = self._start_doctype_decl
+        self._parser = parser
+
+    def feed(self, data, isFinal=False):
+        """
+        Feed a chunk of data to the parser.
+
+        :param data: The data to parse.
+        :type data: :class:`bytes` or :class:`str`
+        :raises xml.sax.SAXParseException: if the data is not well-formed XML
+
+        Any exceptions raised by the content handler propagate unchanged.
+        """
+        if not self._parsing:
+            self._reset()
+            self._parsing = True
+            self._cont_handler.startDocument()
+
+        try:
+            self._parser.Parse(data, isFinal)
+        except pyexpat.ExpatError as exc:
+            raise xml.sax.SAXParseException(
+                pyexpat.ErrorString(exc.code),
+                exc,
+                self,
+            )
+
+    def close(self):
+        """
+        Signal the end of the document to the parser.
+
+        The content handler receives the
+        :meth:`~xml.sax.handler.ContentHandler.endDocument` event and the
+        parser can be re-used for a new document afterwards.
+        """
+        if not self._parsing:
+            return
+        try:
+            self.feed(b"", True)
+            self._cont_handler.endDocument()
+        finally:
+            self._parsing = False
+            self._parser = None
+
+    # Locator interface, used by xml.sax.SAXParseException
+
+    def getColumnNumber(self):
+        if self._parser is None:
+            return None
+        return self._parser.ErrorColumnNumber
+
+    def getLineNumber(self):
+        if self._parser is None:
+            return 1
+        return self._parser.ErrorLineNumber
+
+    def getPublicId(self):
+        return None
+
+    def getSystemId(self):
+        return None
+
+
 def serialize_single_xso(x):
     """
     Serialize a single XSO `x` to a string. This is potentially very slow and
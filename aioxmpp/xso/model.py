@@ -347,6 +347,28 @@ class _PropBase(metaclass=PropBaseMeta):
             )
         return value
 
+    def from_event_list(self, instance, events, pos, ctx):
+        """
+        Non-suspendable equivalent of :meth:`from_events`.
+
+        :param events: Events containing at least the complete subtree of the
+            child element.
+        :param pos: Index of the ``"start"`` event of the child element.
+        :return: Index of the first event after the subtree of the child.
+
+        The default implementation drives :meth:`from_events` with the events
+        of the subtree. Descriptors override this with an implementation which
+        does not need to resume a generator for each event.
+
+        .. versionadded:: 0.10
+        """
+        _, pos = drive_with_event_list(
+            self.from_events(instance, list(events[pos][1:]), ctx),
+            events,
+            pos,
+        )
+        return pos
+
     def mark_incomplete(self, instance):
         instance._xso_contents[self] = self.__INCOMPLETE
 
@@ -448,6 +470,11 @@ class _ChildPropBase(_PropBase):
         cls = self._tag_map[ev_args[0], ev_args[1]]
         return (yield from cls.parse_events(ev_args, ctx))
 
+    def _process_event_list(self, events, pos, ctx):
+        ev = events[pos]
+        cls = self._tag_map[ev[1], ev[2]]
+        return cls.parse_event_list(events, pos, ctx)
+
     def get_tag_map(self):
         """
         Return a dictionary mapping the tags of the supported classes to the
@@ -490,6 +517,8 @@ class Child(_ChildPropBase):
 
     .. automethod:: from_events
 
+    .. automethod:: from_event_list
+
     .. automethod:: to_sax
     """
 
@@ -539,6 +568,17 @@ class Child(_ChildPropBase):
         self.__set__(instance, obj)
         return obj
 
+    def from_event_list(self, instance, events, pos, ctx):
+        """
+        Like :meth:`from_events`, but operating on a sequence of already
+        collected events. See :meth:`.XMLStreamClass.parse_event_list`.
+
+        .. versionadded:: 0.10
+        """
+        obj, pos = self._process_event_list(events, pos, ctx)
+        self.__set__(instance, obj)
+        return pos
+
     def validate_contents(self, instance):
         try:
             obj = self.__get__(instance, type(instance))
@@ -572,6 +612,8 @@ class ChildList(_ChildPropBase):
 
     .. automethod:: from_events
 
+    .. automethod:: from_event_list
+
     .. automethod:: to_sax
     """
 
@@ -603,6 +645,17 @@ class ChildList(_ChildPropBase):
         self.__get__(instance, type(instance)).append(obj)
         return obj
 
+    def from_event_list(self, instance, events, pos, ctx):
+        """
+        Like :meth:`.Child.from_event_list`, but the new object is appended
+        to the list.
+
+        .. versionadded:: 0.10
+        """
+        obj, pos = self._process_event_list(events, pos, ctx)
+        self.__get__(instance, type(instance)).append(obj)
+        return pos
+
     def validate_contents(self, instance):
         for child in self.__get__(instance, type(instance)):
             child.validate()
@@ -890,6 +943,8 @@ class ChildText(_TypedPropBase):
 
     .. automethod:: from_events
 
+    .. automethod:: from_event_list
+
     .. automethod:: to_sax
 
     """
@@ -961,6 +1016,44 @@ class ChildText(_TypedPropBase):
             raise
         self._set_from_recv(instance, parsed)
 
+    def from_event_list(self, instance, events, pos, ctx):
+        """
+        Like :meth:`from_events`, but operating on a sequence of already
+        collected events. See :meth:`.XMLStreamClass.parse_event_list`.
+
+        .. versionadded:: 0.10
+        """
+        attrs = events[pos][3]
+        if attrs and self.attr_policy == UnknownAttrPolicy.FAIL:
+            raise ValueError("unexpected attribute (at text only node)")
+
+        parts = []
+        pos += 1
+        while True:
+            ev = events[pos]
+            ev_type = ev[0]
+            if ev_type == "text":
+                parts.append(ev[1])
+                pos += 1
+            elif ev_type == "start":
+                pos = enforce_unknown_child_policy_in_list(
+                    self.child_policy,
+                    events,
+                    pos)
+            elif ev_type == "end":
+                pos += 1
+                break
+
+        joined = "".join(parts)
+        try:
+            parsed = self.type_.parse(joined)
+        except (ValueError, TypeError):
+            if self.erroneous_as_absent:
+                return pos
+            raise
+        self._set_from_recv(instance, parsed)
+        return pos
+
     def to_sax(self, instance, dest):
         """
         Create a child node at `parent` with the tag :attr:`tag`. Set the text
@@ -1000,6 +1093,8 @@ class ChildMap(_ChildPropBase):
 
     .. automethod:: from_events
 
+    .. automethod:: from_event_list
+
     .. automethod:: to_sax
 
     The following utility function is useful when filling data into descriptors
@@ -1060,6 +1155,18 @@ class ChildMap(_ChildPropBase):
         mapping = self.__get__(instance, type(instance))
         mapping[self.key(obj)].append(obj)
 
+    def from_event_list(self, instance, events, pos, ctx):
+        """
+        Like :meth:`.ChildList.from_event_list`, but the object is appended to
+        the list associated with its tag in the dict.
+
+        .. versionadded:: 0.10
+        """
+        obj, pos = self._process_event_list(events, pos, ctx)
+        mapping = self.__get__(instance, type(instance))
+        mapping[self.key(obj)].append(obj)
+        return pos
+
     def validate_contents(self, instance):
         mapping = self.__get__(instance, type(instance))
         for objects in mapping.values():
@@ -1100,6 +1207,26 @@ class ChildLangMap(ChildMap):
         super().__init__(classes, key=self._lang_key, **kwargs)
 
 
+def _check_empty_in_list(prop, events, pos):
+    # enforce the text_policy and child_policy of a ChildTag or ChildFlag
+    # descriptor on the subtree starting at pos and return the index after the
+    # subtree
+    pos += 1
+    while True:
+        ev_type = events[pos][0]
+        if ev_type == "text":
+            if prop.text_policy == UnknownTextPolicy.FAIL:
+                raise ValueError("unexpected text")
+            pos += 1
+        elif ev_type == "start":
+            pos = enforce_unknown_child_policy_in_list(
+                prop.child_policy,
+                events,
+                pos)
+        elif ev_type == "end":
+            return pos + 1
+
+
 class ChildTag(_PropBase):
     """
     Represents a subset of the children of an XML element, as single value.
@@ -1213,6 +1340,15 @@ class ChildTag(_PropBase):
                 break
         self._set_from_recv(instance, self._converter.parse(tag))
 
+    def from_event_list(self, instance, events, pos, ctx):
+        ev = events[pos]
+        if ev[3] and self.attr_policy == UnknownAttrPolicy.FAIL:
+            raise ValueError("unexpected attributes")
+        tag = ev[1], ev[2]
+        pos = _check_empty_in_list(self, events, pos)
+        self._set_from_recv(instance, self._converter.parse(tag))
+        return pos
+
     def to_sax(self, instance, dest):
         value = self.__get__(instance, type(instance))
         if value is None:
@@ -1283,6 +1419,13 @@ class ChildFlag(_PropBase):
                 break
         self._set_from_recv(instance, True)
 
+    def from_event_list(self, instance, events, pos, ctx):
+        if events[pos][3] and self.attr_policy == UnknownAttrPolicy.FAIL:
+            raise ValueError("unexpected attributes")
+        pos = _check_empty_in_list(self, events, pos)
+        self._set_from_recv(instance, True)
+        return pos
+
     def to_sax(self, instance, dest):
         value = self.__get__(instance, type(instance))
         if not value:
@@ -1352,6 +1495,12 @@ class ChildValueList(_ChildPropBase):
         value = self.type_.unpack(obj)
         self._add(self.__get__(instance, type(instance)), value)
 
+    def from_event_list(self, instance, events, pos, ctx):
+        obj, pos = self._process_event_list(events, pos, ctx)
+        value = self.type_.unpack(obj)
+        self._add(self.__get__(instance, type(instance)), value)
+        return pos
+
     def to_sax(self, instance, dest):
         for value in self.__get__(instance, type(instance)):
             self.type_.pack(value).unparse_to_sax(dest)
@@ -1421,6 +1570,12 @@ class ChildValueMap(_ChildPropBase):
         key, value = self.type_.unpack(obj)
         self.__get__(instance, type(instance))[key] = value
 
+    def from_event_list(self, instance, events, pos, ctx):
+        obj, pos = self._process_event_list(events, pos, ctx)
+        key, value = self.type_.unpack(obj)
+        self.__get__(instance, type(instance))[key] = value
+        return pos
+
 
 class ChildValueMultiMap(_ChildPropBase):
     """
@@ -1471,6 +1626,12 @@ class ChildValueMultiMap(_ChildPropBase):
         key, value = self.type_.unpack(obj)
         self.__get__(instance, type(instance)).add(key, value)
 
+    def from_event_list(self, instance, events, pos, ctx):
+        obj, pos = self._process_event_list(events, pos, ctx)
+        key, value = self.type_.unpack(obj)
+        self.__get__(instance, type(instance)).add(key, value)
+        return pos
+
 
 class ChildTextMap(ChildValueMap):
     """
@@ -1494,6 +1655,186 @@ def _mark_attributes_incomplete(attrs, obj):
         attr.mark_incomplete(obj)
 
 
+class _ParsePlan:
+    """
+    Precompiled per-class information used when parsing an XSO class.
+
+    Plans are compiled by :class:`XMLStreamClass` when the class is created
+    and recompiled whenever descriptors are added to the class (either by
+    assignment or via :meth:`~.XMLStreamClass.register_child`). They replace
+    the lookups of the bookkeeping attributes (which, for
+    :attr:`~.XMLStreamClass.TEXT_PROPERTY` and
+    :attr:`~.XMLStreamClass.COLLECTOR_PROPERTY`, create a new bound descriptor
+    on each access) in the hot parsing paths.
+
+    .. attribute:: attr_map
+
+       The :attr:`~.XMLStreamClass.ATTR_MAP` of the class.
+
+    .. attribute:: missing_attrs
+
+       Tuple of ``(tag, descriptor)`` pairs of the attribute descriptors whose
+       :meth:`~.xso.Attr.handle_missing` may have an effect, in
+       :attr:`attr_map` order. Attributes which are neither required nor have
+       a `missing` callback are left out, as handling their absence is a
+       no-op.
+
+    .. attribute:: lang_attr
+
+       The descriptor handling ``xml:lang`` or :data:`None`.
+
+    .. attribute:: child_map
+
+       The :attr:`~.XMLStreamClass.CHILD_MAP` of the class.
+
+    .. attribute:: text_prop
+
+       The unbound :class:`~.xso.Text` descriptor or :data:`None`.
+
+    .. attribute:: collector_prop
+
+       The unbound :class:`~.xso.Collector` descriptor or :data:`None`.
+
+    The unknown attribute and child policies are deliberately not part of the
+    plan: they are only consulted on the slow path and may be rebound on a
+    class with subclasses.
+    """
+
+    __slots__ = ("attr_map", "missing_attrs", "lang_attr", "child_map",
+                 "text_prop", "collector_prop")
+
+    def __init__(self, cls):
+        self.attr_map = cls.ATTR_MAP
+        self.missing_attrs = tuple(
+            (key, prop)
+            for key, prop in self.attr_map.items()
+            if (prop.missing is not None or
+                prop.default is _PropBase.NO_DEFAULT or
+                type(prop).handle_missing is not Attr.handle_missing)
+        )
+        self.lang_attr = self.attr_map.get((namespaces.xml, "lang"))
+        self.child_map = cls.CHILD_MAP
+
+        text_prop = cls.TEXT_PROPERTY
+        if text_prop is not None:
+            text_prop = text_prop.xq_descriptor
+        self.text_prop = text_prop
+
+        collector_prop = cls.COLLECTOR_PROPERTY
+        if collector_prop is not None:
+            collector_prop = collector_prop.xq_descriptor
+        self.collector_prop = collector_prop
+
+
+class _UnparsePlan:
+    """
+    Precompiled per-class information used when serialising instances of an
+    XSO class.
+
+    Like :class:`_ParsePlan`, this is compiled by :class:`XMLStreamClass`
+    and replaced whenever descriptors are added to the class. The tag and the
+    namespace declarations are not part of the plan, since they are ordinary
+    class attributes which may be rebound.
+
+    .. attribute:: attr_props
+
+       Tuple of the :class:`~.xso.Attr` descriptors.
+
+    .. attribute:: text_prop
+
+       The unbound :class:`~.xso.Text` descriptor or :data:`None`.
+
+    .. attribute:: child_props
+
+       Tuple of the child descriptors, in the order of
+       :attr:`~.XMLStreamClass.CHILD_PROPS`.
+
+    .. attribute:: collector_prop
+
+       The unbound :class:`~.xso.Collector` descriptor or :data:`None`.
+    """
+
+    __slots__ = ("attr_props", "text_prop", "child_props", "collector_prop")
+
+    def __init__(self, cls, parse_plan):
+        self.attr_props = tuple(cls.ATTR_MAP.values())
+        self.text_prop = parse_plan.text_prop
+        self.child_props = tuple(cls.CHILD_PROPS)
+        self.collector_prop = parse_plan.collector_prop
+
+
+def _parse_start(cls, plan, ev_args, ctx):
+    obj = cls.__new__(cls)
+    attrs = ev_args[2]
+    attr_map = plan.attr_map.copy()
+    for key, value in attrs.items():
+        try:
+            prop = attr_map.pop(key)
+        except KeyError:
+            if cls.UNKNOWN_ATTR_POLICY == UnknownAttrPolicy.DROP:
+                continue
+            else:
+                raise ValueError(
+                    "unexpected attribute {!r} on {}".format(
+                        key,
+                        tag_to_str((ev_args[0], ev_args[1]))
+                    )) from None
+        try:
+            if not prop.from_value(obj, value):
+                # assignment failed due to recoverable error, treat as
+                # absent
+                attr_map[key] = prop
+        except:
+            prop.mark_incomplete(obj)
+            _mark_attributes_incomplete(attr_map.values(), obj)
+            logger.debug("while parsing XSO", exc_info=True)
+            # true means suppress
+            if not obj.xso_error_handler(
+                    prop,
+                    value,
+                    sys.exc_info()):
+                raise
+
+    for key, prop in plan.missing_attrs:
+        if key not in attr_map:
+            continue
+        try:
+            prop.handle_missing(obj, ctx)
+        except:
+            logger.debug("while parsing XSO", exc_info=True)
+            # true means suppress
+            if not obj.xso_error_handler(
+                    prop,
+                    None,
+                    sys.exc_info()):
+                raise
+
+    prop = plan.lang_attr
+    if prop is not None:
+        lang = prop.__get__(obj, cls)
+        if lang is not None:
+            ctx.lang = lang
+
+    return obj
+
+
+def _parse_collected_text(plan, obj, collected_text):
+    collected_text = "".join(collected_text)
+    try:
+        plan.text_prop.from_value(
+            obj,
+            collected_text
+        )
+    except:
+        logger.debug("while parsing XSO", exc_info=True)
+        # true means suppress
+        if not obj.xso_error_handler(
+                plan.text_prop,
+                collected_text,
+                sys.exc_info()):
+            raise
+
+
 class XMLStreamClass(xso_query.Class, abc.ABCMeta):
     """
     This metaclass is used to implement the fancy features of :class:`.XSO`
@@ -1555,6 +1896,21 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
        A set of all :class:`~.xso.Child` (or :class:`~.xso.ChildList`)
        descriptor objects of this class.
 
+    .. attribute:: PARSE_PLAN
+
+       An opaque object holding the information from the attributes above in
+       the form in which it is needed while parsing. It is compiled when the
+       class is created and recompiled whenever descriptors are added to the
+       class or :meth:`register_child` is used.
+
+       .. versionadded:: 0.10
+
+    .. attribute:: UNPARSE_PLAN
+
+       Like :attr:`PARSE_PLAN`, but for use by :meth:`.XSO.unparse_to_sax`.
+
+       .. versionadded:: 0.10
+
     .. attribute:: DECLARE_NS
 
        A dictionary which defines the namespace mappings which shall be
@@ -1760,6 +2116,12 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
     def __init__(cls, name, bases, namespace, protect=True):
         super().__init__(name, bases, namespace)
+        cls._compile_plans()
+
+    def _compile_plans(cls):
+        parse_plan = _ParsePlan(cls)
+        type.__setattr__(cls, "PARSE_PLAN", parse_plan)
+        type.__setattr__(cls, "UNPARSE_PLAN", _UnparsePlan(cls, parse_plan))
 
     def __setattr__(cls, name, value):
         try:
@@ -1806,6 +2168,9 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         super().__setattr__(name, value)
 
+        if isinstance(value, _PropBase):
+            cls._compile_plans()
+
     def __delattr__(cls, name):
         try:
             existing = getattr(cls, name).xq_descriptor
@@ -1838,58 +2203,9 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         This method is suspendable.
         """
+        plan = cls.PARSE_PLAN
         with parent_ctx as ctx:
-            obj = cls.__new__(cls)
-            attrs = ev_args[2]
-            attr_map = cls.ATTR_MAP.copy()
-            for key, value in attrs.items():
-                try:
-                    prop = attr_map.pop(key)
-                except KeyError:
-                    if cls.UNKNOWN_ATTR_POLICY == UnknownAttrPolicy.DROP:
-                        continue
-                    else:
-                        raise ValueError(
-                            "unexpected attribute {!r} on {}".format(
-                                key,
-                                tag_to_str((ev_args[0], ev_args[1]))
-                            )) from None
-                try:
-                    if not prop.from_value(obj, value):
-                        # assignment failed due to recoverable error, treat as
-                        # absent
-                        attr_map[key] = prop
-                except:
-                    prop.mark_incomplete(obj)
-                    _mark_attributes_incomplete(attr_map.values(), obj)
-                    logger.debug("while parsing XSO", exc_info=True)
-                    # true means suppress
-                    if not obj.xso_error_handler(
-                            prop,
-                            value,
-                            sys.exc_info()):
-                        raise
-
-            for key, prop in attr_map.items():
-                try:
-                    prop.handle_missing(obj, ctx)
-                except:
-                    logger.debug("while parsing XSO", exc_info=True)
-                    # true means suppress
-                    if not obj.xso_error_handler(
-                            prop,
-                            None,
-                            sys.exc_info()):
-                        raise
-
-            try:
-                prop = cls.ATTR_MAP[namespaces.xml, "lang"]
-            except KeyError:
-                pass
-            else:
-                lang = prop.__get__(obj, cls)
-                if lang is not None:
-                    ctx.lang = lang
+            obj = _parse_start(cls, plan, ev_args, ctx)
 
             collected_text = []
             while True:
@@ -1897,7 +2213,7 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                 if ev_type == "end":
                     break
                 elif ev_type == "text":
-                    if not cls.TEXT_PROPERTY:
+                    if plan.text_prop is None:
                         if ev_args[0].strip():
                             # true means suppress
                             if not obj.xso_error_handler(
@@ -1909,11 +2225,10 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                         collected_text.append(ev_args[0])
                 elif ev_type == "start":
                     try:
-                        handler = cls.CHILD_MAP[ev_args[0], ev_args[1]]
+                        handler = plan.child_map[ev_args[0], ev_args[1]]
                     except KeyError:
-                        if cls.COLLECTOR_PROPERTY:
-                            handler = cls.COLLECTOR_PROPERTY.xq_descriptor
-                        else:
+                        handler = plan.collector_prop
+                        if handler is None:
                             yield from enforce_unknown_child_policy(
                                 cls.UNKNOWN_CHILD_POLICY,
                                 ev_args,
@@ -1934,20 +2249,7 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                             raise
 
             if collected_text:
-                collected_text = "".join(collected_text)
-                try:
-                    cls.TEXT_PROPERTY.xq_descriptor.from_value(
-                        obj,
-                        collected_text
-                    )
-                except:
-                    logger.debug("while parsing XSO", exc_info=True)
-                    # true means suppress
-                    if not obj.xso_error_handler(
-                            cls.TEXT_PROPERTY.xq_descriptor,
-                            collected_text,
-                            sys.exc_info()):
-                        raise
+                _parse_collected_text(plan, obj, collected_text)
 
         obj.validate()
 
@@ -1955,6 +2257,93 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         return obj
 
+    def parse_event_list(cls, events, pos, parent_ctx):
+        """
+        Create an instance of this class from a sequence of already collected
+        events.
+
+        :param events: Events containing at least the complete subtree of the
+            element to parse.
+        :type events: :class:`~collections.abc.Sequence`
+        :param pos: Index of the ``"start"`` event of the element in `events`.
+        :type pos: :class:`int`
+        :param parent_ctx: The parsing context of the parent.
+        :return: The new instance and the index of the first event after the
+            subtree of the element.
+        :rtype: :class:`tuple` of the instance and :class:`int`
+
+        This is the non-suspendable equivalent of :meth:`parse_events`. It
+        produces the same results, including calls to
+        :meth:`~.XSO.xso_error_handler`, but avoids resuming a chain of
+        generators for each event. Descriptors are invoked using their
+        :meth:`~.xso.Child.from_event_list` method.
+
+        .. seealso::
+
+           You probably should not call this method directly, but instead use
+           :meth:`XSOParser.parse_event_list` or a :class:`SAXDriver` in
+           batched mode.
+
+        .. versionadded:: 0.10
+        """
+        plan = cls.PARSE_PLAN
+        with parent_ctx as ctx:
+            ev = events[pos]
+            obj = _parse_start(cls, plan, ev[1:], ctx)
+
+            collected_text = []
+            pos += 1
+            while True:
+                ev = events[pos]
+                ev_type = ev[0]
+                if ev_type == "end":
+                    pos += 1
+                    break
+                elif ev_type == "text":
+                    pos += 1
+                    if plan.text_prop is None:
+                        if ev[1].strip():
+                            # true means suppress
+                            if not obj.xso_error_handler(
+                                    None,
+                                    ev[1],
+                                    None):
+                                raise ValueError("unexpected text")
+                    else:
+                        collected_text.append(ev[1])
+                elif ev_type == "start":
+                    try:
+                        handler = plan.child_map[ev[1], ev[2]]
+                    except KeyError:
+                        handler = plan.collector_prop
+                        if handler is None:
+                            pos = enforce_unknown_child_policy_in_list(
+                                cls.UNKNOWN_CHILD_POLICY,
+                                events,
+                                pos,
+                                obj.xso_error_handler)
+                            continue
+                    try:
+                        pos = handler.from_event_list(obj, events, pos, ctx)
+                    except:
+                        logger.debug("while parsing XSO", exc_info=True)
+                        # true means suppress
+                        if not obj.xso_error_handler(
+                                handler,
+                                list(ev[1:]),
+                                sys.exc_info()):
+                            raise
+                        pos = skip_subtree(events, pos)
+
+            if collected_text:
+                _parse_collected_text(plan, obj, collected_text)
+
+        obj.validate()
+
+        obj.xso_after_load()
+
+        return obj, pos
+
     def register_child(cls, prop, child_cls):
         """
         Register a new :class:`XMLStreamClass` instance `child_cls` for a given
@@ -2000,6 +2389,7 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         prop.xq_descriptor._register(child_cls)
         cls.CHILD_MAP[child_cls.TAG] = prop.xq_descriptor
+        cls._compile_plans()
 
 
 # I know it makes only partially sense to have a separate metasubclass for
@@ -2016,6 +2406,8 @@ class CapturingXMLStreamClass(XMLStreamClass):
        :class:`CapturingXSO`
 
     .. automethod:: parse_events
+
+    .. automethod:: parse_event_list
     """
 
     def parse_events(cls, ev_args, parent_ctx):
@@ -2037,6 +2429,18 @@ class CapturingXMLStreamClass(XMLStreamClass):
 
         return result
 
+    def parse_event_list(cls, events, pos, parent_ctx):
+        """
+        Like :meth:`parse_events`, capture the events of the subtree
+        (including the start event) and call :meth:`_set_captured_events` on
+        the result of :meth:`.XSO.parse_event_list`.
+
+        .. versionadded:: 0.10
+        """
+        result, end = super().parse_event_list(events, pos, parent_ctx)
+        result._set_captured_events(list(events[pos:end]))
+        return result, end
+
 
 class XSO(metaclass=XMLStreamClass):
     """
@@ -2256,30 +2660,32 @@ class XSO(metaclass=XMLStreamClass):
         """
 
     def unparse_to_sax(self, dest):
-        # XXX: if anyone has an idea on how to optimize this, this is a hotspot
-        # when serialising XML
-        # things which do not suffice or even change anything:
-        # 1. pull things in local variables
-        # 2. get rid of the try/finally, even without any replacement
+        # this is a hotspot when serialising XML; the descriptors are taken
+        # from the precompiled plan to avoid iterating the ordered set of
+        # child descriptors and creating bound descriptors for the text and
+        # collector properties on each call
         cls = type(self)
+        plan = cls.UNPARSE_PLAN
+        declare_ns = cls.DECLARE_NS
+        tag = self.TAG
         attrib = {}
-        for prop in cls.ATTR_MAP.values():
+        for prop in plan.attr_props:
             prop.to_dict(self, attrib)
-        if cls.DECLARE_NS:
-            for prefix, uri in cls.DECLARE_NS.items():
+        if declare_ns:
+            for prefix, uri in declare_ns.items():
                 dest.startPrefixMapping(prefix, uri)
-        dest.startElementNS(self.TAG, None, attrib)
+        dest.startElementNS(tag, None, attrib)
         try:
-            if cls.TEXT_PROPERTY:
-                cls.TEXT_PROPERTY.to_sax(self, dest)
-            for prop in cls.CHILD_PROPS:
+            if plan.text_prop is not None:
+                plan.text_prop.to_sax(self, dest)
+            for prop in plan.child_props:
                 prop.to_sax(self, dest)
-            if cls.COLLECTOR_PROPERTY:
-                cls.COLLECTOR_PROPERTY.to_sax(self, dest)
+            if plan.collector_prop is not None:
+                plan.collector_prop.to_sax(self, dest)
         finally:
-            dest.endElementNS(self.TAG, None)
-            if cls.DECLARE_NS:
-                for prefix, uri in cls.DECLARE_NS.items():
+            dest.endElementNS(tag, None)
+            if declare_ns:
+                for prefix, uri in declare_ns.items():
                     dest.endPrefixMapping(prefix)
 
     def unparse_to_node(self, parent):
@@ -2341,16 +2747,40 @@ class SAXDriver(xml.sax.handler.ContentHandler):
     `on_emit` may be a callable. Whenever a suspendable function returned by
     `dest_generator_factory` returns, with the return value as sole argument.
 
+    If `batched` is true, the events are not forwarded one by one. Instead,
+    the events of each complete top-level element are collected and passed
+    in one go to the :meth:`~XSOParser.parse_event_list` method of
+    `dest_generator_factory` once the element has ended. This avoids resuming
+    the chain of suspendable functions for each event and is considerably
+    faster. If `dest_generator_factory` has no :meth:`parse_event_list`
+    method, the collected events are sent to the suspendable function as
+    usual.
+
     When you are done with a :class:`SAXDriver`, you should call :meth:`close`
     to clean up internal parser state.
 
     .. automethod:: close
+
+    .. versionchanged:: 0.10
+
+       The `batched` argument was added.
     """
 
-    def __init__(self, dest_generator_factory, on_emit=None):
+    def __init__(self, dest_generator_factory, on_emit=None, *,
+                 batched=False):
         self._on_emit = on_emit
         self._dest_factory = dest_generator_factory
         self._dest = None
+        if batched:
+            self._batch = []
+            self._depth = 0
+            self._parse_event_list = getattr(
+                dest_generator_factory,
+                "parse_event_list",
+                None,
+            )
+        else:
+            self._batch = None
 
     def _emit(self, value):
         if self._on_emit:
@@ -2369,15 +2799,40 @@ class SAXDriver(xml.sax.handler.ContentHandler):
             self._dest = None
             raise
 
+    def _send_batch(self, events):
+        if self._parse_event_list is not None:
+            self._parse_event_list(events)
+        else:
+            for ev in events:
+                self._send(ev)
+
     def startElementNS(self, name, qname, attributes):
         uri, localname = name
-        self._send(("start", uri, localname, dict(attributes)))
+        ev = ("start", uri, localname, dict(attributes))
+        if self._batch is None:
+            self._send(ev)
+            return
+        self._batch.append(ev)
+        self._depth += 1
 
     def characters(self, data):
-        self._send(("text", data))
+        if self._batch is None:
+            self._send(("text", data))
+        elif self._depth:
+            self._batch.append(("text", data))
+        else:
+            self._send_batch([("text", data)])
 
     def endElementNS(self, name, qname):
-        self._send(("end",))
+        if self._batch is None:
+            self._send(("end",))
+            return
+        self._batch.append(("end",))
+        self._depth -= 1
+        if not self._depth:
+            events = self._batch
+            self._batch = []
+            self._send_batch(events)
 
     def close(self):
         """
@@ -2386,6 +2841,9 @@ class SAXDriver(xml.sax.handler.ContentHandler):
         if self._dest is not None:
             self._dest.close()
             self._dest = None
+        if self._batch is not None:
+            self._batch = []
+            self._depth = 0
 
 
 class Context:
@@ -2434,6 +2892,12 @@ class XSOParser:
 
     .. automethod:: get_tag_map
 
+    Instead of driving the parser with one event at a time, the complete
+    events of a top-level element can be parsed at once using
+    :meth:`parse_event_list`:
+
+    .. automethod:: parse_event_list
+
     """
 
     def __init__(self):
@@ -2454,6 +2918,14 @@ class XSOParser:
         Add a class `cls` for parsing as root level element. When an object of
         `cls` type has been completely parsed, `callback` is called with the
         object as argument.
+
+        Elements are parsed using the :attr:`~.XMLStreamClass.PARSE_PLAN`
+        which the metaclass compiled for `cls`; no per-element inspection of
+        the class bookkeeping attributes takes place.
+
+        .. versionchanged:: 0.10
+
+           Parsing uses the precompiled per-class parse plan.
         """
         if cls.TAG in self._tag_map:
             raise ValueError(
@@ -2513,6 +2985,39 @@ class XSOParser:
                     ev_args)
             cb((yield from cls.parse_events(ev_args, self._ctx)))
 
+    def parse_event_list(self, events):
+        """
+        Parse a complete top-level element from a list of events.
+
+        :param events: The events of the top-level element, starting with its
+            ``"start"`` event and ending with the matching ``"end"`` event.
+        :type events: :class:`list`
+        :raises UnknownTopLevelTag: if no class is registered for the tag of
+            the element.
+
+        This is equivalent to sending the `events` into the suspendable
+        function created by calling the :class:`XSOParser`, but uses
+        :meth:`~.XMLStreamClass.parse_event_list` instead of
+        :meth:`~.XMLStreamClass.parse_events`. As with the suspendable
+        function, the callback registered with :meth:`add_class` is called
+        with the resulting object. Whitespace-only text is ignored.
+
+        .. versionadded:: 0.10
+        """
+        ev = events[0]
+        if ev[0] == "text":
+            if not ev[1].strip():
+                return
+            raise ValueError("unexpected text at top-level")
+
+        try:
+            cls, cb = self._tag_map[ev[1], ev[2]]
+        except KeyError:
+            raise UnknownTopLevelTag(
+                "unhandled top-level element",
+                list(ev[1:]))
+        cb(cls.parse_event_list(events, 0, self._ctx)[0])
+
 
 def drop_handler(ev_args):
     depth = 1
@@ -2536,26 +3041,99 @@ def enforce_unknown_child_policy(policy, ev_args, error_handler=None):
 
 
 def guard(dest, ev_args):
-    next(dest)
     depth = 1
+    try:
+        next(dest)
+    except Exception as exc:
+        error = exc
+    else:
+        while True:
+            ev = yield
+            if ev[0] == "start":
+                depth += 1
+            elif ev[0] == "end":
+                depth -= 1
+            try:
+                dest.send(ev)
+            except StopIteration as exc:
+                return exc.value
+            except Exception as exc:
+                error = exc
+                break
+    while depth > 0:
+        ev_type, *_ = yield
+        if ev_type == "start":
+            depth += 1
+        elif ev_type == "end":
+            depth -= 1
+    raise error
+
+
+def skip_subtree(events, pos):
+    """
+    Return the index of the first event after the subtree whose ``"start"``
+    event is at index `pos` in the sequence `events`.
+
+    This is the equivalent of :func:`drop_handler` for
+    :meth:`~.XMLStreamClass.parse_event_list`.
+
+    .. versionadded:: 0.10
+    """
+    depth = 0
     while True:
-        ev = yield
-        if ev[0] == "start":
+        ev_type = events[pos][0]
+        pos += 1
+        if ev_type == "start":
             depth += 1
-        elif ev[0] == "end":
+        elif ev_type == "end":
             depth -= 1
+            if not depth:
+                return pos
+
+
+def enforce_unknown_child_policy_in_list(policy, events, pos,
+                                         error_handler=None):
+    """
+    Equivalent of :func:`enforce_unknown_child_policy` for
+    :meth:`~.XMLStreamClass.parse_event_list`: return the index of the first
+    event after the subtree starting at `pos` if the child is to be dropped,
+    raise :class:`ValueError` otherwise.
+
+    .. versionadded:: 0.10
+    """
+    if policy != UnknownChildPolicy.DROP:
+        if (error_handler is None or
+                not error_handler(None, list(events[pos][1:]), None)):
+            raise ValueError("unexpected child")
+    return skip_subtree(events, pos)
+
+
+def drive_with_event_list(dest, events, pos):
+    """
+    Feed the events of the subtree whose ``"start"`` event is at index `pos` in
+    `events` into the suspendable function `dest`.
+
+    :return: The return value of `dest` and the index of the first event after
+        the subtree.
+
+    `dest` must have been created with the arguments of the ``"start"`` event
+    and must return after it received the matching ``"end"`` event (this is
+    the contract of the :meth:`from_events` methods of the descriptors). Any
+    exception raised by `dest` propagates.
+
+    This is used to provide :meth:`from_event_list` for descriptors which only
+    implement :meth:`from_events`.
+
+    .. versionadded:: 0.10
+    """
+    next(dest)
+    send = dest.send
+    while True:
+        pos += 1
         try:
-            dest.send(ev)
+            send(events[pos])
         except StopIteration as exc:
-            return exc.value
-        except Exception as exc:
-            error = exc
-            break
-    while depth > 0:
-        ev_type, *_ = yield
-        if ev_type == "end":
-            depth -= 1
-    raise error
+            return exc.value, pos + 1
 
 
 def lang_attr(instance, ctx):
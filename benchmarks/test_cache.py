@@ -19,14 +19,15 @@
 # <http://www.gnu.org/licenses/>.
 #
 ########################################################################
-import io
-import unittest
+import datetime
 import random
+import unittest
 
 import aioxmpp.cache
 
 from aioxmpp.benchtest import times, timed, record
 
+
 class TestLRUDict(unittest.TestCase):
     KEY = "aioxmpp.cache", "LRUDict"
 
@@ -42,9 +43,12 @@ class TestLRUDict(unittest.TestCase):
         for i in range(N):
             lru_dict[keys[i]] = object()
 
+        # draw the keys beforehand, so that only the cache is measured
+        access_keys = [keys[random.randrange(0, N)] for i in range(N)]
+
         with timed() as t:
-            for i in range(N):
-                lru_dict[keys[random.randrange(0, N)]]
+            for k in access_keys:
+                lru_dict[k]
 
         record(key, t.elapsed, "s")
 
@@ -60,8 +64,52 @@ class TestLRUDict(unittest.TestCase):
         for i in range(N):
             lru_dict[keys[i]] = object()
 
+        new_keys = [object() for i in range(N)]
+
+        with timed() as t:
+            for k in new_keys:
+                lru_dict[k] = k
+
+        record(key, t.elapsed, "s")
+
+    @times(1000)
+    def test_random_access_with_ttl(self):
+        key = self.KEY + ("random_access_with_ttl",)
+
+        N = 1000
+
+        lru_dict = aioxmpp.cache.LRUDict()
+        lru_dict.maxsize = N
+        lru_dict.ttl = datetime.timedelta(hours=1)
+        keys = [object() for i in range(N)]
+        for i in range(N):
+            lru_dict[keys[i]] = object()
+
+        access_keys = [keys[random.randrange(0, N)] for i in range(N)]
+
+        with timed() as t:
+            for k in access_keys:
+                lru_dict[k]
+
+        record(key, t.elapsed, "s")
+
+    @times(1000)
+    def test_weighted_inserts(self):
+        key = self.KEY + ("weighted_inserts",)
+
+        N = 1000
+
+        lru_dict = aioxmpp.cache.LRUDict()
+        lru_dict.maxsize = None
+        lru_dict.weight = len
+        lru_dict.max_weight = N * 10
+        for i in range(N):
+            lru_dict[object()] = b"x" * 10
+
+        new_keys = [object() for i in range(N)]
+
         with timed() as t:
-            for i in range(N):
-                lru_dict[object()] = object()
+            for k in new_keys:
+                lru_dict[k] = b"x" * 10
 
         record(key, t.elapsed, "s")
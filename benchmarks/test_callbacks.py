@@ -0,0 +1,90 @@
+########################################################################
+# File name: test_callbacks.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import unittest
+
+import aioxmpp.callbacks as callbacks
+
+from aioxmpp.benchtest import times, timed, record
+
+
+def listener(*args, **kwargs):
+    pass
+
+
+class TestAdHocSignal(unittest.TestCase):
+    KEY = "aioxmpp.callbacks", "AdHocSignal", "fire"
+
+    N = 10000
+
+    def _fire(self, nlisteners):
+        signal = callbacks.AdHocSignal()
+        for i in range(nlisteners):
+            signal.connect(listener)
+
+        with timed() as t:
+            for i in range(self.N):
+                signal.fire(i)
+
+        record(self.KEY + ("listeners={}".format(nlisteners),),
+               self.N / t.elapsed, "fire/s")
+
+    @times(20)
+    def test_fire_0(self):
+        self._fire(0)
+
+    @times(20)
+    def test_fire_1(self):
+        self._fire(1)
+
+    @times(20)
+    def test_fire_10(self):
+        self._fire(10)
+
+    @times(20)
+    def test_fire_100(self):
+        self._fire(100)
+
+
+class TestFilter(unittest.TestCase):
+    KEY = "aioxmpp.callbacks", "Filter", "filter"
+
+    N = 10000
+
+    def _filter(self, nfilters):
+        f = callbacks.Filter()
+        for i in range(nfilters):
+            f.register(lambda obj: obj, i)
+
+        with timed() as t:
+            for i in range(self.N):
+                f.filter(i)
+
+        record(self.KEY + ("filters={}".format(nfilters),),
+               self.N / t.elapsed, "filter/s")
+
+    @times(20)
+    def test_filter_0(self):
+        self._filter(0)
+
+    @times(20)
+    def test_filter_3(self):
+        self._filter(3)
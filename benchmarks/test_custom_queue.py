@@ -0,0 +1,91 @@
+########################################################################
+# File name: test_custom_queue.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import unittest
+
+import aioxmpp.custom_queue as custom_queue
+
+from aioxmpp.benchtest import times, timed, record
+
+
+CONTROL, INTERACTIVE, BULK = range(3)
+
+
+def make_weighted():
+    return custom_queue.WeightedFairQueue({
+        CONTROL: 16,
+        INTERACTIVE: 4,
+        BULK: 1,
+    })
+
+
+class TestOutboundQueue(unittest.TestCase):
+    KEY = "aioxmpp.custom_queue", "outbound"
+
+    N = 5000
+
+    def _ahead_of_ping(self, q, put):
+        # a ping (or an IQ result) is enqueued behind a bulk import
+        for i in range(self.N):
+            put(q, i, BULK)
+        put(q, "ping", CONTROL)
+
+        ahead = 0
+        while q.get_nowait() != "ping":
+            ahead += 1
+        return ahead
+
+    def test_ping_delay_fifo(self):
+        ahead = self._ahead_of_ping(
+            custom_queue.AsyncDeque(),
+            lambda q, item, cls: q.put_nowait(item),
+        )
+        record(self.KEY + ("ping_delay", "fifo"), ahead, "stanzas")
+
+    def test_ping_delay_weighted(self):
+        ahead = self._ahead_of_ping(
+            make_weighted(),
+            lambda q, item, cls: q.put_nowait(item, cls),
+        )
+        record(self.KEY + ("ping_delay", "weighted"), ahead, "stanzas")
+
+    @times(20)
+    def test_throughput_fifo(self):
+        q = custom_queue.AsyncDeque()
+        with timed() as t:
+            for i in range(self.N):
+                q.put_nowait(i)
+            for i in range(self.N):
+                q.get_nowait()
+        record(self.KEY + ("throughput", "fifo"), self.N / t.elapsed,
+               "stanza/s")
+
+    @times(20)
+    def test_throughput_weighted(self):
+        q = make_weighted()
+        classes = [BULK, INTERACTIVE, BULK, CONTROL]
+        with timed() as t:
+            for i in range(self.N):
+                q.put_nowait(i, classes[i % 4])
+            for i in range(self.N):
+                q.get_nowait()
+        record(self.KEY + ("throughput", "weighted"), self.N / t.elapsed,
+               "stanza/s")
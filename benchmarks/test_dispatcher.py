@@ -0,0 +1,109 @@
+########################################################################
+# File name: test_dispatcher.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import unittest
+
+import aioxmpp
+import aioxmpp.dispatcher
+
+from aioxmpp.benchtest import times, timed, record
+
+
+LOCAL_JID = aioxmpp.JID.fromstr("romeo@montague.lit")
+
+
+class Dispatcher(aioxmpp.dispatcher.SimpleStanzaDispatcher):
+    @property
+    def local_jid(self):
+        return LOCAL_JID
+
+
+class FakePresence:
+    __slots__ = ("from_", "type_")
+
+    def __init__(self, from_, type_):
+        self.from_ = from_
+        self.type_ = type_
+
+
+class TestSimpleStanzaDispatcher(unittest.TestCase):
+    KEY = "aioxmpp.dispatcher", "SimpleStanzaDispatcher"
+
+    N = 10000
+
+    @classmethod
+    def setUpClass(cls):
+        # presence storm from a large MUC: many occupants of one room, with
+        # handlers registered for the room (bare JID, wildcard resource),
+        # a few other peers and the catch-all handlers used by services
+        room = aioxmpp.JID.fromstr("coven@chat.shakespeare.lit")
+        cls.stanzas = [
+            FakePresence(
+                room.replace(resource="occupant{}".format(i % 1000)),
+                aioxmpp.PresenceType.AVAILABLE,
+            )
+            for i in range(cls.N)
+        ]
+        cls.room = room
+
+    def _make_dispatcher(self):
+        d = Dispatcher()
+        d.register_callback(aioxmpp.PresenceType.AVAILABLE, self.room,
+                            lambda stanza: None)
+        for i in range(100):
+            d.register_callback(
+                None,
+                aioxmpp.JID("peer{}".format(i), "example.com", None),
+                lambda stanza: None,
+            )
+        d.register_callback(aioxmpp.PresenceType.SUBSCRIBE, None,
+                            lambda stanza: None)
+        return d
+
+    @times(20)
+    def test_feed_room_presence(self):
+        d = self._make_dispatcher()
+        feed = d._feed
+        stanzas = self.stanzas
+
+        with timed() as t:
+            for stanza in stanzas:
+                feed(stanza)
+
+        record(self.KEY + ("feed", "room"), self.N / t.elapsed,
+               "stanza/s")
+
+    @times(20)
+    def test_feed_unmatched(self):
+        d = self._make_dispatcher()
+        feed = d._feed
+        stanzas = [
+            FakePresence(stanza.from_.replace(domain="elsewhere.lit"),
+                         stanza.type_)
+            for stanza in self.stanzas
+        ]
+
+        with timed() as t:
+            for stanza in stanzas:
+                feed(stanza)
+
+        record(self.KEY + ("feed", "unmatched"), self.N / t.elapsed,
+               "stanza/s")
@@ -0,0 +1,124 @@
+########################################################################
+# File name: test_host.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import asyncio
+import unittest
+
+import aioxmpp
+import aioxmpp.disco
+import aioxmpp.host
+
+from aioxmpp.benchtest import times, timed, record
+
+
+class TestServerInfoSharing(unittest.TestCase):
+    KEY = "aioxmpp.host", "query_info"
+
+    NCLIENTS = 200
+    NDOMAINS = 5
+
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.nqueries = 0
+        self.domains = [
+            aioxmpp.JID.fromstr("domain{}.example".format(i))
+            for i in range(self.NDOMAINS)
+        ]
+
+    def _make_clients(self):
+        self.clients = [
+            aioxmpp.Client(
+                aioxmpp.JID.fromstr(
+                    "user{}@domain{}.example".format(i, i % self.NDOMAINS)
+                ),
+                aioxmpp.make_security_layer(None),
+            )
+            for i in range(self.NCLIENTS)
+        ]
+
+    @asyncio.coroutine
+    def _send_and_decode_info_query(self, jid, node):
+        self.nqueries += 1
+        yield from asyncio.sleep(0)
+        return aioxmpp.disco.xso.InfoQuery(
+            identities=[
+                aioxmpp.disco.xso.Identity(category="server", type_="im")
+            ],
+            features=[
+                "urn:xmpp:ping",
+                "urn:xmpp:carbons:2",
+                "urn:xmpp:mam:2",
+            ],
+        )
+
+    def _summon_disco(self):
+        discos = []
+        for client in self.clients:
+            disco = client.summon(aioxmpp.DiscoClient)
+            disco.send_and_decode_info_query = \
+                self._send_and_decode_info_query
+            discos.append(disco)
+        return discos
+
+    def _query_servers(self, discos):
+        @asyncio.coroutine
+        def query_all(disco):
+            for domain in self.domains:
+                yield from disco.query_info(domain)
+
+        self.loop.run_until_complete(asyncio.gather(*[
+            query_all(disco)
+            for disco in discos
+        ]))
+
+    @times(3)
+    def test_separate_clients(self):
+        self.nqueries = 0
+        self._make_clients()
+        discos = self._summon_disco()
+
+        with timed() as t:
+            self._query_servers(discos)
+
+        self.assertEqual(self.nqueries, self.NCLIENTS * self.NDOMAINS)
+        record(self.KEY + ("separate",), t.elapsed, "s")
+        record(self.KEY + ("separate", "queries"), self.nqueries, "")
+
+    @times(3)
+    def test_hosted_clients(self):
+        self.nqueries = 0
+        self._make_clients()
+        host = aioxmpp.host.ClientHost()
+        for client in self.clients:
+            host.attach(client)
+        discos = self._summon_disco()
+
+        with timed() as t:
+            # one client warms the shared cache, the others hit it
+            self._query_servers(discos[:1])
+            self._query_servers(discos[1:])
+
+        self.assertEqual(self.nqueries, self.NDOMAINS)
+        record(self.KEY + ("hosted",), t.elapsed, "s")
+        record(self.KEY + ("hosted", "queries"), self.nqueries, "")
+
+        for client in self.clients:
+            host.detach(client)
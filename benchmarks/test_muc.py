@@ -0,0 +1,115 @@
+########################################################################
+# File name: test_presence.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import unittest
+import unittest.mock
+
+import aioxmpp
+import aioxmpp.muc.service as muc_service
+import aioxmpp.muc.xso as muc_xso
+
+from aioxmpp.benchtest import times, timed, record
+
+
+TEST_MUC_JID = aioxmpp.JID.fromstr("coven@chat.shakespeare.lit")
+
+
+def make_presence(nick, *, status_codes=set(), role="participant",
+                  show=aioxmpp.PresenceShow.NONE):
+    presence = aioxmpp.Presence(
+        type_=aioxmpp.PresenceType.AVAILABLE,
+        from_=TEST_MUC_JID.replace(resource=nick),
+        show=show,
+    )
+    presence.xep0045_muc_user = muc_xso.UserExt(
+        status_codes=set(status_codes),
+        items=[
+            muc_xso.UserItem(
+                affiliation="member",
+                role=role,
+                jid=aioxmpp.JID("user{}".format(nick), "example.com", None),
+            ),
+        ]
+    )
+    return presence
+
+
+class TestRoom(unittest.TestCase):
+    KEY = "aioxmpp.muc", "Room"
+
+    NOCCUPANTS = 5000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.join_storm = [
+            make_presence("nick{}".format(i))
+            for i in range(cls.NOCCUPANTS)
+        ]
+        cls.join_storm.append(make_presence("me", status_codes={110}))
+        cls.updates = [
+            make_presence("nick{}".format(i),
+                          show=aioxmpp.PresenceShow.AWAY,
+                          role="visitor" if i % 2 else "participant")
+            for i in range(cls.NOCCUPANTS)
+        ]
+
+    def _make_room(self):
+        return muc_service.Room(unittest.mock.Mock(), TEST_MUC_JID)
+
+    def _join(self, room):
+        for presence in self.join_storm:
+            room._inbound_muc_user_presence(presence)
+
+    @times(5)
+    def test_join_storm(self):
+        room = self._make_room()
+
+        with timed() as t:
+            self._join(room)
+
+        self.assertEqual(len(room.members), self.NOCCUPANTS + 1)
+        record(self.KEY + ("join", str(self.NOCCUPANTS)),
+               t.elapsed, "s")
+
+    @times(5)
+    def test_presence_updates(self):
+        room = self._make_room()
+        self._join(room)
+
+        with timed() as t:
+            for presence in self.updates:
+                room._inbound_muc_user_presence(presence)
+
+        record(self.KEY + ("update", str(self.NOCCUPANTS)),
+               self.NOCCUPANTS / t.elapsed, "presence/s")
+
+    @times(5)
+    def test_members_during_join(self):
+        # a UI refreshing its member count after each presence
+        room = self._make_room()
+
+        with timed() as t:
+            for presence in self.join_storm:
+                room._inbound_muc_user_presence(presence)
+                len(room.members)
+
+        record(self.KEY + ("join+members", str(self.NOCCUPANTS)),
+               t.elapsed, "s")
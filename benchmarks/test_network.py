@@ -0,0 +1,119 @@
+########################################################################
+# File name: test_network.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import asyncio
+import time
+import unittest
+import unittest.mock
+
+
+import aioxmpp.network as network
+
+from aioxmpp.benchtest import times, timed, record
+
+
+class FakeRRset:
+    ttl = 300
+
+
+class FakeAnswer:
+    rrset = FakeRRset()
+
+    def __init__(self, qname):
+        self.records = [
+            unittest.mock.Mock(priority=0, weight=1, port=5222,
+                               target="xmpp.{}.".format(qname))
+        ]
+
+    def __iter__(self):
+        return iter(self.records)
+
+
+class FakeResolver:
+    LATENCY = 0.002
+
+    def __init__(self):
+        self.nqueries = 0
+
+    def set_flags(self, flags):
+        pass
+
+    def query(self, qname, rdtype, tcp=False, **kwargs):
+        self.nqueries += 1
+        time.sleep(self.LATENCY)
+        return FakeAnswer(qname)
+
+
+class TestLookupSRV(unittest.TestCase):
+    KEY = "aioxmpp.network", "lookup_srv"
+
+    NACCOUNTS = 500
+    NDOMAINS = 5
+
+    def setUp(self):
+        self.resolver = FakeResolver()
+        network.set_resolver(self.resolver)
+        self.loop = asyncio.get_event_loop()
+        self.domains = [
+            "domain{}.example".format(i % self.NDOMAINS).encode("ascii")
+            for i in range(self.NACCOUNTS)
+        ]
+
+    def tearDown(self):
+        network.set_dns_cache(None)
+        network.reconfigure_resolver()
+
+    def _reconnect_storm(self):
+        return self.loop.run_until_complete(asyncio.gather(*[
+            network.lookup_srv(domain, "xmpp-client")
+            for domain in self.domains
+        ]))
+
+    @times(3)
+    def test_uncached(self):
+        self.resolver.nqueries = 0
+
+        with timed() as t:
+            self._reconnect_storm()
+
+        self.assertEqual(self.resolver.nqueries, self.NACCOUNTS)
+        record(self.KEY + ("uncached",), t.elapsed, "s")
+
+    @times(3)
+    def test_cached(self):
+        self.resolver.nqueries = 0
+        cache = network.DNSCache()
+        network.set_dns_cache(cache)
+
+        with timed() as t:
+            self._reconnect_storm()
+
+        self.assertEqual(self.resolver.nqueries, self.NDOMAINS)
+        record(self.KEY + ("cached", "cold"), t.elapsed, "s")
+
+        with timed() as t:
+            self._reconnect_storm()
+
+        self.assertEqual(self.resolver.nqueries, self.NDOMAINS)
+        record(self.KEY + ("cached", "warm"), t.elapsed, "s")
+        # the concurrent lookups of the cold storm are coalesced misses
+        self.assertEqual(cache.coalesced, self.NACCOUNTS - self.NDOMAINS)
+        self.assertEqual(cache.hits, self.NACCOUNTS)
@@ -0,0 +1,129 @@
+########################################################################
+# File name: test_presence.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import gc
+import tracemalloc
+import unittest
+
+import aioxmpp
+import aioxmpp.dispatcher
+import aioxmpp.presence
+
+from aioxmpp.benchtest import times, timed, record
+from aioxmpp.testutils import make_connected_client
+
+
+SHOWS = [
+    aioxmpp.PresenceShow.NONE,
+    aioxmpp.PresenceShow.AWAY,
+    aioxmpp.PresenceShow.CHAT,
+    aioxmpp.PresenceShow.XA,
+]
+
+
+def iter_presences(ncontacts, nresources):
+    for i in range(ncontacts):
+        bare = aioxmpp.JID("contact{}".format(i), "example.com", None)
+        for j in range(nresources):
+            st = aioxmpp.Presence(
+                type_=aioxmpp.PresenceType.AVAILABLE,
+                show=SHOWS[(i + j) % len(SHOWS)],
+                from_=bare.replace(resource="res{}".format(j)),
+            )
+            st.priority = j
+            yield st
+
+
+class TestPresenceClient(unittest.TestCase):
+    KEY = "aioxmpp.presence", "PresenceClient"
+
+    NCONTACTS = 10000
+    NRESOURCES = 3
+
+    @classmethod
+    def setUpClass(cls):
+        cls.presences = list(iter_presences(cls.NCONTACTS, cls.NRESOURCES))
+        cls.peers = sorted({st.from_.bare() for st in cls.presences})
+
+    def _make_client(self):
+        cc = make_connected_client()
+        dispatcher = aioxmpp.dispatcher.SimplePresenceDispatcher(cc)
+        return aioxmpp.PresenceClient(cc, dependencies={
+            aioxmpp.dispatcher.SimplePresenceDispatcher: dispatcher,
+        })
+
+    def _fill(self, svc):
+        for st in self.presences:
+            svc.handle_presence(st)
+
+    @times(5)
+    def test_most_available_stanza(self):
+        svc = self._make_client()
+        self._fill(svc)
+
+        with timed() as t:
+            for peer in self.peers:
+                svc.get_most_available_stanza(peer)
+
+        record(self.KEY + ("get_most_available_stanza",),
+               len(self.peers) / t.elapsed, "query/s")
+
+    @times(5)
+    def test_handle_presence(self):
+        svc = self._make_client()
+
+        with timed() as t:
+            self._fill(svc)
+
+        record(self.KEY + ("handle_presence",),
+               len(self.presences) / t.elapsed, "stanza/s")
+
+    def _measure_store(self, keep_stanzas):
+        # the stanzas are created while tracing and only referenced by the
+        # service afterwards, so that the whole retained memory is measured
+        svc = self._make_client()
+        svc.keep_stanzas = keep_stanzas
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for st in iter_presences(self.NCONTACTS, self.NRESOURCES):
+                svc.handle_presence(st)
+            del st
+            gc.collect()
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return after - before
+
+    @times(1)
+    def test_memory_with_stanzas(self):
+        size = self._measure_store(True)
+        record(self.KEY + ("memory", "keep_stanzas=True"),
+               size / len(self.presences), "B/resource")
+
+    @times(1)
+    def test_memory_compact(self):
+        size = self._measure_store(False)
+        record(self.KEY + ("memory", "keep_stanzas=False"),
+               size / len(self.presences), "B/resource")
@@ -0,0 +1,117 @@
+########################################################################
+# File name: test_roster.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import json
+import pathlib
+import tempfile
+import unittest
+
+import aioxmpp
+import aioxmpp.dispatcher
+import aioxmpp.roster
+import aioxmpp.roster.xso as roster_xso
+
+from aioxmpp.benchtest import times, timed, record
+from aioxmpp.testutils import make_connected_client, run_coroutine
+
+
+class TestRosterStore(unittest.TestCase):
+    KEY = "aioxmpp.roster", "RosterStore"
+
+    N = 20000
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / "roster.jsonl"
+        self.roster = self._make_roster()
+        self.roster.import_items_from_json(
+            (
+                ("contact{}@example.com".format(i), {
+                    "subscription": "both",
+                    "name": "Contact {}".format(i),
+                    "groups": ["group{}".format(i % 20)],
+                })
+                for i in range(self.N)
+            ),
+            "v0",
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _make_roster(self):
+        cc = make_connected_client()
+        return aioxmpp.RosterClient(cc, dependencies={
+            aioxmpp.dispatcher.SimplePresenceDispatcher:
+                aioxmpp.dispatcher.SimplePresenceDispatcher(cc),
+        })
+
+    def _push(self, i):
+        iq = aioxmpp.IQ(type_=aioxmpp.IQType.SET)
+        iq.payload = roster_xso.Query(
+            items=[
+                roster_xso.Item(
+                    jid=aioxmpp.JID("contact{}".format(i), "example.com",
+                                    None),
+                    name="Renamed {}".format(i),
+                    subscription="both",
+                    groups=[roster_xso.Group(name="group{}".format(i % 20))],
+                )
+            ],
+            ver="v{}".format(i + 1),
+        )
+        run_coroutine(self.roster.handle_roster_push(iq))
+
+    @times(5)
+    def test_push_with_full_rewrite(self):
+        with timed() as t:
+            for i in range(10):
+                self._push(i)
+                with self.path.open("w") as f:
+                    json.dump(self.roster.export_as_json(), f)
+
+        record(self.KEY + ("push", "full rewrite"), t.elapsed / 10, "s")
+
+    @times(5)
+    def test_push_with_store(self):
+        store = aioxmpp.roster.RosterStore(self.path)
+        store.compact(self.roster)
+        store.attach(self.roster)
+        try:
+            with timed() as t:
+                for i in range(10):
+                    self._push(i)
+        finally:
+            store.close()
+
+        record(self.KEY + ("push", "append"), t.elapsed / 10, "s")
+
+    @times(5)
+    def test_load(self):
+        store = aioxmpp.roster.RosterStore(self.path)
+        store.compact(self.roster)
+        roster = self._make_roster()
+
+        with timed() as t:
+            store.load(roster)
+
+        self.assertEqual(len(roster.items), self.N)
+        record(self.KEY + ("load",), t.elapsed, "s")
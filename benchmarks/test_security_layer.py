@@ -0,0 +1,255 @@
+########################################################################
+# File name: test_security_layer.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import asyncio
+import base64
+import hashlib
+import hmac
+import unittest
+
+import OpenSSL.crypto
+import OpenSSL.SSL
+
+import aiosasl
+
+import aioxmpp
+import aioxmpp.security_layer as security_layer
+
+from aioxmpp.benchtest import times, timed, record
+
+
+def make_server_context():
+    key = OpenSSL.crypto.PKey()
+    key.generate_key(OpenSSL.crypto.TYPE_RSA, 2048)
+    cert = OpenSSL.crypto.X509()
+    cert.get_subject().CN = "xmpp.example.test"
+    cert.set_serial_number(1)
+    cert.gmtime_adj_notBefore(0)
+    cert.gmtime_adj_notAfter(3600)
+    cert.set_issuer(cert.get_subject())
+    cert.set_pubkey(key)
+    cert.sign(key, "sha256")
+
+    ctx = OpenSSL.SSL.Context(OpenSSL.SSL.TLS_METHOD)
+    ctx.use_privatekey(key)
+    ctx.use_certificate(cert)
+    ctx.set_session_id(b"aioxmpp-benchmark")
+    return ctx
+
+
+def transfer(src, dest):
+    try:
+        data = src.bio_read(65536)
+    except OpenSSL.SSL.WantReadError:
+        return False
+    dest.bio_write(data)
+    return True
+
+
+class FakeTLSTransport:
+    def __init__(self, ssl_object):
+        self.ssl_object = ssl_object
+
+    def get_extra_info(self, name):
+        return {"ssl_object": self.ssl_object}[name]
+
+
+class AcceptingVerifier(security_layer.CertificateVerifier):
+    def verify_callback(self, conn, x509, errno, errdepth, returncode):
+        return True
+
+    @asyncio.coroutine
+    def post_handshake(self, transport):
+        pass
+
+
+class TestReconnectHandshakes(unittest.TestCase):
+    KEY = "aioxmpp.security_layer", "reconnect"
+
+    NRECONNECTS = 200
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server_ctx = make_server_context()
+
+    def _connect(self, session_cache):
+        verifier_factory = AcceptingVerifier
+        if session_cache is not None:
+            verifier_factory = session_cache.wrap_verifier_factory(
+                verifier_factory,
+            )
+
+        verifier = verifier_factory()
+        asyncio.get_event_loop().run_until_complete(
+            verifier.pre_handshake(
+                "example.test",
+                "xmpp.example.test",
+                5222,
+                None,
+            )
+        )
+
+        ctx = security_layer.default_ssl_context()
+        verifier.setup_context(ctx, None)
+
+        client = OpenSSL.SSL.Connection(ctx, None)
+        client.set_connect_state()
+        server = OpenSSL.SSL.Connection(self.server_ctx, None)
+        server.set_accept_state()
+
+        while True:
+            for conn in (client, server):
+                try:
+                    conn.do_handshake()
+                except OpenSSL.SSL.WantReadError:
+                    pass
+            transferred = transfer(client, server)
+            if not (transfer(server, client) or transferred):
+                break
+
+        asyncio.get_event_loop().run_until_complete(
+            verifier.post_handshake(FakeTLSTransport(client))
+        )
+
+        server.send(b"<stream:features/>")
+        transfer(server, client)
+        client.recv(4096)
+
+    def _reconnect_storm(self, session_cache):
+        for i in range(self.NRECONNECTS):
+            self._connect(session_cache)
+
+    @times(3)
+    def test_full_handshakes(self):
+        with timed() as t:
+            self._reconnect_storm(None)
+
+        record(self.KEY + ("full",), t.elapsed, "s")
+
+    @times(3)
+    def test_resumed_handshakes(self):
+        session_cache = security_layer.TLSSessionCache()
+        # the first connection establishes the session
+        self._connect(session_cache)
+
+        with timed() as t:
+            self._reconnect_storm(session_cache)
+
+        self.assertEqual(session_cache.hits, self.NRECONNECTS)
+        record(self.KEY + ("resumed",), t.elapsed, "s")
+
+
+class SCRAMServer:
+    """
+    Minimal SCRAM-SHA-1 server side which accepts any proof; the keys are
+    derived once, so that only the client side is measured.
+    """
+
+    def __init__(self, salt, iteration_count):
+        self.salt = salt
+        self.iteration_count = iteration_count
+        self.server_key = hmac.new(
+            hashlib.pbkdf2_hmac("sha1", b"secret", salt, iteration_count),
+            b"Server Key",
+            "sha1",
+        ).digest()
+
+    @asyncio.coroutine
+    def initiate(self, mechanism, payload):
+        self.client_first_bare = payload[3:]
+        client_nonce = self.client_first_bare.split(b",r=", 1)[1]
+        self.server_first = b"r=" + client_nonce + b"srv,s=" + \
+            base64.b64encode(self.salt) + b",i=" + \
+            str(self.iteration_count).encode("ascii")
+        self.final_sent = False
+        return aiosasl.SASLState.CHALLENGE, self.server_first
+
+    @asyncio.coroutine
+    def response(self, payload):
+        if self.final_sent:
+            return aiosasl.SASLState.SUCCESS, None
+        self.final_sent = True
+        without_proof = payload.rpartition(b",p=")[0]
+        auth_message = b",".join([
+            self.client_first_bare,
+            self.server_first,
+            without_proof,
+        ])
+        signature = hmac.new(self.server_key, auth_message, "sha1").digest()
+        return (aiosasl.SASLState.CHALLENGE,
+                b"v=" + base64.b64encode(signature))
+
+
+class TestSCRAMReconnectStorm(unittest.TestCase):
+    KEY = "aioxmpp.security_layer", "scram"
+
+    NACCOUNTS = 100
+    ITERATIONS = 4096
+    TOKEN = "SCRAM-SHA-1", aiosasl.SCRAM.any_supported(["SCRAM-SHA-1"])[1]
+
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.accounts = [
+            (aioxmpp.JID.fromstr("user{}@example.test".format(i)),
+             SCRAMServer("salt{}".format(i).encode("ascii"),
+                         self.ITERATIONS))
+            for i in range(self.NACCOUNTS)
+        ]
+
+    @asyncio.coroutine
+    def _credential_provider(self):
+        return "user", "secret"
+
+    def _reconnect_storm(self, key_cache):
+        for jid, server in self.accounts:
+            if key_cache is None:
+                mechanism = aiosasl.SCRAM(self._credential_provider)
+            else:
+                mechanism = security_layer._CachingSCRAM(
+                    self._credential_provider,
+                    key_cache,
+                    jid,
+                )
+            self.loop.run_until_complete(
+                mechanism.authenticate(server, self.TOKEN)
+            )
+
+    @times(3)
+    def test_uncached(self):
+        with timed() as t:
+            self._reconnect_storm(None)
+
+        record(self.KEY + ("uncached",), t.elapsed, "s")
+
+    @times(3)
+    def test_cached(self):
+        key_cache = security_layer.SCRAMKeyCache()
+
+        with timed() as t:
+            self._reconnect_storm(key_cache)
+
+        record(self.KEY + ("cached", "cold"), t.elapsed, "s")
+
+        with timed() as t:
+            self._reconnect_storm(key_cache)
+
+        self.assertEqual(key_cache.hits, self.NACCOUNTS)
+        record(self.KEY + ("cached", "warm"), t.elapsed, "s")
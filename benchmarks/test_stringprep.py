@@ -0,0 +1,121 @@
+########################################################################
+# File name: test_stringprep.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import random
+import unittest
+
+import aioxmpp.stringprep as stringprep
+
+from aioxmpp.benchtest import times, timed, record
+
+
+NICKNAMES_ASCII = [
+    "Romeo", "juliet", "Mercutio", "tybalt", "nurse", "Friar Laurence",
+    "benvolio_", "Paris[away]", "Lady.Capulet", "balthasar42",
+]
+
+NICKNAMES_UNICODE = [
+    "Jürgen", "Ærøskøbing", "Ωμέγα", "Дмитрий", "Łukasz", "José",
+    "Ça va", "Straße", "Ørjan", "Zoë",
+]
+
+
+def make_corpus(n, nicknames, *, seed=1):
+    """
+    Generate `n` JIDs (split into their parts) of MUC occupants, similar to
+    what a busy client sees in the ``from`` attributes of its stanzas.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n):
+        localpart = "room{}".format(rng.randrange(50))
+        domain = rng.choice(["conference.shakespeare.lit",
+                             "Chat.Example.ORG",
+                             "muc.capulet.lit"])
+        resource = "{} {}".format(rng.choice(nicknames), i % 100)
+        corpus.append((localpart, domain, resource))
+    return corpus
+
+
+class TestStringprepProfiles(unittest.TestCase):
+    KEY = "aioxmpp.stringprep"
+
+    N = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        cls.corpora = {
+            "ascii": make_corpus(cls.N, NICKNAMES_ASCII),
+            "unicode": make_corpus(cls.N, NICKNAMES_UNICODE),
+        }
+
+    def _run(self, corpus_name, nodeprep, nameprep, resourceprep):
+        corpus = self.corpora[corpus_name]
+        with timed() as t:
+            for localpart, domain, resource in corpus:
+                nodeprep(localpart, False)
+                nameprep(domain, False)
+                resourceprep(resource, False)
+        return len(corpus) / t.elapsed
+
+    @times(20)
+    def test_ascii_fast_path(self):
+        record(
+            (self.KEY, "ascii", "fast_path"),
+            self._run("ascii",
+                      stringprep.nodeprep,
+                      stringprep.nameprep,
+                      stringprep.resourceprep),
+            "jid/s",
+        )
+
+    @times(20)
+    def test_ascii_full(self):
+        record(
+            (self.KEY, "ascii", "full"),
+            self._run("ascii",
+                      stringprep._nodeprep_full,
+                      stringprep._nameprep_full,
+                      stringprep._resourceprep_full),
+            "jid/s",
+        )
+
+    @times(20)
+    def test_unicode_fast_path(self):
+        record(
+            (self.KEY, "unicode", "fast_path"),
+            self._run("unicode",
+                      stringprep.nodeprep,
+                      stringprep.nameprep,
+                      stringprep.resourceprep),
+            "jid/s",
+        )
+
+    @times(20)
+    def test_unicode_full(self):
+        record(
+            (self.KEY, "unicode", "full"),
+            self._run("unicode",
+                      stringprep._nodeprep_full,
+                      stringprep._nameprep_full,
+                      stringprep._resourceprep_full),
+            "jid/s",
+        )
@@ -25,6 +25,7 @@ import itertools
 import unittest
 import random
 
+import aioxmpp
 import aioxmpp.xso as xso
 import aioxmpp.xml
 
@@ -193,3 +194,114 @@ class Testwrite_single_xso(unittest.TestCase):
             aioxmpp.xml.write_single_xso(item, self.buf)
         record(key+("sz",), self.buf.tell(), "B")
         record(key+("rate",), self.buf.tell() / t.elapsed, "B/s")
+
+
+class TestParsers(unittest.TestCase):
+    KEY = "aioxmpp.xml", "parse"
+
+    STREAM_HEADER = (
+        b"<stream:stream xmlns:stream='http://etherx.jabber.org/streams'"
+        b" xmlns='uri:test' version='1.0' from='example.test' id='foo'>"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        samples = [DeepRoot() for i in range(10)]
+        for sample in samples:
+            sample.generate(rng)
+        samples.extend(ShallowRoot() for i in range(100))
+
+        buf = io.BytesIO()
+        for sample in samples:
+            aioxmpp.xml.write_single_xso(sample, buf)
+        cls.data = buf.getvalue()
+        # feed in chunks of similar size as what we get from the transport
+        cls.chunks = [
+            cls.data[i:i+4096]
+            for i in range(0, len(cls.data), 4096)
+        ]
+
+    def _parse(self, key, parser_factory):
+        received = []
+        xso_parser = xso.XSOParser()
+        xso_parser.add_class(DeepRoot, received.append)
+        xso_parser.add_class(ShallowRoot, received.append)
+
+        proc = aioxmpp.xml.XMPPXMLProcessor()
+        proc.stanza_parser = xso_parser
+
+        parser = parser_factory()
+        parser.setContentHandler(proc)
+        parser.feed(self.STREAM_HEADER)
+
+        with timed() as t:
+            for chunk in self.chunks:
+                parser.feed(chunk)
+
+        self.assertEqual(len(received), 110)
+        record(key+("rate",), len(self.data) / t.elapsed, "B/s")
+
+    @times(20)
+    def test_sax(self):
+        self._parse(self.KEY + ("sax",), aioxmpp.xml.make_parser)
+
+    @times(20)
+    def test_expat(self):
+        self._parse(self.KEY + ("expat",), aioxmpp.xml.ExpatParser)
+
+
+class TestSerializers(unittest.TestCase):
+    KEY = "aioxmpp.xml", "serialize"
+
+    N = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        from_ = aioxmpp.JID.fromstr("romeo@montague.lit/balcony")
+        to = aioxmpp.JID.fromstr("juliet@capulet.lit/garden")
+        cls.samples = []
+        for i in range(cls.N):
+            msg = aioxmpp.Message(
+                type_=aioxmpp.MessageType.CHAT,
+                from_=from_,
+                to=to,
+                id_="msg{}".format(i),
+            )
+            msg.body[None] = "Wherefore art thou, Romeo? ({})".format(i)
+            cls.samples.append(msg)
+        cls.to = to
+
+    def _make_stream(self, dest):
+        writer = aioxmpp.xml.XMLStreamWriter(
+            dest,
+            self.to,
+            nsmap={None: "jabber:client"},
+        )
+        writer.start()
+        return writer
+
+    @times(20)
+    def test_generator(self):
+        dest = io.BytesIO()
+        writer = self._make_stream(dest)
+        gen = writer._writer
+
+        with timed() as t:
+            for sample in self.samples:
+                with gen.buffer():
+                    sample.unparse_to_sax(gen)
+
+        record(self.KEY + ("generator",), self.N / t.elapsed, "stanza/s")
+
+    @times(20)
+    def test_bytes_serializer(self):
+        dest = io.BytesIO()
+        writer = self._make_stream(dest)
+
+        with timed() as t:
+            for sample in self.samples:
+                writer.send(sample)
+
+        record(self.KEY + ("bytes_serializer",), self.N / t.elapsed,
+               "stanza/s")
@@ -0,0 +1,141 @@
+########################################################################
+# File name: test_xso_parse.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import datetime
+import io
+import unittest
+
+import aioxmpp
+import aioxmpp.carbons.xso as carbons_xso
+import aioxmpp.misc
+import aioxmpp.xml
+import aioxmpp.xso as xso
+
+from aioxmpp.benchtest import times, timed, record
+
+
+TEST_FROM = aioxmpp.JID.fromstr("romeo@montague.lit/balcony")
+TEST_TO = aioxmpp.JID.fromstr("juliet@capulet.lit/garden")
+
+
+def make_message(i):
+    msg = aioxmpp.Message(
+        type_=aioxmpp.MessageType.CHAT,
+        from_=TEST_FROM,
+        to=TEST_TO,
+        id_="msg{}".format(i),
+    )
+    msg.body[None] = "Wherefore art thou, Romeo? ({})".format(i)
+    return msg
+
+
+def make_samples(n):
+    samples = []
+    for i in range(n):
+        msg = make_message(i)
+
+        if i % 3 == 0:
+            delay = aioxmpp.misc.Delay()
+            delay.from_ = TEST_FROM.bare()
+            delay.stamp = datetime.datetime(2002, 9, 10, 23, 8, 25)
+            delay.reason = "Offline Storage"
+            msg.xep0203_delay.append(delay)
+
+        if i % 5 == 0:
+            carbon = aioxmpp.Message(
+                type_=aioxmpp.MessageType.CHAT,
+                from_=TEST_FROM.bare(),
+                to=TEST_FROM,
+            )
+            carbon.xep0280_received = carbons_xso.Received()
+            carbon.xep0280_received.stanza = msg
+            msg = carbon
+
+        samples.append(msg)
+
+    return samples
+
+
+class TestXSOParser(unittest.TestCase):
+    KEY = "aioxmpp.xso", "parse", "message"
+
+    N = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        buf = io.BytesIO()
+        for sample in make_samples(cls.N):
+            aioxmpp.xml.write_single_xso(sample, buf)
+        cls.data = buf.getvalue()
+
+        # collect the events once so that only the XSO layer is measured
+        cls.events = []
+        driver = xso.SAXDriver(cls._collect_events)
+        parser = aioxmpp.xml.ExpatParser()
+        parser.setContentHandler(driver)
+        parser.feed(b"<root>")
+        parser.feed(cls.data)
+        # drop the start event of the wrapping root element
+        del cls.events[0]
+
+    @classmethod
+    def _collect_events(cls):
+        while True:
+            ev = yield
+            cls.events.append(ev)
+
+    def _make_parser(self, received):
+        xso_parser = xso.XSOParser()
+        xso_parser.add_class(aioxmpp.Message, received.append)
+        return xso_parser
+
+    @times(20)
+    def test_suspendable(self):
+        received = []
+        dest = self._make_parser(received)()
+        next(dest)
+
+        with timed() as t:
+            for ev in self.events:
+                dest.send(ev)
+
+        self.assertEqual(len(received), self.N)
+        record(self.KEY + ("suspendable",), self.N / t.elapsed, "stanza/s")
+
+    @times(20)
+    def test_batched(self):
+        received = []
+        xso_parser = self._make_parser(received)
+
+        with timed() as t:
+            start = 0
+            depth = 0
+            for i, ev in enumerate(self.events):
+                if ev[0] == "start":
+                    depth += 1
+                elif ev[0] == "end":
+                    depth -= 1
+                    if depth == 0:
+                        xso_parser.parse_event_list(self.events[start:i+1])
+                        start = i+1
+
+        self.assertEqual(len(received), self.N)
+        record(self.KEY + ("batched",), self.N / t.elapsed, "stanza/s")
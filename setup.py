@@ -35,7 +35,7 @@ with open(os.path.join(here, "README.rst"), encoding="utf-8") as f:
 version_mod = runpy.run_path("aioxmpp/_version.py")
 
 install_requires = [
-    'aiosasl>=0.3',  # need 0.2+ for LGPLv3
+    'aiosasl>=0.4',  # need 0.2+ for LGPLv3, 0.4+ for SCRAMHashInfo
     'aioopenssl>=0.1',
     'babel~=2.3',
     'dnspython~=1.0',
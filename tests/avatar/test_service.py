@@ -355,6 +355,60 @@ class TestAvatarService(unittest.TestCase):
         self.s.metadata_cache_size = 100
         self.assertEqual(self.s.metadata_cache_size, 100)
 
+    def test_metadata_cache_max_bytes(self):
+        self.assertIsNone(self.s.metadata_cache_max_bytes)
+        self.assertIsNone(self.s._metadata_cache.weight)
+
+        self.s.metadata_cache_max_bytes = 10000
+        self.assertEqual(self.s.metadata_cache_max_bytes, 10000)
+        self.assertIs(self.s._metadata_cache.weight,
+                      avatar_service._estimate_metadata_size)
+
+        self.s.metadata_cache_max_bytes = None
+        self.assertIsNone(self.s.metadata_cache_max_bytes)
+        self.assertIsNone(self.s._metadata_cache.weight)
+
+    def test_estimate_metadata_size(self):
+        self.assertEqual(avatar_service._estimate_metadata_size([]), 0)
+
+        metadata = [
+            avatar_service.PubsubAvatarDescriptor(
+                TEST_JID1, "abcd",
+                mime_type="image/png",
+                url=None,
+            ),
+            avatar_service.VCardAvatarDescriptor(
+                TEST_JID1, "ef",
+                image_bytes=b"x" * 1000,
+            ),
+        ]
+
+        self.assertEqual(
+            avatar_service._estimate_metadata_size(metadata),
+            128 + 4 + 9 + 128 + 2 + 1000,
+        )
+
+    def test_get_avatar_metadata_exceeding_max_bytes(self):
+        self.s.metadata_cache_max_bytes = 500
+
+        with contextlib.ExitStack() as e:
+            e.enter_context(unittest.mock.patch.object(
+                self.vcard, "get_vcard",
+                new=CoroutineMock()))
+            vcard_mock = unittest.mock.Mock()
+            vcard_mock.get_photo_data.return_value = b"x" * 1000
+            vcard_mock.get_photo_mime_type.return_value = "image/png"
+            self.vcard.get_vcard.return_value = vcard_mock
+
+            res = run_coroutine(self.s.get_avatar_metadata(
+                TEST_JID1,
+                disable_pep=True,
+            ))
+
+        self.assertEqual(len(res), 1)
+        self.assertEqual(res[0]._image_bytes, b"x" * 1000)
+        self.assertNotIn(TEST_JID1, self.s._metadata_cache)
+
     def test_handle_stream_destroyed_is_depsignal_handler(self):
         self.assertTrue(aioxmpp.service.is_depsignal_handler(
             aioxmpp.stream.StanzaStream,
@@ -30,6 +30,8 @@ import aioxmpp.disco.xso as disco_xso
 import aioxmpp.stanza as stanza
 import aioxmpp.structs as structs
 import aioxmpp.errors as errors
+import aioxmpp.xml
+import aioxmpp.cache
 
 from aioxmpp.utils import namespaces
 
@@ -1142,6 +1144,150 @@ class TestDiscoClient(unittest.TestCase):
             self.s.items_cache_size,
         )
 
+    def test_cache_max_bytes_defaults(self):
+        self.assertIsNone(self.s.info_cache_max_bytes)
+        self.assertIsNone(self.s.items_cache_max_bytes)
+        self.assertIsNone(self.s._info_pending.weight)
+        self.assertIsNone(self.s._items_pending.weight)
+
+    def test_info_cache_max_bytes_is_settable(self):
+        self.s.info_cache_max_bytes = 4096
+
+        self.assertEqual(self.s.info_cache_max_bytes, 4096)
+        self.assertEqual(self.s._info_pending.max_weight, 4096)
+        self.assertIs(
+            self.s._info_pending.weight,
+            disco_service._estimate_response_size,
+        )
+
+        self.s.info_cache_max_bytes = None
+
+        self.assertIsNone(self.s.info_cache_max_bytes)
+        self.assertIsNone(self.s._info_pending.max_weight)
+        self.assertIsNone(self.s._info_pending.weight)
+
+    def test_items_cache_max_bytes_is_settable(self):
+        self.s.items_cache_max_bytes = 4096
+
+        self.assertEqual(self.s.items_cache_max_bytes, 4096)
+        self.assertEqual(self.s._items_pending.max_weight, 4096)
+        self.assertIs(
+            self.s._items_pending.weight,
+            disco_service._estimate_response_size,
+        )
+
+        self.s.items_cache_max_bytes = None
+
+        self.assertIsNone(self.s.items_cache_max_bytes)
+        self.assertIsNone(self.s._items_pending.weight)
+
+    def test_estimate_response_size(self):
+        info = disco_xso.InfoQuery(features={"urn:example:feature"})
+        fut = asyncio.Future()
+        self.assertEqual(disco_service._estimate_response_size(fut), 0)
+
+        fut.set_result(info)
+        self.assertEqual(
+            disco_service._estimate_response_size(fut),
+            len(aioxmpp.xml.XSOBytesSerializer().serialize(info)),
+        )
+
+        fut = asyncio.Future()
+        fut.set_exception(ValueError())
+        self.assertEqual(disco_service._estimate_response_size(fut), 0)
+
+        fut = asyncio.Future()
+        fut.cancel()
+        self.assertEqual(disco_service._estimate_response_size(fut), 0)
+
+    def test_query_info_weighs_completed_results(self):
+        to1 = structs.JID.fromstr("user@foo.example/res1")
+        to2 = structs.JID.fromstr("user@foo.example/res2")
+        response = disco_xso.InfoQuery(features={"urn:example:feature"})
+        size = len(aioxmpp.xml.XSOBytesSerializer().serialize(response))
+
+        self.s.info_cache_max_bytes = size * 3 // 2
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            send_and_decode.return_value = response
+
+            run_coroutine(self.s.query_info(to1))
+            self.assertEqual(self.s._info_pending.total_weight, size)
+
+            run_coroutine(self.s.query_info(to2))
+            self.assertEqual(self.s._info_pending.total_weight, size)
+
+            # the first result has been purged
+            run_coroutine(self.s.query_info(to1))
+
+        self.assertEqual(len(send_and_decode.mock_calls), 3)
+
+    def test_query_info_weighs_cached_future_when_done(self):
+        to = structs.JID.fromstr("user@foo.example/res1")
+        response = disco_xso.InfoQuery(features={"urn:example:feature"})
+        size = len(aioxmpp.xml.XSOBytesSerializer().serialize(response))
+
+        self.s.info_cache_max_bytes = size * 3
+
+        fut = asyncio.Future()
+        self.s.set_info_future(to, None, fut)
+        self.assertEqual(self.s._info_pending.total_weight, 0)
+
+        fut.set_result(response)
+        result = run_coroutine(self.s.query_info(to))
+
+        self.assertIs(result, response)
+        self.assertEqual(self.s._info_pending.total_weight, size)
+
+    def test_query_items_weighs_completed_results(self):
+        to = structs.JID.fromstr("user@foo.example/res1")
+        response = disco_xso.ItemsQuery()
+        size = len(aioxmpp.xml.XSOBytesSerializer().serialize(response))
+
+        self.s.items_cache_max_bytes = size * 3
+        self.cc.send.return_value = response
+
+        run_coroutine(self.s.query_items(to))
+        self.assertEqual(self.s._items_pending.total_weight, size)
+
+        run_coroutine(self.s.query_items(to))
+        self.assertEqual(self.s._items_pending.total_weight, size)
+        self.assertEqual(len(self.cc.send.mock_calls), 1)
+
+    def test_cache_hits_do_not_reweigh(self):
+        to = structs.JID.fromstr("user@foo.example/res1")
+        self.s.info_cache_max_bytes = 4096
+        self.s.items_cache_max_bytes = 4096
+        self.cc.send.return_value = disco_xso.ItemsQuery()
+
+        with contextlib.ExitStack() as stack:
+            send_and_decode = stack.enter_context(unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock(),
+            ))
+            send_and_decode.return_value = disco_xso.InfoQuery()
+            reweigh = stack.enter_context(unittest.mock.patch.object(
+                aioxmpp.cache.LRUDict,
+                "reweigh",
+                autospec=True,
+            ))
+
+            for i in range(3):
+                run_coroutine(self.s.query_info(to))
+                run_coroutine(self.s.query_items(to))
+
+        self.assertCountEqual(
+            reweigh.mock_calls,
+            [
+                unittest.mock.call(self.s._info_pending, (to, None)),
+                unittest.mock.call(self.s._items_pending, (to, None)),
+            ]
+        )
+
     def test_query_info(self):
         to = structs.JID.fromstr("user@foo.example/res1")
         response = {}
@@ -1296,6 +1442,112 @@ class TestDiscoClient(unittest.TestCase):
             len(send_and_decode.mock_calls)
         )
 
+    def test_server_info_cache_defaults_to_None(self):
+        self.assertIsNone(self.s.server_info_cache)
+
+    def test_query_info_uses_server_info_cache_for_domains(self):
+        to = structs.JID.fromstr("foo.example")
+        response = {}
+        self.s.server_info_cache = {(to, "foobar"): response}
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            result = run_coroutine(
+                self.s.query_info(to, node="foobar")
+            )
+
+        self.assertIs(result, response)
+        send_and_decode.assert_not_called()
+
+    def test_query_info_fills_server_info_cache(self):
+        to = structs.JID.fromstr("foo.example")
+        response = {}
+        shared = {}
+        self.s.server_info_cache = shared
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            send_and_decode.return_value = response
+            result = run_coroutine(
+                self.s.query_info(to, node="foobar")
+            )
+
+        self.assertIs(result, response)
+        self.assertEqual(shared, {(to, "foobar"): response})
+
+        other = disco_service.DiscoClient(make_connected_client())
+        other.server_info_cache = shared
+
+        with unittest.mock.patch.object(
+                other,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as other_send_and_decode:
+            result = run_coroutine(
+                other.query_info(to, node="foobar")
+            )
+
+        self.assertIs(result, response)
+        other_send_and_decode.assert_not_called()
+
+    def test_query_info_ignores_server_info_cache_for_non_domains(self):
+        to = structs.JID.fromstr("user@foo.example/res1")
+        cached = {}
+        response = {}
+        shared = {(to, "foobar"): cached}
+        self.s.server_info_cache = shared
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            send_and_decode.return_value = response
+            result = run_coroutine(
+                self.s.query_info(to, node="foobar")
+            )
+
+        self.assertIs(result, response)
+        self.assertEqual(1, len(send_and_decode.mock_calls))
+        self.assertIs(shared[to, "foobar"], cached)
+
+    def test_query_info_require_fresh_bypasses_server_info_cache(self):
+        to = structs.JID.fromstr("foo.example")
+        response = {}
+        shared = {(to, "foobar"): {}}
+        self.s.server_info_cache = shared
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            send_and_decode.return_value = response
+            result = run_coroutine(
+                self.s.query_info(to, node="foobar", require_fresh=True)
+            )
+
+        self.assertIs(result, response)
+        self.assertEqual(1, len(send_and_decode.mock_calls))
+        self.assertIs(shared[to, "foobar"], response)
+
+    def test_query_info_no_cache_does_not_fill_server_info_cache(self):
+        to = structs.JID.fromstr("foo.example")
+        shared = {}
+        self.s.server_info_cache = shared
+
+        with unittest.mock.patch.object(
+                self.s,
+                "send_and_decode_info_query",
+                new=CoroutineMock()) as send_and_decode:
+            send_and_decode.return_value = {}
+            run_coroutine(
+                self.s.query_info(to, node="foobar", no_cache=True)
+            )
+
+        self.assertFalse(shared)
+
     def test_query_info_reraises_and_aliases_exception(self):
         to = structs.JID.fromstr("user@foo.example/res1")
 
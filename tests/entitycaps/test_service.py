@@ -488,6 +488,241 @@ class TestCache(unittest.TestCase):
 
             self.assertTrue((p / key.path).is_file())
 
+    def test_parsed_cache_size(self):
+        self.assertEqual(self.c.parsed_cache_size, 1024)
+        self.c.parsed_cache_size = 10
+        self.assertEqual(self.c.parsed_cache_size, 10)
+        self.assertEqual(self.c._parsed_cache.maxsize, 10)
+
+    def test_lookup_in_database_caches_parsed_entries(self):
+        base = unittest.mock.Mock()
+        base.p = unittest.mock.MagicMock()
+        self.c.set_system_db_path(base.p)
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(unittest.mock.patch(
+                "aioxmpp.xml.read_single_xso",
+                new=base.read_single_xso
+            ))
+
+            result1 = self.c.lookup_in_database(base.key)
+            result2 = self.c.lookup_in_database(base.key)
+
+        base.read_single_xso.assert_called_once_with(
+            base.p.__truediv__().open(),
+            disco.xso.InfoQuery,
+        )
+        self.assertEqual(result1, base.read_single_xso())
+        self.assertIs(result1, result2)
+
+    def test_setting_databases_clears_parsed_cache(self):
+        for setter in [self.c.set_system_db_path,
+                       self.c.set_user_db_path,
+                       self.c.set_system_db,
+                       self.c.set_user_db]:
+            self.c._parsed_cache[unittest.mock.sentinel.key] = \
+                unittest.mock.sentinel.value
+            setter(unittest.mock.sentinel.db)
+            self.assertEqual(len(self.c._parsed_cache), 0)
+
+    def test_system_db_used_in_lookup(self):
+        db = unittest.mock.Mock()
+        self.c.set_system_db(db)
+
+        result = self.c.lookup_in_database(unittest.mock.sentinel.key)
+
+        db.lookup.assert_called_once_with(unittest.mock.sentinel.key)
+        self.assertEqual(result, db.lookup())
+
+    def test_user_db_used_in_lookup_as_fallback(self):
+        system_db = unittest.mock.Mock()
+        system_db.lookup.side_effect = KeyError()
+        user_db = unittest.mock.Mock()
+        self.c.set_system_db(system_db)
+        self.c.set_user_db(user_db)
+
+        result = self.c.lookup_in_database(unittest.mock.sentinel.key)
+
+        system_db.lookup.assert_called_once_with(unittest.mock.sentinel.key)
+        user_db.lookup.assert_called_once_with(unittest.mock.sentinel.key)
+        self.assertEqual(result, user_db.lookup())
+
+    def test_lookup_raises_KeyError_if_not_in_dbs(self):
+        system_db = unittest.mock.Mock()
+        system_db.lookup.side_effect = KeyError()
+        user_db = unittest.mock.Mock()
+        user_db.lookup.side_effect = KeyError()
+        self.c.set_system_db(system_db)
+        self.c.set_user_db(user_db)
+
+        with self.assertRaises(KeyError):
+            self.c.lookup_in_database(unittest.mock.Mock())
+
+    def test_set_system_db_replaces_path_and_vice_versa(self):
+        self.c.set_system_db_path(unittest.mock.sentinel.path)
+        self.c.set_system_db(unittest.mock.sentinel.db)
+        self.assertIsNone(self.c._system_db_path)
+        self.assertEqual(self.c._system_db, unittest.mock.sentinel.db)
+
+        self.c.set_system_db_path(unittest.mock.sentinel.path)
+        self.assertIsNone(self.c._system_db)
+
+    def test_set_user_db_replaces_path_and_vice_versa(self):
+        self.c.set_user_db_path(unittest.mock.sentinel.path)
+        self.c.set_user_db(unittest.mock.sentinel.db)
+        self.assertIsNone(self.c._user_db_path)
+        self.assertEqual(self.c._user_db, unittest.mock.sentinel.db)
+
+        self.c.set_user_db_path(unittest.mock.sentinel.path)
+        self.assertIsNone(self.c._user_db)
+
+    def test_add_cache_entry_stores_in_user_db(self):
+        q = disco.xso.InfoQuery()
+        db = unittest.mock.Mock()
+        self.c.set_user_db(db)
+
+        with contextlib.ExitStack() as stack:
+            copy = stack.enter_context(unittest.mock.patch(
+                "copy.copy"
+            ))
+
+            run_in_executor = stack.enter_context(unittest.mock.patch.object(
+                asyncio.get_event_loop(),
+                "run_in_executor"
+            ))
+
+            async = stack.enter_context(unittest.mock.patch(
+                "asyncio.ensure_future"
+            ))
+
+            self.c.add_cache_entry(
+                unittest.mock.sentinel.key,
+                q,
+            )
+
+        run_in_executor.assert_called_once_with(
+            None,
+            db.store,
+            unittest.mock.sentinel.key,
+            q.captured_events,
+        )
+        async.assert_called_once_with(run_in_executor())
+
+        result = self.c.lookup_in_database(unittest.mock.sentinel.key)
+        self.assertEqual(result, copy())
+        db.lookup.assert_not_called()
+
+
+class TestSQLiteCapsDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / "caps.sqlite"
+        self.db = entitycaps_service.SQLiteCapsDatabase(self.path)
+
+        self.key = unittest.mock.Mock()
+        self.key.path = pathlib.Path("hashes") / "sha-1_foo.xml"
+
+        self.entry = disco.xso.InfoQuery()
+        self.entry.captured_events = [
+            ("start", self.entry.TAG[0], self.entry.TAG[1], {}),
+            ("start", self.entry.TAG[0], "feature", {(None, "var"): "foo"}),
+            ("end",),
+            ("end",),
+        ]
+
+    def tearDown(self):
+        self.db.close()
+        self.tempdir.cleanup()
+
+    def test_lookup_raises_KeyError_if_database_does_not_exist(self):
+        with self.assertRaises(KeyError):
+            self.db.lookup(self.key)
+        self.assertFalse(self.path.exists())
+
+    def test_store_and_lookup(self):
+        self.db.store(self.key, self.entry.captured_events)
+        self.assertTrue(self.path.is_file())
+
+        result = self.db.lookup(self.key)
+
+        self.assertIsInstance(result, disco.xso.InfoQuery)
+        self.assertSetEqual(result.features, {"foo"})
+
+    def test_lookup_raises_KeyError_for_unknown_key(self):
+        self.db.store(self.key, self.entry.captured_events)
+
+        other_key = unittest.mock.Mock()
+        other_key.path = pathlib.Path("hashes") / "sha-1_bar.xml"
+
+        with self.assertRaises(KeyError):
+            self.db.lookup(other_key)
+
+    def test_lookup_sees_entries_stored_later(self):
+        with self.assertRaises(KeyError):
+            self.db.lookup(self.key)
+
+        self.db.store(self.key, self.entry.captured_events)
+        self.db.lookup(self.key)
+
+        other_key = unittest.mock.Mock()
+        other_key.path = pathlib.Path("hashes") / "sha-1_bar.xml"
+        self.db.store(other_key, self.entry.captured_events)
+        self.db.lookup(other_key)
+
+    def test_store_replaces_entries(self):
+        self.db.store(self.key, self.entry.captured_events)
+        self.db.store(self.key, [
+            ("start", self.entry.TAG[0], self.entry.TAG[1], {}),
+            ("end",),
+        ])
+
+        result = self.db.lookup(self.key)
+        self.assertSetEqual(result.features, set())
+
+    def test_database_is_shared_between_instances(self):
+        self.db.store(self.key, self.entry.captured_events)
+
+        other = entitycaps_service.SQLiteCapsDatabase(self.path)
+        try:
+            result = other.lookup(self.key)
+        finally:
+            other.close()
+
+        self.assertSetEqual(result.features, {"foo"})
+
+    def test_import_directory(self):
+        dirpath = pathlib.Path(self.tempdir.name) / "db"
+        entitycaps_service.writeback(
+            dirpath / self.key.path,
+            self.entry.captured_events,
+        )
+        # existing entries are kept
+        other_key = unittest.mock.Mock()
+        other_key.path = pathlib.Path("hashes") / "sha-1_bar.xml"
+        entitycaps_service.writeback(
+            dirpath / other_key.path,
+            self.entry.captured_events,
+        )
+        self.db.store(other_key, [
+            ("start", self.entry.TAG[0], self.entry.TAG[1], {}),
+            ("end",),
+        ])
+
+        count = self.db.import_directory(dirpath)
+
+        self.assertEqual(count, 1)
+        self.assertSetEqual(self.db.lookup(self.key).features, {"foo"})
+        self.assertSetEqual(self.db.lookup(other_key).features, set())
+
+    def test_cache_with_sqlite_user_db(self):
+        cache = entitycaps_service.Cache()
+        cache.set_user_db(self.db)
+
+        self.db.store(self.key, self.entry.captured_events)
+
+        result = cache.lookup_in_database(self.key)
+        self.assertSetEqual(result.features, {"foo"})
+
 
 class TestService(unittest.TestCase):
     def setUp(self):
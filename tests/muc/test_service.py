@@ -20,6 +20,7 @@
 #
 ########################################################################
 import asyncio
+import collections.abc
 import contextlib
 import functools
 import unittest
@@ -415,12 +416,18 @@ class TestOccupant(unittest.TestCase):
                 unittest.mock.sentinel.is_self,
             )
 
+            # the uid is generated lazily
+            uuid4.assert_not_called()
+
+            uid = occ.uid
+
         uuid4.assert_called_once_with()
 
         self.assertEqual(
             b"urn:uuid:" + uuid_sentinel.bytes,
-            occ.uid,
+            uid,
         )
+        self.assertEqual(uid, occ.uid)
 
     def test_uid_from_jid_if_jid_is_known(self):
         presence = aioxmpp.stanza.Presence(
@@ -2787,6 +2794,247 @@ class TestRoom(unittest.TestCase):
 
         self.assertIs(self.jmuc.members[0], self.jmuc.me)
 
+    def _occupant_presence(self, nick, *,
+                           role="participant",
+                           affiliation="member",
+                           jid=None,
+                           type_=aioxmpp.structs.PresenceType.AVAILABLE,
+                           status_codes=set(),
+                           new_nick=None):
+        presence = aioxmpp.stanza.Presence(
+            type_=type_,
+            from_=TEST_MUC_JID.replace(resource=nick)
+        )
+        presence.xep0045_muc_user = muc_xso.UserExt(
+            status_codes=set(status_codes),
+            items=[
+                muc_xso.UserItem(affiliation=affiliation,
+                                 role=role,
+                                 jid=jid,
+                                 nick=new_nick),
+            ]
+        )
+        return presence
+
+    def test_members_is_live_view(self):
+        members = self.jmuc.members
+        self.assertIsInstance(members, muc_service.RoomMembers)
+        self.assertIsInstance(members, collections.abc.Sequence)
+        self.assertEqual(len(members), 0)
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch")
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("thirdwitch", status_codes={110})
+        )
+
+        self.assertIs(self.jmuc.members, members)
+        self.assertEqual(len(members), 2)
+        self.assertIs(members[0], self.jmuc.me)
+
+        first, = [occupant for occupant in members
+                  if occupant is not self.jmuc.me]
+        self.assertIn(first, members)
+        self.assertIn(self.jmuc.me, members)
+        self.assertNotIn(
+            muc_service.Occupant(TEST_MUC_JID.replace(resource="firstwitch"),
+                                 False),
+            members,
+        )
+        self.assertNotIn(None, members)
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence(
+                "firstwitch",
+                type_=aioxmpp.structs.PresenceType.UNAVAILABLE,
+                role="none",
+            )
+        )
+
+        self.assertSequenceEqual(list(members), [self.jmuc.me])
+        self.assertNotIn(first, members)
+
+    def test_members_snapshot_is_reused_until_occupants_change(self):
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch")
+        )
+
+        snapshot = self.jmuc._occupants.members()
+
+        # a presence change does not change the set of occupants
+        presence = self._occupant_presence("firstwitch")
+        presence.show = aioxmpp.PresenceShow.AWAY
+        self.jmuc._inbound_muc_user_presence(presence)
+
+        self.assertIs(self.jmuc._occupants.members(), snapshot)
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("secondwitch")
+        )
+
+        self.assertIsNot(self.jmuc._occupants.members(), snapshot)
+        self.assertEqual(len(self.jmuc._occupants.members()), 2)
+
+    def test_muc_get_occupant(self):
+        self.assertIsNone(self.jmuc.muc_get_occupant("firstwitch"))
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch")
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("thirdwitch", status_codes={110})
+        )
+
+        first = self.jmuc.muc_get_occupant("firstwitch")
+        self.assertEqual(first.nick, "firstwitch")
+        self.assertIs(self.jmuc.muc_get_occupant("thirdwitch"), self.jmuc.me)
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence(
+                "firstwitch",
+                type_=aioxmpp.structs.PresenceType.UNAVAILABLE,
+                status_codes={303},
+                new_nick="oldwitch",
+            )
+        )
+
+        self.assertIsNone(self.jmuc.muc_get_occupant("firstwitch"))
+        self.assertIs(self.jmuc.muc_get_occupant("oldwitch"), first)
+
+    def test_muc_get_occupants_by_role_and_affiliation(self):
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch", role="moderator",
+                                    affiliation="owner")
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("secondwitch")
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("thirdwitch", status_codes={110})
+        )
+
+        first = self.jmuc.muc_get_occupant("firstwitch")
+        second = self.jmuc.muc_get_occupant("secondwitch")
+
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("moderator"),
+            [first],
+        )
+        self.assertCountEqual(
+            self.jmuc.muc_get_occupants_by_role("participant"),
+            [second, self.jmuc.me],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_affiliation("owner"),
+            [first],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("visitor"),
+            [],
+        )
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("secondwitch", role="moderator",
+                                    affiliation="admin")
+        )
+
+        self.assertCountEqual(
+            self.jmuc.muc_get_occupants_by_role("moderator"),
+            [first, second],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("participant"),
+            [self.jmuc.me],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_affiliation("admin"),
+            [second],
+        )
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence(
+                "firstwitch",
+                type_=aioxmpp.structs.PresenceType.UNAVAILABLE,
+                role="none",
+                affiliation="owner",
+            )
+        )
+
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("moderator"),
+            [second],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_affiliation("owner"),
+            [],
+        )
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("none"),
+            [],
+        )
+
+    def test_muc_get_occupants_by_jid(self):
+        jid = TEST_ENTITY_JID.bare()
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch", jid=jid)
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("secondwitch")
+        )
+
+        first = self.jmuc.muc_get_occupant("firstwitch")
+        second = self.jmuc.muc_get_occupant("secondwitch")
+
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_jid(jid),
+            [first],
+        )
+
+        # the direct JID becomes known with a role change
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("secondwitch", jid=jid,
+                                    role="moderator")
+        )
+
+        self.assertCountEqual(
+            self.jmuc.muc_get_occupants_by_jid(jid),
+            [first, second],
+        )
+
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence(
+                "firstwitch",
+                type_=aioxmpp.structs.PresenceType.UNAVAILABLE,
+                role="none",
+            )
+        )
+
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_jid(jid),
+            [second],
+        )
+
+    def test_resume_clears_occupant_indices(self):
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("firstwitch", role="moderator")
+        )
+        self.jmuc._inbound_muc_user_presence(
+            self._occupant_presence("thirdwitch", status_codes={110})
+        )
+
+        members = self.jmuc.members
+        self.jmuc._resume()
+
+        self.assertEqual(len(members), 0)
+        self.assertIsNone(self.jmuc.me)
+        self.assertIsNone(self.jmuc.muc_get_occupant("firstwitch"))
+        self.assertSequenceEqual(
+            self.jmuc.muc_get_occupants_by_role("moderator"),
+            [],
+        )
+
     def test_muc_request_voice(self):
         run_coroutine(self.jmuc.muc_request_voice())
 
@@ -19,6 +19,7 @@
 # <http://www.gnu.org/licenses/>.
 #
 ########################################################################
+import random
 import types
 import unittest
 
@@ -231,6 +232,179 @@ class TestPresenceClient(unittest.TestCase):
     def test_get_most_available_stanza_returns_None_for_unavailable_JID(self):
         self.assertIsNone(self.s.get_most_available_stanza(TEST_PEER_JID1))
 
+    def test_get_most_available_stanza_prefers_latest_of_equal_states(self):
+        st1 = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                              from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(st1)
+        st2 = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                              from_=TEST_PEER_JID1.replace(resource="bar"))
+        self.s.handle_presence(st2)
+
+        self.assertIs(self.s.get_most_available_stanza(TEST_PEER_JID1), st2)
+
+        st3 = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                              from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(st3)
+
+        self.assertIs(self.s.get_most_available_stanza(TEST_PEER_JID1), st2)
+
+    def test_most_available_index_follows_presence_changes(self):
+        stdnd = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                                show=structs.PresenceShow.DND,
+                                from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(stdnd)
+        st = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                             from_=TEST_PEER_JID1.replace(resource="bar"))
+        self.s.handle_presence(st)
+
+        self.assertEqual(
+            self.s.get_most_available_resource(TEST_PEER_JID1),
+            "foo",
+        )
+
+        staway = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                                 show=structs.PresenceShow.AWAY,
+                                 from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(staway)
+
+        self.assertEqual(
+            self.s.get_most_available_resource(TEST_PEER_JID1),
+            "bar",
+        )
+
+        self.s.handle_presence(stanza.Presence(
+            type_=structs.PresenceType.UNAVAILABLE,
+            from_=TEST_PEER_JID1.replace(resource="bar"),
+        ))
+
+        self.assertIs(self.s.get_most_available_stanza(TEST_PEER_JID1),
+                      staway)
+
+        self.s.handle_presence(stanza.Presence(
+            type_=structs.PresenceType.UNAVAILABLE,
+            from_=TEST_PEER_JID1.replace(resource="foo"),
+        ))
+
+        self.assertIsNone(
+            self.s.get_most_available_resource(TEST_PEER_JID1)
+        )
+
+    def test_most_available_index_matches_sorting(self):
+        rng = random.Random(1)
+        shows = list(structs.PresenceShow)
+        resources = ["r{}".format(i) for i in range(6)]
+        received = {}
+
+        for i in range(500):
+            resource = rng.choice(resources)
+            jid = TEST_PEER_JID1.replace(resource=resource)
+            if rng.random() < 0.3:
+                st = stanza.Presence(
+                    type_=structs.PresenceType.UNAVAILABLE,
+                    from_=jid,
+                )
+                received.pop(resource, None)
+            else:
+                st = stanza.Presence(
+                    type_=structs.PresenceType.AVAILABLE,
+                    show=rng.choice(shows),
+                    from_=jid,
+                )
+                received[resource] = st
+            self.s.handle_presence(st)
+
+            expected = sorted(
+                received.values(),
+                key=structs.PresenceState.from_stanza,
+            )
+            self.assertIs(
+                self.s.get_most_available_stanza(TEST_PEER_JID1),
+                expected[-1] if expected else None,
+            )
+
+    def test_get_resource_presence(self):
+        self.assertIsNone(self.s.get_resource_presence(
+            TEST_PEER_JID1.replace(resource="foo"),
+        ))
+
+        st = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                             show=structs.PresenceShow.CHAT,
+                             from_=TEST_PEER_JID1.replace(resource="foo"))
+        st.priority = 10
+        st.status[None] = "hello"
+        self.s.handle_presence(st)
+
+        info = self.s.get_resource_presence(st.from_)
+        self.assertIsInstance(info, presence_service.ResourcePresence)
+        self.assertEqual(
+            info.state,
+            structs.PresenceState(True, structs.PresenceShow.CHAT),
+        )
+        self.assertEqual(info.priority, 10)
+        self.assertEqual(info.status, {None: "hello"})
+        self.assertIs(info.stanza, st)
+
+        self.assertIsNone(self.s.get_resource_presence(
+            TEST_PEER_JID1.replace(resource="bar"),
+        ))
+
+    def test_keep_stanzas(self):
+        self.assertTrue(self.s.keep_stanzas)
+
+        st1 = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                              from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(st1)
+
+        self.s.keep_stanzas = False
+        self.assertFalse(self.s.keep_stanzas)
+
+        self.assertIsNone(self.s.get_resource_presence(st1.from_).stanza)
+
+        st2 = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                              show=structs.PresenceShow.AWAY,
+                              from_=TEST_PEER_JID1.replace(resource="bar"))
+        st2.priority = -1
+        st2.status[None] = "away"
+        self.s.handle_presence(st2)
+
+        self.assertIsNone(self.s.get_resource_presence(st2.from_).stanza)
+
+        result = self.s.get_stanza(st2.from_)
+        self.assertIsNot(result, st2)
+        self.assertEqual(result.type_, structs.PresenceType.AVAILABLE)
+        self.assertEqual(result.show, structs.PresenceShow.AWAY)
+        self.assertEqual(result.from_, st2.from_)
+        self.assertEqual(result.priority, -1)
+        self.assertEqual(result.status, {None: "away"})
+
+        self.assertEqual(
+            self.s.get_most_available_stanza(TEST_PEER_JID1).from_,
+            st1.from_,
+        )
+        self.assertSetEqual(
+            set(self.s.get_peer_resources(TEST_PEER_JID1)),
+            {"foo", "bar"},
+        )
+
+    def test_keep_stanzas_keeps_error_stanzas(self):
+        self.s.keep_stanzas = False
+
+        st = stanza.Presence(type_=structs.PresenceType.ERROR,
+                             from_=TEST_PEER_JID1)
+        self.s.handle_presence(st)
+
+        self.assertIs(self.s.get_stanza(st.from_), st)
+
+    def test_unavailable_peers_are_forgotten(self):
+        st = stanza.Presence(type_=structs.PresenceType.AVAILABLE,
+                             from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(st)
+        st = stanza.Presence(type_=structs.PresenceType.UNAVAILABLE,
+                             from_=TEST_PEER_JID1.replace(resource="foo"))
+        self.s.handle_presence(st)
+
+        self.assertNotIn(TEST_PEER_JID1, self.s._presences)
+
     def test_handle_presence_emits_available_signals(self):
         base = unittest.mock.Mock()
         base.bare.return_value = False
@@ -421,6 +595,21 @@ class TestPresenceClient(unittest.TestCase):
             base.mock_calls
         )
 
+    def test_handle_presence_error_without_available_resources(self):
+        base = unittest.mock.Mock()
+        base.bare.return_value = False
+        base.full.return_value = False
+
+        self.s.on_unavailable.connect(base.full)
+        self.s.on_bare_unavailable.connect(base.bare)
+
+        st = stanza.Presence(type_=structs.PresenceType.ERROR,
+                             from_=TEST_PEER_JID1)
+        self.s.handle_presence(st)
+        self.s.handle_presence(st)
+
+        self.assertSequenceEqual(base.mock_calls, [])
+
     def tearDown(self):
         del self.s
         del self.cc
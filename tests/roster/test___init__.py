@@ -25,6 +25,7 @@ import aioxmpp
 import aioxmpp.roster as roster
 import aioxmpp.roster.xso as roster_xso
 import aioxmpp.roster.service as roster_service
+import aioxmpp.roster.store as roster_store
 
 
 class TestExports(unittest.TestCase):
@@ -40,3 +41,6 @@ class TestExports(unittest.TestCase):
 
     def test_Item(self):
         self.assertIs(roster.Item, roster_service.Item)
+
+    def test_RosterStore(self):
+        self.assertIs(roster.RosterStore, roster_store.RosterStore)
@@ -405,6 +405,29 @@ class TestService(unittest.TestCase):
         self.assertIn(self.user2, self.s.items)
         self.assertEqual("foobarbaz", self.s.version)
 
+    def test_handle_roster_push_emits_on_update_applied(self):
+        request = roster_xso.Query(
+            items=[
+                roster_xso.Item(
+                    jid=self.user1,
+                    subscription="remove"),
+            ],
+            ver="foobarbaz"
+        )
+
+        iq = stanza.IQ(type_=structs.IQType.SET)
+        iq.payload = request
+
+        def check(version):
+            # the update is complete when the event fires
+            self.assertNotIn(self.user1, self.s.items)
+
+        self.listener.on_update_applied.side_effect = check
+
+        run_coroutine(self.s.handle_roster_push(iq))
+
+        self.listener.on_update_applied.assert_called_once_with("foobarbaz")
+
     def test_item_objects_do_not_change_during_push(self):
         old_item = self.s.items[self.user1]
 
@@ -497,6 +520,37 @@ class TestService(unittest.TestCase):
             cb.mock_calls
         )
 
+    def test_initial_roster_emits_on_update_applied(self):
+        response = roster_xso.Query(
+            items=[
+                roster_xso.Item(
+                    jid=self.user2,
+                    name="some bar user",
+                    subscription="both"
+                )
+            ],
+            ver="fnord"
+        )
+
+        base = unittest.mock.Mock()
+        base.update_applied.return_value = None
+        base.initial_roster_received.return_value = None
+        self.s.on_update_applied.connect(base.update_applied)
+        self.s.on_initial_roster_received.connect(
+            base.initial_roster_received
+        )
+
+        self.cc.send.return_value = response
+        run_coroutine(self.cc.before_stream_established())
+
+        self.assertSequenceEqual(
+            base.mock_calls,
+            [
+                unittest.mock.call.update_applied("fnord"),
+                unittest.mock.call.initial_roster_received(),
+            ]
+        )
+
     def test_initial_roster_fires_group_event(self):
         response = roster_xso.Query(
             items=[
@@ -1087,6 +1141,32 @@ class TestService(unittest.TestCase):
 
         self.assertSequenceEqual([], cb.mock_calls)
 
+    def test_export_items_as_json(self):
+        self.assertDictEqual(
+            dict(self.s.export_items_as_json()),
+            self.s.export_as_json()["items"],
+        )
+
+    def test_import_items_from_json_consumes_iterator(self):
+        jid1 = structs.JID.fromstr("fnord@foo.example")
+
+        def generate():
+            yield str(jid1), {
+                "name": "foo fnord",
+                "subscription": "both",
+                "groups": ["a"],
+            }
+
+        cb = unittest.mock.Mock()
+        with self.s.on_entry_added.context_connect(cb):
+            self.s.import_items_from_json(generate(), "v2")
+
+        self.assertEqual("v2", self.s.version)
+        self.assertSetEqual(set(self.s.items), {jid1})
+        self.assertEqual(self.s.items[jid1].name, "foo fnord")
+        self.assertSetEqual(set(self.s.groups), {"a"})
+        self.assertSequenceEqual([], cb.mock_calls)
+
     def test_do_not_send_versioned_request_if_not_supported_by_server(self):
         response = roster_xso.Query()
 
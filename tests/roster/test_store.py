@@ -0,0 +1,264 @@
+########################################################################
+# File name: test_store.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import contextlib
+import json
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import aioxmpp.dispatcher
+import aioxmpp.roster.service as roster_service
+import aioxmpp.roster.store as roster_store
+import aioxmpp.roster.xso as roster_xso
+import aioxmpp.stanza as stanza
+import aioxmpp.structs as structs
+
+from aioxmpp.testutils import (
+    make_connected_client,
+    run_coroutine,
+)
+
+
+TEST_JID1 = structs.JID.fromstr("user@foo.example")
+TEST_JID2 = structs.JID.fromstr("user@bar.example")
+TEST_JID3 = structs.JID.fromstr("fnord@bar.example")
+
+
+class TestRosterStore(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / "roster" / "data.jsonl"
+        self.roster = self._make_roster()
+        self.roster.import_from_json({
+            "items": {
+                str(TEST_JID1): {
+                    "subscription": "both",
+                    "groups": ["group1"],
+                },
+                str(TEST_JID2): {
+                    "subscription": "to",
+                    "name": "bar user",
+                },
+            },
+            "ver": "v1",
+        })
+        self.store = roster_store.RosterStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tempdir.cleanup()
+
+    def _make_roster(self):
+        cc = make_connected_client()
+        return roster_service.RosterClient(cc, dependencies={
+            aioxmpp.dispatcher.SimplePresenceDispatcher:
+                aioxmpp.dispatcher.SimplePresenceDispatcher(cc),
+        })
+
+    def _push(self, ver, *items):
+        iq = stanza.IQ(type_=structs.IQType.SET)
+        iq.payload = roster_xso.Query(items=list(items), ver=ver)
+        run_coroutine(self.roster.handle_roster_push(iq))
+
+    def _reload(self):
+        roster = self._make_roster()
+        roster_store.RosterStore(self.path).load(roster)
+        return roster
+
+    def _read_records(self):
+        with self.path.open("r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_path(self):
+        self.assertEqual(self.store.path, self.path)
+
+    def test_load_missing_file_empties_roster(self):
+        self.store.load(self.roster)
+
+        self.assertDictEqual(self.roster.items, {})
+        self.assertIsNone(self.roster.version)
+
+    def test_compact_and_load(self):
+        self.store.compact(self.roster)
+
+        roster = self._reload()
+
+        self.assertEqual(
+            roster.export_as_json(),
+            self.roster.export_as_json(),
+        )
+        self.assertSetEqual(set(roster.groups), {"group1"})
+
+    def test_compact_requires_roster(self):
+        with self.assertRaisesRegex(RuntimeError, "not attached"):
+            self.store.compact()
+
+    def test_attach_appends_changed_items_only(self):
+        self.store.compact(self.roster)
+        self.store.attach(self.roster)
+        nrecords = len(self._read_records())
+
+        self._push(
+            "v2",
+            roster_xso.Item(jid=TEST_JID2, name="new name",
+                            subscription="to"),
+            roster_xso.Item(jid=TEST_JID3, subscription="none"),
+        )
+
+        records = self._read_records()[nrecords:]
+        self.assertCountEqual(
+            records[:-1],
+            [
+                {"jid": str(TEST_JID2),
+                 "item": self.roster.items[TEST_JID2].export_as_json()},
+                {"jid": str(TEST_JID3),
+                 "item": self.roster.items[TEST_JID3].export_as_json()},
+            ]
+        )
+        self.assertEqual(records[-1], {"ver": "v2"})
+
+        roster = self._reload()
+        self.assertEqual(
+            roster.export_as_json(),
+            self.roster.export_as_json(),
+        )
+
+    def test_attach_appends_removals(self):
+        self.store.compact(self.roster)
+        self.store.attach(self.roster)
+
+        self._push(
+            "v2",
+            roster_xso.Item(jid=TEST_JID1, subscription="remove"),
+        )
+
+        self.assertSequenceEqual(
+            self._read_records()[-2:],
+            [
+                {"jid": str(TEST_JID1)},
+                {"ver": "v2"},
+            ]
+        )
+
+        roster = self._reload()
+        self.assertSetEqual(set(roster.items), {TEST_JID2})
+        self.assertDictEqual(roster.groups, {})
+        self.assertEqual(roster.version, "v2")
+
+    def test_attach_twice_raises(self):
+        self.store.attach(self.roster)
+        with self.assertRaisesRegex(RuntimeError, "already attached"):
+            self.store.attach(self.roster)
+
+    def test_detach_stops_writing(self):
+        self.store.compact(self.roster)
+        self.store.attach(self.roster)
+        self.store.detach()
+        self.store.detach()
+
+        self._push(
+            "v2",
+            roster_xso.Item(jid=TEST_JID3, subscription="none"),
+        )
+
+        self.assertNotIn(TEST_JID3, self._reload().items)
+
+    def test_compact_uses_attached_roster(self):
+        self.store.attach(self.roster)
+        self._push(
+            "v2",
+            roster_xso.Item(jid=TEST_JID3, subscription="none"),
+        )
+
+        self.store.compact()
+
+        records = self._read_records()
+        self.assertEqual(len(records), len(self.roster.items) + 1)
+        self.assertEqual(
+            self._reload().export_as_json(),
+            self.roster.export_as_json(),
+        )
+
+    def test_load_ignores_uncommitted_update(self):
+        self.store.compact(self.roster)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"jid": str(TEST_JID3), "item": {}}) + "\n")
+
+        with self.assertLogs("aioxmpp.roster.store", "WARNING"):
+            roster = self._reload()
+
+        self.assertNotIn(TEST_JID3, roster.items)
+        self.assertEqual(roster.version, "v1")
+
+    def test_append_after_interrupted_write(self):
+        self.store.compact(self.roster)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write('{"jid": "fnord@bar.example", "it')
+
+        self.store.attach(self.roster)
+        self._push(
+            "v2",
+            roster_xso.Item(jid=TEST_JID3, name="fnord",
+                            subscription="none"),
+        )
+
+        with self.assertLogs("aioxmpp.roster.store", "WARNING"):
+            roster = self._reload()
+
+        self.assertEqual(
+            roster.export_as_json(),
+            self.roster.export_as_json(),
+        )
+
+    def test_failed_write_is_retried_with_next_update(self):
+        self.store.compact(self.roster)
+        self.store.attach(self.roster)
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(unittest.mock.patch.object(
+                self.store, "_get_writer",
+                side_effect=OSError("disk full"),
+            ))
+            stack.enter_context(
+                self.assertLogs("aioxmpp.roster.store", "ERROR")
+            )
+            self._push(
+                "v2",
+                roster_xso.Item(jid=TEST_JID3, name="fnord",
+                                subscription="none"),
+            )
+
+        self.assertEqual(self._reload().version, "v1")
+
+        self._push(
+            "v3",
+            roster_xso.Item(jid=TEST_JID2, subscription="remove"),
+        )
+
+        roster = self._reload()
+        self.assertEqual(roster.version, "v3")
+        self.assertIn(TEST_JID3, roster.items)
+        self.assertEqual(
+            roster.export_as_json(),
+            self.roster.export_as_json(),
+        )
@@ -20,7 +20,11 @@
 #
 ########################################################################
 import collections.abc
+import contextlib
 import unittest
+import unittest.mock
+
+from datetime import timedelta
 
 import aioxmpp.cache as cache
 
@@ -300,3 +304,359 @@ class TestLRUDict(unittest.TestCase):
             with self.assertRaises(KeyError):
                 self.d[k]
             self.assertTrue(self.d._test_consistency())
+
+    def test_iteration_allows_lookups(self):
+        self.d.maxsize = 3
+        keys = [object() for i in range(3)]
+        for k in keys:
+            self.d[k] = k
+
+        for k in self.d:
+            self.assertIs(self.d[k], k)
+
+        self.assertCountEqual(list(self.d.values()), keys)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_setting_existing_key_does_not_count_as_use(self):
+        self.d.maxsize = 2
+        k1, k2, k3 = object(), object(), object()
+        self.d[k1] = 1
+        self.d[k2] = 2
+        self.d[k1] = 3
+        self.d[k3] = 4
+
+        with self.assertRaises(KeyError):
+            self.d[k1]
+        self.assertEqual(self.d[k2], 2)
+        self.assertEqual(self.d[k3], 4)
+
+    def test_initial_counters(self):
+        self.assertEqual(self.d.hits, 0)
+        self.assertEqual(self.d.misses, 0)
+        self.assertEqual(self.d.evictions, 0)
+        self.assertEqual(self.d.expirations, 0)
+
+    def test_counts_hits_and_misses(self):
+        key = object()
+        self.d[key] = object()
+
+        self.d[key]
+        self.d[key]
+        with self.assertRaises(KeyError):
+            self.d[object()]
+
+        self.assertEqual(self.d.hits, 2)
+        self.assertEqual(self.d.misses, 1)
+
+    def test_counts_evictions(self):
+        self.d.maxsize = 2
+        for i in range(5):
+            self.d[i] = i
+
+        self.assertEqual(self.d.evictions, 3)
+
+        self.d.maxsize = 1
+        self.assertEqual(self.d.evictions, 4)
+
+    def test_deletion_is_no_eviction(self):
+        self.d[1] = 1
+        del self.d[1]
+        self.assertEqual(self.d.evictions, 0)
+
+    def test_reset_counters(self):
+        self.d.maxsize = 1
+        self.d[1] = 1
+        self.d[2] = 2
+        self.d[2]
+        with self.assertRaises(KeyError):
+            self.d[1]
+
+        self.d.reset_counters()
+
+        self.assertEqual(self.d.hits, 0)
+        self.assertEqual(self.d.misses, 0)
+        self.assertEqual(self.d.evictions, 0)
+        self.assertEqual(self.d.expirations, 0)
+
+
+class TestLRUDictTTL(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self._patches = contextlib.ExitStack()
+        monotonic = self._patches.enter_context(
+            unittest.mock.patch("time.monotonic")
+        )
+        monotonic.side_effect = lambda: self.now
+
+        self.d = cache.LRUDict()
+        self.d.maxsize = 10
+        self.d.ttl = timedelta(seconds=10)
+
+    def tearDown(self):
+        self._patches.close()
+        del self.d
+
+    def test_default_ttl(self):
+        self.assertIsNone(cache.LRUDict().ttl)
+
+    def test_ttl_can_be_written(self):
+        self.assertEqual(self.d.ttl, timedelta(seconds=10))
+        self.d.ttl = None
+        self.assertIsNone(self.d.ttl)
+
+    def test_ttl_rejects_non_positive_values(self):
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            self.d.ttl = timedelta(0)
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            self.d.ttl = timedelta(seconds=-1)
+        self.assertEqual(self.d.ttl, timedelta(seconds=10))
+
+    def test_entries_available_before_ttl(self):
+        self.d[1] = "a"
+        self.now += 9.9
+        self.assertEqual(self.d[1], "a")
+        self.assertEqual(self.d.hits, 1)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_use_does_not_extend_lifetime(self):
+        self.d[1] = "a"
+        self.now += 5
+        self.d[1]
+        self.now += 5
+
+        with self.assertRaises(KeyError):
+            self.d[1]
+
+    def test_entries_expire(self):
+        self.d[1] = "a"
+        self.now += 10
+
+        with self.assertRaises(KeyError):
+            self.d[1]
+
+        self.assertEqual(self.d.misses, 1)
+        self.assertEqual(self.d.expirations, 1)
+        self.assertEqual(self.d.evictions, 0)
+        self.assertTrue(self.d._test_consistency())
+
+        self.assertNotIn(1, self.d)
+
+    def test_storing_restarts_lifetime(self):
+        self.d[1] = "a"
+        self.now += 5
+        self.d[1] = "b"
+        self.now += 5
+
+        self.assertEqual(self.d[1], "b")
+        self.assertTrue(self.d._test_consistency())
+
+        self.now += 5
+        with self.assertRaises(KeyError):
+            self.d[1]
+
+    def test_len_and_iter_skip_expired_entries(self):
+        self.d[1] = "a"
+        self.now += 5
+        self.d[2] = "b"
+        self.now += 5
+
+        self.assertEqual(len(self.d), 1)
+        self.assertEqual(list(self.d), [2])
+        self.assertEqual(self.d.expirations, 1)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_expire_removes_expired_entries(self):
+        for i in range(3):
+            self.d[i] = i
+            self.now += 1
+
+        # now at 1011.5, the first two entries expired at 1010 and 1011
+        self.now += 8.5
+        self.d.expire()
+
+        self.assertEqual(self.d.expirations, 2)
+        self.assertEqual(self.d.hits, 0)
+        self.assertEqual(self.d.misses, 0)
+        self.assertTrue(self.d._test_consistency())
+
+        self.assertEqual(self.d[2], 2)
+
+    def test_expired_entries_are_removed_before_evicting(self):
+        self.d.maxsize = 2
+        self.d[1] = "a"
+        self.now += 5
+        self.d[2] = "b"
+        self.now += 5
+        self.d[3] = "c"
+
+        self.assertEqual(self.d.evictions, 0)
+        self.assertEqual(self.d.expirations, 1)
+        self.assertEqual(self.d[2], "b")
+        self.assertEqual(self.d[3], "c")
+
+    def test_setting_ttl_restarts_lifetime(self):
+        self.d[1] = "a"
+        self.now += 9
+        self.d.ttl = timedelta(seconds=2)
+        self.now += 1.5
+
+        self.assertEqual(self.d[1], "a")
+        self.now += 1
+        with self.assertRaises(KeyError):
+            self.d[1]
+
+    def test_disabling_ttl(self):
+        self.d[1] = "a"
+        self.d.ttl = None
+        self.now += 100
+        self.assertEqual(self.d[1], "a")
+
+    def test_delete_and_clear(self):
+        self.d[1] = "a"
+        self.d[2] = "b"
+        del self.d[1]
+        self.assertTrue(self.d._test_consistency())
+        self.d.clear()
+        self.assertTrue(self.d._test_consistency())
+        self.assertEqual(len(self.d), 0)
+
+
+class TestLRUDictWeight(unittest.TestCase):
+    def setUp(self):
+        self.d = cache.LRUDict()
+        self.d.maxsize = None
+        self.d.weight = len
+
+    def tearDown(self):
+        del self.d
+
+    def test_defaults(self):
+        d = cache.LRUDict()
+        self.assertIsNone(d.weight)
+        self.assertIsNone(d.max_weight)
+        self.assertEqual(d.total_weight, 0)
+
+    def test_total_weight(self):
+        self.d[1] = "abc"
+        self.d[2] = "de"
+        self.assertEqual(self.d.total_weight, 5)
+
+        self.d[1] = "a"
+        self.assertEqual(self.d.total_weight, 3)
+
+        del self.d[2]
+        self.assertEqual(self.d.total_weight, 1)
+        self.assertTrue(self.d._test_consistency())
+
+        self.d.clear()
+        self.assertEqual(self.d.total_weight, 0)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_max_weight_requires_weight(self):
+        d = cache.LRUDict()
+        with self.assertRaisesRegex(ValueError, "requires a weight"):
+            d.max_weight = 10
+        self.assertIsNone(d.max_weight)
+
+    def test_max_weight_rejects_non_positive_values(self):
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            self.d.max_weight = 0
+
+    def test_max_weight_purges_least_recently_used(self):
+        self.d.max_weight = 10
+        self.d[1] = "aaaa"
+        self.d[2] = "bbbb"
+        self.d[1]
+        self.d[3] = "cccc"
+
+        with self.assertRaises(KeyError):
+            self.d[2]
+        self.assertEqual(self.d[1], "aaaa")
+        self.assertEqual(self.d[3], "cccc")
+        self.assertEqual(self.d.total_weight, 8)
+        self.assertEqual(self.d.evictions, 1)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_growing_value_purges(self):
+        self.d.max_weight = 10
+        self.d[1] = "aaaa"
+        self.d[2] = "bbbb"
+        self.d[2] = "bbbbbbb"
+
+        self.assertNotIn(1, self.d)
+        self.assertEqual(self.d.total_weight, 7)
+
+    def test_oversized_value_is_purged_right_away(self):
+        self.d.max_weight = 10
+        self.d[1] = "a"
+        self.d[2] = "b" * 11
+
+        self.assertEqual(len(self.d), 0)
+        self.assertEqual(self.d.total_weight, 0)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_reducing_max_weight_purges(self):
+        for i in range(5):
+            self.d[i] = "xx"
+        self.d.max_weight = 5
+
+        self.assertEqual(len(self.d), 2)
+        self.assertEqual(self.d.total_weight, 4)
+
+    def test_maxsize_applies_as_well(self):
+        self.d.maxsize = 2
+        self.d.max_weight = 100
+        for i in range(5):
+            self.d[i] = "x"
+        self.assertEqual(len(self.d), 2)
+        self.assertEqual(self.d.total_weight, 2)
+
+    def test_reject_negative_weight(self):
+        self.d.weight = lambda x: x
+        with self.assertRaisesRegex(ValueError, "must be non-negative"):
+            self.d[1] = -1
+        self.assertNotIn(1, self.d)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_setting_weight_reweighs_all_entries(self):
+        self.d[1] = "abc"
+        self.d[2] = "de"
+        self.d.weight = lambda x: 2 * len(x)
+        self.assertEqual(self.d.total_weight, 10)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_disabling_weight(self):
+        self.d[1] = "abc"
+        self.d.weight = None
+        self.assertEqual(self.d.total_weight, 0)
+        self.d[2] = "de"
+        self.assertEqual(self.d.total_weight, 0)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_reweigh(self):
+        self.d.max_weight = 10
+        value = ["x"]
+        self.d[1] = "aaaa"
+        self.d[2] = value
+        self.assertEqual(self.d.total_weight, 5)
+
+        value.extend("x" * 6)
+        self.d.reweigh(2)
+
+        self.assertEqual(self.d.total_weight, 7)
+        self.assertNotIn(1, self.d)
+        self.assertTrue(self.d._test_consistency())
+
+    def test_reweigh_does_not_count_as_use(self):
+        self.d[1] = "a"
+        self.d.reweigh(1)
+        self.assertEqual(self.d.hits, 0)
+
+    def test_reweigh_ignores_unknown_keys(self):
+        self.d.reweigh(object())
+
+    def test_reweigh_without_weight_is_noop(self):
+        d = cache.LRUDict()
+        d[1] = "a"
+        d.reweigh(1)
+        self.assertEqual(d.total_weight, 0)
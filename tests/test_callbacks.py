@@ -1090,6 +1090,92 @@ class TestAdHocSignal(unittest.TestCase):
 
         self.assertEqual(fut, Future())
 
+    def test_fire_does_not_copy_connections_without_changes(self):
+        signal = AdHocSignal()
+        signal.connect(unittest.mock.Mock(return_value=None))
+        signal.fire()
+
+        snapshot = signal._snapshot
+        self.assertIsNotNone(snapshot)
+
+        signal.fire()
+        signal.fire()
+
+        self.assertIs(signal._snapshot, snapshot)
+
+    def test_connect_and_disconnect_invalidate_snapshot(self):
+        signal = AdHocSignal()
+        first = unittest.mock.Mock(return_value=None)
+        second = unittest.mock.Mock(return_value=None)
+
+        signal.connect(first)
+        signal.fire()
+
+        token = signal.connect(second)
+        signal.fire()
+
+        signal.disconnect(token)
+        signal.fire()
+
+        self.assertEqual(len(first.mock_calls), 3)
+        self.assertEqual(len(second.mock_calls), 1)
+
+    def test_fire_without_listeners(self):
+        signal = AdHocSignal()
+        signal.fire()
+
+        token = signal.connect(unittest.mock.Mock(return_value=None))
+        signal.disconnect(token)
+        signal.fire()
+
+        self.assertFalse(signal._connections)
+        self.assertSequenceEqual(signal._snapshot, ())
+
+    def test_connect_during_fire_takes_effect_on_next_fire(self):
+        signal = AdHocSignal()
+        late = unittest.mock.Mock(return_value=None)
+
+        def connect_late():
+            signal.connect(late)
+            return True
+
+        signal.connect(connect_late)
+        signal.fire()
+
+        late.assert_not_called()
+
+        signal.fire()
+
+        late.assert_called_once_with()
+
+    def test_disconnect_during_fire_does_not_affect_current_emission(self):
+        signal = AdHocSignal()
+        second = unittest.mock.Mock(return_value=None)
+
+        def disconnect_second():
+            signal.disconnect(token)
+
+        signal.connect(disconnect_second)
+        token = signal.connect(second)
+
+        signal.fire()
+        second.assert_called_once_with()
+
+        signal.fire()
+        second.assert_called_once_with()
+
+    def test_listener_may_disconnect_itself_and_return_true(self):
+        signal = AdHocSignal()
+
+        def disconnect_self():
+            signal.disconnect(token)
+            return True
+
+        token = signal.connect(disconnect_self)
+        signal.fire()
+
+        self.assertFalse(signal._connections)
+
 
 class TestSyncAdHocSignal(unittest.TestCase):
     def test_connect_and_fire(self):
@@ -1178,6 +1264,25 @@ class TestSyncAdHocSignal(unittest.TestCase):
             coro.mock_calls
         )
 
+    def test_connect_during_fire_takes_effect_on_next_fire(self):
+        signal = SyncAdHocSignal()
+        late = CoroutineMock()
+        late.return_value = True
+
+        @asyncio.coroutine
+        def connect_late():
+            signal.connect(late)
+            return True
+
+        signal.connect(connect_late)
+        run_coroutine(signal.fire())
+
+        late.assert_not_called()
+
+        run_coroutine(signal.fire())
+
+        late.assert_called_once_with()
+
 
 class TestSignal(unittest.TestCase):
     def test_get(self):
@@ -1548,6 +1653,31 @@ class TestFilter(unittest.TestCase):
             unittest.mock.sentinel.token
         )
 
+    def test_filter_uses_precompiled_chain(self):
+        mock = unittest.mock.Mock()
+
+        token = self.f.register(mock.func1, 1)
+        self.f.register(mock.func2, 0)
+        self.f.register(mock.func3, 1)
+
+        self.assertSequenceEqual(
+            self.f._filter_chain,
+            (mock.func2, mock.func1, mock.func3),
+        )
+
+        self.f.unregister(token)
+
+        self.assertSequenceEqual(
+            self.f._filter_chain,
+            (mock.func2, mock.func3),
+        )
+
+    def test_filter_without_functions_returns_object(self):
+        self.assertIs(
+            self.f.filter(unittest.mock.sentinel.obj),
+            unittest.mock.sentinel.obj,
+        )
+
 
 class Testfirst_signal(unittest.TestCase):
     def test_connects_future_to_both_and_returns_future(self):
@@ -323,6 +323,64 @@ class TestSTARTTLSConnector(unittest.TestCase):
             ]
         )
 
+    def test_abort_xmlstream_if_cancelled_during_negotiation(self):
+        features_future = asyncio.Future()
+
+        base = unittest.mock.Mock()
+        base.create_starttls_connection = CoroutineMock()
+        base.create_starttls_connection.return_value = (
+            unittest.mock.sentinel.transport,
+            base.protocol,
+        )
+        base.XMLStream.return_value = base.protocol
+        base.Future.return_value = features_future
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch(
+                    "asyncio.Future",
+                    new=base.Future,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.ssl_transport.create_starttls_connection",
+                    new=base.create_starttls_connection,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.protocol.XMLStream",
+                    new=base.XMLStream,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.connector.timedelta",
+                )
+            )
+
+            task = asyncio.ensure_future(self.c.connect(
+                unittest.mock.sentinel.loop,
+                base.metadata,
+                unittest.mock.sentinel.domain,
+                unittest.mock.sentinel.host,
+                unittest.mock.sentinel.port,
+                unittest.mock.sentinel.timeout,
+            ))
+            run_coroutine(asyncio.sleep(0))
+
+            base.protocol.abort.assert_not_called()
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                run_coroutine(task)
+
+        base.protocol.abort.assert_called_once_with()
+
     def test_connect_without_starttls_support_and_with_required_success(self):
         captured_features_future = None
 
@@ -1485,3 +1543,64 @@ class TestXMPPOverTLSConnector(unittest.TestCase):
                 unittest.mock.call.protocol.abort()
             ]
         )
+
+    def test_abort_xmlstream_if_cancelled_during_negotiation(self):
+        features_future = asyncio.Future()
+
+        base = unittest.mock.Mock()
+        base.create_starttls_connection = CoroutineMock()
+        base.create_starttls_connection.return_value = (
+            unittest.mock.sentinel.transport,
+            base.protocol,
+        )
+        base.XMLStream.return_value = base.protocol
+        base.Future.return_value = features_future
+        base.certificate_verifier.pre_handshake = CoroutineMock()
+        base.metadata.certificate_verifier_factory.return_value = \
+            base.certificate_verifier
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch(
+                    "asyncio.Future",
+                    new=base.Future,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.ssl_transport.create_starttls_connection",
+                    new=base.create_starttls_connection,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.protocol.XMLStream",
+                    new=base.XMLStream,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.connector.timedelta",
+                )
+            )
+
+            task = asyncio.ensure_future(self.c.connect(
+                unittest.mock.sentinel.loop,
+                base.metadata,
+                unittest.mock.sentinel.domain,
+                unittest.mock.sentinel.host,
+                unittest.mock.sentinel.port,
+                unittest.mock.sentinel.timeout,
+            ))
+            run_coroutine(asyncio.sleep(0))
+
+            base.protocol.abort.assert_not_called()
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                run_coroutine(task)
+
+        base.protocol.abort.assert_called_once_with()
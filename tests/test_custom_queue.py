@@ -32,6 +32,20 @@ class TestAsyncDeque(unittest.TestCase):
         self.loop = asyncio.get_event_loop()
         self.q = custom_queue.AsyncDeque(loop=self.loop)
 
+    def test_put_nowait_sets_notify_event(self):
+        notify = asyncio.Event(loop=self.loop)
+        q = custom_queue.AsyncDeque(loop=self.loop, notify=notify)
+        self.assertFalse(notify.is_set())
+        q.put_nowait(1)
+        self.assertTrue(notify.is_set())
+
+    def test_putleft_nowait_sets_notify_event(self):
+        notify = asyncio.Event(loop=self.loop)
+        q = custom_queue.AsyncDeque(loop=self.loop, notify=notify)
+        self.assertFalse(notify.is_set())
+        q.putleft_nowait(1)
+        self.assertTrue(notify.is_set())
+
     def test_put_get_cycle_nowait(self):
         self.q.put_nowait(1)
         self.q.put_nowait(2)
@@ -178,3 +192,105 @@ class TestAsyncDeque(unittest.TestCase):
     def tearDown(self):
         del self.q
         del self.loop
+
+
+class TestWeightedFairQueue(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.q = custom_queue.WeightedFairQueue(
+            {"a": 3, "b": 1},
+            loop=self.loop,
+        )
+
+    def tearDown(self):
+        del self.q
+        del self.loop
+
+    def test_fifo_within_class(self):
+        for i in range(3):
+            self.q.put_nowait(i, "a")
+
+        self.assertEqual(len(self.q), 3)
+        self.assertEqual(self.q.qsize("a"), 3)
+        self.assertEqual(self.q.qsize("b"), 0)
+        self.assertEqual(
+            [self.q.get_nowait() for i in range(3)],
+            [0, 1, 2],
+        )
+
+    def test_classes_served_proportionally_to_weight(self):
+        for i in range(8):
+            self.q.put_nowait(("a", i), "a")
+            self.q.put_nowait(("b", i), "b")
+
+        result = [self.q.get_nowait()[0] for i in range(8)]
+        self.assertEqual(result.count("a"), 6)
+        self.assertEqual(result.count("b"), 2)
+        # smooth round robin interleaves the classes
+        self.assertNotEqual(result[:4], ["a"] * 4)
+
+    def test_single_class_gets_all_capacity(self):
+        for i in range(3):
+            self.q.put_nowait(i, "b")
+
+        self.assertEqual(
+            [self.q.get_nowait() for i in range(3)],
+            [0, 1, 2],
+        )
+
+    def test_putleft_nowait_is_served_first(self):
+        self.q.put_nowait(1, "a")
+        self.q.put_nowait(2, "b")
+        self.q.putleft_nowait(3)
+        self.q.putleft_nowait(4)
+
+        self.assertIn(4, self.q)
+        self.assertIn(2, self.q)
+        self.assertEqual(self.q.get_nowait(), 4)
+        self.assertEqual(self.q.get_nowait(), 3)
+
+    def test_empty_and_clear(self):
+        self.assertTrue(self.q.empty())
+        self.q.put_nowait(1, "a")
+        self.q.putleft_nowait(2)
+        self.assertFalse(self.q.empty())
+        self.q.clear()
+        self.assertTrue(self.q.empty())
+        self.assertEqual(len(self.q), 0)
+        with self.assertRaises(asyncio.QueueEmpty):
+            self.q.get_nowait()
+
+    def test_put_sets_notify_event(self):
+        notify = asyncio.Event(loop=self.loop)
+        q = custom_queue.WeightedFairQueue({"a": 1}, loop=self.loop,
+                                           notify=notify)
+        q.put_nowait(1, "a")
+        self.assertTrue(notify.is_set())
+        notify.clear()
+        q.putleft_nowait(2)
+        self.assertTrue(notify.is_set())
+
+    def test_get_waits_for_item(self):
+        task = asyncio.ensure_future(self.q.get())
+        run_coroutine(asyncio.sleep(0))
+        self.assertFalse(task.done())
+
+        self.q.put_nowait(1, "b")
+        self.assertEqual(run_coroutine(task), 1)
+
+    def test_weights(self):
+        self.assertEqual(self.q.get_weight("a"), 3)
+        self.q.set_weight("a", 5)
+        self.assertEqual(self.q.get_weight("a"), 5)
+
+        with self.assertRaises(ValueError):
+            self.q.set_weight("a", 0)
+        with self.assertRaises(KeyError):
+            self.q.set_weight("c", 1)
+        with self.assertRaises(ValueError):
+            custom_queue.WeightedFairQueue({"a": 0})
+
+    def test_unknown_class_raises(self):
+        with self.assertRaises(KeyError):
+            self.q.put_nowait(1, "c")
+        self.assertTrue(self.q.empty())
@@ -20,6 +20,8 @@
 #
 ########################################################################
 import contextlib
+import functools
+import random
 import unittest
 import unittest.mock
 
@@ -399,6 +401,141 @@ class TestSimpleStanzaDispatcher(unittest.TestCase):
             ]
         )
 
+    def test_feed_returns_whether_stanza_was_dispatched(self):
+        stanza = FooStanza(TEST_JID, unittest.mock.sentinel.type_)
+        self.assertTrue(self.d._feed(stanza))
+
+        d = FooDispatcher()
+        self.assertFalse(d._feed(stanza))
+
+    def test_counters(self):
+        d = FooDispatcher()
+        d.register_callback(
+            unittest.mock.sentinel.type_,
+            TEST_JID.bare(),
+            self.handlers.cb,
+        )
+        self.assertEqual(d.dispatched, 0)
+        self.assertEqual(d.unmatched, 0)
+
+        d._feed(FooStanza(TEST_JID, unittest.mock.sentinel.type_))
+        d._feed(FooStanza(TEST_JID, unittest.mock.sentinel.othertype))
+        d._feed(FooStanza(TEST_JID.replace(localpart="fnord"),
+                          unittest.mock.sentinel.type_))
+
+        self.assertEqual(d.dispatched, 1)
+        self.assertEqual(d.unmatched, 2)
+
+        d.reset_counters()
+        self.assertEqual(d.dispatched, 0)
+        self.assertEqual(d.unmatched, 0)
+
+    def test_feed_does_not_construct_bare_jids(self):
+        stanza = FooStanza(TEST_JID, unittest.mock.sentinel.othertype)
+        with unittest.mock.patch.object(
+                aioxmpp.JID, "bare",
+                side_effect=AssertionError("bare() called")):
+            self.d._feed(stanza)
+
+        self.assertCountEqual(
+            self.handlers.mock_calls,
+            [
+                unittest.mock.call.wildcard_fulljid_no_wildcard(stanza),
+            ]
+        )
+
+    def test_unregister_prunes_index(self):
+        d = FooDispatcher()
+        d.register_callback(
+            unittest.mock.sentinel.type_,
+            TEST_JID,
+            self.handlers.cb1,
+        )
+        d.register_callback(
+            unittest.mock.sentinel.type_,
+            TEST_JID.bare(),
+            self.handlers.cb2,
+        )
+        d.register_callback(
+            None,
+            None,
+            self.handlers.cb3,
+        )
+
+        d.unregister_callback(unittest.mock.sentinel.type_, TEST_JID)
+        d.unregister_callback(unittest.mock.sentinel.type_, TEST_JID.bare())
+        d.unregister_callback(None, None)
+
+        self.assertEqual(d._index, {})
+        self.assertEqual(d._type_wildcards, {})
+        self.assertFalse(
+            d._feed(FooStanza(TEST_JID, unittest.mock.sentinel.type_))
+        )
+
+    def test_dispatch_matches_linear_key_search(self):
+        # reference implementation: the lookup order documented in
+        # register_callback, as implemented before the index was introduced
+        def reference(map_, stanza):
+            from_ = stanza.from_ or TEST_LOCAL_JID
+            keys = [
+                (stanza.type_, from_, False),
+                (stanza.type_, from_.bare(), True),
+                (None, from_, False),
+                (None, from_.bare(), True),
+                (stanza.type_, None, False),
+                (None, None, False),
+            ]
+            for key in keys:
+                if key in map_:
+                    return key
+            return None
+
+        types = [None, "a", "b"]
+        jids = [
+            None,
+            TEST_JID,
+            TEST_JID.bare(),
+            TEST_JID.replace(resource="other"),
+            TEST_JID.replace(localpart="other"),
+            TEST_JID.replace(localpart=None, resource=None),
+            TEST_LOCAL_JID,
+        ]
+
+        rng = random.Random(1)
+        for i in range(200):
+            d = FooDispatcher()
+            called = []
+            for type_ in types:
+                for jid in jids:
+                    for wildcard_resource in (False, True):
+                        if rng.random() >= 0.3:
+                            continue
+                        if jid is None or not jid.is_bare:
+                            key = (type_, jid, False)
+                        else:
+                            key = (type_, jid, wildcard_resource)
+                        if key in d._map:
+                            continue
+                        d.register_callback(
+                            type_, jid,
+                            functools.partial(
+                                lambda key, stanza: called.append(key),
+                                key,
+                            ),
+                            wildcard_resource=wildcard_resource,
+                        )
+
+            for type_ in types:
+                for jid in jids:
+                    stanza = FooStanza(jid, type_)
+                    expected = reference(d._map, stanza)
+                    called.clear()
+                    self.assertEqual(d._feed(stanza), expected is not None)
+                    if expected is None:
+                        self.assertSequenceEqual(called, [])
+                    else:
+                        self.assertSequenceEqual(called, [expected])
+
     def test_does_not_connect_to_on_message_received(self):
         self.assertFalse(
             aioxmpp.service.is_depsignal_handler(
@@ -0,0 +1,452 @@
+
+########################################################################
+# File name: test_host.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+import asyncio
+import unittest
+import unittest.mock
+
+from datetime import timedelta
+
+import aioxmpp
+import aioxmpp.cache
+import aioxmpp.entitycaps
+import aioxmpp.host as host
+import aioxmpp.network as network
+import aioxmpp.tasks
+
+from aioxmpp.testutils import (
+    run_coroutine,
+)
+
+
+TEST_JID1 = aioxmpp.JID.fromstr("romeo@montague.lit/balcony")
+TEST_JID2 = aioxmpp.JID.fromstr("juliet@capulet.lit/garden")
+
+
+class TestConnectionLimiter(unittest.TestCase):
+    def test_defaults(self):
+        limiter = host.ConnectionLimiter()
+        self.assertEqual(limiter.attempts, 0)
+        self.assertEqual(limiter.in_progress, 0)
+
+    def test_reject_non_positive_max_concurrent(self):
+        with self.assertRaisesRegex(ValueError,
+                                    "max_concurrent must be positive"):
+            host.ConnectionLimiter(max_concurrent=0)
+
+    def test_reject_non_positive_rate(self):
+        with self.assertRaisesRegex(ValueError, "rate must be positive"):
+            host.ConnectionLimiter(rate=0)
+
+    def test_acquire_and_release_without_limits(self):
+        limiter = host.ConnectionLimiter()
+
+        for i in range(3):
+            run_coroutine(limiter.acquire())
+
+        self.assertEqual(limiter.attempts, 3)
+        self.assertEqual(limiter.in_progress, 3)
+
+        limiter.release()
+
+        self.assertEqual(limiter.attempts, 3)
+        self.assertEqual(limiter.in_progress, 2)
+
+    def test_limits_concurrency(self):
+        limiter = host.ConnectionLimiter(max_concurrent=2)
+
+        run_coroutine(limiter.acquire())
+        run_coroutine(limiter.acquire())
+
+        task = asyncio.ensure_future(limiter.acquire())
+        run_coroutine(asyncio.sleep(0.01))
+        self.assertFalse(task.done())
+        self.assertEqual(limiter.in_progress, 2)
+
+        limiter.release()
+        run_coroutine(task)
+
+        self.assertEqual(limiter.attempts, 3)
+        self.assertEqual(limiter.in_progress, 2)
+
+    def test_cancelled_acquire_does_not_leak_slot(self):
+        limiter = host.ConnectionLimiter(rate=1, max_concurrent=1)
+
+        run_coroutine(limiter.acquire())
+        limiter.release()
+
+        # waits for the token bucket while holding the slot
+        task = asyncio.ensure_future(limiter.acquire())
+        run_coroutine(asyncio.sleep(0.01))
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task)
+
+        self.assertEqual(limiter.attempts, 1)
+        self.assertEqual(limiter._semaphore._value, 1)
+
+    def test_limits_rate(self):
+        limiter = host.ConnectionLimiter(rate=50, burst=1)
+        loop = asyncio.get_event_loop()
+
+        run_coroutine(limiter.acquire())
+        started = loop.time()
+        run_coroutine(limiter.acquire())
+        run_coroutine(limiter.acquire())
+
+        self.assertGreaterEqual(loop.time() - started, 0.035)
+        self.assertEqual(limiter.attempts, 3)
+
+
+class TestClientMetrics(unittest.TestCase):
+    def test_init(self):
+        metrics = host.ClientMetrics()
+        for name in host.ClientMetrics.__slots__:
+            self.assertEqual(getattr(metrics, name), 0)
+
+    def test_repr(self):
+        self.assertIn("connection_attempts=0", repr(host.ClientMetrics()))
+
+
+class TestClientHost(unittest.TestCase):
+    def setUp(self):
+        network.set_dns_cache(None)
+        self.h = host.ClientHost()
+        self.c1 = aioxmpp.Client(TEST_JID1, object())
+        self.c2 = aioxmpp.Client(TEST_JID2, object())
+
+    def tearDown(self):
+        network.set_dns_cache(None)
+
+    def test_init(self):
+        self.assertIsInstance(self.h.entitycaps_cache,
+                              aioxmpp.entitycaps.Cache)
+        self.assertIsInstance(self.h.server_info_cache,
+                              aioxmpp.cache.LRUDict)
+        self.assertEqual(self.h.server_info_cache.maxsize, 1024)
+        self.assertEqual(self.h.server_info_cache.ttl, timedelta(hours=1))
+        self.assertIsInstance(self.h.task_pool, aioxmpp.tasks.TaskPool)
+        self.assertIsNone(self.h.connection_limiter)
+        self.assertSequenceEqual(self.h.clients, [])
+
+    def test_does_not_install_dns_cache_implicitly(self):
+        self.assertIsInstance(self.h.dns_cache, network.DNSCache)
+        self.assertIsNone(network.get_dns_cache())
+
+    def test_install_dns_cache(self):
+        self.h.install_dns_cache()
+        self.assertIs(network.get_dns_cache(), self.h.dns_cache)
+
+    def test_reuses_installed_dns_cache(self):
+        self.h.install_dns_cache()
+        h = host.ClientHost()
+        self.assertIs(h.dns_cache, self.h.dns_cache)
+
+    def test_uses_dns_cache_from_argument(self):
+        cache = network.DNSCache()
+        h = host.ClientHost(dns_cache=cache)
+        self.assertIs(h.dns_cache, cache)
+        self.assertIsNone(network.get_dns_cache())
+        h.install_dns_cache()
+        self.assertIs(network.get_dns_cache(), cache)
+
+    def test_close_restores_previous_dns_cache(self):
+        previous = network.DNSCache()
+        network.set_dns_cache(previous)
+        h = host.ClientHost(dns_cache=network.DNSCache())
+
+        h.install_dns_cache()
+        h.install_dns_cache()
+        self.assertIs(network.get_dns_cache(), h.dns_cache)
+
+        h.close()
+        self.assertIs(network.get_dns_cache(), previous)
+
+        h.close()
+        self.assertIs(network.get_dns_cache(), previous)
+
+    def test_close_keeps_dns_cache_installed_by_others(self):
+        self.h.install_dns_cache()
+        other = network.DNSCache()
+        network.set_dns_cache(other)
+
+        self.h.close()
+        self.assertIs(network.get_dns_cache(), other)
+
+    def test_close_without_install_is_noop(self):
+        cache = network.DNSCache()
+        network.set_dns_cache(cache)
+        self.h.close()
+        self.assertIs(network.get_dns_cache(), cache)
+
+    def test_init_arguments(self):
+        limiter = host.ConnectionLimiter()
+        h = host.ClientHost(
+            max_tasks=10,
+            max_tasks_per_client=2,
+            connection_limiter=limiter,
+            server_info_cache_size=5,
+            server_info_ttl=timedelta(minutes=5),
+        )
+        self.assertEqual(h.task_pool.get_limit(()), 10)
+        self.assertEqual(h.task_pool.default_limit, 2)
+        self.assertIs(h.connection_limiter, limiter)
+        self.assertEqual(h.server_info_cache.maxsize, 5)
+        self.assertEqual(h.server_info_cache.ttl, timedelta(minutes=5))
+
+    def test_server_info_ttl_can_be_disabled(self):
+        h = host.ClientHost(server_info_ttl=None)
+        self.assertIsNone(h.server_info_cache.ttl)
+
+    def test_attach_shares_caches_with_summoned_services(self):
+        caps1 = self.c1.summon(aioxmpp.EntityCapsService)
+        disco1 = self.c1.summon(aioxmpp.DiscoClient)
+
+        self.h.attach(self.c1)
+
+        self.assertIs(caps1.cache, self.h.entitycaps_cache)
+        self.assertIs(disco1.server_info_cache, self.h.server_info_cache)
+
+    def test_attach_shares_caches_with_services_summoned_later(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+
+        caps1 = self.c1.summon(aioxmpp.EntityCapsService)
+        caps2 = self.c2.summon(aioxmpp.EntityCapsService)
+        disco1 = self.c1.summon(aioxmpp.DiscoClient)
+
+        self.assertIs(caps1.cache, self.h.entitycaps_cache)
+        self.assertIs(caps2.cache, self.h.entitycaps_cache)
+        self.assertIs(disco1.server_info_cache, self.h.server_info_cache)
+
+    def test_attach_replaces_connection_limiter(self):
+        self.h.attach(self.c1)
+        self.assertIsNotNone(self.c1.connection_limiter)
+
+    def test_attach_twice_raises(self):
+        self.h.attach(self.c1)
+        with self.assertRaisesRegex(ValueError, "already attached"):
+            self.h.attach(self.c1)
+
+    def test_clients(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+        self.assertSequenceEqual(self.h.clients, [self.c1, self.c2])
+
+    def test_detach_restores_private_state(self):
+        self.h.attach(self.c1)
+        caps1 = self.c1.summon(aioxmpp.EntityCapsService)
+        disco1 = self.c1.summon(aioxmpp.DiscoClient)
+
+        self.h.detach(self.c1)
+
+        self.assertIsNot(caps1.cache, self.h.entitycaps_cache)
+        self.assertIsNone(disco1.server_info_cache)
+        self.assertIsNone(self.c1.connection_limiter)
+        self.assertSequenceEqual(self.h.clients, [])
+
+        # services summoned after detaching are not touched
+        self.c1.summon(aioxmpp.PresenceClient)
+        caps2 = self.c2.summon(aioxmpp.EntityCapsService)
+        self.assertIsNot(caps2.cache, self.h.entitycaps_cache)
+
+    def test_detach_unknown_raises(self):
+        with self.assertRaises(KeyError):
+            self.h.detach(self.c1)
+
+    def test_detach_keeps_foreign_connection_limiter(self):
+        limiter = host.ConnectionLimiter()
+        self.h.attach(self.c1)
+        self.c1.connection_limiter = limiter
+        self.h.detach(self.c1)
+        self.assertIs(self.c1.connection_limiter, limiter)
+
+    def test_spawn_and_detach_cancels_tasks(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+
+        futs = [asyncio.Future(), asyncio.Future()]
+
+        @asyncio.coroutine
+        def coro(i):
+            return (yield from futs[i])
+
+        t1 = self.h.spawn(self.c1, coro, 0)
+        t2 = self.h.spawn(self.c2, coro, 1)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertEqual(self.h.get_metrics(self.c1).tasks, 1)
+        self.assertEqual(self.h.get_aggregate_metrics().tasks, 2)
+
+        self.h.detach(self.c1)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertTrue(t1.cancelled())
+        self.assertFalse(t2.done())
+
+        futs[1].set_result(None)
+        run_coroutine(t2)
+
+    def test_spawn_respects_per_client_limit(self):
+        h = host.ClientHost(max_tasks_per_client=1)
+        h.attach(self.c1)
+        h.attach(self.c2)
+
+        fut = asyncio.Future()
+
+        @asyncio.coroutine
+        def coro():
+            return (yield from fut)
+
+        h.spawn(self.c1, coro)
+        h.spawn(self.c2, coro)
+        with self.assertRaises(RuntimeError):
+            h.spawn(self.c1, coro)
+
+        fut.set_result(None)
+        run_coroutine(asyncio.sleep(0))
+
+    def test_spawn_for_unknown_client_raises(self):
+        coro_fun = unittest.mock.Mock()
+        with self.assertRaises(KeyError):
+            self.h.spawn(self.c1, coro_fun)
+        coro_fun.assert_not_called()
+
+    def test_metrics_count_client_events(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+
+        self.c1.on_stream_established()
+        self.c1.on_stream_suspended(ConnectionError())
+        self.c1.on_stream_destroyed()
+        self.c1.on_stream_established()
+        self.c2.on_failure(ConnectionError())
+
+        m1 = self.h.get_metrics(self.c1)
+        self.assertEqual(m1.streams_established, 2)
+        self.assertEqual(m1.streams_suspended, 1)
+        self.assertEqual(m1.streams_destroyed, 1)
+        self.assertEqual(m1.failures, 0)
+        self.assertEqual(m1.established, 0)
+
+        m2 = self.h.get_metrics(self.c2)
+        self.assertEqual(m2.failures, 1)
+
+        total = self.h.get_aggregate_metrics()
+        self.assertEqual(total.streams_established, 2)
+        self.assertEqual(total.failures, 1)
+
+    def test_metrics_report_established_clients(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+        self.c2.established_event.set()
+
+        self.assertEqual(self.h.get_metrics(self.c1).established, 0)
+        self.assertEqual(self.h.get_metrics(self.c2).established, 1)
+        self.assertEqual(self.h.get_aggregate_metrics().established, 1)
+
+    def test_metrics_are_snapshots(self):
+        self.h.attach(self.c1)
+        metrics = self.h.get_metrics(self.c1)
+        self.c1.on_stream_established()
+        self.assertEqual(metrics.streams_established, 0)
+
+    def test_metrics_not_collected_after_detach(self):
+        self.h.attach(self.c1)
+        self.h.detach(self.c1)
+        self.c1.on_stream_established()
+        with self.assertRaises(KeyError):
+            self.h.get_metrics(self.c1)
+        self.assertEqual(
+            self.h.get_aggregate_metrics().streams_established,
+            0
+        )
+
+    def test_connection_attempts_go_through_connection_limiter(self):
+        limiter = unittest.mock.Mock()
+        limiter.acquire = unittest.mock.Mock()
+        limiter.acquire.return_value = asyncio.sleep(0.01)
+        self.h.connection_limiter = limiter
+        self.h.attach(self.c1)
+
+        run_coroutine(self.c1.connection_limiter.acquire())
+        limiter.acquire.assert_called_once_with()
+        limiter.release.assert_not_called()
+
+        self.c1.connection_limiter.release()
+        limiter.release.assert_called_once_with()
+
+        metrics = self.h.get_metrics(self.c1)
+        self.assertEqual(metrics.connection_attempts, 1)
+        self.assertGreater(metrics.connection_wait_time, 0)
+
+    def test_connection_attempts_are_counted_without_limiter(self):
+        self.h.attach(self.c1)
+
+        run_coroutine(self.c1.connection_limiter.acquire())
+        self.c1.connection_limiter.release()
+
+        metrics = self.h.get_metrics(self.c1)
+        self.assertEqual(metrics.connection_attempts, 1)
+        self.assertEqual(metrics.connection_wait_time, 0)
+
+    def test_disco_clients_share_server_info(self):
+        self.h.attach(self.c1)
+        self.h.attach(self.c2)
+
+        disco1 = self.c1.summon(aioxmpp.DiscoClient)
+        disco2 = self.c2.summon(aioxmpp.DiscoClient)
+
+        server = aioxmpp.JID.fromstr("capulet.lit")
+        info = unittest.mock.sentinel.info
+
+        with unittest.mock.patch.object(
+                disco1, "send_and_decode_info_query") as query1, \
+                unittest.mock.patch.object(
+                    disco2, "send_and_decode_info_query") as query2:
+            query1.return_value = asyncio.sleep(0, info)
+            self.assertIs(run_coroutine(disco1.query_info(server)), info)
+            self.assertIs(run_coroutine(disco2.query_info(server)), info)
+
+        query1.assert_called_once_with(server, None)
+        query2.assert_not_called()
+
+    def test_shared_server_info_expires(self):
+        self.h.attach(self.c1)
+        disco1 = self.c1.summon(aioxmpp.DiscoClient)
+
+        server = aioxmpp.JID.fromstr("capulet.lit")
+
+        with unittest.mock.patch.object(
+                disco1, "send_and_decode_info_query") as query, \
+                unittest.mock.patch("aioxmpp.cache.time") as time:
+            time.monotonic.return_value = 1000
+            query.return_value = asyncio.sleep(0, unittest.mock.sentinel.i1)
+            self.assertIs(run_coroutine(disco1.query_info(server)),
+                          unittest.mock.sentinel.i1)
+
+            time.monotonic.return_value = 1000 + 3601
+            disco1.flush_cache()
+            query.return_value = asyncio.sleep(0, unittest.mock.sentinel.i2)
+            self.assertIs(run_coroutine(disco1.query_info(server)),
+                          unittest.mock.sentinel.i2)
+
+        self.assertEqual(len(query.mock_calls), 2)
@@ -23,9 +23,12 @@ import asyncio
 import collections
 import concurrent.futures
 import random
+import threading
 import unittest
 import unittest.mock
 
+from datetime import timedelta
+
 import dns
 import dns.flags
 
@@ -1049,6 +1052,417 @@ class Testrepeated_query(unittest.TestCase):
                 ))
 
 
+class TestDNSCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.time = unittest.mock.Mock()
+        self.time.monotonic.side_effect = lambda: self.now
+        self.patches = [
+            unittest.mock.patch("aioxmpp.network.time", new=self.time),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+        self.c = network.DNSCache()
+        self.loop = asyncio.get_event_loop()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def _answer(self, ttl):
+        answer = unittest.mock.Mock()
+        answer.rrset.ttl = ttl
+        return answer
+
+    def _query(self, *results, delay=0):
+        results = list(results)
+        query = unittest.mock.Mock()
+
+        @asyncio.coroutine
+        def impl():
+            query()
+            yield from asyncio.sleep(delay)
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        query.impl = impl
+        return query
+
+    def _lookup(self, query, key=unittest.mock.sentinel.key):
+        return run_coroutine(self.c._lookup(key, query.impl, self.loop))
+
+    def test_defaults(self):
+        self.assertEqual(self.c.maxsize, 1024)
+        self.assertEqual(self.c.negative_ttl, timedelta(seconds=60))
+        self.assertEqual(self.c.max_ttl, timedelta(days=1))
+        self.assertEqual(self.c.stale_ttl, timedelta(seconds=60))
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.stale_hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertEqual(self.c.coalesced, 0)
+        self.assertIsNone(self.c.hit_rate)
+
+    def test_init_arguments(self):
+        c = network.DNSCache(
+            maxsize=10,
+            negative_ttl=timedelta(seconds=1),
+            max_ttl=timedelta(seconds=2),
+            stale_ttl=timedelta(seconds=3),
+        )
+        self.assertEqual(c.maxsize, 10)
+        self.assertEqual(c.negative_ttl, timedelta(seconds=1))
+        self.assertEqual(c.max_ttl, timedelta(seconds=2))
+        self.assertEqual(c.stale_ttl, timedelta(seconds=3))
+
+    def test_caches_result_for_record_ttl(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2)
+
+        self.assertIs(self._lookup(query), a1)
+        self.now += 299
+        self.assertIs(self._lookup(query), a1)
+
+        self.assertEqual(len(query.mock_calls), 1)
+        self.assertEqual(self.c.hits, 1)
+        self.assertEqual(self.c.misses, 1)
+        self.assertEqual(self.c.hit_rate, 0.5)
+
+    def test_queries_again_after_ttl_and_stale_ttl(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2)
+
+        self.assertIs(self._lookup(query), a1)
+        self.now += 360
+        self.assertIs(self._lookup(query), a2)
+
+        self.assertEqual(len(query.mock_calls), 2)
+        self.assertEqual(self.c.misses, 2)
+        self.assertEqual(self.c.stale_hits, 0)
+
+    def test_serves_stale_result_while_refreshing(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2)
+
+        self._lookup(query)
+        self.now += 330
+
+        self.assertIs(self._lookup(query), a1)
+        self.assertEqual(self.c.stale_hits, 1)
+
+        # let the refresh complete
+        run_coroutine(asyncio.sleep(0))
+        self.assertEqual(len(query.mock_calls), 2)
+
+        self.assertIs(self._lookup(query), a2)
+        self.assertEqual(self.c.hits, 1)
+
+    def test_stale_lookups_start_only_one_refresh(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2, delay=0.01)
+
+        self._lookup(query)
+        self.now += 330
+
+        self.assertIs(self._lookup(query), a1)
+        self.assertIs(self._lookup(query), a1)
+
+        run_coroutine(asyncio.sleep(0.02))
+        self.assertEqual(len(query.mock_calls), 2)
+        self.assertEqual(self.c.stale_hits, 2)
+
+    def test_keeps_stale_result_if_refresh_fails(self):
+        a1 = self._answer(300)
+        query = self._query(a1, TimeoutError(), TimeoutError())
+
+        self._lookup(query)
+        self.now += 330
+
+        self.assertIs(self._lookup(query), a1)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertIs(self._lookup(query), a1)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertEqual(len(query.mock_calls), 3)
+        self.assertEqual(self.c.stale_hits, 2)
+
+        self.now += 60
+        with self.assertRaises(TimeoutError):
+            self._lookup(self._query(TimeoutError()))
+
+    def test_caches_negative_results_for_negative_ttl(self):
+        self.c.negative_ttl = timedelta(seconds=10)
+        a2 = self._answer(300)
+        query = self._query(None, a2)
+
+        self.assertIsNone(self._lookup(query))
+        self.now += 9
+        self.assertIsNone(self._lookup(query))
+        self.assertEqual(len(query.mock_calls), 1)
+
+        self.now += 62
+        self.assertIs(self._lookup(query), a2)
+        self.assertEqual(len(query.mock_calls), 2)
+
+    def test_does_not_cache_zero_ttl(self):
+        a1, a2 = self._answer(0), self._answer(0)
+        query = self._query(a1, a2)
+
+        self.assertIs(self._lookup(query), a1)
+        self.assertIs(self._lookup(query), a2)
+        self.assertEqual(len(self.c), 0)
+
+    def test_clamps_ttl_to_max_ttl(self):
+        self.c.max_ttl = timedelta(seconds=10)
+        self.c.stale_ttl = timedelta(0)
+        a1, a2 = self._answer(3600), self._answer(3600)
+        query = self._query(a1, a2)
+
+        self._lookup(query)
+        self.now += 10
+        self.assertIs(self._lookup(query), a2)
+
+    def test_does_not_cache_errors(self):
+        exc = dns.resolver.NoNameservers()
+        a2 = self._answer(300)
+        query = self._query(exc, a2)
+
+        with self.assertRaises(dns.resolver.NoNameservers):
+            self._lookup(query)
+
+        self.assertIs(self._lookup(query), a2)
+        self.assertEqual(len(query.mock_calls), 2)
+
+    def test_concurrent_lookups_share_one_query(self):
+        a1 = self._answer(300)
+        query = self._query(a1, delay=0.01)
+
+        results = run_coroutine(asyncio.gather(
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+        ))
+
+        self.assertSequenceEqual(results, [a1, a1, a1])
+        self.assertEqual(len(query.mock_calls), 1)
+        self.assertEqual(self.c.misses, 3)
+        self.assertEqual(self.c.coalesced, 2)
+
+    def test_lookups_on_different_loops_do_not_share_queries(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2, delay=0.01)
+
+        first = asyncio.ensure_future(
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+            loop=self.loop,
+        )
+        run_coroutine(asyncio.sleep(0))
+        self.assertEqual(len(query.mock_calls), 1)
+
+        other_loop = asyncio.new_event_loop()
+        try:
+            result = other_loop.run_until_complete(
+                self.c._lookup(unittest.mock.sentinel.key, query.impl,
+                               other_loop)
+            )
+        finally:
+            other_loop.close()
+
+        self.assertIs(result, a1)
+        self.assertEqual(len(query.mock_calls), 2)
+        self.assertEqual(self.c.coalesced, 0)
+
+        self.assertIs(run_coroutine(first), a2)
+
+    def test_concurrent_lookups_share_errors(self):
+        exc = TimeoutError()
+        query = self._query(exc, delay=0.01)
+
+        results = run_coroutine(asyncio.gather(
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop),
+            return_exceptions=True,
+        ))
+
+        self.assertSequenceEqual(results, [exc, exc])
+        self.assertEqual(len(query.mock_calls), 1)
+
+    def test_cancelled_lookup_does_not_cancel_shared_query(self):
+        a1 = self._answer(300)
+        query = self._query(a1, delay=0.01)
+
+        t1 = asyncio.ensure_future(
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop)
+        )
+        t2 = asyncio.ensure_future(
+            self.c._lookup(unittest.mock.sentinel.key, query.impl, self.loop)
+        )
+        run_coroutine(asyncio.sleep(0))
+
+        t1.cancel()
+        self.assertIs(run_coroutine(t2), a1)
+        self.assertTrue(t1.cancelled())
+
+        self.assertIs(self._lookup(query), a1)
+        self.assertEqual(len(query.mock_calls), 1)
+
+    def test_different_keys_are_cached_separately(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2)
+
+        self.assertIs(self._lookup(query, unittest.mock.sentinel.k1), a1)
+        self.assertIs(self._lookup(query, unittest.mock.sentinel.k2), a2)
+        self.assertIs(self._lookup(query, unittest.mock.sentinel.k1), a1)
+        self.assertEqual(len(self.c), 2)
+
+    def test_maxsize_evicts_least_recently_used(self):
+        self.c.maxsize = 2
+        answers = [self._answer(300) for i in range(4)]
+        query = self._query(*answers)
+
+        self._lookup(query, unittest.mock.sentinel.k1)
+        self._lookup(query, unittest.mock.sentinel.k2)
+        self._lookup(query, unittest.mock.sentinel.k1)
+        self._lookup(query, unittest.mock.sentinel.k3)
+
+        self.assertEqual(len(self.c), 2)
+        self.assertIs(self._lookup(query, unittest.mock.sentinel.k1),
+                      answers[0])
+        self.assertIs(self._lookup(query, unittest.mock.sentinel.k2),
+                      answers[3])
+
+    def test_clear(self):
+        a1, a2 = self._answer(300), self._answer(300)
+        query = self._query(a1, a2)
+
+        self._lookup(query)
+        self.c.clear()
+        self.assertEqual(len(self.c), 0)
+        self.assertIs(self._lookup(query), a2)
+
+    def test_reset_counters(self):
+        query = self._query(self._answer(300))
+        self._lookup(query)
+        self._lookup(query)
+
+        self.c.reset_counters()
+
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertIsNone(self.c.hit_rate)
+
+
+class Testrepeated_query_with_cache(unittest.TestCase):
+    def setUp(self):
+        self.cache = network.DNSCache()
+        self.uncached = CoroutineMock()
+        self.uncached.return_value = unittest.mock.Mock()
+        self.uncached.return_value.rrset.ttl = 300
+
+        self.patches = [
+            unittest.mock.patch(
+                "aioxmpp.network._repeated_query",
+                new=self.uncached,
+            ),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+        network.set_dns_cache(self.cache)
+
+    def tearDown(self):
+        network.set_dns_cache(None)
+        for patch in self.patches:
+            patch.stop()
+
+    def test_get_set_dns_cache(self):
+        self.assertIs(network.get_dns_cache(), self.cache)
+        network.set_dns_cache(None)
+        self.assertIsNone(network.get_dns_cache())
+
+    def test_uses_cache(self):
+        for i in range(3):
+            result = run_coroutine(network.repeated_query(
+                b"example.com",
+                dns.rdatatype.A,
+                executor=unittest.mock.sentinel.executor,
+            ))
+            self.assertIs(result, self.uncached.return_value)
+
+        self.uncached.assert_called_once_with(
+            b"example.com",
+            dns.rdatatype.A,
+            nattempts=None,
+            resolver=None,
+            require_ad=False,
+            executor=unittest.mock.sentinel.executor,
+        )
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_require_ad_is_part_of_the_key(self):
+        run_coroutine(network.repeated_query(
+            b"example.com",
+            dns.rdatatype.TLSA,
+        ))
+        run_coroutine(network.repeated_query(
+            b"example.com",
+            dns.rdatatype.TLSA,
+            require_ad=True,
+        ))
+        run_coroutine(network.repeated_query(
+            b"example.com",
+            dns.rdatatype.SRV,
+        ))
+
+        self.assertEqual(len(self.uncached.mock_calls), 3)
+        self.assertEqual(len(self.cache), 3)
+
+    def test_bypasses_cache_with_explicit_resolver(self):
+        for i in range(2):
+            run_coroutine(network.repeated_query(
+                b"example.com",
+                dns.rdatatype.A,
+                resolver=unittest.mock.sentinel.resolver,
+            ))
+
+        self.assertEqual(len(self.uncached.mock_calls), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_bypasses_cache_with_overridden_resolver(self):
+        with unittest.mock.patch("aioxmpp.network._state",
+                                 new=threading.local()):
+            network.set_resolver(unittest.mock.sentinel.resolver)
+
+            for i in range(2):
+                run_coroutine(network.repeated_query(
+                    b"example.com",
+                    dns.rdatatype.A,
+                ))
+
+        self.assertEqual(len(self.uncached.mock_calls), 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_rejects_non_positive_number_of_attempts_on_hit(self):
+        run_coroutine(network.repeated_query(
+            b"example.com",
+            dns.rdatatype.A,
+        ))
+
+        with self.assertRaisesRegex(
+                ValueError,
+                "query cannot succeed with non-positive amount of attempts"):
+            run_coroutine(network.repeated_query(
+                b"example.com",
+                dns.rdatatype.A,
+                nattempts=0,
+            ))
+
+
 class Testlookup_srv(unittest.TestCase):
     def setUp(self):
         base = unittest.mock.Mock()
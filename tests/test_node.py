@@ -37,6 +37,7 @@ import dns.resolver
 import aiosasl
 
 import aioxmpp
+import aioxmpp.connector
 import aioxmpp.dispatcher
 import aioxmpp.node as node
 import aioxmpp.structs as structs
@@ -1655,6 +1656,249 @@ class Testconnect_xmlstream(unittest.TestCase):
             ]
         )
 
+    def _racing_connector(self, name, *, exc=None, delay=None, gate=None):
+        conn = unittest.mock.Mock(name=name)
+        conn.events = []
+        conn.xmlstream = unittest.mock.Mock(name=name + ".xmlstream")
+
+        @asyncio.coroutine
+        def connect(*args, **kwargs):
+            conn.events.append("start")
+            try:
+                if gate is not None:
+                    yield from gate
+                elif delay is None:
+                    yield from asyncio.Future()
+                else:
+                    yield from asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                conn.events.append("cancelled")
+                raise
+            if exc is not None:
+                raise exc
+            return (
+                getattr(unittest.mock.sentinel, name + "_transport"),
+                conn.xmlstream,
+                getattr(unittest.mock.sentinel, name + "_features"),
+            )
+
+        conn.connect = connect
+        return conn
+
+    def test_racing_starts_next_attempt_after_attempt_delay(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+        metadata.sasl_providers = []
+
+        c0 = self._racing_connector("c0")
+        c1 = self._racing_connector("c1", delay=0.01)
+        c2 = self._racing_connector("c2")
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+            (unittest.mock.sentinel.h2, 5222, c2),
+        ]
+
+        result = run_coroutine(node.connect_xmlstream(
+            jid,
+            metadata,
+            attempt_delay=0.05,
+        ))
+
+        self.assertEqual(
+            result,
+            (
+                unittest.mock.sentinel.c1_transport,
+                c1.xmlstream,
+                unittest.mock.sentinel.c1_features,
+            )
+        )
+
+        self.assertSequenceEqual(c0.events, ["start", "cancelled"])
+        self.assertSequenceEqual(c1.events, ["start"])
+        # c1 succeeded before the attempt delay elapsed
+        self.assertSequenceEqual(c2.events, [])
+
+    def test_racing_starts_next_attempt_early_on_failure(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+        metadata.sasl_providers = []
+
+        exc = OSError()
+        c0 = self._racing_connector("c0", delay=0, exc=exc)
+        c1 = self._racing_connector("c1", delay=0)
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+        ]
+
+        # the attempt delay would make the test time out if it was waited for
+        result = run_coroutine(node.connect_xmlstream(
+            jid,
+            metadata,
+            attempt_delay=3600,
+        ))
+
+        self.assertEqual(result[1], c1.xmlstream)
+        self.assertSequenceEqual(c0.events, ["start"])
+        self.assertSequenceEqual(c1.events, ["start"])
+
+    def test_racing_aborts_surplus_successful_attempts(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+        metadata.sasl_providers = []
+
+        # both attempts finish in the same loop iteration
+        gate = asyncio.Future()
+        asyncio.get_event_loop().call_later(0.01, gate.set_result, None)
+        c0 = self._racing_connector("c0", gate=gate)
+        c1 = self._racing_connector("c1", gate=gate)
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+        ]
+
+        result = run_coroutine(node.connect_xmlstream(
+            jid,
+            metadata,
+            attempt_delay=0,
+        ))
+
+        self.assertEqual(result[1], c0.xmlstream)
+        self.assertSequenceEqual(c0.events, ["start"])
+        self.assertSequenceEqual(c1.events, ["start"])
+        c0.xmlstream.abort.assert_not_called()
+        c1.xmlstream.abort.assert_called_once_with()
+
+    def test_racing_aborts_successful_attempt_if_other_attempt_raises(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+        metadata.sasl_providers = []
+
+        # not an OSError, so it is not collected for the next attempt
+        exc = asyncio.TimeoutError()
+
+        # both attempts finish in the same loop iteration
+        gate = asyncio.Future()
+        asyncio.get_event_loop().call_later(0.01, gate.set_result, None)
+        c0 = self._racing_connector("c0", gate=gate)
+        c1 = self._racing_connector("c1", gate=gate, exc=exc)
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+        ]
+
+        with self.assertRaises(asyncio.TimeoutError) as ctx:
+            run_coroutine(node.connect_xmlstream(
+                jid,
+                metadata,
+                attempt_delay=0,
+            ))
+
+        self.assertIs(ctx.exception, exc)
+        self.assertSequenceEqual(c0.events, ["start"])
+        self.assertSequenceEqual(c1.events, ["start"])
+        c0.xmlstream.abort.assert_called_once_with()
+
+    def test_racing_raises_multi_os_error_if_all_attempts_fail(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+
+        excs = [OSError(), OSError(), OSError()]
+        conns = [
+            self._racing_connector("c{}".format(i), delay=0.01 * (3 - i),
+                                   exc=exc)
+            for i, exc in enumerate(excs)
+        ]
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.host, 5222, conn)
+            for conn in conns
+        ]
+
+        with self.assertRaises(errors.MultiOSError) as ctx:
+            run_coroutine(node.connect_xmlstream(
+                jid,
+                metadata,
+                attempt_delay=0,
+            ))
+
+        self.assertCountEqual(ctx.exception.exceptions, excs)
+        for conn in conns:
+            self.assertSequenceEqual(conn.events, ["start"])
+
+    def test_racing_continues_with_remaining_options_if_sasl_fails(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+
+        c0 = self._racing_connector("c0", delay=0)
+        c1 = self._racing_connector("c1", delay=0)
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+        ]
+
+        exc = errors.SASLUnavailable("foo")
+        self.negotiate_sasl.side_effect = [
+            exc,
+            unittest.mock.sentinel.post_sasl_features,
+        ]
+
+        result = run_coroutine(node.connect_xmlstream(
+            jid,
+            metadata,
+            attempt_delay=3600,
+        ))
+
+        self.assertEqual(
+            result,
+            (
+                unittest.mock.sentinel.c1_transport,
+                c1.xmlstream,
+                unittest.mock.sentinel.post_sasl_features,
+            )
+        )
+
+        self.send_stream_error.assert_called_once_with(
+            c0.xmlstream,
+            condition=errors.StreamErrorCondition.POLICY_VIOLATION,
+            text=str(exc),
+        )
+
+    def test_racing_cancels_attempts_if_cancelled(self):
+        jid = unittest.mock.Mock()
+        metadata = unittest.mock.Mock()
+
+        c0 = self._racing_connector("c0")
+        c1 = self._racing_connector("c1")
+
+        self.discover_connectors.return_value = [
+            (unittest.mock.sentinel.h0, 5222, c0),
+            (unittest.mock.sentinel.h1, 5222, c1),
+        ]
+
+        task = asyncio.ensure_future(node.connect_xmlstream(
+            jid,
+            metadata,
+            attempt_delay=0,
+        ))
+        run_coroutine(asyncio.sleep(0.01))
+
+        self.assertSequenceEqual(c0.events, ["start"])
+        self.assertSequenceEqual(c1.events, ["start"])
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task)
+
+        self.assertSequenceEqual(c0.events, ["start", "cancelled"])
+        self.assertSequenceEqual(c1.events, ["start", "cancelled"])
+
     def test_handle_no_options(self):
         base = unittest.mock.Mock()
 
@@ -1678,6 +1922,125 @@ class Testconnect_xmlstream(unittest.TestCase):
                 ))
 
 
+class Testconnect_xmlstream_racing_local(unittest.TestCase):
+    STREAM_HEADER = (
+        b"<?xml version='1.0'?>"
+        b"<stream:stream xmlns='jabber:client'"
+        b" xmlns:stream='http://etherx.jabber.org/streams'"
+        b" from='localhost' id='racing' version='1.0'>"
+        b"<stream:features/>"
+    )
+
+    class ServerProtocol(asyncio.Protocol):
+        def __init__(self, server, respond):
+            super().__init__()
+            self.server = server
+            self.respond = respond
+
+        def connection_made(self, transport):
+            self.transport = transport
+            self.server.connections.append(self)
+
+        def data_received(self, data):
+            if self.respond:
+                self.respond = False
+                self.transport.write(
+                    Testconnect_xmlstream_racing_local.STREAM_HEADER
+                )
+
+        def connection_lost(self, exc):
+            self.server.lost.append(self)
+
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.servers = []
+        self.jid = structs.JID.fromstr("romeo@localhost")
+        self.metadata = unittest.mock.Mock()
+        self.metadata.tls_required = False
+        self.metadata.sasl_providers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+            run_coroutine(server.wait_closed())
+
+    def _start_server(self, respond):
+        info = unittest.mock.Mock()
+        info.connections = []
+        info.lost = []
+        server = run_coroutine(self.loop.create_server(
+            lambda: self.ServerProtocol(info, respond),
+            host="127.0.0.1",
+            port=0,
+        ))
+        self.servers.append(server)
+        info.port = server.sockets[0].getsockname()[1]
+        return info
+
+    def test_unresponsive_host_does_not_block_connection(self):
+        dead = self._start_server(respond=False)
+        alive = self._start_server(respond=True)
+
+        override_peer = [
+            ("127.0.0.1", dead.port, aioxmpp.connector.STARTTLSConnector()),
+            ("127.0.0.1", alive.port, aioxmpp.connector.STARTTLSConnector()),
+        ]
+
+        transport, xmlstream, features = run_coroutine(
+            node.connect_xmlstream(
+                self.jid,
+                self.metadata,
+                negotiation_timeout=60,
+                override_peer=override_peer,
+                attempt_delay=0.05,
+            ),
+            timeout=get_timeout(1.0),
+        )
+
+        try:
+            self.assertIsInstance(features, nonza.StreamFeatures)
+            self.assertEqual(len(alive.connections), 1)
+            self.assertEqual(
+                transport.get_extra_info("peername")[1],
+                alive.port,
+            )
+
+            # the attempt to the unresponsive host has been closed
+            run_coroutine(asyncio.sleep(0.01))
+            self.assertEqual(len(dead.connections), 1)
+            self.assertEqual(len(dead.lost), 1)
+        finally:
+            xmlstream.abort()
+
+    def test_sequential_connection_waits_for_unresponsive_host(self):
+        dead = self._start_server(respond=False)
+        alive = self._start_server(respond=True)
+
+        override_peer = [
+            ("127.0.0.1", dead.port, aioxmpp.connector.STARTTLSConnector()),
+            ("127.0.0.1", alive.port, aioxmpp.connector.STARTTLSConnector()),
+        ]
+
+        task = asyncio.ensure_future(node.connect_xmlstream(
+            self.jid,
+            self.metadata,
+            negotiation_timeout=60,
+            override_peer=override_peer,
+        ))
+        run_coroutine(asyncio.sleep(0.1))
+
+        self.assertFalse(task.done())
+        self.assertEqual(len(dead.connections), 1)
+        self.assertEqual(len(alive.connections), 0)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task)
+
+        run_coroutine(asyncio.sleep(0.01))
+        self.assertEqual(len(dead.lost), 1)
+
+
 class TestClient(xmltestutils.XMLTestCase):
     @asyncio.coroutine
     def _connect_xmlstream(self, *args, **kwargs):
@@ -1787,6 +2150,7 @@ class TestClient(xmltestutils.XMLTestCase):
             self.client.local_jid.bare(),
             self.client.stream.local_jid
         )
+        self.assertIsNone(self.client.write_policy)
 
     def test_setup(self):
         def peer_iterator():
@@ -1797,9 +2161,19 @@ class TestClient(xmltestutils.XMLTestCase):
             self.test_jid,
             self.security_layer,
             override_peer=peer_iterator(),
-            negotiation_timeout=timedelta(seconds=30)
+            negotiation_timeout=timedelta(seconds=30),
+            write_policy=unittest.mock.sentinel.write_policy,
+            attempt_delay=timedelta(milliseconds=250),
         )
         self.assertEqual(client.local_jid, self.test_jid)
+        self.assertEqual(
+            client.write_policy,
+            unittest.mock.sentinel.write_policy,
+        )
+        self.assertEqual(
+            client.attempt_delay,
+            timedelta(milliseconds=250),
+        )
         self.assertEqual(
             client.negotiation_timeout,
             timedelta(seconds=30)
@@ -1959,7 +2333,8 @@ class TestClient(xmltestutils.XMLTestCase):
             send_task = asyncio.ensure_future(
                 self.client.send(unittest.mock.sentinel.stanza,
                                  timeout=unittest.mock.sentinel.timeout,
-                                 cb=unittest.mock.sentinel.cb)
+                                 cb=unittest.mock.sentinel.cb,
+                                 priority=unittest.mock.sentinel.priority)
             )
 
             run_coroutine(asyncio.sleep(0.1))
@@ -1973,7 +2348,8 @@ class TestClient(xmltestutils.XMLTestCase):
             stream_send.assert_called_once_with(
                 unittest.mock.sentinel.stanza,
                 timeout=unittest.mock.sentinel.timeout,
-                cb=unittest.mock.sentinel.cb
+                cb=unittest.mock.sentinel.cb,
+                priority=unittest.mock.sentinel.priority,
             )
 
         # ensure that the "main task" we faked above gets cancelled before the
@@ -1995,6 +2371,7 @@ class TestClient(xmltestutils.XMLTestCase):
             override_peer=[],
             loop=self.loop,
             logger=self.client.logger,
+            attempt_delay=None,
         )
 
     def test_start_with_override_peer(self):
@@ -2016,8 +2393,31 @@ class TestClient(xmltestutils.XMLTestCase):
             override_peer=self.client.override_peer,
             loop=self.loop,
             logger=self.client.logger,
+            attempt_delay=None,
         )
 
+    def test_start_with_attempt_delay(self):
+        self.assertIsNone(self.client.attempt_delay)
+        self.client.attempt_delay = timedelta(milliseconds=250)
+        self.client.start()
+        run_coroutine(self.xmlstream.run_test(self.resource_binding))
+        self.connect_xmlstream_rec.assert_called_once_with(
+            self.test_jid,
+            self.security_layer,
+            negotiation_timeout=60.0,
+            override_peer=[],
+            loop=self.loop,
+            logger=self.client.logger,
+            attempt_delay=0.25,
+        )
+
+    def test_start_applies_write_policy(self):
+        policy = unittest.mock.sentinel.write_policy
+        self.client.write_policy = policy
+        self.client.start()
+        run_coroutine(self.xmlstream.run_test(self.resource_binding))
+        self.assertIs(self.xmlstream.write_policy, policy)
+
     def test_reject_start_twice(self):
         self.client.start()
         with self.assertRaisesRegex(RuntimeError,
@@ -2133,7 +2533,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     negotiation_timeout=0.01,
                     override_peer=[],
                     loop=self.loop,
-                    logger=self.client.logger)
+                    logger=self.client.logger,
+                    attempt_delay=None)
             ]*2,
             self.connect_xmlstream_rec.mock_calls
         )
@@ -2159,7 +2560,8 @@ class TestClient(xmltestutils.XMLTestCase):
             negotiation_timeout=60.0,
             override_peer=[],
             loop=self.loop,
-            logger=self.client.logger)
+            logger=self.client.logger,
+            attempt_delay=None)
 
         self.client.backoff_start = timedelta(seconds=0.05)
         self.client.backoff_factor = 2
@@ -2303,7 +2705,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     negotiation_timeout=0.01,
                     override_peer=[],
                     loop=self.loop,
-                    logger=self.client.logger)
+                    logger=self.client.logger,
+                    attempt_delay=None)
             ]*2,
             self.connect_xmlstream_rec.mock_calls
         )
@@ -2422,6 +2825,56 @@ class TestClient(xmltestutils.XMLTestCase):
             self.failure_rec.mock_calls
         )
 
+    def test_connection_limiter_wraps_connect_xmlstream(self):
+        self.assertIsNone(self.client.connection_limiter)
+
+        limiter = unittest.mock.Mock()
+        limiter.acquire = CoroutineMock()
+
+        def check_acquired(*args, **kwargs):
+            limiter.acquire.assert_called_once_with()
+            limiter.release.assert_not_called()
+
+        self.connect_xmlstream_rec.side_effect = check_acquired
+        self.client.connection_limiter = limiter
+
+        self.client.start()
+        run_coroutine(self.xmlstream.run_test(self.resource_binding))
+
+        self.connect_xmlstream_rec.assert_called_once_with(
+            self.test_jid,
+            self.security_layer,
+            negotiation_timeout=60.0,
+            override_peer=[],
+            loop=self.loop,
+            logger=self.client.logger,
+            attempt_delay=None,
+        )
+        limiter.release.assert_called_once_with()
+
+    def test_connection_limiter_released_on_connection_error(self):
+        limiter = unittest.mock.Mock()
+        limiter.acquire = CoroutineMock()
+
+        self.connect_xmlstream_rec.side_effect = OSError()
+        self.client.backoff_start = timedelta(seconds=60)
+        self.client.connection_limiter = limiter
+
+        self.client.start()
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertTrue(self.client.running)
+        self.assertSequenceEqual(
+            limiter.mock_calls,
+            [
+                unittest.mock.call.acquire(),
+                unittest.mock.call.release(),
+            ]
+        )
+
+        self.client.stop()
+        run_coroutine(asyncio.sleep(0))
+
     def test_exponential_backoff_on_os_error(self):
         base_timeout = get_timeout(0.01)
 
@@ -2431,7 +2884,8 @@ class TestClient(xmltestutils.XMLTestCase):
             negotiation_timeout=60.0,
             override_peer=[],
             loop=self.loop,
-            logger=self.client.logger)
+            logger=self.client.logger,
+            attempt_delay=None)
 
         exc = OSError()
         self.connect_xmlstream_rec.side_effect = exc
@@ -2518,7 +2972,8 @@ class TestClient(xmltestutils.XMLTestCase):
             negotiation_timeout=60.0,
             override_peer=[],
             loop=self.loop,
-            logger=self.client.logger)
+            logger=self.client.logger,
+            attempt_delay=None)
 
         exc = OSError()
         self.connect_xmlstream_rec.side_effect = exc
@@ -2556,7 +3011,8 @@ class TestClient(xmltestutils.XMLTestCase):
             negotiation_timeout=60.0,
             override_peer=[],
             loop=self.loop,
-            logger=self.client.logger)
+            logger=self.client.logger,
+            attempt_delay=None)
 
         exc = dns.resolver.NoNameservers()
         self.connect_xmlstream_rec.side_effect = exc
@@ -2633,7 +3089,8 @@ class TestClient(xmltestutils.XMLTestCase):
             negotiation_timeout=60.0,
             override_peer=[],
             loop=self.loop,
-            logger=self.client.logger)
+            logger=self.client.logger,
+            attempt_delay=None)
 
         exc = OpenSSL.SSL.Error
         self.connect_xmlstream_rec.side_effect = exc
@@ -3079,7 +3536,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     override_peer=[],
                     negotiation_timeout=60.0,
                     loop=self.loop,
-                    logger=self.client.logger),
+                    logger=self.client.logger,
+                    attempt_delay=None),
                 unittest.mock.call(
                     self.test_jid,
                     self.security_layer,
@@ -3088,7 +3546,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     ],
                     negotiation_timeout=60.0,
                     loop=self.loop,
-                    logger=self.client.logger),
+                    logger=self.client.logger,
+                    attempt_delay=None),
             ],
             self.connect_xmlstream_rec.mock_calls
         )
@@ -3156,7 +3615,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     ],
                     negotiation_timeout=60.0,
                     loop=self.loop,
-                    logger=self.client.logger),
+                    logger=self.client.logger,
+                    attempt_delay=None),
                 unittest.mock.call(
                     self.test_jid,
                     self.security_layer,
@@ -3166,7 +3626,8 @@ class TestClient(xmltestutils.XMLTestCase):
                     ],
                     negotiation_timeout=60.0,
                     loop=self.loop,
-                    logger=self.client.logger),
+                    logger=self.client.logger,
+                    attempt_delay=None),
             ],
             self.connect_xmlstream_rec.mock_calls
         )
@@ -3432,11 +3893,6 @@ class TestClient(xmltestutils.XMLTestCase):
     def test_signals_fire_correctly_on_fail_after_established_connection(self):
         self.client.start()
 
-        run_coroutine(self.xmlstream.run_test([]))
-
-        exc = aiosasl.AuthenticationFailure("not-authorized")
-        self.connect_xmlstream_rec.side_effect = exc
-
         run_coroutine(self.xmlstream.run_test([
             XMLStreamMock.Send(
                 stanza.IQ(
@@ -3458,6 +3914,9 @@ class TestClient(xmltestutils.XMLTestCase):
             )
         ]))
 
+        exc = aiosasl.AuthenticationFailure("not-authorized")
+        self.connect_xmlstream_rec.side_effect = exc
+
         run_coroutine(self.xmlstream.run_test(
             [
             ],
@@ -3499,6 +3958,31 @@ class TestClient(xmltestutils.XMLTestCase):
         self.established_rec.assert_called_once_with()
         self.destroyed_rec.assert_called_once_with()
 
+    def test_summon_emits_on_service_summoned(self):
+        class Svc1(service.Service):
+            pass
+
+        class Svc2(service.Service):
+            ORDER_AFTER = [Svc1]
+
+        listener = unittest.mock.Mock()
+        listener.return_value = None
+        self.client.on_service_summoned.connect(listener)
+
+        svc2 = self.client.summon(Svc2)
+
+        self.assertSequenceEqual(
+            listener.mock_calls,
+            [
+                unittest.mock.call(svc2.dependencies[Svc1]),
+                unittest.mock.call(svc2),
+            ]
+        )
+
+        listener.reset_mock()
+        self.client.summon(Svc2)
+        listener.assert_not_called()
+
     def test_summon(self):
         svc_init = unittest.mock.Mock()
 
@@ -33,6 +33,7 @@ import aioxmpp.structs as structs
 import aioxmpp.xso as xso
 import aioxmpp.nonza as nonza
 import aioxmpp.errors as errors
+import aioxmpp.xml
 
 from aioxmpp.testutils import (
     TransportMock,
@@ -545,6 +546,121 @@ class TestAlivenessMonitor(unittest.TestCase):
         self.listener.on_deadtime_hard_limit_tripped.assert_called_once_with()
 
 
+class TestWriteCoalescingPolicy(unittest.TestCase):
+    def test_defaults(self):
+        policy = protocol.WriteCoalescingPolicy()
+        self.assertIsNone(policy.max_delay)
+        self.assertEqual(policy.max_size, 16384)
+
+    def test_init(self):
+        policy = protocol.WriteCoalescingPolicy(
+            max_delay=timedelta(milliseconds=5),
+            max_size=1024,
+        )
+        self.assertEqual(policy.max_delay, timedelta(milliseconds=5))
+        self.assertEqual(policy.max_size, 1024)
+
+    def test_reject_non_positive_max_size(self):
+        with self.assertRaises(ValueError):
+            protocol.WriteCoalescingPolicy(max_size=0)
+
+    def test_arguments_are_keyword_only(self):
+        with self.assertRaises(TypeError):
+            protocol.WriteCoalescingPolicy(None, 1024)
+
+
+class Test_CoalescingWriter(unittest.TestCase):
+    def setUp(self):
+        self.transport = unittest.mock.Mock()
+        self.loop = unittest.mock.Mock()
+        self.w = protocol._CoalescingWriter(self.transport, self.loop)
+
+    def tearDown(self):
+        del self.w
+
+    def test_passes_writes_through_without_policy(self):
+        self.assertIsNone(self.w.policy)
+        self.w.write(b"foo")
+        self.w.write(b"bar")
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b"foo"),
+                unittest.mock.call.write(b"bar"),
+            ],
+            self.transport.mock_calls
+        )
+        self.loop.call_soon.assert_not_called()
+
+    def test_buffers_writes_until_next_iteration(self):
+        self.w.policy = protocol.WriteCoalescingPolicy()
+        self.w.write(b"foo")
+        self.w.write(b"bar")
+        self.w.write(b"baz")
+
+        self.loop.call_soon.assert_called_once_with(self.w.flush)
+        self.assertSequenceEqual([], self.transport.mock_calls)
+
+        self.w.flush()
+        self.loop.call_soon().cancel.assert_called_once_with()
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.writelines([b"foo", b"bar", b"baz"]),
+            ],
+            self.transport.mock_calls
+        )
+
+    def test_uses_write_for_single_piece(self):
+        self.w.policy = protocol.WriteCoalescingPolicy()
+        self.w.write(b"foo")
+        self.w.flush()
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b"foo"),
+            ],
+            self.transport.mock_calls
+        )
+
+    def test_flush_without_data_is_noop(self):
+        self.w.policy = protocol.WriteCoalescingPolicy()
+        self.w.flush()
+        self.assertSequenceEqual([], self.transport.mock_calls)
+
+    def test_uses_call_later_with_max_delay(self):
+        self.w.policy = protocol.WriteCoalescingPolicy(
+            max_delay=timedelta(milliseconds=5),
+        )
+        self.w.write(b"foo")
+        self.w.write(b"bar")
+        self.loop.call_later.assert_called_once_with(0.005, self.w.flush)
+        self.loop.call_soon.assert_not_called()
+
+    def test_flushes_immediately_when_size_is_reached(self):
+        self.w.policy = protocol.WriteCoalescingPolicy(max_size=6)
+        self.w.write(b"foo")
+        self.assertSequenceEqual([], self.transport.mock_calls)
+        self.w.write(b"bar")
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.writelines([b"foo", b"bar"]),
+            ],
+            self.transport.mock_calls
+        )
+        self.loop.call_soon().cancel.assert_called_once_with()
+
+        self.transport.mock_calls.clear()
+        self.loop.reset_mock()
+        self.w.write(b"baz")
+        self.loop.call_soon.assert_called_once_with(self.w.flush)
+
+    def test_discard(self):
+        self.w.policy = protocol.WriteCoalescingPolicy()
+        self.w.write(b"foo")
+        self.w.discard()
+        self.loop.call_soon().cancel.assert_called_once_with()
+        self.w.flush()
+        self.assertSequenceEqual([], self.transport.mock_calls)
+
+
 class TestXMLStream(unittest.TestCase):
     def setUp(self):
         self.maxDiff = None
@@ -642,6 +758,40 @@ class TestXMLStream(unittest.TestCase):
                 ]
             ))
 
+    def test_uses_ExpatParser_by_default(self):
+        t, p = self._make_stream(to=TEST_PEER)
+        run_coroutine(
+            t.run_test(
+                [
+                    TransportMock.Write(STREAM_HEADER),
+                ],
+                partial=True
+            ))
+        self.assertIsInstance(p._parser, aioxmpp.xml.ExpatParser)
+
+    def test_uses_parser_factory(self):
+        factory = unittest.mock.Mock(wraps=aioxmpp.xml.make_parser)
+        t, p = self._make_stream(to=TEST_PEER, parser_factory=factory)
+        factory.assert_not_called()
+        run_coroutine(
+            t.run_test(
+                [
+                    TransportMock.Write(
+                        STREAM_HEADER,
+                        response=[
+                            TransportMock.Receive(
+                                self._make_peer_header(version=(1, 0)) +
+                                self._make_eos()),
+                            TransportMock.ReceiveEof()
+                        ]
+                    ),
+                    TransportMock.Write(b"</stream:stream>"),
+                    TransportMock.WriteEof(),
+                    TransportMock.Close()
+                ]
+            ))
+        factory.assert_called_once_with()
+
     def test_only_one_close_event_on_multiple_errors(self):
         t, p = self._make_stream(to=TEST_PEER)
         run_coroutine(t.run_test([
@@ -1051,6 +1201,166 @@ class TestXMLStream(unittest.TestCase):
             )
         )
 
+    def test_write_policy(self):
+        t, p = self._make_stream(to=TEST_PEER)
+        self.assertIsNone(p.write_policy)
+
+        policy = protocol.WriteCoalescingPolicy()
+        t, p = self._make_stream(to=TEST_PEER, write_policy=policy)
+        self.assertIs(p.write_policy, policy)
+
+        p.write_policy = None
+        self.assertIsNone(p.write_policy)
+
+    def test_send_xso_coalesces_writes(self):
+        transport = unittest.mock.Mock()
+        transport.can_write_eof.return_value = False
+        t, p = self._make_stream(
+            to=TEST_PEER,
+            write_policy=protocol.WriteCoalescingPolicy(),
+        )
+        p.connection_made(transport)
+        p.data_received(self._make_peer_header())
+        run_coroutine(asyncio.sleep(0))
+        transport.mock_calls.clear()
+
+        for i in range(3):
+            st = FakeIQ(structs.IQType.GET)
+            st.id_ = str(i)
+            p.send_xso(st)
+
+        self.assertSequenceEqual([], transport.mock_calls)
+
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.writelines([
+                    b'<iq id="0" type="get"/>',
+                    b'<iq id="1" type="get"/>',
+                    b'<iq id="2" type="get"/>',
+                ]),
+            ],
+            transport.mock_calls
+        )
+
+    def test_bytes_sent(self):
+        transport = unittest.mock.Mock()
+        t, p = self._make_stream(
+            to=TEST_PEER,
+            write_policy=protocol.WriteCoalescingPolicy(),
+        )
+        self.assertEqual(p.bytes_sent, 0)
+
+        p.connection_made(transport)
+        p.data_received(self._make_peer_header())
+        # the stream header has been sent
+        base = p.bytes_sent
+        self.assertGreater(base, 0)
+
+        st = FakeIQ(structs.IQType.GET)
+        st.id_ = "foo"
+        p.send_xso(st)
+        # held back data counts, too
+        self.assertEqual(
+            p.bytes_sent,
+            base + len(b'<iq id="foo" type="get"/>'),
+        )
+
+        p.connection_lost(None)
+        self.assertEqual(
+            p.bytes_sent,
+            base + len(b'<iq id="foo" type="get"/>'),
+        )
+
+    def test_flush_writes_held_back_data(self):
+        transport = unittest.mock.Mock()
+        t, p = self._make_stream(
+            to=TEST_PEER,
+            write_policy=protocol.WriteCoalescingPolicy(),
+        )
+        p.connection_made(transport)
+        p.data_received(self._make_peer_header())
+        transport.mock_calls.clear()
+
+        st = FakeIQ(structs.IQType.GET)
+        st.id_ = "foo"
+        p.send_xso(st)
+        self.assertSequenceEqual([], transport.mock_calls)
+
+        p.flush()
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b'<iq id="foo" type="get"/>'),
+            ],
+            transport.mock_calls
+        )
+
+    def test_disabling_write_policy_flushes(self):
+        transport = unittest.mock.Mock()
+        t, p = self._make_stream(
+            to=TEST_PEER,
+            write_policy=protocol.WriteCoalescingPolicy(),
+        )
+        p.connection_made(transport)
+        p.data_received(self._make_peer_header())
+        transport.mock_calls.clear()
+
+        st = FakeIQ(structs.IQType.GET)
+        st.id_ = "foo"
+        p.send_xso(st)
+        p.write_policy = None
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b'<iq id="foo" type="get"/>'),
+            ],
+            transport.mock_calls
+        )
+        transport.mock_calls.clear()
+
+        p.send_xso(st)
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b'<iq id="foo" type="get"/>'),
+            ],
+            transport.mock_calls
+        )
+
+    def test_close_flushes_before_eof_with_write_policy(self):
+        t, p = self._make_stream(
+            to=TEST_PEER,
+            write_policy=protocol.WriteCoalescingPolicy(),
+        )
+
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(
+                    STREAM_HEADER,
+                    response=[
+                        TransportMock.Receive(
+                            self._make_peer_header(version=(1, 0))
+                        ),
+                    ]),
+            ],
+            partial=True
+        ))
+
+        st = FakeIQ(structs.IQType.GET)
+        st.id_ = "foo"
+        p.send_xso(st)
+        p.close()
+
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(
+                    b'<iq id="foo" type="get"/></stream:stream>'
+                ),
+                TransportMock.WriteEof(),
+            ],
+            partial=True
+        ))
+
     def test_send_xso_reraises_error_from_writer(self):
         st = FakeIQ(structs.IQType.GET)
         st.id_ = "id"
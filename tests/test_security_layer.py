@@ -20,16 +20,27 @@
 #
 ########################################################################
 import asyncio
+import base64
+import concurrent.futures
 import contextlib
+import hashlib
+import hmac
+import pickle
 import random
 import ssl
+import sys
 import unittest
 
+from datetime import timedelta
+
 import OpenSSL.crypto
 import OpenSSL.SSL
 
 import aiosasl
 
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec
+
 import aioxmpp.errors as errors
 import aioxmpp.structs as structs
 import aioxmpp.security_layer as security_layer
@@ -1874,6 +1885,68 @@ class TestPasswordSASLProvider(xmltestutils.XMLTestCase):
             )
         )
 
+    def test_uses_scram_key_cache(self):
+        self.mechanisms.mechanisms.append(
+            security_layer.SASLMechanism(name="SCRAM-SHA-1"),
+        )
+
+        provider = security_layer.PasswordSASLProvider(
+            self._password_provider_wrapper,
+            scram_key_cache=unittest.mock.sentinel.scram_key_cache,
+        )
+
+        with contextlib.ExitStack() as stack:
+            _CachingSCRAM = stack.enter_context(unittest.mock.patch(
+                "aioxmpp.security_layer._CachingSCRAM",
+            ))
+            _execute = stack.enter_context(unittest.mock.patch.object(
+                provider,
+                "_execute",
+                new=CoroutineMock(),
+            ))
+            _execute.return_value = True
+
+            self.assertTrue(self._test_provider(provider))
+
+        _CachingSCRAM.assert_called_once_with(
+            unittest.mock.ANY,
+            unittest.mock.sentinel.scram_key_cache,
+            self.client_jid.bare(),
+        )
+        _execute.assert_called_once_with(
+            unittest.mock.ANY,
+            _CachingSCRAM(),
+            aiosasl.SCRAM.any_supported(["SCRAM-SHA-1"]),
+        )
+
+    def test_does_not_use_scram_key_cache_for_plain(self):
+        self.mechanisms.mechanisms.append(
+            security_layer.SASLMechanism(name="PLAIN"),
+        )
+
+        provider = security_layer.PasswordSASLProvider(
+            self._password_provider_wrapper,
+            scram_key_cache=unittest.mock.sentinel.scram_key_cache,
+        )
+
+        with contextlib.ExitStack() as stack:
+            _CachingSCRAM = stack.enter_context(unittest.mock.patch(
+                "aioxmpp.security_layer._CachingSCRAM",
+            ))
+            _execute = stack.enter_context(unittest.mock.patch.object(
+                provider,
+                "_execute",
+                new=CoroutineMock(),
+            ))
+            _execute.return_value = True
+
+            self.assertTrue(self._test_provider(provider,
+                                                tls_transport=True))
+
+        _CachingSCRAM.assert_not_called()
+        _, (_, mechanism, _), _ = _execute.mock_calls[0]
+        self.assertIsInstance(mechanism, aiosasl.PLAIN)
+
     def tearDown(self):
         del self.xmlstream
         del self.transport
@@ -1884,6 +1957,366 @@ class TestPasswordSASLProvider(xmltestutils.XMLTestCase):
         aiosasl._system_random = random.SystemRandom()
 
 
+class FakeSCRAMServer:
+    def __init__(self, password, salt, iteration_count, hashfun_name):
+        self.salt = salt
+        self.iteration_count = iteration_count
+        self.hashfun_name = hashfun_name
+        self.salted_password = hashlib.pbkdf2_hmac(
+            hashfun_name,
+            password.encode("utf-8"),
+            salt,
+            iteration_count,
+        )
+        self.server_signature_valid = True
+
+    def _hmac(self, key, msg):
+        return hmac.new(key, msg, self.hashfun_name).digest()
+
+    @asyncio.coroutine
+    def initiate(self, mechanism, payload):
+        self.client_first_bare = payload[3:]
+        client_nonce = dict(
+            part.split(b"=", 1)
+            for part in self.client_first_bare.split(b",")
+        )[b"r"]
+        self.server_first = b",".join([
+            b"r=" + client_nonce + b"server",
+            b"s=" + base64.b64encode(self.salt),
+            b"i=" + str(self.iteration_count).encode("ascii"),
+        ])
+        self.final_sent = False
+        return aiosasl.SASLState.CHALLENGE, self.server_first
+
+    @asyncio.coroutine
+    def response(self, payload):
+        if self.final_sent:
+            return aiosasl.SASLState.SUCCESS, None
+
+        without_proof, _, proof = payload.rpartition(b",p=")
+        auth_message = b",".join([
+            self.client_first_bare,
+            self.server_first,
+            without_proof,
+        ])
+
+        client_key = self._hmac(self.salted_password, b"Client Key")
+        stored_key = hashlib.new(self.hashfun_name, client_key).digest()
+        client_signature = self._hmac(stored_key, auth_message)
+        if bytes(a ^ b for a, b in zip(client_signature, client_key)) != \
+                base64.b64decode(proof):
+            raise aiosasl.SASLFailure("not-authorized")
+
+        server_signature = self._hmac(
+            self._hmac(self.salted_password, b"Server Key"),
+            auth_message,
+        )
+        if not self.server_signature_valid:
+            server_signature = bytes(len(server_signature))
+
+        self.final_sent = True
+        return (aiosasl.SASLState.CHALLENGE,
+                b"v=" + base64.b64encode(server_signature))
+
+    @asyncio.coroutine
+    def abort(self):
+        pass
+
+
+class RecordingSCRAMServer(FakeSCRAMServer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages = []
+
+    @asyncio.coroutine
+    def initiate(self, mechanism, payload):
+        self.messages.append((mechanism, payload))
+        return (yield from super().initiate(mechanism, payload))
+
+    @asyncio.coroutine
+    def response(self, payload):
+        self.messages.append(payload)
+        return (yield from super().response(payload))
+
+
+class TestSCRAMKeyCache(unittest.TestCase):
+    TOKEN = "SCRAM-SHA-1", aiosasl.SCRAM.any_supported(["SCRAM-SHA-1"])[1]
+
+    def setUp(self):
+        self.c = security_layer.SCRAMKeyCache()
+        self.jid = structs.JID.fromstr("foo@bar.example")
+        self.server = FakeSCRAMServer("foobar", b"salt", 4096, "sha1")
+        self.password = "foobar"
+
+    def tearDown(self):
+        del self.c
+
+    @asyncio.coroutine
+    def _credential_provider(self):
+        return "foo", self.password
+
+    def _authenticate(self, jid=None):
+        mechanism = security_layer._CachingSCRAM(
+            self._credential_provider,
+            self.c,
+            jid or self.jid,
+        )
+        run_coroutine(mechanism.authenticate(self.server, self.TOKEN))
+
+    def test_init(self):
+        self.assertEqual(self.c.maxsize, 1024)
+        self.assertIsNone(self.c.executor)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertIsNone(self.c.hit_rate)
+        self.assertEqual(len(self.c), 0)
+
+    def test_init_with_arguments(self):
+        c = security_layer.SCRAMKeyCache(
+            maxsize=2,
+            executor=unittest.mock.sentinel.executor,
+        )
+        self.assertEqual(c.maxsize, 2)
+        self.assertEqual(c.executor, unittest.mock.sentinel.executor)
+
+    def test_aiosasl_scram_works_against_fake_server(self):
+        mechanism = aiosasl.SCRAM(self._credential_provider)
+        run_coroutine(mechanism.authenticate(self.server, self.TOKEN))
+
+    def test_authenticate_derives_keys_once(self):
+        with unittest.mock.patch(
+                "hashlib.pbkdf2_hmac",
+                wraps=hashlib.pbkdf2_hmac) as pbkdf2_hmac:
+            self._authenticate()
+            self._authenticate()
+            self._authenticate()
+
+        pbkdf2_hmac.assert_called_once_with(
+            "sha1",
+            b"foobar",
+            b"salt",
+            4096,
+        )
+        self.assertEqual(self.c.misses, 1)
+        self.assertEqual(self.c.hits, 2)
+        self.assertEqual(len(self.c), 1)
+
+    def test_cached_keys(self):
+        self._authenticate()
+        (key, (_, keys)), = self.c._entries.items()
+        self.assertEqual(key, (self.jid, b"salt", 4096, "sha1"))
+        self.assertEqual(keys.salted_password, self.server.salted_password)
+        self.assertEqual(
+            keys.client_key,
+            hmac.new(keys.salted_password, b"Client Key", "sha1").digest(),
+        )
+        self.assertEqual(
+            keys.server_key,
+            hmac.new(keys.salted_password, b"Server Key", "sha1").digest(),
+        )
+
+    def test_keys_are_not_reused_with_another_password(self):
+        self._authenticate()
+
+        self.password = "baz"
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate()
+
+        self.assertEqual(self.c.misses, 2)
+        self.assertEqual(self.c.hits, 0)
+
+    def test_keys_are_not_reused_with_another_salt(self):
+        self._authenticate()
+        self.server = FakeSCRAMServer("foobar", b"pepper", 4096, "sha1")
+        self._authenticate()
+        self.assertEqual(self.c.misses, 2)
+        self.assertEqual(len(self.c), 2)
+
+    def test_keys_are_not_reused_with_another_iteration_count(self):
+        self._authenticate()
+        self.server = FakeSCRAMServer("foobar", b"salt", 5000, "sha1")
+        self._authenticate()
+        self.assertEqual(self.c.misses, 2)
+
+    def test_keys_are_not_reused_for_another_jid(self):
+        self._authenticate()
+        self._authenticate(structs.JID.fromstr("baz@bar.example"))
+        self.assertEqual(self.c.misses, 2)
+
+    def test_authenticate_with_sha256(self):
+        self.server = FakeSCRAMServer("foobar", b"salt", 4096, "sha256")
+        mechanism = security_layer._CachingSCRAM(
+            self._credential_provider,
+            self.c,
+            self.jid,
+        )
+        run_coroutine(mechanism.authenticate(
+            self.server,
+            aiosasl.SCRAM.any_supported(["SCRAM-SHA-256"]),
+        ))
+        (key, _), = self.c._entries.items()
+        self.assertEqual(key, (self.jid, b"salt", 4096, "sha256"))
+
+    def test_authenticate_checks_server_signature(self):
+        self.server.server_signature_valid = False
+        with self.assertRaisesRegex(aiosasl.SASLFailure,
+                                    "server signature invalid"):
+            self._authenticate()
+        self.assertEqual(len(self.c), 0)
+
+    def test_invalid_server_signature_evicts_cached_keys(self):
+        self._authenticate()
+        self.assertEqual(len(self.c), 1)
+
+        self.server.server_signature_valid = False
+        with self.assertRaises(aiosasl.SASLFailure):
+            self._authenticate()
+        self.assertEqual(self.c.hits, 1)
+        self.assertEqual(len(self.c), 0)
+
+    def test_rejected_cached_keys_are_evicted(self):
+        self._authenticate()
+
+        # same salt and iteration count, but the password was changed on the
+        # server
+        self.server = FakeSCRAMServer("baz", b"salt", 4096, "sha1")
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate()
+        self.assertEqual(self.c.hits, 1)
+        self.assertEqual(len(self.c), 0)
+
+    def test_failed_authentication_does_not_evict_other_keys(self):
+        self.c.maxsize = 1
+        self._authenticate()
+
+        self.server = FakeSCRAMServer("baz", b"pepper", 4096, "sha1")
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate()
+
+        (key, _), = self.c._entries.items()
+        self.assertEqual(key, (self.jid, b"salt", 4096, "sha1"))
+
+    def test_pbkdf2_hook_is_installed_in_aiosasl(self):
+        scram_module = sys.modules[aiosasl.SCRAM.__module__]
+        security_layer._CachingSCRAM(
+            self._credential_provider,
+            self.c,
+            self.jid,
+        )
+        self.assertIs(scram_module.pbkdf2, security_layer._pbkdf2)
+
+    def test_pbkdf2_hook_derives_unprepared_keys(self):
+        self.assertEqual(
+            security_layer._pbkdf2("sha1", b"foobar", b"salt", 4096),
+            self.server.salted_password,
+        )
+
+    def test_authenticate_uses_cached_keys_in_aiosasl(self):
+        self._authenticate()
+        with unittest.mock.patch(
+                "hashlib.pbkdf2_hmac") as pbkdf2_hmac:
+            self._authenticate()
+        pbkdf2_hmac.assert_not_called()
+        self.assertEqual(security_layer._prepared_salted_passwords, {})
+
+    def test_concurrent_authentications_share_prepared_keys(self):
+        @asyncio.coroutine
+        def authenticate():
+            server = FakeSCRAMServer("foobar", b"salt", 4096, "sha1")
+            mechanism = security_layer._CachingSCRAM(
+                self._credential_provider,
+                self.c,
+                self.jid,
+            )
+            yield from mechanism.authenticate(server, self.TOKEN)
+
+        run_coroutine(asyncio.gather(authenticate(), authenticate()))
+        self.assertEqual(security_layer._prepared_salted_passwords, {})
+        self.assertEqual(len(self.c), 1)
+
+    def test_messages_match_installed_aiosasl(self):
+        scram_module = sys.modules[aiosasl.SCRAM.__module__]
+
+        def run(mechanism, token):
+            server = RecordingSCRAMServer("foobar", b"salt", 4096,
+                                          token[1].hashfun_name)
+            random = unittest.mock.Mock()
+            random.getrandbits.return_value = 0x1234567890
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(unittest.mock.patch.object(
+                    scram_module, "_system_random", new=random,
+                ))
+                run_coroutine(mechanism.authenticate(server, token))
+            return server.messages
+
+        for name in ["SCRAM-SHA-1", "SCRAM-SHA-256"]:
+            token = aiosasl.SCRAM.any_supported([name])
+            self.assertEqual(
+                run(security_layer._CachingSCRAM(
+                    self._credential_provider,
+                    self.c,
+                    self.jid,
+                ), token),
+                run(aiosasl.SCRAM(self._credential_provider), token),
+            )
+
+    def test_authenticate_enforces_minimum_iteration_count(self):
+        self.server = FakeSCRAMServer("foobar", b"salt", 1000, "sha1")
+        with self.assertRaisesRegex(aiosasl.SASLFailure,
+                                    "minimum iteration count"):
+            self._authenticate()
+        self.assertEqual(len(self.c), 0)
+
+    def test_derives_keys_in_executor(self):
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            self.c.executor = executor
+            with unittest.mock.patch.object(
+                    asyncio.get_event_loop(),
+                    "run_in_executor",
+                    wraps=asyncio.get_event_loop().run_in_executor
+            ) as run_in_executor:
+                self._authenticate()
+                self._authenticate()
+
+        run_in_executor.assert_called_once_with(
+            executor,
+            security_layer._derive_scram_keys,
+            "sha1",
+            b"foobar",
+            b"salt",
+            4096,
+        )
+        self.assertEqual(self.c.hits, 1)
+
+    def test_derivation_can_run_in_process_pool(self):
+        keys = security_layer._derive_scram_keys("sha1", b"foo", b"salt", 1)
+        self.assertIs(
+            pickle.loads(pickle.dumps(security_layer._derive_scram_keys)),
+            security_layer._derive_scram_keys,
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(keys)), keys)
+
+    def test_clear_and_reset_counters(self):
+        self._authenticate()
+        self._authenticate()
+        self.assertEqual(self.c.hit_rate, 0.5)
+
+        self.c.reset_counters()
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertIsNone(self.c.hit_rate)
+        self.assertEqual(len(self.c), 1)
+
+        self.c.clear()
+        self.assertEqual(len(self.c), 0)
+
+    def test_maxsize(self):
+        self.c.maxsize = 1
+        self._authenticate()
+        self._authenticate(structs.JID.fromstr("baz@bar.example"))
+        self.assertEqual(len(self.c), 1)
+
+
 @unittest.skipUnless(hasattr(aiosasl, "ANONYMOUS"),
                      "version of aiosasl does not support ANONYMOUS")
 class TestAnonymousSASLProvider(unittest.TestCase):
@@ -2255,6 +2688,390 @@ class TestSTARTTLSProvider(unittest.TestCase):
         )
 
 
+def _make_server_context():
+    key = OpenSSL.crypto.PKey.from_cryptography_key(
+        ec.generate_private_key(ec.SECP256R1(), default_backend())
+    )
+    cert = OpenSSL.crypto.X509()
+    cert.get_subject().CN = "xmpp.example.test"
+    cert.set_serial_number(1)
+    cert.gmtime_adj_notBefore(0)
+    cert.gmtime_adj_notAfter(3600)
+    cert.set_issuer(cert.get_subject())
+    cert.set_pubkey(key)
+    cert.sign(key, "sha256")
+
+    ctx = OpenSSL.SSL.Context(OpenSSL.SSL.TLS_METHOD)
+    ctx.use_privatekey(key)
+    ctx.use_certificate(cert)
+    ctx.set_session_id(b"aioxmpp-test")
+    return ctx
+
+
+def _transfer(src, dest):
+    try:
+        data = src.bio_read(65536)
+    except OpenSSL.SSL.WantReadError:
+        return False
+    dest.bio_write(data)
+    return True
+
+
+def _handshake(client, server):
+    for _ in range(10):
+        for conn in (client, server):
+            try:
+                conn.do_handshake()
+            except OpenSSL.SSL.WantReadError:
+                pass
+        transferred = _transfer(client, server)
+        transferred = _transfer(server, client) or transferred
+        if not transferred:
+            break
+
+
+class FakeTLSTransport:
+    def __init__(self, ssl_object):
+        self.ssl_object = ssl_object
+
+    def get_extra_info(self, name):
+        return {"ssl_object": self.ssl_object}[name]
+
+
+class CountingVerifier(security_layer.CertificateVerifier):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.nverified = 0
+
+    def verify_callback(self, conn, x509, errno, errdepth, returncode):
+        self.nverified += 1
+        return True
+
+    @asyncio.coroutine
+    def post_handshake(self, transport):
+        if self.fail:
+            raise errors.TLSFailure("verification failed")
+
+
+class TestTLSSessionCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server_ctx = _make_server_context()
+
+    def setUp(self):
+        self.c = security_layer.TLSSessionCache()
+
+    def tearDown(self):
+        del self.c
+
+    def _connect(self, *,
+                 max_version=None,
+                 fail=False,
+                 domain="example.test",
+                 host="xmpp.example.test",
+                 inner=None,
+                 use_factory=False):
+        if inner is None:
+            inner = CountingVerifier(fail=fail)
+        if use_factory:
+            verifier = self.c.wrap_verifier_factory(lambda: inner)()
+            run_coroutine(verifier.pre_handshake(
+                domain,
+                host,
+                5222,
+                unittest.mock.sentinel.metadata,
+            ))
+        else:
+            verifier = self.c.wrap_verifier(inner, domain, host)
+
+        ctx = OpenSSL.SSL.Context(OpenSSL.SSL.TLS_METHOD)
+        if max_version is not None:
+            ctx.set_max_proto_version(max_version)
+        verifier.setup_context(ctx, unittest.mock.sentinel.transport)
+
+        client = OpenSSL.SSL.Connection(ctx, None)
+        client.set_connect_state()
+        server = OpenSSL.SSL.Connection(self.server_ctx, None)
+        server.set_accept_state()
+        _handshake(client, server)
+
+        try:
+            run_coroutine(verifier.post_handshake(FakeTLSTransport(client)))
+        except errors.TLSFailure:
+            pass
+
+        # the first application data lets the client process the session
+        # tickets which TLS 1.3 servers send after the handshake
+        server.send(b"x")
+        _transfer(server, client)
+        self.assertEqual(client.recv(1), b"x")
+
+        # the connection is dropped without TLS shutdown, like a broken
+        # connection
+        return inner
+
+    def test_init(self):
+        self.assertEqual(self.c.maxsize, 1024)
+        self.assertEqual(self.c.max_age, timedelta(hours=2))
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertEqual(self.c.stores, 0)
+        self.assertIsNone(self.c.hit_rate)
+        self.assertEqual(len(self.c), 0)
+
+    def test_init_with_arguments(self):
+        c = security_layer.TLSSessionCache(
+            maxsize=2,
+            max_age=timedelta(minutes=5),
+        )
+        self.assertEqual(c.maxsize, 2)
+        self.assertEqual(c.max_age, timedelta(minutes=5))
+
+    def test_maxsize_evicts_least_recently_used(self):
+        self.c.maxsize = 2
+        self.c._store("a", unittest.mock.sentinel.a)
+        self.c._store("b", unittest.mock.sentinel.b)
+        self.c._store("c", unittest.mock.sentinel.c)
+        self.assertEqual(len(self.c), 2)
+        self.assertIsNone(self.c._get("a"))
+        self.assertEqual(self.c._get("c"), unittest.mock.sentinel.c)
+
+    def test_get_drops_sessions_older_than_max_age(self):
+        with unittest.mock.patch(
+                "aioxmpp.security_layer.time") as time_:
+            time_.monotonic.return_value = 100
+            self.c._store("a", unittest.mock.sentinel.a)
+
+            time_.monotonic.return_value = 100 + 7200
+            self.assertEqual(self.c._get("a"), unittest.mock.sentinel.a)
+
+            time_.monotonic.return_value = 100 + 7201
+            self.assertIsNone(self.c._get("a"))
+
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.hits, 1)
+        self.assertEqual(self.c.misses, 1)
+
+    def test_clear(self):
+        self.c._store("a", unittest.mock.sentinel.a)
+        self.c.clear()
+        self.assertEqual(len(self.c), 0)
+        self.assertIsNone(self.c._get("a"))
+
+    def test_hit_rate_and_reset_counters(self):
+        self.c._store("a", unittest.mock.sentinel.a)
+        self.c._get("a")
+        self.c._get("a")
+        self.c._get("a")
+        self.c._get("b")
+        self.assertEqual(self.c.hit_rate, 0.75)
+
+        self.c.reset_counters()
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertEqual(self.c.stores, 0)
+        self.assertIsNone(self.c.hit_rate)
+        self.assertEqual(len(self.c), 1)
+
+    def test_wrap_verifier_delegates(self):
+        inner = unittest.mock.Mock()
+        inner.pre_handshake = CoroutineMock()
+        inner.post_handshake = CoroutineMock()
+
+        verifier = self.c.wrap_verifier(inner, "example.test", "host")
+        self.assertIsInstance(verifier, security_layer.CertificateVerifier)
+
+        run_coroutine(verifier.pre_handshake(
+            unittest.mock.sentinel.domain,
+            unittest.mock.sentinel.host,
+            unittest.mock.sentinel.port,
+            unittest.mock.sentinel.metadata,
+        ))
+        inner.pre_handshake.assert_called_once_with(
+            unittest.mock.sentinel.domain,
+            unittest.mock.sentinel.host,
+            unittest.mock.sentinel.port,
+            unittest.mock.sentinel.metadata,
+        )
+
+        ctx = unittest.mock.Mock()
+        verifier.setup_context(ctx, unittest.mock.sentinel.transport)
+        inner.setup_context.assert_called_once_with(
+            ctx,
+            unittest.mock.sentinel.transport,
+        )
+        ctx.set_info_callback.assert_called_once_with(unittest.mock.ANY)
+
+        transport = unittest.mock.Mock()
+        transport.get_extra_info.return_value.get_shutdown.return_value = 0
+        run_coroutine(verifier.post_handshake(transport))
+        inner.post_handshake.assert_called_once_with(transport)
+        transport.get_extra_info.assert_called_once_with("ssl_object")
+
+    def test_wrap_verifier_factory(self):
+        inner_factory = unittest.mock.Mock()
+        inner_factory.return_value.pre_handshake = CoroutineMock()
+
+        factory = self.c.wrap_verifier_factory(inner_factory)
+        inner_factory.assert_not_called()
+
+        verifier = factory()
+        inner_factory.assert_called_once_with()
+        self.assertIsInstance(verifier, security_layer.CertificateVerifier)
+        self.assertIsNot(factory(), verifier)
+
+    def test_wrap_verifier_factory_keys_sessions_in_pre_handshake(self):
+        verifier = self.c.wrap_verifier_factory(
+            security_layer.PKIXCertificateVerifier
+        )()
+
+        run_coroutine(verifier.pre_handshake(
+            "example.test",
+            "xmpp.example.test",
+            5222,
+            unittest.mock.sentinel.metadata,
+        ))
+
+        self.assertEqual(
+            verifier._key,
+            self.c.wrap_verifier(
+                security_layer.PKIXCertificateVerifier(),
+                "example.test",
+                "xmpp.example.test",
+            )._key,
+        )
+
+    def test_wrap_verifier_factory_does_not_wrap_null_verifier(self):
+        factory = self.c.wrap_verifier_factory(security_layer._NullVerifier)
+        self.assertIsInstance(factory(), security_layer._NullVerifier)
+
+    def test_wrap_verifier_factory_needs_pre_handshake_for_sessions(self):
+        inner = CountingVerifier()
+        verifier = self.c.wrap_verifier_factory(lambda: inner)()
+
+        ctx = OpenSSL.SSL.Context(OpenSSL.SSL.TLS_METHOD)
+        verifier.setup_context(ctx, unittest.mock.sentinel.transport)
+        client = OpenSSL.SSL.Connection(ctx, None)
+        client.set_connect_state()
+        server = OpenSSL.SSL.Connection(self.server_ctx, None)
+        server.set_accept_state()
+        _handshake(client, server)
+        run_coroutine(verifier.post_handshake(FakeTLSTransport(client)))
+
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.misses, 0)
+
+    def test_resumes_session_with_wrapped_factory(self):
+        first = self._connect(use_factory=True)
+        self.assertGreater(first.nverified, 0)
+
+        second = self._connect(use_factory=True)
+        self.assertEqual(second.nverified, 0)
+        self.assertEqual(self.c.hits, 1)
+
+        other_host = self._connect(use_factory=True,
+                                   host="other.example.test")
+        self.assertGreater(other_host.nverified, 0)
+
+    def test_resumes_tls12_session(self):
+        first = self._connect(max_version=OpenSSL.SSL.TLS1_2_VERSION)
+        self.assertGreater(first.nverified, 0)
+        self.assertEqual(self.c.misses, 1)
+        self.assertEqual(self.c.stores, 1)
+        self.assertEqual(len(self.c), 1)
+
+        second = self._connect(max_version=OpenSSL.SSL.TLS1_2_VERSION)
+        self.assertEqual(second.nverified, 0)
+        self.assertEqual(self.c.hits, 1)
+
+    def test_resumes_tls13_session(self):
+        first = self._connect(max_version=OpenSSL.SSL.TLS1_3_VERSION)
+        self.assertGreater(first.nverified, 0)
+        self.assertEqual(self.c.misses, 1)
+        self.assertGreaterEqual(self.c.stores, 1)
+
+        second = self._connect(max_version=OpenSSL.SSL.TLS1_3_VERSION)
+        self.assertEqual(second.nverified, 0)
+        self.assertEqual(self.c.hits, 1)
+
+    def test_does_not_store_session_if_verification_fails(self):
+        for max_version in [OpenSSL.SSL.TLS1_2_VERSION,
+                            OpenSSL.SSL.TLS1_3_VERSION]:
+            self._connect(max_version=max_version, fail=True)
+
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.stores, 0)
+
+    def test_sessions_are_keyed_by_domain_and_host(self):
+        self._connect()
+
+        other_host = self._connect(host="other.example.test")
+        self.assertGreater(other_host.nverified, 0)
+
+        other_domain = self._connect(domain="other.example.test")
+        self.assertGreater(other_domain.nverified, 0)
+
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 3)
+
+    def test_sessions_without_verification_are_not_stored(self):
+        null_verifier = security_layer._NullVerifier()
+        self.assertIs(
+            self.c.wrap_verifier(null_verifier, "example.test", "host"),
+            null_verifier,
+        )
+
+        # one cache shared by a no_verify layer and a strict layer
+        for max_version in [OpenSSL.SSL.TLS1_2_VERSION,
+                            OpenSSL.SSL.TLS1_3_VERSION]:
+            self.c.clear()
+            self._connect(max_version=max_version,
+                          inner=security_layer._NullVerifier())
+            self.assertEqual(len(self.c), 0)
+
+            strict = self._connect(max_version=max_version)
+            self.assertGreater(strict.nverified, 0)
+
+        self.assertEqual(self.c.hits, 0)
+
+    def test_sessions_are_keyed_by_verifier_class(self):
+        class OtherVerifier(CountingVerifier):
+            pass
+
+        self._connect()
+
+        other = self._connect(inner=OtherVerifier())
+        self.assertGreater(other.nverified, 0)
+
+        same = self._connect()
+        self.assertEqual(same.nverified, 0)
+        self.assertEqual(self.c.hits, 1)
+
+    def test_sessions_are_keyed_by_pin_store(self):
+        store1 = security_layer.PublicKeyPinStore()
+        store2 = security_layer.PublicKeyPinStore()
+
+        def key(store, deferred_failure=None):
+            verifier = security_layer.PinningPKIXCertificateVerifier(
+                store.query,
+                deferred_failure,
+            )
+            return self.c.wrap_verifier(verifier, "example.test", "host")._key
+
+        self.assertEqual(key(store1), key(store1))
+        self.assertNotEqual(key(store1), key(store2))
+        self.assertNotEqual(
+            key(store1),
+            key(store1, unittest.mock.sentinel.deferred_failure),
+        )
+        self.assertNotEqual(
+            key(store1),
+            self.c.wrap_verifier(security_layer.PKIXCertificateVerifier(),
+                                 "example.test", "host")._key,
+        )
+
+
 class Test_default_ssl_context(unittest.TestCase):
 
     def test_default_ssl_context(self):
@@ -2378,6 +3195,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         SecurityLayer.assert_called_with(
@@ -2392,6 +3210,84 @@ class Testmake(unittest.TestCase):
             SecurityLayer(),
         )
 
+    def test_passes_tls_session_cache(self):
+        with contextlib.ExitStack() as stack:
+            SecurityLayer = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.SecurityLayer"
+                )
+            )
+
+            PasswordSASLProvider = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.PasswordSASLProvider"
+                )
+            )
+
+            PKIXCertificateVerifier = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.PKIXCertificateVerifier"
+                )
+            )
+
+            default_ssl_context = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.default_ssl_context"
+                )
+            )
+
+            tls_session_cache = unittest.mock.Mock()
+
+            result = security_layer.make(
+                unittest.mock.sentinel.password_provider,
+                tls_session_cache=tls_session_cache,
+            )
+
+        tls_session_cache.wrap_verifier_factory.assert_called_once_with(
+            PKIXCertificateVerifier,
+        )
+
+        SecurityLayer.assert_called_with(
+            default_ssl_context,
+            tls_session_cache.wrap_verifier_factory(),
+            True,
+            (PasswordSASLProvider(),)
+        )
+
+        self.assertEqual(
+            result,
+            SecurityLayer(),
+        )
+
+    def test_passes_scram_key_cache(self):
+        with contextlib.ExitStack() as stack:
+            SecurityLayer = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.SecurityLayer"
+                )
+            )
+
+            PasswordSASLProvider = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.PasswordSASLProvider"
+                )
+            )
+
+            result = security_layer.make(
+                unittest.mock.sentinel.password_provider,
+                scram_key_cache=unittest.mock.sentinel.scram_key_cache,
+            )
+
+        PasswordSASLProvider.assert_called_with(
+            unittest.mock.sentinel.password_provider,
+            scram_key_cache=unittest.mock.sentinel.scram_key_cache,
+        )
+
+        self.assertEqual(
+            result,
+            SecurityLayer(),
+        )
+
     def test_with_static_password(self):
         with contextlib.ExitStack() as stack:
             SecurityLayer = stack.enter_context(
@@ -2424,6 +3320,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.ANY,
+            scram_key_cache=None,
         )
 
         _, (password_provider, ), _ = PasswordSASLProvider.mock_calls[0]
@@ -2565,6 +3462,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         self.assertSequenceEqual(
@@ -2653,6 +3551,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         self.assertSequenceEqual(
@@ -2736,6 +3635,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         SecurityLayer.assert_called_with(
@@ -2804,6 +3704,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         SecurityLayer.assert_called_with(
@@ -2857,6 +3758,7 @@ class Testmake(unittest.TestCase):
 
         PasswordSASLProvider.assert_called_once_with(
             unittest.mock.sentinel.password_provider,
+            scram_key_cache=None,
         )
 
         AnonymousSASLProvider.assert_called_once_with(
@@ -805,6 +805,342 @@ class TestStanzaStream(StanzaStreamTestBase):
         run_coroutine(asyncio.sleep(0))
         self.assertFalse(self.stream.running)
 
+    def test_priority_weights(self):
+        self.assertEqual(
+            self.stream.get_priority_weight(stream.StanzaPriority.CONTROL),
+            16,
+        )
+        self.assertEqual(
+            self.stream.get_priority_weight(
+                stream.StanzaPriority.INTERACTIVE
+            ),
+            4,
+        )
+        self.assertEqual(
+            self.stream.get_priority_weight(stream.StanzaPriority.BULK),
+            1,
+        )
+
+        self.stream.set_priority_weight(stream.StanzaPriority.BULK, 2)
+        self.assertEqual(
+            self.stream.get_priority_weight(stream.StanzaPriority.BULK),
+            2,
+        )
+
+        with self.assertRaises(ValueError):
+            self.stream.set_priority_weight(stream.StanzaPriority.BULK, 0)
+
+    def test_bulk_stanzas_do_not_starve_control_stanzas(self):
+        self.stream.outgoing_batch_size = 1
+        self.stream.set_priority_weight(stream.StanzaPriority.CONTROL, 2)
+
+        bulk = [make_test_message() for i in range(4)]
+        for msg in bulk:
+            self.stream._enqueue(msg, priority=stream.StanzaPriority.BULK)
+
+        request = make_test_iq()
+        response = request.make_reply(type_=structs.IQType.RESULT)
+        self.stream._enqueue(response, priority=stream.StanzaPriority.CONTROL)
+
+        self.stream.start(self.xmlstream)
+
+        sent = [run_coroutine(self.sent_stanzas.get()) for i in range(5)]
+        self.assertLess(sent.index(response), 2)
+        self.assertSequenceEqual(
+            [obj for obj in sent if obj is not response],
+            bulk,
+        )
+
+        self.stream.stop()
+
+    def test_enqueue_uses_interactive_priority_by_default(self):
+        msg = make_test_message()
+        self.stream._enqueue(msg)
+        self.assertEqual(
+            self.stream._active_queue.qsize(
+                stream.StanzaPriority.INTERACTIVE
+            ),
+            1,
+        )
+
+    def test_enqueue_uses_interactive_priority_for_iq_responses(self):
+        response = make_test_iq().make_reply(type_=structs.IQType.RESULT)
+        self.stream._enqueue(response)
+        self.assertEqual(
+            self.stream._active_queue.qsize(
+                stream.StanzaPriority.INTERACTIVE
+            ),
+            1,
+        )
+
+    def test_enqueue_without_priority_preserves_order(self):
+        msg = make_test_message()
+        response = make_test_iq().make_reply(type_=structs.IQType.RESULT)
+        self.stream._enqueue(msg)
+        self.stream._enqueue(response)
+
+        self.stream.start(self.xmlstream)
+
+        self.assertIs(run_coroutine(self.sent_stanzas.get()), msg)
+        self.assertIs(run_coroutine(self.sent_stanzas.get()), response)
+
+        self.stream.stop()
+
+    def test_enqueue_with_explicit_priority(self):
+        response = make_test_iq().make_reply(type_=structs.IQType.RESULT)
+        self.stream._enqueue(response, priority=stream.StanzaPriority.BULK)
+        self.assertEqual(
+            self.stream._active_queue.qsize(stream.StanzaPriority.BULK),
+            1,
+        )
+
+    def test_aborted_token_is_skipped_in_priority_queue(self):
+        msg1 = make_test_message()
+        msg2 = make_test_message()
+        token1 = self.stream._enqueue(msg1,
+                                      priority=stream.StanzaPriority.BULK)
+        self.stream._enqueue(msg2)
+        token1.abort()
+
+        self.stream.start(self.xmlstream)
+        self.assertIs(run_coroutine(self.sent_stanzas.get()), msg2)
+        run_coroutine(asyncio.sleep(0))
+        self.assertTrue(self.sent_stanzas.empty())
+        self.assertEqual(token1.state, stream.StanzaState.ABORTED)
+
+        self.stream.stop()
+
+    def test_shaping_policy_defaults_to_None(self):
+        self.assertIsNone(self.stream.shaping_policy)
+
+    def test_shaping_policy_limits_stanza_rate(self):
+        self.stream.shaping_policy = stream.RateShapingPolicy(
+            stanzas_per_second=20,
+            stanza_burst=2,
+        )
+
+        msgs = [make_test_message() for i in range(3)]
+        tokens = [self.stream._enqueue(msg) for msg in msgs]
+
+        self.stream.start(self.xmlstream)
+        run_coroutine(asyncio.sleep(0.01))
+
+        self.assertEqual(self.sent_stanzas.qsize(), 2)
+        self.assertEqual(tokens[2].state, stream.StanzaState.ACTIVE)
+
+        run_coroutine(asyncio.sleep(0.06))
+        self.assertEqual(self.sent_stanzas.qsize(), 3)
+        self.assertEqual(tokens[2].state, stream.StanzaState.SENT_WITHOUT_SM)
+
+        self.stream.stop()
+
+    def test_shaping_policy_limits_byte_rate(self):
+        self.xmlstream.bytes_sent = 0
+        send_xso = self.xmlstream.send_xso
+
+        def count_bytes(obj):
+            self.xmlstream.bytes_sent += 100
+            send_xso(obj)
+
+        self.xmlstream.send_xso = count_bytes
+
+        self.stream.shaping_policy = stream.RateShapingPolicy(
+            bytes_per_second=2000,
+            byte_burst=150,
+        )
+
+        msgs = [make_test_message() for i in range(3)]
+        for msg in msgs:
+            self.stream._enqueue(msg)
+
+        self.stream.start(self.xmlstream)
+        run_coroutine(asyncio.sleep(0.01))
+
+        # the second stanza overdraws the bucket
+        self.assertEqual(self.sent_stanzas.qsize(), 2)
+
+        run_coroutine(asyncio.sleep(0.06))
+        self.assertEqual(self.sent_stanzas.qsize(), 3)
+
+        self.stream.stop()
+
+    def test_shaping_does_not_block_incoming_stanzas(self):
+        received = []
+        self.stream.on_message_received.connect(received.append)
+        self.stream.shaping_policy = stream.RateShapingPolicy(
+            stanzas_per_second=1,
+        )
+
+        self.stream._enqueue(make_test_message())
+        self.stream._enqueue(make_test_message())
+
+        self.stream.start(self.xmlstream)
+        run_coroutine(asyncio.sleep(0))
+
+        msg = make_test_message()
+        self.stream.recv_stanza(msg)
+        run_coroutine(asyncio.sleep(0.01))
+
+        self.assertSequenceEqual(received, [msg])
+        self.assertEqual(self.sent_stanzas.qsize(), 1)
+
+        self.stream.stop()
+
+    def test_clearing_shaping_policy_releases_held_stanzas(self):
+        self.stream.shaping_policy = stream.RateShapingPolicy(
+            stanzas_per_second=1,
+        )
+
+        for i in range(3):
+            self.stream._enqueue(make_test_message())
+
+        self.stream.start(self.xmlstream)
+        run_coroutine(asyncio.sleep(0.01))
+        self.assertEqual(self.sent_stanzas.qsize(), 1)
+
+        self.stream.shaping_policy = None
+        run_coroutine(asyncio.sleep(0.01))
+        self.assertEqual(self.sent_stanzas.qsize(), 3)
+
+        self.stream.stop()
+
+    def test_iq_request_limits_default(self):
+        self.assertIsNone(self.stream.max_iq_request_tasks)
+        self.assertIsNone(self.stream.get_iq_request_limit(FancyTestIQ))
+        self.assertEqual(self.stream.iq_request_queue_limit, 128)
+
+    def test_iq_request_limits_settable(self):
+        self.stream.max_iq_request_tasks = 10
+        self.stream.set_iq_request_limit(FancyTestIQ, 2)
+        self.stream.iq_request_queue_limit = 0
+
+        self.assertEqual(self.stream.max_iq_request_tasks, 10)
+        self.assertEqual(self.stream.get_iq_request_limit(FancyTestIQ), 2)
+        self.assertEqual(self.stream.iq_request_queue_limit, 0)
+
+        self.stream.set_iq_request_limit(FancyTestIQ, None)
+        self.assertIsNone(self.stream.get_iq_request_limit(FancyTestIQ))
+
+    def test_iq_request_limits_reject_negative_values(self):
+        with self.assertRaises(ValueError):
+            self.stream.max_iq_request_tasks = -1
+        with self.assertRaises(ValueError):
+            self.stream.set_iq_request_limit(FancyTestIQ, -1)
+        with self.assertRaises(ValueError):
+            self.stream.iq_request_queue_limit = -1
+
+    def _setup_blocking_iq_handler(self):
+        futures = []
+        started = []
+
+        def handle_request(stanza):
+            started.append(stanza)
+            fut = asyncio.Future()
+            futures.append(fut)
+            return fut
+
+        self.stream.register_iq_request_handler(
+            structs.IQType.GET,
+            FancyTestIQ,
+            handle_request)
+
+        return started, futures
+
+    def test_iq_requests_beyond_payload_limit_are_queued(self):
+        started, futures = self._setup_blocking_iq_handler()
+        self.stream.set_iq_request_limit(FancyTestIQ, 2)
+
+        iqs = [make_test_iq() for i in range(4)]
+
+        self.stream.start(self.xmlstream)
+        for iq in iqs:
+            self.stream.recv_stanza(iq)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertSequenceEqual(started, iqs[:2])
+        self.assertTrue(self.sent_stanzas.empty())
+
+        futures[0].set_result(None)
+        response = run_coroutine(self.sent_stanzas.get())
+        self.assertEqual(response.id_, iqs[0].id_)
+        self.assertEqual(response.type_, structs.IQType.RESULT)
+        self.assertSequenceEqual(started, iqs[:3])
+
+        futures[1].set_result(None)
+        futures[2].set_result(None)
+        run_coroutine(self.sent_stanzas.get())
+        run_coroutine(self.sent_stanzas.get())
+        self.assertSequenceEqual(started, iqs)
+
+        futures[3].set_result(None)
+        response = run_coroutine(self.sent_stanzas.get())
+        self.assertEqual(response.id_, iqs[3].id_)
+
+        self.stream.stop()
+
+    def test_iq_requests_beyond_total_limit_are_queued(self):
+        started, futures = self._setup_blocking_iq_handler()
+        self.stream.max_iq_request_tasks = 1
+
+        iqs = [make_test_iq() for i in range(2)]
+
+        self.stream.start(self.xmlstream)
+        for iq in iqs:
+            self.stream.recv_stanza(iq)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertSequenceEqual(started, iqs[:1])
+
+        self.stream.max_iq_request_tasks = None
+        self.assertSequenceEqual(started, iqs)
+
+        for fut in futures:
+            fut.set_result(None)
+        run_coroutine(self.sent_stanzas.get())
+        run_coroutine(self.sent_stanzas.get())
+
+        self.stream.stop()
+
+    def test_iq_request_queue_overflow_replies_with_resource_constraint(self):
+        started, futures = self._setup_blocking_iq_handler()
+        self.stream.set_iq_request_limit(FancyTestIQ, 1)
+        self.stream.iq_request_queue_limit = 1
+
+        iqs = [make_test_iq() for i in range(3)]
+
+        self.stream.start(self.xmlstream)
+        for iq in iqs:
+            self.stream.recv_stanza(iq)
+
+        response = run_coroutine(self.sent_stanzas.get())
+        self.assertEqual(response.id_, iqs[2].id_)
+        self.assertEqual(response.type_, structs.IQType.ERROR)
+        self.assertEqual(
+            response.error.condition,
+            errors.ErrorCondition.RESOURCE_CONSTRAINT,
+        )
+        self.assertEqual(response.error.type_, structs.ErrorType.WAIT)
+
+        self.assertSequenceEqual(started, iqs[:1])
+
+        self.stream.stop()
+
+    def test_queued_iq_requests_are_dropped_on_close(self):
+        started, futures = self._setup_blocking_iq_handler()
+        self.stream.set_iq_request_limit(FancyTestIQ, 1)
+
+        self.stream.start(self.xmlstream)
+        self.stream.recv_stanza(make_test_iq())
+        self.stream.recv_stanza(make_test_iq())
+        run_coroutine(asyncio.sleep(0))
+        self.assertEqual(len(started), 1)
+
+        run_coroutine(self.stream.close())
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertTrue(futures[0].cancelled())
+        self.assertEqual(len(started), 1)
+
     def test_run_message_callback(self):
         msg = make_test_message()
 
@@ -1541,14 +1877,14 @@ class TestStanzaStream(StanzaStreamTestBase):
         self.assertIsInstance(exc, asyncio.CancelledError)
 
     def test_close_sets_active_stanza_tokens_to_aborted(self):
-        get_mock = CoroutineMock()
-        get_mock.delay = 1000
+        wait_mock = CoroutineMock()
+        wait_mock.delay = 1000
         # let’s mess with the processor a bit ...
         # otherwise, the stanza is sent before the close can happen
         with unittest.mock.patch.object(
-                self.stream._active_queue,
-                "get",
-                new=get_mock):
+                self.stream._broker_wakeup,
+                "wait",
+                new=wait_mock):
 
             self.stream.start(self.xmlstream)
             run_coroutine(asyncio.sleep(0))
@@ -1563,14 +1899,14 @@ class TestStanzaStream(StanzaStreamTestBase):
         self.assertEqual(token.state, stream.StanzaState.DISCONNECTED)
 
     def test_close_sets_active_stanza_tokens_to_aborted_on_stopped_stream(self):
-        get_mock = CoroutineMock()
-        get_mock.delay = 1000
+        wait_mock = CoroutineMock()
+        wait_mock.delay = 1000
         # let’s mess with the processor a bit ...
         # otherwise, the stanza is sent before the close can happen
         with unittest.mock.patch.object(
-                self.stream._active_queue,
-                "get",
-                new=get_mock):
+                self.stream._broker_wakeup,
+                "wait",
+                new=wait_mock):
 
             token = self.stream._enqueue(make_test_message())
 
@@ -2841,7 +3177,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(self.stream._send_immediately(pres))
 
         base.register_iq_response_future.assert_not_called()
-        base._enqueue.assert_called_with(unittest.mock.ANY)
+        base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
 
     def test_send_awaits_stanza_token_for_message(self):
         message = make_test_presence()
@@ -2866,7 +3202,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(self.stream._send_immediately(message))
 
         base.register_iq_response_future.assert_not_called()
-        base._enqueue.assert_called_with(unittest.mock.ANY)
+        base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
 
     def test_send_awaits_stanza_token_for_iq_response(self):
         iq = make_test_iq(type_=aioxmpp.IQType.RESULT)
@@ -2891,7 +3227,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(self.stream._send_immediately(iq))
 
         base.register_iq_response_future.assert_not_called()
-        base._enqueue.assert_called_with(unittest.mock.ANY)
+        base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
 
     def test_send_awaits_stanza_token_for_iq_and_registers_for_reply(self):
         iq = make_test_iq()
@@ -2919,7 +3255,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -2966,7 +3302,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -3019,7 +3355,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -3063,7 +3399,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
 
             stanza_fut.set_result(None)
 
@@ -3097,7 +3433,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -3142,7 +3478,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -3184,7 +3520,7 @@ class TestStanzaStream(StanzaStreamTestBase):
             run_coroutine(asyncio.sleep(0.01))
 
             self.assertFalse(task.done())
-            base._enqueue.assert_called_with(unittest.mock.ANY)
+            base._enqueue.assert_called_with(unittest.mock.ANY, priority=None)
             base.iq_response_map.add_listener.assert_called_once_with(
                 (iq.to, iq.id_),
                 unittest.mock.ANY,
@@ -3668,6 +4004,57 @@ class TestStanzaStream(StanzaStreamTestBase):
             request.type_
         )
 
+    def test_batch_sizes_default(self):
+        self.assertEqual(self.stream.incoming_batch_size, 64)
+        self.assertEqual(self.stream.outgoing_batch_size, 64)
+
+    def test_batch_sizes_settable(self):
+        self.stream.incoming_batch_size = 2
+        self.stream.outgoing_batch_size = 3
+        self.assertEqual(self.stream.incoming_batch_size, 2)
+        self.assertEqual(self.stream.outgoing_batch_size, 3)
+
+    def test_batch_sizes_reject_non_positive(self):
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            self.stream.incoming_batch_size = 0
+        with self.assertRaisesRegex(ValueError, "must be positive"):
+            self.stream.outgoing_batch_size = -1
+        self.assertEqual(self.stream.incoming_batch_size, 64)
+        self.assertEqual(self.stream.outgoing_batch_size, 64)
+
+    def test_incoming_batch_size_limits_stanzas_per_turn(self):
+        # count event loop iterations to find out which stanzas were
+        # processed in the same turn of the broker
+        ticks = [0]
+
+        def tick():
+            ticks[0] += 1
+            if not done:
+                self.loop.call_soon(tick)
+
+        done = False
+        turns = []
+        self.stream.on_message_received.connect(
+            lambda msg: turns.append(ticks[0])
+        )
+        self.stream.incoming_batch_size = 2
+
+        self.stream.start(self.xmlstream)
+        run_coroutine(asyncio.sleep(0))
+
+        for i in range(5):
+            self.stream.recv_stanza(make_test_message())
+
+        self.loop.call_soon(tick)
+        run_coroutine(asyncio.sleep(0.01))
+        done = True
+
+        self.assertEqual(len(turns), 5)
+        self.assertEqual(turns[0], turns[1])
+        self.assertLess(turns[1], turns[2])
+        self.assertEqual(turns[2], turns[3])
+        self.assertLess(turns[3], turns[4])
+
     def test_round_trip_time_settable_while_not_started(self):
         value = timedelta(0.2)
         self.assertNotEqual(self.stream.round_trip_time, value)
@@ -4076,6 +4463,161 @@ class TestStanzaStreamSM(StanzaStreamTestBase):
         with self.assertRaisesRegex(RuntimeError, "is not enabled"):
             self.stream.sm_ack(0)
 
+    def test_sm_ack_policy_defaults(self):
+        self.assertEqual(self.stream.sm_ack_request_count, 1)
+        self.assertIsNone(self.stream.sm_ack_request_interval)
+        self.assertIsNone(self.stream.sm_ack_max_unacked)
+
+    def test_sm_ack_policy_rejects_invalid_values(self):
+        with self.assertRaises(ValueError):
+            self.stream.sm_ack_request_count = 0
+        with self.assertRaises(ValueError):
+            self.stream.sm_ack_request_interval = timedelta(0)
+        with self.assertRaises(ValueError):
+            self.stream.sm_ack_max_unacked = 0
+
+        self.assertEqual(self.stream.sm_ack_request_count, 1)
+        self.assertIsNone(self.stream.sm_ack_request_interval)
+        self.assertIsNone(self.stream.sm_ack_max_unacked)
+
+    def _start_sm(self):
+        self.stream.start(self.xmlstream)
+        run_coroutine_with_peer(
+            self.stream.start_sm(),
+            self.xmlstream.run_test(self.successful_sm)
+        )
+
+    def test_sm_ack_request_count(self):
+        self.stream.sm_ack_request_count = 3
+        # long interval to disable flushing when idle
+        self.stream.sm_ack_request_interval = timedelta(seconds=60)
+        iqs = [make_test_iq() for i in range(4)]
+
+        self._start_sm()
+
+        for iq in iqs[:2]:
+            self.stream._enqueue(iq)
+            run_coroutine(asyncio.sleep(0))
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[0]),
+            XMLStreamMock.Send(iqs[1]),
+        ]))
+
+        self.stream._enqueue(iqs[2])
+        self.stream._enqueue(iqs[3])
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[2]),
+            XMLStreamMock.Send(iqs[3]),
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+    def test_sm_ack_request_interval(self):
+        self.stream.sm_ack_request_count = 10
+        self.stream.sm_ack_request_interval = timedelta(seconds=0.05)
+        iqs = [make_test_iq() for i in range(2)]
+
+        self._start_sm()
+
+        for iq in iqs:
+            self.stream._enqueue(iq)
+            run_coroutine(asyncio.sleep(0))
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[0]),
+            XMLStreamMock.Send(iqs[1]),
+        ]))
+
+        run_coroutine(asyncio.sleep(0.1))
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+    def test_sm_ack_request_flushed_when_idle_without_interval(self):
+        self.stream.sm_ack_request_count = 10
+        self.stream.outgoing_batch_size = 2
+        iqs = [make_test_iq() for i in range(3)]
+
+        self._start_sm()
+
+        for iq in iqs:
+            self.stream._enqueue(iq)
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[0]),
+            XMLStreamMock.Send(iqs[1]),
+            XMLStreamMock.Send(iqs[2]),
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+    def test_sm_ack_max_unacked(self):
+        self.stream.sm_ack_request_count = 10
+        self.stream.sm_ack_request_interval = timedelta(seconds=60)
+        self.stream.sm_ack_max_unacked = 2
+        iqs = [make_test_iq() for i in range(3)]
+
+        self._start_sm()
+
+        self.stream._enqueue(iqs[0])
+        run_coroutine(asyncio.sleep(0))
+        self.stream._enqueue(iqs[1])
+        run_coroutine(asyncio.sleep(0))
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[0]),
+            XMLStreamMock.Send(iqs[1]),
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+        # nothing has been acked yet, so the limit is still exceeded
+        self.stream._enqueue(iqs[2])
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[2]),
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+    def test_sm_ack_request_piggybacked_on_ack(self):
+        self.stream.sm_ack_request_count = 10
+        self.stream.sm_ack_request_interval = timedelta(seconds=60)
+        iq = make_test_iq()
+
+        self._start_sm()
+
+        self.stream._enqueue(iq)
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iq),
+        ]))
+
+        ack = nonza.SMAcknowledgement()
+        ack.counter = 0
+        run_coroutine(self.xmlstream.run_test(
+            [
+                XMLStreamMock.Send(ack),
+                XMLStreamMock.Send(nonza.SMRequest()),
+            ],
+            stimulus=XMLStreamMock.Receive(nonza.SMRequest()),
+        ))
+
+    def test_sm_ack_timer_cancelled_on_stop(self):
+        self.stream.sm_ack_request_count = 10
+        self.stream.sm_ack_request_interval = timedelta(seconds=0.05)
+        iq = make_test_iq()
+
+        self._start_sm()
+
+        self.stream._enqueue(iq)
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iq),
+        ]))
+
+        self.stream.stop()
+        run_coroutine(asyncio.sleep(0.1))
+
+        run_coroutine(self.xmlstream.run_test([]))
+
     def test_sm_outbound(self):
         state_change_handler = unittest.mock.MagicMock()
         iqs = [make_test_iq() for i in range(3)]
@@ -4308,11 +4850,11 @@ class TestStanzaStreamSM(StanzaStreamTestBase):
             self.stream.sm_inbound_ctr
         )
 
+        # the replies to the second and third IQ are sent in one batch
         run_coroutine(self.xmlstream.run_test([
             XMLStreamMock.Send(error_iqs.pop()),
             XMLStreamMock.Send(nonza.SMRequest()),
             XMLStreamMock.Send(error_iqs.pop()),
-            XMLStreamMock.Send(nonza.SMRequest()),
             XMLStreamMock.Send(error_iqs.pop()),
             XMLStreamMock.Send(nonza.SMRequest()),
         ]))
@@ -4353,11 +4895,11 @@ class TestStanzaStreamSM(StanzaStreamTestBase):
             self.stream.sm_inbound_ctr
         )
 
+        # the replies to the second and third IQ are sent in one batch
         run_coroutine(self.xmlstream.run_test([
             XMLStreamMock.Send(error_iqs.pop()),
             XMLStreamMock.Send(nonza.SMRequest()),
             XMLStreamMock.Send(error_iqs.pop()),
-            XMLStreamMock.Send(nonza.SMRequest()),
             XMLStreamMock.Send(error_iqs.pop()),
             XMLStreamMock.Send(nonza.SMRequest()),
         ]))
@@ -4437,6 +4979,55 @@ class TestStanzaStreamSM(StanzaStreamTestBase):
             r"stream management disabled"
         )
 
+    def test_sm_resume_resends_unacked_stanzas_in_order(self):
+        iqs = [make_test_iq() for i in range(4)]
+
+        additional_iq = iqs.pop()
+
+        self.stream.start(self.xmlstream)
+        run_coroutine_with_peer(
+            self.stream.start_sm(),
+            self.xmlstream.run_test(self.successful_sm)
+        )
+
+        for iq in iqs:
+            self.stream._enqueue(iq)
+
+        run_coroutine(self.xmlstream.run_test([
+            XMLStreamMock.Send(iqs[0]),
+            XMLStreamMock.Send(iqs[1]),
+            XMLStreamMock.Send(iqs[2]),
+            XMLStreamMock.Send(nonza.SMRequest()),
+        ]))
+
+        self.stream.stop()
+        run_coroutine(asyncio.sleep(0))
+
+        self.stream._enqueue(additional_iq)
+
+        run_coroutine_with_peer(
+            self.stream.resume_sm(self.xmlstream),
+            self.xmlstream.run_test([
+                XMLStreamMock.Send(
+                    nonza.SMResume(previd="foobar",
+                                   counter=0),
+                    response=XMLStreamMock.Receive(
+                        nonza.SMResumed(previd="foobar",
+                                        counter=0)
+                    )
+                ),
+                XMLStreamMock.Send(iqs[0]),
+                XMLStreamMock.Send(iqs[1]),
+                XMLStreamMock.Send(iqs[2]),
+                XMLStreamMock.Send(additional_iq),
+                XMLStreamMock.Send(nonza.SMRequest()),
+            ])
+        )
+
+        self.stream.stop()
+        run_coroutine(asyncio.sleep(0))
+        self.stream.stop_sm()
+
     def test_sm_resume_overflow(self):
         iqs = [make_test_iq() for i in range(4)]
 
@@ -5037,16 +5628,13 @@ class TestStanzaStreamSM(StanzaStreamTestBase):
         run_coroutine_with_peer(
             self.stream.close(),
             self.xmlstream.run_test([
+                # the broker sends the stanza before close() gets to run
+                XMLStreamMock.Send(pres),
+                XMLStreamMock.Send(nonza.SMRequest()),
                 XMLStreamMock.Send(
                     nonza.SMAcknowledgement()
                 ),
                 XMLStreamMock.Close(),
-                # this is a race-condition of the test suite
-                # in a real stream, the Send would not happen as the stream
-                # changes state immediately and raises an exception from
-                # send_xso
-                XMLStreamMock.Send(pres),
-                XMLStreamMock.Send(nonza.SMRequest()),
             ]),
         )
 
@@ -5652,6 +6240,80 @@ class TestStanzaToken(unittest.TestCase):
             self.token.future.result()
 
 
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        self.bucket = stream.TokenBucket(10, 20, clock=lambda: self.now)
+
+    def tearDown(self):
+        del self.bucket
+
+    def test_starts_full(self):
+        self.assertEqual(self.bucket.level, 20)
+        self.assertEqual(self.bucket.delay(20), 0)
+
+    def test_consume_and_refill(self):
+        self.bucket.consume(15)
+        self.assertEqual(self.bucket.level, 5)
+
+        self.now += 1
+        self.assertEqual(self.bucket.level, 15)
+
+        self.now += 10
+        self.assertEqual(self.bucket.level, 20)
+
+    def test_debt_is_paid_back_before_delay_allows_activity(self):
+        self.bucket.consume(40)
+        self.assertEqual(self.bucket.level, -20)
+        self.assertAlmostEqual(self.bucket.delay(), 2)
+        self.assertAlmostEqual(self.bucket.delay(1), 2.1)
+
+        self.now += 2
+        self.assertEqual(self.bucket.delay(), 0)
+
+    def test_rejects_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            stream.TokenBucket(0, 1)
+        with self.assertRaises(ValueError):
+            stream.TokenBucket(1, 0)
+
+
+class TestRateShapingPolicy(unittest.TestCase):
+    def test_defaults(self):
+        p = stream.RateShapingPolicy()
+        self.assertIsNone(p.bytes_per_second)
+        self.assertIsNone(p.byte_burst)
+        self.assertIsNone(p.stanzas_per_second)
+        self.assertIsNone(p.stanza_burst)
+
+    def test_bursts_default_to_one_second(self):
+        p = stream.RateShapingPolicy(bytes_per_second=1000,
+                                     stanzas_per_second=5)
+        self.assertEqual(p.byte_burst, 1000)
+        self.assertEqual(p.stanza_burst, 5)
+
+        p = stream.RateShapingPolicy(stanzas_per_second=0.5)
+        self.assertEqual(p.stanza_burst, 1)
+
+    def test_explicit_bursts(self):
+        p = stream.RateShapingPolicy(bytes_per_second=1000,
+                                     byte_burst=4000,
+                                     stanzas_per_second=5,
+                                     stanza_burst=2)
+        self.assertEqual(p.byte_burst, 4000)
+        self.assertEqual(p.stanza_burst, 2)
+
+    def test_rejects_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            stream.RateShapingPolicy(bytes_per_second=0)
+        with self.assertRaises(ValueError):
+            stream.RateShapingPolicy(stanzas_per_second=-1)
+        with self.assertRaises(ValueError):
+            stream.RateShapingPolicy(bytes_per_second=1, byte_burst=0)
+        with self.assertRaises(ValueError):
+            stream.RateShapingPolicy(stanzas_per_second=1, stanza_burst=0)
+
+
 class Testiq_handler(unittest.TestCase):
     def setUp(self):
         self.stream = unittest.mock.Mock()
@@ -19,7 +19,11 @@
 # <http://www.gnu.org/licenses/>.
 #
 ########################################################################
+import random
 import unittest
+import unittest.mock
+
+import aioxmpp.stringprep
 
 from aioxmpp.stringprep import (
     nodeprep, resourceprep, nameprep,
@@ -27,6 +31,58 @@ from aioxmpp.stringprep import (
 )
 
 
+def _prep_or_error(func, s):
+    try:
+        return func(s, False)
+    except ValueError as exc:
+        return str(exc)
+
+
+class AsciiFastPathMixin:
+    # self.prep is the public function, self.full is the full algorithm
+    # which it falls back to
+
+    def test_single_characters_match_full_algorithm(self):
+        for cp in range(0x80):
+            c = chr(cp)
+            self.assertEqual(
+                _prep_or_error(self.prep, c),
+                _prep_or_error(self.full, c),
+                "result differs for U+{:04x}".format(cp),
+            )
+
+    def test_random_strings_match_full_algorithm(self):
+        rng = random.Random(1)
+        for i in range(1000):
+            s = "".join(
+                chr(rng.randrange(0, 0x80))
+                for j in range(rng.randrange(0, 8))
+            )
+            self.assertEqual(
+                _prep_or_error(self.prep, s),
+                _prep_or_error(self.full, s),
+                "result differs for {!r}".format(s),
+            )
+
+    def test_fast_path_skips_full_algorithm(self):
+        with unittest.mock.patch.object(
+                aioxmpp.stringprep,
+                self.full.__name__) as full:
+            result = self.prep("Romeo.Montague-1")
+
+        full.assert_not_called()
+        self.assertEqual(result, self.full("Romeo.Montague-1", False))
+
+    def test_non_ascii_uses_full_algorithm(self):
+        with unittest.mock.patch.object(
+                aioxmpp.stringprep,
+                self.full.__name__) as full:
+            result = self.prep("Jürgen", allow_unassigned=True)
+
+        full.assert_called_once_with("Jürgen", True)
+        self.assertEqual(result, full())
+
+
 class Testcheck_bidi(unittest.TestCase):
     # some test cases which are not covered by the other tests
     def test_empty_string(self):
@@ -37,7 +93,10 @@ class Testcheck_bidi(unittest.TestCase):
             check_bidi("\u05be\u0041")
 
 
-class TestNodeprep(unittest.TestCase):
+class TestNodeprep(AsciiFastPathMixin, unittest.TestCase):
+    prep = staticmethod(nodeprep)
+    full = staticmethod(aioxmpp.stringprep._nodeprep_full)
+
     def test_map_to_nothing(self):
         self.assertEqual(
             "ix",
@@ -95,7 +154,10 @@ class TestNodeprep(unittest.TestCase):
             nodeprep("\u0221", allow_unassigned=True))
 
 
-class TestNameprep(unittest.TestCase):
+class TestNameprep(AsciiFastPathMixin, unittest.TestCase):
+    prep = staticmethod(nameprep)
+    full = staticmethod(aioxmpp.stringprep._nameprep_full)
+
     def test_map_to_nothing(self):
         self.assertEqual(
             "ix",
@@ -177,7 +239,10 @@ class TestNameprep(unittest.TestCase):
             nameprep("\u0221", allow_unassigned=True))
 
 
-class TestResourceprep(unittest.TestCase):
+class TestResourceprep(AsciiFastPathMixin, unittest.TestCase):
+    prep = staticmethod(resourceprep)
+    full = staticmethod(aioxmpp.stringprep._resourceprep_full)
+
     def test_map_to_nothing(self):
         self.assertEqual(
             "IX",
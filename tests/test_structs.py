@@ -22,6 +22,7 @@
 import collections.abc
 import enum
 import unittest
+import unittest.mock
 import warnings
 
 import aioxmpp
@@ -581,6 +582,155 @@ class TestJID(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "too long"):
             structs.JID.fromstr("foo/" + "ü"*512)
 
+    def test_fromstr_uses_jid_cache(self):
+        with unittest.mock.patch.object(
+                structs.jid_cache, "lookup") as lookup:
+            result = structs.JID.fromstr("foo@bar.example", strict=False)
+
+        lookup.assert_called_once_with("foo@bar.example", False)
+        self.assertEqual(result, lookup())
+
+    def test_fromstr_returns_interned_objects(self):
+        j1 = structs.JID.fromstr("interned@bar.example/baz")
+        j2 = structs.JID.fromstr("interned@bar.example/baz")
+        self.assertIs(j1, j2)
+
+    def test_fromstr_on_subclass_bypasses_cache(self):
+        class SubJID(structs.JID):
+            __slots__ = []
+
+        with unittest.mock.patch.object(
+                structs.jid_cache, "lookup") as lookup:
+            result = SubJID.fromstr("foo@bar.example/baz")
+
+        lookup.assert_not_called()
+        self.assertIsInstance(result, SubJID)
+        self.assertEqual(
+            result,
+            structs.JID("foo", "bar.example", "baz"),
+        )
+
+
+class TestJIDCache(unittest.TestCase):
+    def setUp(self):
+        self.c = structs.JIDCache()
+
+    def tearDown(self):
+        del self.c
+
+    def test_defaults(self):
+        self.assertEqual(self.c.maxsize, 8192)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertEqual(len(self.c), 0)
+
+    def test_init_maxsize(self):
+        c = structs.JIDCache(maxsize=10)
+        self.assertEqual(c.maxsize, 10)
+
+    def test_jid_cache_instance(self):
+        self.assertIsInstance(structs.jid_cache, structs.JIDCache)
+
+    def test_lookup_parses_and_counts_miss(self):
+        result = self.c.lookup("foo@bar.example/baz")
+        self.assertEqual(result, structs.JID("foo", "bar.example", "baz"))
+        self.assertEqual(self.c.misses, 1)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(len(self.c), 1)
+
+    def test_lookup_returns_cached_object_and_counts_hit(self):
+        j1 = self.c.lookup("foo@bar.example/baz")
+        with unittest.mock.patch.object(
+                structs.JID, "_fromstr_uncached") as fromstr_uncached:
+            j2 = self.c.lookup("foo@bar.example/baz")
+        fromstr_uncached.assert_not_called()
+
+        self.assertIs(j1, j2)
+        self.assertEqual(self.c.misses, 1)
+        self.assertEqual(self.c.hits, 1)
+
+    def test_lookup_keys_on_strictness(self):
+        j1 = self.c.lookup("foo@bar.example", True)
+        j2 = self.c.lookup("foo@bar.example", False)
+        self.assertEqual(j1, j2)
+        self.assertEqual(self.c.misses, 2)
+        self.assertEqual(len(self.c), 2)
+
+    def test_lookup_passes_strictness(self):
+        with self.assertRaises(ValueError):
+            self.c.lookup("\U0001f601@example.test", True)
+
+        self.assertEqual(
+            self.c.lookup("\U0001f601@example.test", False),
+            structs.JID("\U0001f601", "example.test", None, strict=False)
+        )
+
+    def test_lookup_does_not_cache_errors(self):
+        for i in range(2):
+            with self.assertRaises(ValueError):
+                self.c.lookup("@bar.example")
+
+        self.assertEqual(self.c.misses, 2)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(len(self.c), 0)
+
+    def test_maxsize_bounds_entries(self):
+        self.c.maxsize = 2
+        j1 = self.c.lookup("a@bar.example")
+        self.c.lookup("b@bar.example")
+        # use a, so that b is the least recently used entry
+        self.c.lookup("a@bar.example")
+        self.c.lookup("c@bar.example")
+
+        self.assertEqual(len(self.c), 2)
+        self.assertIs(self.c.lookup("a@bar.example"), j1)
+        self.c.lookup("b@bar.example")
+        self.assertEqual(self.c.misses, 4)
+        self.assertEqual(self.c.hits, 2)
+
+    def test_reducing_maxsize_purges(self):
+        for i in range(5):
+            self.c.lookup("{}@bar.example".format(i))
+        self.c.maxsize = 2
+        self.assertEqual(len(self.c), 2)
+
+    def test_maxsize_zero_disables_cache(self):
+        self.c.lookup("foo@bar.example")
+        self.c.maxsize = 0
+        self.assertEqual(len(self.c), 0)
+
+        j1 = self.c.lookup("foo@bar.example")
+        j2 = self.c.lookup("foo@bar.example")
+        self.assertEqual(j1, j2)
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 3)
+
+        self.c.maxsize = 1
+        self.c.lookup("foo@bar.example")
+        self.assertEqual(len(self.c), 1)
+
+    def test_reject_negative_maxsize(self):
+        with self.assertRaises(ValueError):
+            self.c.maxsize = -1
+        self.assertEqual(self.c.maxsize, 8192)
+
+    def test_clear(self):
+        self.c.lookup("foo@bar.example")
+        self.c.lookup("foo@bar.example")
+        self.c.clear()
+        self.assertEqual(len(self.c), 0)
+        self.assertEqual(self.c.hits, 1)
+        self.assertEqual(self.c.misses, 1)
+
+    def test_reset_counters(self):
+        self.c.lookup("foo@bar.example")
+        self.c.lookup("foo@bar.example")
+        self.c.reset_counters()
+        self.assertEqual(self.c.hits, 0)
+        self.assertEqual(self.c.misses, 0)
+        self.assertEqual(len(self.c), 1)
+
 
 class TestPresenceShow(unittest.TestCase):
     def test_aliases(self):
@@ -26,7 +26,7 @@ import unittest.mock
 
 import aioxmpp.tasks as tasks
 
-from aioxmpp.testutils import CoroutineMock
+from aioxmpp.testutils import CoroutineMock, run_coroutine
 
 
 @asyncio.coroutine
@@ -145,3 +145,94 @@ class TestTaskPool(unittest.TestCase):
             result,
             async_()
         )
+
+    def test_set_limit_rejects_negative_limit(self):
+        with self.assertRaisesRegex(ValueError, "non-negative"):
+            self.p.set_limit(("foo",), -1)
+        self.assertIsNone(self.p.get_limit(("foo",)))
+
+    def test_spawn_accounts_task_in_groups(self):
+        task = self.p.spawn({"foo"}, _infinite_loop)
+
+        self.assertEqual(self.p.get_task_count(()), 1)
+        self.assertEqual(self.p.get_task_count("foo"), 1)
+        self.assertEqual(self.p.get_task_count("bar"), 0)
+        self.assertSequenceEqual(self.p.iter_tasks(), [task])
+        self.assertSequenceEqual(self.p.iter_tasks("foo"), [task])
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task)
+
+        self.assertEqual(self.p.get_task_count(()), 0)
+        self.assertEqual(self.p.get_task_count("foo"), 0)
+        self.assertSequenceEqual(self.p.iter_tasks(), [])
+
+    def test_add_accounts_task_in_groups(self):
+        task = self.p.add({"foo"}, _infinite_loop())
+
+        self.assertEqual(self.p.get_task_count(()), 1)
+        self.assertEqual(self.p.get_task_count("foo"), 1)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task)
+
+        self.assertEqual(self.p.get_task_count(()), 0)
+        self.assertEqual(self.p.get_task_count("foo"), 0)
+
+    def test_spawn_enforces_group_limit(self):
+        self.p.set_limit("foo", 1)
+        task = self.p.spawn({"foo"}, _infinite_loop)
+
+        self.assertFalse(self.p.has_capacity({"foo"}))
+        self.assertTrue(self.p.has_capacity({"bar"}))
+
+        coro_fun = unittest.mock.Mock()
+        with self.assertRaisesRegex(RuntimeError, "exhausted"):
+            self.p.spawn({"foo"}, coro_fun)
+        coro_fun.assert_not_called()
+
+        other = self.p.spawn({"bar"}, _infinite_loop)
+
+        task.cancel()
+        other.cancel()
+        run_coroutine(asyncio.wait([task, other]))
+
+        self.assertTrue(self.p.has_capacity({"foo"}))
+
+    def test_spawn_enforces_total_limit(self):
+        p = tasks.TaskPool(max_tasks=1)
+        task = p.spawn({"foo"}, _infinite_loop)
+
+        self.assertFalse(p.has_capacity({"bar"}))
+        with self.assertRaisesRegex(RuntimeError, "exhausted"):
+            p.spawn({"bar"}, _infinite_loop)
+
+        task.cancel()
+        run_coroutine(asyncio.wait([task]))
+
+        self.assertTrue(p.has_capacity({"bar"}))
+
+    def test_default_limit_applies_to_groups_without_limit(self):
+        p = tasks.TaskPool(default_limit=1)
+        task = p.spawn({"foo"}, _infinite_loop)
+
+        self.assertFalse(p.has_capacity({"foo"}))
+        self.assertTrue(p.has_capacity({"bar"}))
+
+        p.set_limit("foo", 2)
+        self.assertTrue(p.has_capacity({"foo"}))
+
+        task.cancel()
+        run_coroutine(asyncio.wait([task]))
+
+    def test_add_enforces_limits(self):
+        self.p.set_limit("foo", 0)
+
+        coro = _infinite_loop()
+        with self.assertRaisesRegex(RuntimeError, "exhausted"):
+            self.p.add({"foo"}, coro)
+        coro.close()
+
+        self.assertEqual(self.p.get_task_count(()), 0)
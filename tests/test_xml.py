@@ -625,6 +625,63 @@ class TestXMPPXMLGenerator(XMLTestCase):
         with self.assertRaises(ValueError):
             gen.startElementNS((None, "\u0000"), None, None)
 
+    def test_validates_names_only_once(self):
+        gen = xml.XMPPXMLGenerator(self.buf, short_empty_elements=True)
+        gen.startDocument()
+
+        with unittest.mock.patch(
+                "aioxmpp.xml.xmlValidateNameValue_str",
+                new=unittest.mock.Mock(
+                    wraps=xml.xmlValidateNameValue_str
+                )) as validate:
+            for i in range(3):
+                gen.startElementNS(
+                    (None, "name-validated-once"),
+                    None,
+                    {(None, "attr-validated-once"): "value"}
+                )
+                gen.endElementNS((None, "name-validated-once"), None)
+
+        self.assertCountEqual(
+            [
+                unittest.mock.call("name-validated-once"),
+                unittest.mock.call("attr-validated-once"),
+            ],
+            validate.mock_calls
+        )
+
+    def test_reject_invalid_element_names_repeatedly(self):
+        gen = xml.XMPPXMLGenerator(self.buf, short_empty_elements=True)
+        gen.startDocument()
+        for i in range(2):
+            with self.assertRaises(ValueError):
+                gen.startElementNS((None, "foo*bar"), None, None)
+            with self.assertRaises(ValueError):
+                gen.startElementNS((None, "foo"), None, {
+                    (None, "foo*bar"): "baz",
+                })
+
+    def test_end_element_reuses_qname_of_start_element(self):
+        gen = xml.XMPPXMLGenerator(self.buf, short_empty_elements=True)
+        gen.startDocument()
+        gen.startPrefixMapping("a", "uri:foo")
+        gen.startElementNS(("uri:foo", "foo"), None, None)
+        gen.startPrefixMapping("b", "uri:bar")
+        gen.startElementNS(("uri:bar", "bar"), None, None)
+        gen.characters("x")
+        gen.endElementNS(("uri:bar", "bar"), None)
+        gen.endPrefixMapping("b")
+        gen.endElementNS(("uri:foo", "foo"), None)
+        gen.endPrefixMapping("a")
+        gen.endDocument()
+
+        self.assertEqual(
+            b'<?xml version="1.0"?>'
+            b'<a:foo xmlns:a="uri:foo"><b:bar xmlns:b="uri:bar">x</b:bar>'
+            b'</a:foo>',
+            self.buf.getvalue()
+        )
+
     def test_reject_xmlns_attributes(self):
         gen = xml.XMPPXMLGenerator(self.buf, short_empty_elements=True)
         gen.startDocument()
@@ -1391,6 +1448,252 @@ class TestXMPPXMLGenerator(XMLTestCase):
         )
 
 
+class _EventSource:
+    def __init__(self, func):
+        self._func = func
+
+    def unparse_to_sax(self, dest):
+        self._func(dest)
+
+
+class TestXSOBytesSerializer(unittest.TestCase):
+    STREAM_NSMAP = {
+        "stream": namespaces.xmlstream,
+        None: "jabber:client",
+    }
+
+    def _generate(self, nsmap, func, **kwargs):
+        buf = io.BytesIO()
+        gen = xml.XMPPXMLGenerator(buf, short_empty_elements=True, **kwargs)
+        for prefix, uri in nsmap.items():
+            gen.startPrefixMapping(prefix, uri)
+        gen.startElementNS((namespaces.xmlstream, "stream"), None, {})
+        gen.flush()
+        offset = len(buf.getvalue())
+        func(gen)
+        return buf.getvalue()[offset:]
+
+    def _assert_same_output(self, nsmap, func, **kwargs):
+        ser = xml.XSOBytesSerializer(nsmap, **kwargs)
+        result = ser.serialize(_EventSource(func))
+        self.assertIsInstance(result, bytearray)
+        self.assertEqual(
+            self._generate(nsmap, func, **kwargs),
+            bytes(result),
+        )
+        return result
+
+    def test_same_output_as_generator_for_stanza(self):
+        def func(dest):
+            dest.startElementNS(
+                ("jabber:client", "message"),
+                None,
+                {
+                    (None, "to"): "foo@bar.example",
+                    (None, "type"): "chat",
+                    (namespaces.xml, "lang"): "de",
+                }
+            )
+            dest.startElementNS(("jabber:client", "body"), None, {})
+            dest.characters("<Hello & \"World\">")
+            dest.endElementNS(("jabber:client", "body"), None)
+            dest.startPrefixMapping(None, "urn:xmpp:delay")
+            dest.startElementNS(
+                ("urn:xmpp:delay", "delay"),
+                None,
+                {(None, "stamp"): "2002-09-10T23:08:25Z"}
+            )
+            dest.endElementNS(("urn:xmpp:delay", "delay"), None)
+            dest.endPrefixMapping(None)
+            dest.endElementNS(("jabber:client", "message"), None)
+
+        result = self._assert_same_output(self.STREAM_NSMAP, func,
+                                          sorted_attributes=True)
+        self.assertEqual(
+            b'<message to="foo@bar.example" type="chat" xml:lang="de">'
+            b'<body>&lt;Hello &amp; "World"&gt;</body>'
+            b'<delay xmlns="urn:xmpp:delay" stamp="2002-09-10T23:08:25Z"/>'
+            b'</message>',
+            result
+        )
+
+    def test_same_output_as_generator_for_auto_namespaces(self):
+        def func(dest):
+            dest.startElementNS(
+                ("uri:foo", "foo"),
+                None,
+                {
+                    ("uri:bar", "a"): "1",
+                    ("uri:baz", "b"): "2",
+                    ("uri:foo", "c"): "3",
+                }
+            )
+            dest.startElementNS(("uri:bar", "bar"), None, {})
+            dest.startElementNS(("uri:foo", "foo"), None, {})
+            dest.endElementNS(("uri:foo", "foo"), None)
+            dest.endElementNS(("uri:bar", "bar"), None)
+            dest.startPrefixMapping("x", "uri:x")
+            dest.startElementNS(("uri:x", "x"), None, {("uri:x", "y"): "z"})
+            dest.characters("text")
+            dest.endElementNS(("uri:x", "x"), None)
+            dest.endPrefixMapping("x")
+            dest.endElementNS(("uri:foo", "foo"), None)
+
+        self._assert_same_output(self.STREAM_NSMAP, func,
+                                 sorted_attributes=True)
+
+    def test_same_output_as_generator_for_lxml_tree(self):
+        tree = etree.fromstring(TEST_TREE)
+
+        def func(dest):
+            lxml.sax.saxify(
+                tree,
+                xso.model._CollectorContentHandlerFilter(dest)
+            )
+
+        self._assert_same_output({"stream": namespaces.xmlstream}, func,
+                                 sorted_attributes=True)
+
+    def test_same_output_as_generator_for_xsos(self):
+        class Child(xso.XSO):
+            TAG = ("uri:foo", "child")
+
+            text = xso.Text()
+
+        class Parent(xso.XSO):
+            TAG = ("uri:bar", "parent")
+
+            attr = xso.Attr("attr")
+            children = xso.ChildList([Child])
+
+        obj = Parent()
+        obj.attr = "foo"
+        for i in range(2):
+            child = Child()
+            child.text = str(i)
+            obj.children.append(child)
+
+        self._assert_same_output(self.STREAM_NSMAP, obj.unparse_to_sax)
+
+    def test_escaping(self):
+        def func(dest):
+            dest.startElementNS(
+                ("uri:foo", "foo"),
+                None,
+                {(None, "a"): "'\"\n"}
+            )
+            dest.characters("<&>\r\n'\"")
+            dest.endElementNS(("uri:foo", "foo"), None)
+
+        self._assert_same_output({}, func)
+        self._assert_same_output({}, func, additional_escapes="\r'")
+
+    def test_returns_fresh_bytearray(self):
+        obj = Cls()
+        ser = xml.XSOBytesSerializer()
+        result1 = ser.serialize(obj)
+        result2 = ser.serialize(obj)
+        self.assertIsNot(result1, result2)
+        self.assertEqual(result1, result2)
+
+    def test_does_not_reuse_rebound_prefix(self):
+        def func(dest):
+            dest.startElementNS(("jabber:client", "message"), None, {})
+            dest.startPrefixMapping(None, "urn:xmpp:forward:0")
+            dest.startElementNS(("urn:xmpp:forward:0", "forwarded"),
+                                None, {})
+            dest.startElementNS(("jabber:client", "message"), None, {})
+            dest.endElementNS(("jabber:client", "message"), None)
+            dest.endElementNS(("urn:xmpp:forward:0", "forwarded"), None)
+            dest.endPrefixMapping(None)
+            dest.endElementNS(("jabber:client", "message"), None)
+
+        ser = xml.XSOBytesSerializer(self.STREAM_NSMAP)
+        self.assertEqual(
+            b'<message>'
+            b'<forwarded xmlns="urn:xmpp:forward:0">'
+            b'<message xmlns="jabber:client"/>'
+            b'</forwarded>'
+            b'</message>',
+            ser.serialize(_EventSource(func))
+        )
+
+    def test_does_not_redeclare_namespaces_from_nsmap(self):
+        def func(dest):
+            dest.startPrefixMapping(None, "jabber:client")
+            dest.startElementNS(("jabber:client", "iq"), None, {})
+            dest.endElementNS(("jabber:client", "iq"), None)
+            dest.endPrefixMapping(None)
+
+        result = self._assert_same_output(self.STREAM_NSMAP, func)
+        self.assertEqual(b"<iq/>", result)
+
+    def test_recovers_after_exception(self):
+        def func(dest):
+            dest.startElementNS(("uri:foo", "foo"), None, {})
+            dest.startElementNS(("uri:foo", "bar"), None, {})
+            dest.characters("\u0000")
+
+        ser = xml.XSOBytesSerializer(self.STREAM_NSMAP)
+        with self.assertRaisesRegex(ValueError, "control characters"):
+            ser.serialize(_EventSource(func))
+
+        self.assertEqual(
+            b'<bar xmlns="uri:foo"/>',
+            ser.serialize(_EventSource(
+                lambda dest: (dest.startElementNS(("uri:foo", "bar"), None),
+                              dest.endElementNS(("uri:foo", "bar"), None))
+            ))
+        )
+
+    def test_reject_invalid_names(self):
+        ser = xml.XSOBytesSerializer()
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.startElementNS((None, "foo*bar"), None)
+            ))
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.startElementNS(
+                    (None, "foo"), None, {(None, "foo:bar"): "x"}
+                )
+            ))
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.startElementNS(
+                    (None, "foo"), None, {(None, "xmlns"): "x"}
+                )
+            ))
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.startPrefixMapping("xmlns", "uri:foo")
+            ))
+
+    def test_reject_unnamespaced_element_if_default_namespace_is_bound(self):
+        ser = xml.XSOBytesSerializer({None: "jabber:client"})
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.startElementNS((None, "foo"), None)
+            ))
+
+    def test_detection_of_unclosed_namespace(self):
+        def func(dest):
+            dest.startPrefixMapping("a", "uri:a")
+            dest.startElementNS(("uri:a", "foo"), None)
+            dest.endElementNS(("uri:a", "foo"), None)
+            dest.startElementNS(("uri:a", "foo"), None)
+
+        ser = xml.XSOBytesSerializer()
+        with self.assertRaises(RuntimeError):
+            ser.serialize(_EventSource(func))
+
+    def test_reject_processing_instructions(self):
+        ser = xml.XSOBytesSerializer()
+        with self.assertRaises(ValueError):
+            ser.serialize(_EventSource(
+                lambda dest: dest.processingInstruction("foo", "bar")
+            ))
+
 
 class TestXMLStreamWriter(unittest.TestCase):
     TEST_TO = structs.JID.fromstr("example.test")
@@ -1481,6 +1784,49 @@ class TestXMLStreamWriter(unittest.TestCase):
             b'</stream:stream>',
             self.buf.getvalue())
 
+    def test_send_writes_object_at_once(self):
+        obj = Cls()
+        f = unittest.mock.Mock()
+        gen = xml.XMLStreamWriter(f, self.TEST_TO)
+        gen.start()
+        f.mock_calls.clear()
+
+        gen.send(obj)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b'<bar xmlns="uri:foo"/>'),
+            ],
+            f.mock_calls
+        )
+
+    def test_send_writes_nothing_on_error(self):
+        class Broken(xso.XSO):
+            TAG = ("uri:foo", "broken")
+
+            text = xso.Text()
+
+        obj = Broken()
+        obj.text = "\u0000"
+
+        f = unittest.mock.Mock()
+        gen = xml.XMLStreamWriter(f, self.TEST_TO)
+        gen.start()
+        f.mock_calls.clear()
+
+        with self.assertRaises(ValueError):
+            gen.send(obj)
+
+        self.assertSequenceEqual([], f.mock_calls)
+
+        gen.send(Cls())
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.write(b'<bar xmlns="uri:foo"/>'),
+            ],
+            f.mock_calls
+        )
+
     def test_send_object_inherits_namespaces(self):
         obj = Cls()
         gen = self._make_gen(nsmap={"jc": "uri:foo"})
@@ -2216,6 +2562,178 @@ class Testmake_parser(unittest.TestCase):
         )
 
 
+class TestExpatParser(unittest.TestCase):
+    def setUp(self):
+        self.handler = unittest.mock.Mock()
+        self.p = xml.ExpatParser()
+        self.p.setContentHandler(self.handler)
+
+    def tearDown(self):
+        del self.p
+        del self.handler
+
+    def test_is_incremental(self):
+        self.assertTrue(
+            hasattr(self.p, "feed")
+        )
+
+    def test_content_handler(self):
+        self.assertIs(self.p.getContentHandler(), self.handler)
+
+    def test_forwards_events(self):
+        self.p.feed(b"<root xmlns='uri:foo' xmlns:p='uri:p' a='1' p:b='2'>")
+        self.p.feed(b"<child xmlns='uri:bar' xml:lang='de'>foo&amp;")
+        self.p.feed(b"bar</child><nons xmlns=''/></root>")
+        self.p.close()
+
+        self.assertSequenceEqual(
+            self.handler.mock_calls,
+            [
+                unittest.mock.call.startDocument(),
+                unittest.mock.call.startElementNS(
+                    ("uri:foo", "root"),
+                    None,
+                    {
+                        (None, "a"): "1",
+                        ("uri:p", "b"): "2",
+                    }
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "child"),
+                    None,
+                    {
+                        (namespaces.xml, "lang"): "de",
+                    }
+                ),
+                unittest.mock.call.characters("foo&"),
+                unittest.mock.call.characters("bar"),
+                unittest.mock.call.endElementNS(
+                    ("uri:bar", "child"),
+                    None,
+                ),
+                unittest.mock.call.startElementNS(
+                    (None, "nons"),
+                    None,
+                    {},
+                ),
+                unittest.mock.call.endElementNS(
+                    (None, "nons"),
+                    None,
+                ),
+                unittest.mock.call.endElementNS(
+                    ("uri:foo", "root"),
+                    None,
+                ),
+                unittest.mock.call.endDocument(),
+            ]
+        )
+
+    def test_forwards_processing_instructions(self):
+        self.p.feed(b"<root><?foo bar?>")
+        self.handler.processingInstruction.assert_called_once_with(
+            "foo", "bar",
+        )
+
+    def test_accepts_str(self):
+        self.p.feed("<root>föo")
+        self.p.feed("</root>")
+        self.handler.characters.assert_called_once_with("föo")
+
+    def test_reject_comments(self):
+        self.p.feed(b"<root>")
+        with self.assertRaises(errors.StreamError) as cm:
+            self.p.feed(b"<!-- foo -->")
+        self.assertEqual(
+            errors.StreamErrorCondition.RESTRICTED_XML,
+            cm.exception.condition
+        )
+
+    def test_reject_dtd(self):
+        with self.assertRaises(errors.StreamError) as cm:
+            self.p.feed(b"<!DOCTYPE root []><root>")
+        self.assertEqual(
+            errors.StreamErrorCondition.RESTRICTED_XML,
+            cm.exception.condition
+        )
+
+    def test_undefined_entity_raises_SAXParseException(self):
+        self.p.feed(b"<root>")
+        with self.assertRaises(xml_sax.SAXParseException) as cm:
+            self.p.feed(b"&foo;")
+        self.assertTrue(
+            cm.exception.getException().args[0].startswith(
+                "undefined entity"
+            )
+        )
+
+    def test_malformed_xml_raises_same_error_as_sax_parser(self):
+        sax_parser = xml.make_parser()
+        sax_parser.setContentHandler(unittest.mock.Mock())
+        sax_parser.feed(b"<root>")
+        with self.assertRaises(xml_sax.SAXParseException) as cm:
+            sax_parser.feed(b"<</>")
+        sax_exc = cm.exception
+
+        self.p.feed(b"<root>")
+        with self.assertRaises(xml_sax.SAXParseException) as cm:
+            self.p.feed(b"<</>")
+
+        self.assertEqual(str(cm.exception), str(sax_exc))
+
+    def test_propagates_exceptions_from_content_handler(self):
+        class FooException(Exception):
+            pass
+
+        self.handler.startElementNS.side_effect = FooException()
+        with self.assertRaises(FooException):
+            self.p.feed(b"<root>")
+
+    def test_can_be_reused_after_close(self):
+        self.p.feed(b"<root/>")
+        self.p.close()
+        self.handler.mock_calls.clear()
+
+        self.p.feed(b"<root/>")
+        self.p.close()
+
+        self.assertSequenceEqual(
+            self.handler.mock_calls,
+            [
+                unittest.mock.call.startDocument(),
+                unittest.mock.call.startElementNS(
+                    (None, "root"), None, {},
+                ),
+                unittest.mock.call.endElementNS(
+                    (None, "root"), None,
+                ),
+                unittest.mock.call.endDocument(),
+            ]
+        )
+
+    def test_close_without_feed_is_noop(self):
+        self.p.close()
+        self.assertSequenceEqual(self.handler.mock_calls, [])
+
+    def test_drives_XMPPXMLProcessor(self):
+        proc = xml.XMPPXMLProcessor()
+        proc.stanza_parser = xso.XSOParser()
+        received = []
+        proc.stanza_parser.add_class(Cls, received.append)
+        self.p.setContentHandler(proc)
+
+        self.p.feed(
+            "<stream:stream xmlns:stream='{}' xmlns='uri:foo' version='1.0'"
+            " from='example.test' id='foo'>".format(
+                namespaces.xmlstream
+            )
+        )
+        self.p.feed("<bar/></stream:stream>")
+        self.p.close()
+
+        self.assertEqual(len(received), 1)
+        self.assertIsInstance(received[0], Cls)
+
+
 class TestXMPPLexicalHandler(unittest.TestCase):
     def setUp(self):
         self.proc = xml.XMPPLexicalHandler()
@@ -60,6 +60,17 @@ def drive_from_events(method, instance, subtree, ctx):
     lxml.sax.saxify(subtree, sd)
 
 
+def collect_events(subtree):
+    events = []
+
+    def collector():
+        while True:
+            events.append((yield))
+
+    lxml.sax.saxify(subtree, xso.SAXDriver(collector))
+    return events
+
+
 def make_instance_mock(mapping={}):
     instance = unittest.mock.MagicMock()
     instance.TAG = ("uri:mock", "mock-instance")
@@ -654,6 +665,140 @@ class TestXMLStreamClass(unittest.TestCase):
                 "register_child is forbidden on classes with subclasses"):
             Cls.register_child(Cls.child, ClsB)
 
+    def test_parse_plan(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            required = xso.Attr("a")
+            optional = xso.Attr("b", default=None)
+            computed = xso.Attr("c", default=None,
+                                missing=lambda instance, ctx: "x")
+            lang = xso.LangAttr()
+            child = xso.Child([])
+            text = xso.Text()
+            collector = xso.Collector()
+
+        plan = Cls.PARSE_PLAN
+        self.assertIs(plan.attr_map, Cls.ATTR_MAP)
+        self.assertIs(plan.child_map, Cls.CHILD_MAP)
+        self.assertIs(plan.text_prop, Cls.text.xq_descriptor)
+        self.assertIs(plan.collector_prop, Cls.collector.xq_descriptor)
+        self.assertIs(plan.lang_attr, Cls.lang.xq_descriptor)
+        self.assertSequenceEqual(
+            [
+                ((None, "a"), Cls.required.xq_descriptor),
+                ((None, "c"), Cls.computed.xq_descriptor),
+                ((namespaces.xml, "lang"), Cls.lang.xq_descriptor),
+            ],
+            plan.missing_attrs
+        )
+
+    def test_parse_plan_of_empty_class(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+        plan = Cls.PARSE_PLAN
+        self.assertIsNone(plan.text_prop)
+        self.assertIsNone(plan.collector_prop)
+        self.assertIsNone(plan.lang_attr)
+        self.assertSequenceEqual([], plan.missing_attrs)
+
+    def test_parse_plan_is_per_class(self):
+        class ClsA(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            attr = xso.Attr("a")
+
+        class ClsB(ClsA):
+            text = xso.Text()
+
+        self.assertIsNot(ClsA.PARSE_PLAN, ClsB.PARSE_PLAN)
+        self.assertIsNone(ClsA.PARSE_PLAN.text_prop)
+        self.assertIs(ClsB.PARSE_PLAN.text_prop, ClsB.text.xq_descriptor)
+        self.assertSequenceEqual(
+            [((None, "a"), ClsA.attr.xq_descriptor)],
+            ClsB.PARSE_PLAN.missing_attrs
+        )
+
+    def test_parse_plan_is_recompiled_when_adding_descriptors(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+        old_plan = Cls.PARSE_PLAN
+
+        Cls.text = xso.Text()
+        self.assertIsNot(old_plan, Cls.PARSE_PLAN)
+        self.assertIs(Cls.PARSE_PLAN.text_prop, Cls.text.xq_descriptor)
+
+        Cls.attr = xso.Attr("a")
+        self.assertSequenceEqual(
+            [((None, "a"), Cls.attr.xq_descriptor)],
+            Cls.PARSE_PLAN.missing_attrs
+        )
+
+        Cls.collector = xso.Collector()
+        self.assertIs(Cls.PARSE_PLAN.collector_prop,
+                      Cls.collector.xq_descriptor)
+
+    def test_parse_plan_is_not_recompiled_for_other_attributes(self):
+        class Cls(metaclass=xso_model.XMLStreamClass, protect=False):
+            TAG = "foo"
+
+        old_plan = Cls.PARSE_PLAN
+        Cls.foo = "bar"
+        self.assertIs(old_plan, Cls.PARSE_PLAN)
+
+    def test_parse_plan_is_recompiled_on_register_child(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            child = xso.Child([])
+
+        class ClsA(metaclass=xso_model.XMLStreamClass):
+            TAG = "bar"
+
+        old_plan = Cls.PARSE_PLAN
+        Cls.register_child(Cls.child, ClsA)
+        self.assertIsNot(old_plan, Cls.PARSE_PLAN)
+        self.assertIs(Cls.PARSE_PLAN.child_map[ClsA.TAG],
+                      Cls.child.xq_descriptor)
+
+    def test_unparse_plan(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            attr1 = xso.Attr("a")
+            attr2 = xso.Attr("b")
+            child1 = xso.ChildText((None, "c"))
+            child2 = xso.ChildText((None, "d"))
+            text = xso.Text()
+
+        plan = Cls.UNPARSE_PLAN
+        self.assertSequenceEqual(
+            [Cls.attr1.xq_descriptor, Cls.attr2.xq_descriptor],
+            plan.attr_props,
+        )
+        self.assertSequenceEqual(
+            [Cls.child1.xq_descriptor, Cls.child2.xq_descriptor],
+            plan.child_props,
+        )
+        self.assertIs(plan.text_prop, Cls.text.xq_descriptor)
+        self.assertIsNone(plan.collector_prop)
+
+    def test_unparse_plan_is_recompiled_when_adding_descriptors(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+        Cls.child = xso.ChildText((None, "c"))
+        Cls.collector = xso.Collector()
+
+        plan = Cls.UNPARSE_PLAN
+        self.assertSequenceEqual(
+            [Cls.child.xq_descriptor],
+            plan.child_props,
+        )
+        self.assertIs(plan.collector_prop, Cls.collector.xq_descriptor)
+
     def test_call_error_handler_on_broken_child(self):
         class Bar(xso.XSO):
             TAG = "bar"
@@ -1949,6 +2094,33 @@ class TestCapturingXMLStreamClass(unittest.TestCase):
 
         self.assertIs(ctx.exception.value, result)
 
+    def test_parse_event_list_captures_subtree(self):
+        class Cls(metaclass=xso_model.CapturingXMLStreamClass):
+            pass
+
+        result = unittest.mock.Mock()
+        events = [
+            ("start", None, "root", {}),
+            ("start", None, "foo", {}),
+            ("text", "bar"),
+            ("end",),
+            ("end",),
+        ]
+        parent_ctx = object()
+
+        with unittest.mock.patch.object(
+                xso_model.XMLStreamClass,
+                "parse_event_list") as parse_event_list:
+            parse_event_list.return_value = result, 4
+
+            self.assertEqual(
+                Cls.parse_event_list(events, 1, parent_ctx),
+                (result, 4),
+            )
+
+        parse_event_list.assert_called_once_with(events, 1, parent_ctx)
+        result._set_captured_events.assert_called_once_with(events[1:4])
+
 
 class TestXSO(XMLTestCase):
     def _unparse_test(self, obj, tree):
@@ -2844,6 +3016,16 @@ class TestChild(XMLTestCase):
 
         self.ctx = xso_model.Context()
 
+    def test_from_event_list(self):
+        obj = self.ClsA()
+        events = collect_events(etree.fromstring("<foo><bar/></foo>"))
+
+        self.assertEqual(
+            self.ClsA.test_child.from_event_list(obj, events, 1, self.ctx),
+            3,
+        )
+        self.assertIsInstance(obj.test_child, self.ClsLeaf)
+
     def test_default_default_is_None(self):
         prop = xso.Child([])
         self.assertIs(prop.default, None)
@@ -3228,6 +3410,24 @@ class TestCollector(XMLTestCase):
     def setUp(self):
         self.ctx = xso_model.Context()
 
+    def test_from_event_list_drives_from_events(self):
+        instance = make_instance_mock()
+        prop = xso.Collector()
+        events = collect_events(
+            etree.fromstring("<root><bar a='baz'>fnord<x/></bar></root>")
+        )
+
+        self.assertEqual(
+            prop.from_event_list(instance, events, 1, self.ctx),
+            len(events) - 1,
+        )
+
+        result, = instance._xso_contents[prop]
+        self.assertSubtreeEqual(
+            etree.fromstring("<bar a='baz'>fnord<x/></bar>"),
+            result,
+        )
+
     def test_get_on_class_returns_BoundDescriptor(self):
         prop = xso.Collector()
 
@@ -3544,6 +3744,42 @@ class TestChildText(XMLTestCase):
     def setUp(self):
         self.ctx = xso_model.Context()
 
+    def test_from_event_list(self):
+        instance = make_instance_mock()
+        prop = xso.ChildText("body")
+        events = collect_events(etree.fromstring(
+            "<body>foo<!-- x -->bar</body>"
+        ))
+
+        self.assertEqual(
+            prop.from_event_list(instance, events, 0, self.ctx),
+            len(events),
+        )
+        self.assertDictEqual(
+            {
+                prop: "foobar",
+            },
+            instance._xso_contents
+        )
+
+    def test_from_event_list_enforces_child_policy(self):
+        instance = make_instance_mock()
+        prop = xso.ChildText("body")
+        events = collect_events(etree.fromstring("<body>foo<a/></body>"))
+
+        with self.assertRaisesRegex(ValueError, "unexpected child"):
+            prop.from_event_list(instance, events, 0, self.ctx)
+
+        prop = xso.ChildText(
+            "body",
+            child_policy=xso.UnknownChildPolicy.DROP,
+        )
+        self.assertEqual(
+            prop.from_event_list(instance, events, 0, self.ctx),
+            len(events),
+        )
+        self.assertEqual(instance._xso_contents[prop], "foo")
+
     def test_init(self):
         type_mock = unittest.mock.MagicMock()
         validator_mock = unittest.mock.MagicMock()
@@ -4501,6 +4737,36 @@ class TestChildFlag(unittest.TestCase):
     def setUp(self):
         self.ctx = xso_model.Context()
 
+    def test_from_event_list(self):
+        instance = make_instance_mock()
+        prop = xso.ChildFlag(
+            tag=("uri:foo", "foo")
+        )
+        events = collect_events(etree.fromstring("<foo xmlns='uri:foo'/>"))
+
+        self.assertEqual(
+            prop.from_event_list(instance, events, 0, self.ctx),
+            2,
+        )
+        self.assertDictEqual(
+            {
+                prop: True,
+            },
+            instance._xso_contents
+        )
+
+    def test_from_event_list_enforces_text_policy(self):
+        instance = make_instance_mock()
+        prop = xso.ChildFlag(
+            tag=("uri:foo", "foo")
+        )
+        events = collect_events(
+            etree.fromstring("<foo xmlns='uri:foo'>bar</foo>")
+        )
+
+        with self.assertRaisesRegex(ValueError, "unexpected text"):
+            prop.from_event_list(instance, events, 0, self.ctx)
+
     def test_get_tag_map(self):
         self.assertSetEqual(
             xso.ChildFlag("foo").get_tag_map(),
@@ -4933,6 +5199,155 @@ class Testguard(unittest.TestCase):
             ctx.exception
         )
 
+    def test_drain_nested_elements_after_exception(self):
+        cmd_sequence = [
+            ("start", None, "foo", {}),
+            ("start", None, "bar", {}),
+            ("start", None, "baz", {}),
+            ("end",),
+            ("end",),
+            ("end",),
+        ]
+
+        dest = unittest.mock.MagicMock()
+        guard = xso_model.guard(dest, cmd_sequence[0][1:])
+        next(guard)
+
+        exc = ValueError()
+        dest.send.side_effect = exc
+
+        for cmd in cmd_sequence[1:-1]:
+            guard.send(cmd)
+
+        with self.assertRaises(ValueError) as ctx:
+            guard.send(cmd_sequence[-1])
+
+        self.assertIs(exc, ctx.exception)
+
+    def test_drain_subtree_if_first_next_raises(self):
+        cmd_sequence = [
+            ("start", None, "foo", {}),
+            ("start", None, "bar", {}),
+            ("end",),
+            ("end",),
+        ]
+
+        exc = ValueError()
+        dest = unittest.mock.MagicMock()
+        dest.__next__.side_effect = exc
+
+        guard = xso_model.guard(dest, cmd_sequence[0][1:])
+        next(guard)
+
+        for cmd in cmd_sequence[1:-1]:
+            guard.send(cmd)
+
+        with self.assertRaises(ValueError) as ctx:
+            guard.send(cmd_sequence[-1])
+
+        self.assertIs(exc, ctx.exception)
+        dest.send.assert_not_called()
+
+
+class Testskip_subtree(unittest.TestCase):
+    def test_skip_nested(self):
+        events = [
+            ("start", None, "root", {}),
+            ("start", None, "foo", {}),
+            ("text", "bar"),
+            ("start", None, "baz", {}),
+            ("end",),
+            ("end",),
+            ("text", "fnord"),
+            ("end",),
+        ]
+
+        self.assertEqual(xso_model.skip_subtree(events, 1), 6)
+        self.assertEqual(xso_model.skip_subtree(events, 3), 5)
+        self.assertEqual(xso_model.skip_subtree(events, 0), 8)
+
+
+class Testenforce_unknown_child_policy_in_list(unittest.TestCase):
+    def setUp(self):
+        self.events = [
+            ("start", None, "root", {}),
+            ("start", None, "foo", {}),
+            ("end",),
+            ("end",),
+        ]
+
+    def test_drop_policy(self):
+        self.assertEqual(
+            xso_model.enforce_unknown_child_policy_in_list(
+                xso.UnknownChildPolicy.DROP,
+                self.events,
+                1,
+            ),
+            3
+        )
+
+    def test_fail_policy(self):
+        with self.assertRaisesRegex(ValueError, "unexpected child"):
+            xso_model.enforce_unknown_child_policy_in_list(
+                xso.UnknownChildPolicy.FAIL,
+                self.events,
+                1,
+            )
+
+    def test_fail_policy_can_be_suppressed_by_error_handler(self):
+        error_handler = unittest.mock.Mock()
+        error_handler.return_value = True
+        self.assertEqual(
+            xso_model.enforce_unknown_child_policy_in_list(
+                xso.UnknownChildPolicy.FAIL,
+                self.events,
+                1,
+                error_handler,
+            ),
+            3
+        )
+        error_handler.assert_called_once_with(
+            None,
+            [None, "foo", {}],
+            None,
+        )
+
+    def test_fail_policy_with_non_suppressing_error_handler(self):
+        error_handler = unittest.mock.Mock()
+        error_handler.return_value = False
+        with self.assertRaisesRegex(ValueError, "unexpected child"):
+            xso_model.enforce_unknown_child_policy_in_list(
+                xso.UnknownChildPolicy.FAIL,
+                self.events,
+                1,
+                error_handler,
+            )
+
+
+class Testdrive_with_event_list(unittest.TestCase):
+    def test_feeds_subtree_and_returns_result(self):
+        events = [
+            ("start", None, "root", {}),
+            ("start", None, "foo", {}),
+            ("text", "bar"),
+            ("end",),
+            ("end",),
+        ]
+        received = []
+
+        def receiver():
+            while True:
+                ev = yield
+                received.append(ev)
+                if ev[0] == "end":
+                    return "result"
+
+        self.assertEqual(
+            xso_model.drive_with_event_list(receiver(), events, 1),
+            ("result", 4),
+        )
+        self.assertSequenceEqual(received, events[2:4])
+
 
 class TestSAXDriver(unittest.TestCase):
     def setUp(self):
@@ -5069,6 +5484,102 @@ class TestSAXDriver(unittest.TestCase):
 
         self.assertIsInstance(self.l[-1], GeneratorExit)
 
+    def test_batched_passes_complete_elements_to_parse_event_list(self):
+        dest = unittest.mock.Mock(["parse_event_list"])
+        sd = xso.SAXDriver(dest, batched=True)
+
+        sd.startElementNS((None, "foo"), "foo", {})
+        sd.characters("bar")
+        sd.startElementNS((None, "baz"), "baz", {(None, "a"): "b"})
+        sd.endElementNS((None, "baz"), "baz")
+        dest.parse_event_list.assert_not_called()
+        sd.endElementNS((None, "foo"), "foo")
+
+        dest.parse_event_list.assert_called_once_with(
+            [
+                ("start", None, "foo", {}),
+                ("text", "bar"),
+                ("start", None, "baz", {(None, "a"): "b"}),
+                ("end",),
+                ("end",),
+            ]
+        )
+        dest.parse_event_list.reset_mock()
+
+        sd.startElementNS((None, "foo"), "foo", {})
+        sd.endElementNS((None, "foo"), "foo")
+        dest.parse_event_list.assert_called_once_with(
+            [
+                ("start", None, "foo", {}),
+                ("end",),
+            ]
+        )
+
+    def test_batched_passes_top_level_text_immediately(self):
+        dest = unittest.mock.Mock(["parse_event_list"])
+        sd = xso.SAXDriver(dest, batched=True)
+
+        sd.characters(" ")
+        dest.parse_event_list.assert_called_once_with(
+            [
+                ("text", " "),
+            ]
+        )
+
+    def test_batched_falls_back_to_generator(self):
+        tree = etree.fromstring("<foo><bar/></foo>")
+        sd = xso.SAXDriver(self.catchall, batched=True)
+        lxml.sax.saxify(tree, sd)
+
+        self.assertSequenceEqual(
+            [
+                ("start", None, "foo", {}),
+                ("start", None, "bar", {}),
+                ("end",),
+                ("end",)
+            ],
+            self.l
+        )
+
+        sd.close()
+
+    def test_batched_recovers_from_exception(self):
+        dest = unittest.mock.Mock(["parse_event_list"])
+        dest.parse_event_list.side_effect = ValueError()
+        sd = xso.SAXDriver(dest, batched=True)
+
+        sd.startElementNS((None, "foo"), "foo", {})
+        with self.assertRaises(ValueError):
+            sd.endElementNS((None, "foo"), "foo")
+
+        dest.parse_event_list.side_effect = None
+        dest.parse_event_list.reset_mock()
+
+        sd.startElementNS((None, "bar"), "bar", {})
+        sd.endElementNS((None, "bar"), "bar")
+        dest.parse_event_list.assert_called_once_with(
+            [
+                ("start", None, "bar", {}),
+                ("end",),
+            ]
+        )
+
+    def test_close_discards_partial_batch(self):
+        dest = unittest.mock.Mock(["parse_event_list"])
+        sd = xso.SAXDriver(dest, batched=True)
+
+        sd.startElementNS((None, "foo"), "foo", {})
+        sd.close()
+
+        sd.startElementNS((None, "bar"), "bar", {})
+        sd.endElementNS((None, "bar"), "bar")
+        dest.parse_event_list.assert_called_once_with(
+            [
+                ("start", None, "bar", {}),
+                ("end",),
+            ]
+        )
+
     def tearDown(self):
         del self.l
 
@@ -6558,6 +7069,89 @@ class TestXSOParser(XMLTestCase):
             result.attr
         )
 
+    def test_skips_failed_subtree(self):
+        class Child(xso.XSO):
+            TAG = "uri:foo", "child"
+
+            attr = xso.Attr("a", type_=xso.Integer())
+
+        class Sibling(xso.XSO):
+            TAG = "uri:foo", "sibling"
+
+        class Root(xso.XSO):
+            TAG = "uri:foo", "root"
+
+            child = xso.Child([Child])
+            sibling = xso.Child([Sibling])
+
+            def xso_error_handler(self, *args):
+                return True
+
+        tree = etree.fromstring(
+            "<root xmlns='uri:foo'>"
+            "<child a='x'><nested><deeper/></nested></child>"
+            "<sibling/>"
+            "</root>"
+        )
+        result = self.run_parser_one([Root], tree)
+        self.assertIsNone(result.child)
+        self.assertIsInstance(result.sibling, Sibling)
+
+
+class TestXSOParserBatched(TestXSOParser):
+    """
+    Run all :class:`XSOParser` tests through
+    :meth:`~.XSOParser.parse_event_list` to ensure that it is equivalent to
+    the suspendable parser.
+    """
+
+    def run_parser(self, classes, tree):
+        results = []
+
+        def catch_result(value):
+            nonlocal results
+            results.append(value)
+
+        def fail_hard(*args):
+            raise AssertionError("this should not be reached")
+
+        parser = xso.XSOParser()
+        for cls in classes:
+            parser.add_class(cls, catch_result)
+
+        sd = xso.SAXDriver(
+            parser,
+            on_emit=fail_hard,
+            batched=True,
+        )
+        lxml.sax.saxify(tree, sd)
+
+        return results
+
+    def test_parse_event_list_unknown_top_level_tag(self):
+        parser = xso.XSOParser()
+        with self.assertRaises(xso.UnknownTopLevelTag) as ctx:
+            parser.parse_event_list([
+                ("start", "uri:foo", "foo", {}),
+                ("end",),
+            ])
+        self.assertEqual(
+            ctx.exception.ev_args,
+            ["uri:foo", "foo", {}],
+        )
+
+    def test_parse_event_list_ignores_whitespace(self):
+        class Foo(xso.XSO):
+            TAG = ("uri:foo", "foo")
+
+        callback = unittest.mock.Mock()
+
+        parser = xso.XSOParser()
+        parser.add_class(Foo, callback)
+        self.assertIsNone(parser.parse_event_list([("text", " \n")]))
+
+        callback.assert_not_called()
+
 
 class TestContext(unittest.TestCase):
     def setUp(self):